@@ -1,20 +1,24 @@
 #!/usr/bin/env python3
 """Daemon to control cameras."""
 
+import csv
 import os
 import threading
 import time
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 
 from astropy.time import Time
 
 from gtecs.common.system import make_pid_file
 from gtecs.control import params
+from gtecs.control.astronomy import night_startdate
 from gtecs.control.daemons import (BaseDaemon, DaemonDependencyError, HardwareError,
                                    daemon_proxy, get_daemon_host)
 from gtecs.control.exposures import Exposure
-from gtecs.control.fits import (clear_glance_files, get_daemon_info, glance_location,
-                                image_location, make_fits, make_header, save_fits)
+from gtecs.control.fits import (clear_glance_files, get_daemon_info, get_image_quality,
+                                glance_location, image_location, make_fits, make_header,
+                                save_fits)
 from gtecs.control.slack import send_slack_msg
 
 
@@ -53,11 +57,14 @@ class CamDaemon(BaseDaemon):
         self.current_exposure = None
         self.temp_headers = None
         self.latest_headers = (self.num_taken, {ut: None for ut in self.uts})
+        self.image_quality = deque(maxlen=params.IMAGE_QUALITY_HISTORY)
+        self.image_quality_lock = threading.Lock()
         self.exposure_start_time = {ut: 0 for ut in self.uts}
         self.exposure_finished = {ut: False for ut in self.uts}
         self.exposing_start_time = 0
         self.image_ready = {ut: False for ut in self.uts}
         self.saving_thread_running = False
+        self.exposure_span = None
 
         self.target_window = {ut: None for ut in self.uts}
         self.measure_hfds = False
@@ -108,6 +115,7 @@ class CamDaemon(BaseDaemon):
             # take exposure
             if self.take_exposure_flag:
                 expstr = self.current_exposure.expstr.capitalize()
+                run_number = self.current_exposure.run_number
 
                 # Exposure state machine
                 if self.exposure_state == 'none':
@@ -116,14 +124,21 @@ class CamDaemon(BaseDaemon):
                     self.log.info('{}: Beginning new exposure'.format(expstr))
                     self.log.debug('{}: {}'.format(
                         expstr, self.current_exposure.as_line().strip()))
+                    span = self.tracer.span('prepare', run_number,
+                                            set_num=self.current_exposure.set_num,
+                                            set_pos=self.current_exposure.set_pos,
+                                            uts=self.active_uts.copy())
                     exptime = self.current_exposure.exptime
                     exptime_ms = exptime * 1000.
                     binning = self.current_exposure.binning
                     frametype = self.current_exposure.frametype
+                    window = self.current_exposure.window
                     for ut in self.active_uts:
                         argstr = '{:.1f}s, {:.0f}x{:.0f}, {}'.format(exptime,
                                                                      binning, binning,
                                                                      frametype)
+                        if window is not None:
+                            argstr += ', window ({:.0f},{:.0f},{:.0f},{:.0f})'.format(*window)
                         self.log.info('{}: Preparing exposure ({}) on camera {}'.format(
                                       expstr, argstr, ut))
                         try:
@@ -137,7 +152,12 @@ class CamDaemon(BaseDaemon):
                                 if reply:
                                     self.log.info(reply)
                                 # set window
-                                if self.target_window[ut] is None:
+                                if window is not None:
+                                    # a window just for this exposure, the next exposure will
+                                    # go back to the usual window below
+                                    x, y, dx, dy = window
+                                    reply = interface.set_window(x, y, dx, dy)
+                                elif self.target_window[ut] is None:
                                     # we need to set the default to full-frame here, since on
                                     # startup the cameras default to the active area only
                                     reply = interface.set_window_full()
@@ -153,8 +173,11 @@ class CamDaemon(BaseDaemon):
                             self.log.error('No response from interface cam{}'.format(ut))
                             self.log.debug('', exc_info=True)
 
+                    span.end()
+
                     # Start the exposure
                     # (separate from the above, so they all start closer together)
+                    span = self.tracer.span('start', run_number)
                     for ut in self.active_uts:
                         self.log.info('{}: Starting exposure on camera {}'.format(
                                       expstr, ut))
@@ -169,8 +192,10 @@ class CamDaemon(BaseDaemon):
                         except Exception:
                             self.log.error('No response from interface cam{}'.format(ut))
                             self.log.debug('', exc_info=True)
+                    span.end()
                     self.exposing_start_time = self.loop_time
                     self.exposure_state = 'exposing'
+                    self.exposure_span = self.tracer.span('exposing', run_number)
 
                 if (self.exposure_state == 'exposing' and
                         self.info['time'] > self.exposing_start_time):
@@ -196,6 +221,8 @@ class CamDaemon(BaseDaemon):
 
                     if all(self.exposure_finished[ut] for ut in self.active_uts):
                         self.exposure_state = 'reading_out'
+                        self.exposure_span.end()
+                        self.exposure_span = self.tracer.span('readout', run_number)
 
                 if self.exposure_state == 'reading_out':
                     # STATE 3: Wait for the readout to finish and images are ready to be saved
@@ -204,6 +231,7 @@ class CamDaemon(BaseDaemon):
                     # Construct the image headers
                     # We only need to do this once per exposure
                     if self.temp_headers is None:
+                        span = self.tracer.span('header', run_number)
                         # Fetch info from the other daemons
                         self.log.info('{}: Fetching info from other daemons'.format(expstr))
                         daemon_info, bad = get_daemon_info(self.info.copy(), log=self.log)
@@ -225,6 +253,7 @@ class CamDaemon(BaseDaemon):
                                 headers[ut] = None
                         self.temp_headers = headers
                         self.log.info('{}: Created image headers'.format(expstr))
+                        span.end()
 
                     # Wait for the images to be ready
                     for ut in self.active_uts:
@@ -241,6 +270,8 @@ class CamDaemon(BaseDaemon):
 
                     if all(self.image_ready[ut] for ut in self.active_uts):
                         self.exposure_state = 'images_ready'
+                        self.exposure_span.end()
+                        self.exposure_span = self.tracer.span('wait_save', run_number)
 
                 if (self.exposure_state == 'images_ready' and
                         self.saving_thread_running is False and
@@ -263,6 +294,8 @@ class CamDaemon(BaseDaemon):
                                                    self.info.copy()])
                     t.daemon = True
                     t.start()
+                    self.exposure_span.end()
+                    self.exposure_span = None
 
                     # Clear tags, ready for next exposure
                     self.exposure_state = 'none'
@@ -299,6 +332,9 @@ class CamDaemon(BaseDaemon):
                     if len(self.active_uts) == 0:
                         # we've aborted everything, stop the exposure
                         self.log.info('{}: Exposure aborted'.format(expstr))
+                        if self.exposure_span is not None:
+                            self.exposure_span.end(aborted=True)
+                            self.exposure_span = None
                         self.exposure_state = 'none'
                         self.current_exposure = None
                         self.exposing_start_time = 0
@@ -431,6 +467,7 @@ class CamDaemon(BaseDaemon):
                     ut_info['hw_class'] = interface.get_class()
                     ut_info['remaining'] = interface.get_time_remaining()
                     ut_info['in_queue'] = interface.get_queue_length()
+                    self.metrics.set_gauge('image_queue_length', ut_info['in_queue'], ut=ut)
                     ut_info['ccd_temp'] = interface.get_temp('CCD')
                     ut_info['base_temp'] = interface.get_temp('BASE')
                     ut_info['target_temp'] = self.target_temp[ut]
@@ -463,6 +500,7 @@ class CamDaemon(BaseDaemon):
             current_info['target'] = self.current_exposure.target
             current_info['imgtype'] = self.current_exposure.imgtype
             current_info['glance'] = self.current_exposure.glance
+            current_info['window'] = self.current_exposure.window
             current_info['uts'] = self.current_exposure.uts
             current_info['set_num'] = self.current_exposure.set_num
             current_info['set_pos'] = self.current_exposure.set_pos
@@ -509,6 +547,7 @@ class CamDaemon(BaseDaemon):
         current_exposure = cam_info['current_exposure']
         expstr = current_exposure['expstr'].capitalize()
         self.log.info('{}: Saving thread started'.format(expstr))
+        saving_span = self.tracer.span('saving', current_exposure['run_number'])
 
         if len(active_uts) == 0:
             # We must have aborted before we got to this stage
@@ -535,11 +574,14 @@ class CamDaemon(BaseDaemon):
 
         # start fetching images from the interfaces in parallel
         future_images = {ut: None for ut in active_uts}
+        fetch_spans = {ut: None for ut in active_uts}
         with ThreadPoolExecutor(max_workers=len(active_uts)) as executor:
             for ut in active_uts:
                 with daemon_proxy(f'cam{ut}', timeout=99) as interface:
                     try:
                         self.log.info('{}: Fetching exposure from camera {}'.format(expstr, ut))
+                        fetch_spans[ut] = self.tracer.span('fetch', current_exposure['run_number'],
+                                                           ut=ut)
                         future_images[ut] = executor.submit(interface.fetch_exposure)
                     except Exception:
                         self.log.error('No response from interface cam{}'.format(ut))
@@ -552,6 +594,7 @@ class CamDaemon(BaseDaemon):
                 for ut in active_uts:
                     if future_images[ut].done() and images[ut] is None:
                         images[ut] = future_images[ut].result()
+                        fetch_spans[ut].end()
                         self.log.info('{}: Fetched exposure from camera {}'.format(expstr, ut))
 
                 # keep looping until all the images and info are fetched
@@ -583,21 +626,24 @@ class CamDaemon(BaseDaemon):
                     filename += '.no_header'
 
                 # create and fill the FITS HDU
-                hdu = make_fits(image_data,
-                                header_cards=header_info[ut],
-                                compress=params.COMPRESS_IMAGES,
-                                measure_hfds=self.measure_hfds,
-                                log=self.log
-                                )
+                with self.tracer.span('make_fits', current_exposure['run_number'], ut=ut):
+                    hdu = make_fits(image_data,
+                                    header_cards=header_info[ut],
+                                    compress=params.COMPRESS_IMAGES,
+                                    measure_hfds=self.measure_hfds,
+                                    log=self.log
+                                    )
                 full_headers[ut] = hdu.header
 
                 # write the FITS file
                 self.log.info('{}: Saving exposure from camera {} to {}'.format(
                               expstr, ut, filename))
-                executor.submit(save_fits, hdu, filename,
-                                log=self.log, log_debug=False, fancy_log=True)
+                executor.submit(self._write_fits, hdu, filename,
+                                self.tracer.span('write', current_exposure['run_number'], ut=ut))
 
         self.latest_headers = (self.num_taken, full_headers)
+        self._store_image_quality(full_headers)
+        saving_span.end()
         self.saving_thread_running = False
         self.log.info('{}: Saving thread finished'.format(expstr))
         self.log.info('{}: Exposure complete'.format(expstr))
@@ -608,6 +654,7 @@ class CamDaemon(BaseDaemon):
         current_exposure = cam_info['current_exposure']
         expstr = current_exposure['expstr'].capitalize()
         self.log.info('{}: Saving thread started'.format(expstr))
+        saving_span = self.tracer.span('saving', current_exposure['run_number'])
 
         if len(active_uts) == 0:
             # We must have aborted before we got to this stage
@@ -640,7 +687,8 @@ class CamDaemon(BaseDaemon):
 
             self.log.info('{}: Saving exposure on camera {} to {}'.format(expstr, ut, filename))
             try:
-                with daemon_proxy(f'cam{ut}') as interface:
+                with daemon_proxy(f'cam{ut}') as interface, \
+                        self.tracer.span('save_request', current_exposure['run_number'], ut=ut):
                     full_headers[ut] = interface.save_exposure(
                         filename=filename,
                         header_cards=header_info[ut],
@@ -652,10 +700,58 @@ class CamDaemon(BaseDaemon):
                 self.log.debug('', exc_info=True)
 
         self.latest_headers = (self.num_taken, full_headers)
+        self._store_image_quality(full_headers)
+        saving_span.end()
         self.saving_thread_running = False
         self.log.info('{}: Saving thread finished'.format(expstr))
         self.log.info('{}: Exposure complete'.format(expstr))
 
+    def _write_fits(self, hdu, filename, span):
+        """Write a FITS file, and record the timing span."""
+        with span:
+            save_fits(hdu, filename, log=self.log, log_debug=False, fancy_log=True)
+
+    def _store_image_quality(self, full_headers):
+        """Store the image quality records from the headers of the latest saved images."""
+        records = []
+        for ut in sorted(full_headers):
+            if full_headers[ut] is None:
+                continue
+            try:
+                records.append(get_image_quality(full_headers[ut]))
+            except Exception:
+                self.log.error('Could not get image quality for camera {}'.format(ut))
+                self.log.debug('', exc_info=True)
+        with self.image_quality_lock:
+            self.image_quality.extend(records)
+
+        if params.IMAGE_QUALITY_LOG and len(records) > 0:
+            try:
+                self._write_image_quality_log(records)
+            except Exception:
+                self.log.error('Could not write image quality log')
+                self.log.debug('', exc_info=True)
+
+    def _write_image_quality_log(self, records):
+        """Append image quality records to tonight's log file, with one row per region."""
+        columns = ['time', 'run_number', 'ut', 'imgtype', 'exptime', 'filter',
+                   'background', 'saturation',
+                   'region', 'num_sources', 'hfd', 'hfd_std', 'fwhm', 'ellipticity']
+        if not os.path.exists(params.IMAGE_QUALITY_PATH):
+            os.mkdir(params.IMAGE_QUALITY_PATH)
+        filename = os.path.join(params.IMAGE_QUALITY_PATH, night_startdate() + '.csv')
+        new_file = not os.path.exists(filename)
+        with open(filename, 'a', newline='') as f:
+            writer = csv.DictWriter(f, columns, restval='')
+            if new_file:
+                writer.writeheader()
+            for record in records:
+                row = {key: value for key, value in record.items() if key != 'regions'}
+                if len(record['regions']) == 0:
+                    writer.writerow(row)
+                for region in record['regions']:
+                    writer.writerow({**row, **region})
+
     # Control functions
     def take_image(self, exptime, binning, imgtype, uts=None):
         """Take a normal frame with the camera."""
@@ -773,6 +869,34 @@ class CamDaemon(BaseDaemon):
             raise HardwareError('Cameras are currently reading out')
         return self.latest_headers
 
+    def get_image_quality(self, start_time=None, uts=None, limit=None):
+        """Get the image quality records of recently saved images, oldest first.
+
+        See `gtecs.control.fits.get_image_quality` for the contents of each record.
+
+        Parameters
+        ----------
+        start_time : float, optional
+            only return records for images taken after this time (as a Unix timestamp)
+            default = no limit
+        uts : list of int, optional
+            only return records for images from these UTs
+            default = all UTs
+        limit : int, optional
+            only return this many of the most recent records
+            default = no limit
+
+        """
+        with self.image_quality_lock:
+            records = list(self.image_quality)
+        if start_time is not None:
+            records = [record for record in records if record['time'] > start_time]
+        if uts is not None:
+            records = [record for record in records if record['ut'] in uts]
+        if limit is not None:
+            records = records[-limit:] if limit > 0 else []
+        return records
+
     def set_window(self, x, y, dx, dy, uts=None):
         """Set the camera's image window area."""
         if self.dependency_error:
@@ -856,6 +980,21 @@ class CamDaemon(BaseDaemon):
         """
         return self.take_exposure_flag
 
+    def get_exposure_state(self):
+        """Return the stage the current exposure is at.
+
+        Returns 'none' if there is no exposure, 'exposing' while the cameras are exposing, or
+        'reading_out' once they have finished and the image header info has been recorded.
+        Once it's 'reading_out' the mount and filter wheels can be moved ready for the next
+        exposure, but the next exposure can't be started until it's back to 'none'.
+        """
+        if not self.take_exposure_flag:
+            return 'none'
+        elif self.exposure_state in ['none', 'exposing'] or self.temp_headers is None:
+            return 'exposing'
+        else:
+            return 'reading_out'
+
     # Info function
     def get_info_string(self, verbose=False, force_update=False):
         """Get a string for printing status info."""
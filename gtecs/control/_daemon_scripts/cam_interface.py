@@ -164,10 +164,11 @@ class CameraInterfaceDaemon(BaseDaemon):
         self.log.info('Fetching image')
         return self.camera.fetch_image()
 
-    def _write_fits(self, hdu, filename):
+    def _write_fits(self, hdu, filename, run_number=None):
         """Write image HDU to a FITS file."""
         self.log.info('Saving image to {}'.format(filename))
-        save_fits(hdu, filename, log=self.log, log_debug=True, fancy_log=False)
+        with self.tracer.span('write', run_number):
+            save_fits(hdu, filename, log=self.log, log_debug=True, fancy_log=False)
         if os.path.isfile(filename):
             self.log.info('Image saved to {}'.format(filename))
         else:
@@ -176,10 +177,12 @@ class CameraInterfaceDaemon(BaseDaemon):
     def save_exposure(self, filename, header_cards=None, compress=False, measure_hfds=False,
                       method='proc'):
         """Fetch the image data and save to a FITS file."""
+        start_time = time.time()
         image_data = self.fetch_exposure()
         if image_data is None:
             self.log.error('ERROR: Failed to write image (nothing returned)')
             return None
+        fetch_time = time.time()
 
         hdu = make_fits(image_data,
                         header_cards=header_cards,
@@ -187,20 +190,27 @@ class CameraInterfaceDaemon(BaseDaemon):
                         measure_hfds=measure_hfds,
                         log=self.log)
 
+        # We only know the run number from the header, so record the spans afterwards
+        run_number = hdu.header.get('RUN')
+        if run_number == 'NA':
+            run_number = None  # glance
+        self.tracer.record('fetch', start_time, fetch_time, run_number)
+        self.tracer.record('make_fits', fetch_time, time.time(), run_number)
+
         if method == 'proc':
             # Start image saving in a new process
-            p = mp.Process(target=self._write_fits, args=[hdu, filename])
+            p = mp.Process(target=self._write_fits, args=[hdu, filename, run_number])
             p.start()
             self.log.info('Saving process started')
         elif method == 'thread':
             # Start image saving in a new thread
-            t = threading.Thread(target=self._write_fits, args=[hdu, filename])
+            t = threading.Thread(target=self._write_fits, args=[hdu, filename, run_number])
             t.daemon = True
             t.start()
             self.log.info('Saving thread started')
         else:
             # Just save directly here
-            self._write_fits(hdu, filename)
+            self._write_fits(hdu, filename, run_number)
             self.log.info('Saving complete')
 
         # return the image header
@@ -10,7 +10,7 @@ from astropy.time import Time
 from gtecs.common.system import make_pid_file
 from gtecs.control import params
 from gtecs.control.daemons import BaseDaemon, DaemonDependencyError, daemon_proxy
-from gtecs.control.exposures import Exposure, ExposureQueue
+from gtecs.control.exposures import Exposure, ExposureQueue, check_window
 
 
 class ExqDaemon(BaseDaemon):
@@ -24,7 +24,13 @@ class ExqDaemon(BaseDaemon):
         self.paused = True  # start paused
         self.exp_queue = ExposureQueue()
         self.current_exposure = None
+        self.reading_exposure = None
         self.exposure_state = 'none'
+        self.dither_state = 'none'
+        self.filter_state = 'none'
+        self.exposure_span = None
+        self.discard_exposure_flag = 0
+        self.requeue_exposure = False
 
         # dithering
         self.dithering_enabled = params.EXQ_DITHERING  # TODO: should be per exposure, also in db
@@ -35,7 +41,6 @@ class ExqDaemon(BaseDaemon):
                                ('N', 1.21),
                                ('E', 1.22),
                                ]
-        self.dithering = False
         self.dither_time = 0
         self.dither_delay = params.EXQ_DITHER_DELAY
 
@@ -86,170 +91,65 @@ class ExqDaemon(BaseDaemon):
                 self._get_info()
 
             # exposure queue processes
+            # Check if the cameras have finished reading out the previous exposure
+            if self.reading_exposure is not None and self.exposure_state != 'cameras_exposing':
+                try:
+                    with daemon_proxy('cam') as daemon:
+                        cam_state = daemon.get_exposure_state()
+                    if cam_state == 'none':
+                        reading_setstr = self.reading_exposure.setstr.capitalize()
+                        self.log.info('{}: Exposure complete'.format(reading_setstr))
+                        self.reading_exposure = None
+                        self.force_check_flag = True
+                except Exception:
+                    self.log.error('Error connecting to camera daemon')
+                    self.log.debug('', exc_info=True)
+
+            # Drop the current exposure if it hasn't been sent to the cameras yet
+            # (after the queue is cleared or paused, otherwise it would start afterwards)
+            if self.discard_exposure_flag:
+                self._discard_exposure()
+                self.discard_exposure_flag = 0
+
             # only do anything if we're not paused (and we're not in the middle of an exposure)
             if (not self.paused) or (self.exposure_state != 'none'):
                 # If we're not currently doing anything and there are exposures in the
                 # queue then pop off the first one and make that the current
+                # NB this can happen while the cameras are still reading out the previous one
                 if self.current_exposure is None and len(self.exp_queue) > 0:
-                    self.current_exposure = self.exp_queue.pop(0)
+                    self.current_exposure = self.exp_queue.popleft()
                     setstr = self.current_exposure.setstr.capitalize()
                     self.log.info('{}: Beginning new exposure'.format(setstr))
                     self.log.debug('{}: {}'.format(
                         setstr, self.current_exposure.as_line().strip()))
                     self.exposure_state = 'init'  # continue to state 1
+                    # NB the run number isn't known until the cameras start,
+                    # so the spans are recorded with the set number and position
+                    trace_args = {'set_num': self.current_exposure.set_num,
+                                  'set_pos': self.current_exposure.set_pos}
+                    self.exposure_span = self.tracer.span('prepare', **trace_args)
 
                 # Exposure state machine
                 if self.exposure_state == 'init':
-                    # STATE 1: Start the mount dithering (if required)
-                    if self.dithering_enabled and self.current_exposure.frametype != 'dark':
-                        try:
-                            with daemon_proxy('mnt', timeout=10) as daemon:
-                                info = daemon.get_info(force_update=True)
-
-                            # Check if the mount can move
-                            if info['status'] in ['Parked', 'Stopped',
-                                                  'IN BLINKY MODE', 'MOTORS OFF']:
-                                self.log.warning(
-                                    '{}: Cannot move mount ({}), skipping dither'.format(
-                                    setstr, info['status']))
-                                self.dithering = False
-                            elif self.current_exposure.set_pos == 1:
-                                # If it's the start of a new set then make sure we're in position
-                                # If we give no coordinates it will slew to the current target,
-                                # which will reset any offsets from previous dithers
-                                # However, we only want to do this if we've been dithering
-                                # since the last slew command. So we check the last move type first.
-                                if info['last_move_type'] == 'guide':
-                                    msg = f'{setstr}: Recentring mount on target position'
-                                    self.log.info(msg)
-                                    with daemon_proxy('mnt') as daemon:
-                                        daemon.slew(coords=None)
-                                    self.dither_time = self.loop_time
-                                    self.dithering = True
-                            else:
-                                # For subsequent exposures in a set, offset the mount slightly
-                                # using pulse guiding
-                                i = (self.current_exposure.set_pos - 2) % len(self.dither_pattern)
-                                direction = self.dither_pattern[i][0]
-                                duration = self.dither_pattern[i][1]
-                                msg = f'{setstr}: Offsetting the mount {duration:.2f}s {direction}'
-                                self.log.info(msg)
-                                with daemon_proxy('mnt') as daemon:
-                                    daemon.pulse_guide(direction, duration * 1000)
-                                self.dither_time = self.loop_time
-                                self.dithering = True
-                            self.exposure_state = 'mount_dithering'  # continue to state 2
-                        except Exception:
-                            self.log.error('Error connecting to mount daemon')
-                            self.log.debug('', exc_info=True)
-                            self.dithering = False
-                    else:
-                        self.dithering = False
-                        self.exposure_state = 'mount_dithering'  # continue to state 2
-
-                if self.exposure_state == 'mount_dithering':
-                    # STATE 2: Home the filter wheels (if required)
-                    if self.current_exposure.filt is not None:
-                        try:
-                            with daemon_proxy('filt') as daemon:
-                                info = daemon.get_info(force_update=False)
-                            # exclude uts without filter wheels
-                            filt_uts = [ut for ut in self.current_exposure.uts if ut in info]
-
-                            # Check if we need to home the filters
-                            if all(info[ut]['homed'] for ut in filt_uts):
-                                self.exposure_state = 'filters_homed'  # skip to state 4
-                            else:
-                                self.log.info('{}: Homing filter wheels'.format(setstr))
-                                with daemon_proxy('filt') as daemon:
-                                    daemon.home_filters(filt_uts)
-                                self.exposure_state = 'filters_homing'  # continue to state 3
-                        except Exception:
-                            self.log.error('Error connecting to filter wheel daemon')
-                            self.log.debug('', exc_info=True)
-                    else:
-                        # Filter doesn't matter, e.g. dark, so skip to state 6
-                        self.exposure_state = 'filters_set'
-
-                if self.exposure_state == 'filters_homing':
-                    # STATE 3: Wait for filter wheels to finish homing
-                    try:
-                        with daemon_proxy('filt', timeout=10) as daemon:
-                            info = daemon.get_info(force_update=True)
-                        filt_uts = [ut for ut in self.current_exposure.uts if ut in info]
-
-                        # Continue when all the filters are homed
-                        if all(info[ut]['homed'] for ut in filt_uts):
-                            self.log.info('{}: Filter wheels homed'.format(setstr))
-                            self.exposure_state = 'filters_homed'  # continue to state 4
-                    except Exception:
-                        self.log.error('Error connecting to filter wheel daemon')
-                        self.log.debug('', exc_info=True)
-
-                if self.exposure_state == 'filters_homed':
-                    # STATE 4: Change filter (if required)
-                    try:
-                        with daemon_proxy('filt') as daemon:
-                            info = daemon.get_info(force_update=False)
-                        filt_uts = [ut for ut in self.current_exposure.uts if ut in info]
-
-                        # Check if we need to change the filters
-                        if all(info[ut]['current_filter'] == self.current_exposure.filt
-                               for ut in filt_uts):
-                            self.exposure_state = 'filters_set'  # skip to state 6
-                        else:
-                            self.log.info('{}: Setting filter wheels to {}'.format(
-                                          setstr, self.current_exposure.filt))
-                            with daemon_proxy('filt') as daemon:
-                                filt_dict = {ut: self.current_exposure.filt for ut in filt_uts}
-                                daemon.set_filters(filt_dict)
-                            self.exposure_state = 'filters_setting'  # continue to state 5
-                    except Exception:
-                        self.log.error('Error connecting to filter wheel daemon')
-                        self.log.debug('', exc_info=True)
-
-                if self.exposure_state == 'filters_setting':
-                    # STATE 5: Wait for filter wheels to finish moving
-                    try:
-                        with daemon_proxy('filt', timeout=10) as daemon:
-                            info = daemon.get_info(force_update=True)
-                        filt_uts = [ut for ut in self.current_exposure.uts if ut in info]
-
-                        # Continue when the filters are set
-                        if all(info[ut]['current_filter'] == self.current_exposure.filt
-                               for ut in filt_uts):
-                            self.log.info('{}: Filter wheels set'.format(setstr))
-                            self.exposure_state = 'filters_set'  # continue to state 6
-                    except Exception:
-                        self.log.error('Error connecting to filter wheel daemon')
-                        self.log.debug('', exc_info=True)
-
-                if self.exposure_state == 'filters_set':
-                    # STATE 6: Wait for the mount to finish dithering
-                    if self.dithering is True:
-                        try:
-                            with daemon_proxy('mnt', timeout=10) as daemon:
-                                info = daemon.get_info(force_update=True)
-
-                            # Continue when the mount is tracking, and the last move was after the
-                            # dithering command (otherwise the status doesn't change fast enough).
-                            # We also add a delay since the mount tracking status can be
-                            # set too early before it's properly settled.
-                            if (info['status'] == 'Tracking' and
-                                    'last_move_time' in info and
-                                    info['last_move_time'] > self.dither_time and
-                                    self.loop_time > self.dither_time + self.dither_delay):
-                                self.log.info('{}: Mount tracking'.format(setstr))
-                                self.dithering = False
-                                self.exposure_state = 'mount_tracking'  # continue to state 7
-                        except Exception:
-                            self.log.error('Error connecting to mount daemon')
-                            self.log.debug('', exc_info=True)
-                    else:
-                        self.exposure_state = 'mount_tracking'  # continue to state 7
-
-                if self.exposure_state == 'mount_tracking':
-                    # STATE 7: Start the exposure
+                    # STATE 1: Start preparing the mount and filter wheels
+                    self.dither_state = 'none'
+                    self.filter_state = 'none'
+                    self.exposure_state = 'preparing'  # continue to state 2
+
+                if self.exposure_state == 'preparing':
+                    # STATE 2: Wait for the mount to dither and the filter wheels to be set
+                    # The mount and filter wheels move at the same time, so we check both
+                    if self.dither_state != 'done':
+                        self._prepare_mount(setstr)
+                    if self.filter_state != 'set':
+                        self._prepare_filters(setstr)
+                    if self.dither_state == 'done' and self.filter_state == 'set':
+                        self.exposure_state = 'ready'  # continue to state 3
+                        self.exposure_span.end()
+                        self.exposure_span = self.tracer.span('start', **trace_args)
+
+                if self.exposure_state == 'ready' and self.reading_exposure is None:
+                    # STATE 3: Start the exposure (once the previous one has been read out)
                     if not self.current_exposure.glance:
                         self.log.info('{}: Starting {:.0f}s exposure'.format(
                             setstr, self.current_exposure.exptime))
@@ -259,22 +159,34 @@ class ExqDaemon(BaseDaemon):
                     try:
                         with daemon_proxy('cam') as daemon:
                             daemon.take_exposure(self.current_exposure)
-                            self.exposure_state = 'cameras_exposing'  # continue to state 8
+                            self.exposure_state = 'cameras_exposing'  # continue to state 4
+                            self.exposure_span.end()
+                            self.exposure_span = self.tracer.span('exposing', **trace_args)
                     except Exception:
                         self.log.error('Error connecting to camera daemon')
                         self.log.debug('', exc_info=True)
 
                 if self.exposure_state == 'cameras_exposing':
-                    # STATE 8: Wait for the exposure to finish
+                    # STATE 4: Wait for the cameras to finish exposing
                     try:
                         with daemon_proxy('cam') as daemon:
-                            cam_exposing = daemon.is_exposing()
+                            cam_state = daemon.get_exposure_state()
 
-                        # Continue if the exposure has finished
-                        if not cam_exposing:
+                        # Once the shutters have closed and the camera daemon has recorded the
+                        # header info we can move on to the next exposure while the cameras
+                        # are reading out
+                        if cam_state == 'none':
                             self.log.info('{}: Exposure complete'.format(setstr))
                             self.current_exposure = None
                             self.exposure_state = 'none'  # return to start
+                            self.exposure_span.end()
+                            self.force_check_flag = True
+                        elif cam_state == 'reading_out':
+                            self.log.info('{}: Exposure finished, reading out'.format(setstr))
+                            self.reading_exposure = self.current_exposure
+                            self.current_exposure = None
+                            self.exposure_state = 'none'  # return to start
+                            self.exposure_span.end()
                             self.force_check_flag = True
                     except Exception:
                         self.log.error('Error connecting to camera daemon')
@@ -285,6 +197,178 @@ class ExqDaemon(BaseDaemon):
         self.log.info('Daemon control thread stopped')
 
     # Internal functions
+    def _discard_exposure(self):
+        """Drop the current exposure, if it's still being prepared and hasn't been started.
+
+        If `self.requeue_exposure` is True then it's put back at the front of the queue.
+        """
+        if (self.current_exposure is None or
+                self.exposure_state not in ['init', 'preparing', 'ready']):
+            return
+        setstr = self.current_exposure.setstr.capitalize()
+        if self.requeue_exposure:
+            self.log.info('{}: Returning exposure to the queue'.format(setstr))
+            self.exp_queue.insert(0, self.current_exposure)
+        else:
+            self.log.info('{}: Discarding exposure'.format(setstr))
+        self.current_exposure = None
+        self.exposure_state = 'none'
+        self.dither_state = 'none'
+        self.filter_state = 'none'
+        if self.exposure_span is not None:
+            self.exposure_span.end(aborted=True)
+            self.exposure_span = None
+        self.force_check_flag = True
+
+    def _prepare_mount(self, setstr):
+        """Start the mount dithering for the current exposure, and check when it's finished.
+
+        Updates `self.dither_state`, which will be 'done' when the mount is ready.
+        """
+        if self.dither_state == 'none':
+            if not self.dithering_enabled or self.current_exposure.frametype == 'dark':
+                self.dither_state = 'done'
+                return
+            try:
+                with daemon_proxy('mnt', timeout=10) as daemon:
+                    info = daemon.get_info(force_update=True)
+
+                # Check if the mount can move
+                if info['status'] in ['Parked', 'Stopped', 'IN BLINKY MODE', 'MOTORS OFF']:
+                    self.log.warning('{}: Cannot move mount ({}), skipping dither'.format(
+                                     setstr, info['status']))
+                    self.dither_state = 'done'
+                elif self.current_exposure.set_pos == 1:
+                    # If it's the start of a new set then make sure we're in position
+                    # If we give no coordinates it will slew to the current target,
+                    # which will reset any offsets from previous dithers
+                    # However, we only want to do this if we've been dithering
+                    # since the last slew command. So we check the last move type first.
+                    if info['last_move_type'] == 'guide':
+                        self.log.info(f'{setstr}: Recentring mount on target position')
+                        with daemon_proxy('mnt') as daemon:
+                            daemon.slew(coords=None)
+                        self.dither_time = self.loop_time
+                        self.dither_state = 'dithering'
+                    else:
+                        self.dither_state = 'done'
+                else:
+                    # For subsequent exposures in a set, offset the mount slightly
+                    # using pulse guiding
+                    i = (self.current_exposure.set_pos - 2) % len(self.dither_pattern)
+                    direction = self.dither_pattern[i][0]
+                    duration = self.dither_pattern[i][1]
+                    msg = f'{setstr}: Offsetting the mount {duration:.2f}s {direction}'
+                    self.log.info(msg)
+                    with daemon_proxy('mnt') as daemon:
+                        daemon.pulse_guide(direction, duration * 1000)
+                    self.dither_time = self.loop_time
+                    self.dither_state = 'dithering'
+            except Exception:
+                self.log.error('Error connecting to mount daemon')
+                self.log.debug('', exc_info=True)
+            return
+
+        if self.dither_state == 'dithering':
+            try:
+                with daemon_proxy('mnt', timeout=10) as daemon:
+                    info = daemon.get_info(force_update=True)
+
+                # Continue when the mount is tracking, and the last move was after the
+                # dithering command (otherwise the status doesn't change fast enough).
+                # We also add a delay since the mount tracking status can be
+                # set too early before it's properly settled.
+                if (info['status'] == 'Tracking' and
+                        'last_move_time' in info and
+                        info['last_move_time'] > self.dither_time and
+                        self.loop_time > self.dither_time + self.dither_delay):
+                    self.log.info('{}: Mount tracking'.format(setstr))
+                    self.dither_state = 'done'
+            except Exception:
+                self.log.error('Error connecting to mount daemon')
+                self.log.debug('', exc_info=True)
+
+    def _prepare_filters(self, setstr):
+        """Home and set the filter wheels for the current exposure, and check when they're done.
+
+        Updates `self.filter_state`, which will be 'set' when the filter wheels are ready.
+        """
+        if self.filter_state == 'none':
+            if self.current_exposure.filt is None:
+                # Filter doesn't matter, e.g. dark
+                self.filter_state = 'set'
+                return
+            try:
+                with daemon_proxy('filt') as daemon:
+                    info = daemon.get_info(force_update=False)
+                # exclude uts without filter wheels
+                filt_uts = [ut for ut in self.current_exposure.uts if ut in info]
+
+                # Check if we need to home the filters
+                if all(info[ut]['homed'] for ut in filt_uts):
+                    self.filter_state = 'homed'
+                else:
+                    self.log.info('{}: Homing filter wheels'.format(setstr))
+                    with daemon_proxy('filt') as daemon:
+                        daemon.home_filters(filt_uts)
+                    self.filter_state = 'homing'
+            except Exception:
+                self.log.error('Error connecting to filter wheel daemon')
+                self.log.debug('', exc_info=True)
+
+        if self.filter_state == 'homing':
+            # Wait for filter wheels to finish homing
+            try:
+                with daemon_proxy('filt', timeout=10) as daemon:
+                    info = daemon.get_info(force_update=True)
+                filt_uts = [ut for ut in self.current_exposure.uts if ut in info]
+
+                # Continue when all the filters are homed
+                if all(info[ut]['homed'] for ut in filt_uts):
+                    self.log.info('{}: Filter wheels homed'.format(setstr))
+                    self.filter_state = 'homed'
+            except Exception:
+                self.log.error('Error connecting to filter wheel daemon')
+                self.log.debug('', exc_info=True)
+
+        if self.filter_state == 'homed':
+            # Change filter (if required)
+            try:
+                with daemon_proxy('filt') as daemon:
+                    info = daemon.get_info(force_update=False)
+                filt_uts = [ut for ut in self.current_exposure.uts if ut in info]
+
+                # Check if we need to change the filters
+                if all(info[ut]['current_filter'] == self.current_exposure.filt
+                       for ut in filt_uts):
+                    self.filter_state = 'set'
+                else:
+                    self.log.info('{}: Setting filter wheels to {}'.format(
+                                  setstr, self.current_exposure.filt))
+                    with daemon_proxy('filt') as daemon:
+                        filt_dict = {ut: self.current_exposure.filt for ut in filt_uts}
+                        daemon.set_filters(filt_dict)
+                    self.filter_state = 'setting'
+            except Exception:
+                self.log.error('Error connecting to filter wheel daemon')
+                self.log.debug('', exc_info=True)
+
+        if self.filter_state == 'setting':
+            # Wait for filter wheels to finish moving
+            try:
+                with daemon_proxy('filt', timeout=10) as daemon:
+                    info = daemon.get_info(force_update=True)
+                filt_uts = [ut for ut in self.current_exposure.uts if ut in info]
+
+                # Continue when the filters are set
+                if all(info[ut]['current_filter'] == self.current_exposure.filt
+                       for ut in filt_uts):
+                    self.log.info('{}: Filter wheels set'.format(setstr))
+                    self.filter_state = 'set'
+            except Exception:
+                self.log.error('Error connecting to filter wheel daemon')
+                self.log.debug('', exc_info=True)
+
     def _get_info(self):
         """Get the latest status info from the hardware."""
         temp_info = {}
@@ -298,27 +382,36 @@ class ExqDaemon(BaseDaemon):
         # Get internal info
         if self.paused:
             temp_info['status'] = 'Paused'
-        elif self.current_exposure is not None:
+        elif self.current_exposure is not None or self.reading_exposure is not None:
             temp_info['status'] = 'Working'
         else:
             temp_info['status'] = 'Ready'
         temp_info['queue_length'] = len(self.exp_queue)
-        if self.current_exposure is not None:
+        self.metrics.set_gauge('exposure_queue_length', temp_info['queue_length'])
+        temp_info['exposure_state'] = self.exposure_state
+        temp_info['reading_out'] = self.reading_exposure is not None
+        # The current exposure is the one being prepared or taken,
+        # or if there isn't one the previous exposure that's still being read out
+        current_exposure = self.current_exposure
+        if current_exposure is None:
+            current_exposure = self.reading_exposure
+        if current_exposure is not None:
             temp_info['exposing'] = True
             current_info = {}
-            current_info['exptime'] = self.current_exposure.exptime
-            current_info['filter'] = self.current_exposure.filt
-            current_info['binning'] = self.current_exposure.binning
-            current_info['frametype'] = self.current_exposure.frametype
-            current_info['target'] = self.current_exposure.target
-            current_info['imgtype'] = self.current_exposure.imgtype
-            current_info['glance'] = self.current_exposure.glance
-            current_info['uts'] = self.current_exposure.uts
-            current_info['set_num'] = self.current_exposure.set_num
-            current_info['set_pos'] = self.current_exposure.set_pos
-            current_info['set_tot'] = self.current_exposure.set_tot
-            current_info['set_id'] = self.current_exposure.set_id
-            current_info['pointing_id'] = self.current_exposure.pointing_id
+            current_info['exptime'] = current_exposure.exptime
+            current_info['filter'] = current_exposure.filt
+            current_info['binning'] = current_exposure.binning
+            current_info['frametype'] = current_exposure.frametype
+            current_info['target'] = current_exposure.target
+            current_info['imgtype'] = current_exposure.imgtype
+            current_info['glance'] = current_exposure.glance
+            current_info['window'] = current_exposure.window
+            current_info['uts'] = current_exposure.uts
+            current_info['set_num'] = current_exposure.set_num
+            current_info['set_pos'] = current_exposure.set_pos
+            current_info['set_tot'] = current_exposure.set_tot
+            current_info['set_id'] = current_exposure.set_id
+            current_info['pointing_id'] = current_exposure.pointing_id
             temp_info['current_exposure'] = current_info
         else:
             temp_info['exposing'] = False
@@ -344,9 +437,12 @@ class ExqDaemon(BaseDaemon):
 
     # Control functions
     def add(self, exptime, nexp=1, filt=None, binning=1, frametype='normal',
-            target='NA', imgtype='SCIENCE', glance=False, uts=None,
+            target='NA', imgtype='SCIENCE', glance=False, uts=None, window=None,
             set_id=None, pointing_id=None):
-        """Add exposures to the queue."""
+        """Add exposures to the queue.
+
+        If no window is given, focus and glance frames use the default windows from params.
+        """
         if self.dependency_error:
             raise DaemonDependencyError(f'Dependencies are not responding: {self.bad_dependencies}')
         if int(exptime) < 0:
@@ -369,6 +465,12 @@ class ExqDaemon(BaseDaemon):
             uts = self.uts.copy()
         if any(ut not in self.uts for ut in uts):
             raise ValueError(f'Invalid UTs: {[ut for ut in uts if ut not in self.uts]}')
+        if window is None:
+            if glance:
+                window = params.EXQ_GLANCE_WINDOW
+            elif imgtype.upper() == 'FOCUS':
+                window = params.EXQ_FOCUS_WINDOW
+        window = check_window(window)
 
         # Find and update set number
         with open(self.set_number_file, 'r') as f:
@@ -379,6 +481,7 @@ class ExqDaemon(BaseDaemon):
         self.latest_set_number = new_set_number
 
         self.log.info('Adding new exposure set s{:07d}'.format(new_set_number))
+        exposures = []
         for i in range(1, nexp + 1):
             exposure = Exposure(exptime,
                                 filt,
@@ -388,19 +491,25 @@ class ExqDaemon(BaseDaemon):
                                 imgtype.replace(';', '').upper(),
                                 glance,
                                 uts,
+                                window,
                                 set_num=new_set_number,
                                 set_pos=i,
                                 set_tot=nexp,
                                 set_id=set_id,
                                 pointing_id=pointing_id,
                                 )
-            self.exp_queue.append(exposure)
+            exposures.append(exposure)
+
+        # Add the whole set to the queue at once
+        queue_length = len(self.exp_queue)
+        self.exp_queue.extend(exposures)
+        for i in range(1, nexp + 1):
             if not glance:
                 self.log.info('Added {:.0f}s {} exposure, now {:.0f} in queue'.format(
-                              exptime, filt if filt is not None else 'X', len(self.exp_queue)))
+                              exptime, filt if filt is not None else 'X', queue_length + i))
             else:
                 self.log.info('Added {:.0f}s {} glance, now {:.0f} in queue'.format(
-                              exptime, filt if filt is not None else 'X', len(self.exp_queue)))
+                              exptime, filt if filt is not None else 'X', queue_length + i))
 
     def clear(self):
         """Empty the exposure queue."""
@@ -410,6 +519,9 @@ class ExqDaemon(BaseDaemon):
         queue_length = len(self.exp_queue)
         self.log.info(f'Clearing {queue_length:.0f} items from queue')
         self.exp_queue.clear()
+        # Also drop the next exposure if it's already been taken from the queue
+        self.requeue_exposure = False
+        self.discard_exposure_flag = 1
         return queue_length
 
     def get(self):
@@ -434,6 +546,11 @@ class ExqDaemon(BaseDaemon):
         if not self.paused:
             self.log.info('Pausing queue')
             self.paused = True
+            # Put the next exposure back in the queue if it's already been taken out,
+            # so it won't be started until the queue is resumed (unless it's being cleared)
+            if not self.discard_exposure_flag:
+                self.requeue_exposure = True
+            self.discard_exposure_flag = 1
 
     def resume(self):
         """Unpause the queue."""
@@ -31,6 +31,7 @@ class FiltDaemon(BaseDaemon):
         self.filters = {ut: params.UT_DICT[ut]['FILTERS'] for ut in self.uts}
 
         self.last_move_time = {ut: None for ut in self.uts}
+        self.move_spans = {ut: None for ut in self.uts}
 
         # dependencies
         for interface_id in self.interfaces:
@@ -83,6 +84,8 @@ class FiltDaemon(BaseDaemon):
                                 if reply:
                                     self.log.info(reply)
                             self.last_move_time[ut] = self.loop_time
+                            self.move_spans[ut] = self.tracer.span(
+                                'move', ut=ut, filter=self.new_filter[ut])
                         except Exception:
                             self.log.error('No response from interface filt{}'.format(ut))
                             self.log.debug('', exc_info=True)
@@ -104,6 +107,7 @@ class FiltDaemon(BaseDaemon):
                                 if reply:
                                     self.log.info(reply)
                             self.last_move_time[ut] = self.loop_time
+                            self.move_spans[ut] = self.tracer.span('home', ut=ut)
                         except Exception:
                             self.log.error('No response from interface filt{}'.format(ut))
                             self.log.debug('', exc_info=True)
@@ -152,6 +156,11 @@ class FiltDaemon(BaseDaemon):
                 ut_info['filters'] = self.filters[ut]
                 ut_info['last_move_time'] = self.last_move_time[ut]
 
+                if ut_info['status'] == 'Ready' and self.move_spans[ut] is not None:
+                    # Finished moving
+                    self.move_spans[ut].end()
+                    self.move_spans[ut] = None
+
                 temp_info[ut] = ut_info
             except Exception:
                 self.log.error('Failed to get filter wheel {} info'.format(ut))
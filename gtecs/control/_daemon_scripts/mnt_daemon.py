@@ -47,6 +47,8 @@ class MntDaemon(BaseDaemon):
         self.target = None
         self.last_move_time = None
         self.last_move_type = None
+        self.move_span = None
+        self.move_seen_slewing = False
         self.offset_direction = None
         self.offset_distance = None
         self.guide_direction = None
@@ -141,6 +143,7 @@ class MntDaemon(BaseDaemon):
                         self.log.info(reply)
                     self.last_move_time = self.loop_time
                     self.last_move_type = 'slew'
+                    self._start_move_span()
                 except Exception:
                     self.log.error('slew command failed')
                     self.log.debug('', exc_info=True)
@@ -187,6 +190,7 @@ class MntDaemon(BaseDaemon):
                         self.log.info(reply)
                     self.last_move_time = self.loop_time
                     self.last_move_type = 'park'
+                    self._start_move_span()
                 except Exception:
                     self.log.error('park command failed')
                     self.log.debug('', exc_info=True)
@@ -220,6 +224,7 @@ class MntDaemon(BaseDaemon):
                         self.log.info(reply)
                     self.last_move_time = self.loop_time
                     self.last_move_type = 'offset'
+                    self._start_move_span()
                 except Exception:
                     self.log.error('offset command failed')
                     self.log.debug('', exc_info=True)
@@ -239,6 +244,10 @@ class MntDaemon(BaseDaemon):
                         self.log.info(reply)
                     self.last_move_time = self.loop_time
                     self.last_move_type = 'guide'
+                    # The mount doesn't report when it's guiding, but we know how long it takes
+                    self.tracer.record('move', self.loop_time,
+                                       self.loop_time + self.guide_duration / 1000,
+                                       type='guide', direction=self.guide_direction)
                 except Exception:
                     self.log.error('pulse_guide command failed')
                     self.log.debug('', exc_info=True)
@@ -347,6 +356,7 @@ class MntDaemon(BaseDaemon):
                 self.mount = SiTech(
                     params.MOUNT_HOST,
                     params.MOUNT_PORT,
+                    status_period=params.MOUNT_STATUS_PERIOD,
                     log=self.log,
                     log_debug=params.MOUNT_DEBUG,
                 )
@@ -466,14 +476,6 @@ class MntDaemon(BaseDaemon):
                 temp_info['acceleration'] = self.mount.acceleration
                 temp_info['motor_current'] = self.mount.motor_current
 
-                # Save history internally so we can add to the image headers
-                self.history['encoder_position'] = self.mount.encoder_position_history
-                self.history['position_error'] = self.mount.position_error_history
-                self.history['tracking_error'] = self.mount.tracking_error_history
-                self.history['velocity'] = self.mount.velocity_history
-                self.history['acceleration'] = self.mount.acceleration_history
-                self.history['motor_current'] = self.mount.motor_current_history
-
                 # Check if the mount is within the encoder position limits
                 temp_info['encoder_position_limits'] = {
                     'ra': (params.ENCODER_RA_MIN, params.ENCODER_RA_MAX),
@@ -549,6 +551,7 @@ class MntDaemon(BaseDaemon):
                 temp_info['class'] = 'SITECH'
                 temp_info['nonsidereal'] = None
                 # Report the connection as failed
+                self.mount.disconnect()
                 self.mount = None
                 if 'sitech' not in self.bad_hardware:
                     self.bad_hardware.add('sitech')
@@ -645,9 +648,23 @@ class MntDaemon(BaseDaemon):
         except Exception:
             self.log.error('Could not write current status')
 
+        # Finish the timing span for the latest move once the mount has stopped slewing
+        # (or if it never seemed to start)
+        if self.move_span is not None and 'status' in temp_info:
+            if temp_info['status'] == 'Slewing':
+                self.move_seen_slewing = True
+            elif self.move_seen_slewing or self.loop_time - self.last_move_time > 10:
+                self.move_span.end(status=temp_info['status'])
+                self.move_span = None
+
         # Update the master info dict
         self.info = temp_info
 
+    def _start_move_span(self):
+        """Start the timing span for a new mount move."""
+        self.move_span = self.tracer.span('move', type=self.last_move_type)
+        self.move_seen_slewing = False
+
     def _limit_check(self, force_stop=True):
         """Check if the mount position is past the valid limits."""
         if self.info['elevation_within_limits'] is False:
@@ -1047,7 +1064,21 @@ class MntDaemon(BaseDaemon):
 
         This was previously part of the usual get_info() function, but the values made the
         dict too long so it was split out.
+        The history is read from the mount's telemetry store when requested, rather than being
+        copied every time the info is updated.
         """
+        if isinstance(self.mount, (DDM500, FakeDDM500)):
+            try:
+                self.history = {'encoder_position': self.mount.encoder_position_history,
+                                'position_error': self.mount.position_error_history,
+                                'tracking_error': self.mount.tracking_error_history,
+                                'velocity': self.mount.velocity_history,
+                                'acceleration': self.mount.acceleration_history,
+                                'motor_current': self.mount.motor_current_history,
+                                }
+            except Exception:
+                self.log.error('Failed to get mount history')
+                self.log.debug('', exc_info=True)
         return self.history
 
     # Info function
@@ -11,7 +11,7 @@ from gtecs.common.system import make_pid_file
 from gtecs.control import params
 from gtecs.control.daemons import BaseDaemon
 from gtecs.control.hardware.power import APCATS, APCPDU, APCUPS, APCUPS_USB, EPCPDU, ETHPDU
-from gtecs.control.hardware.power import FakePDU, FakeUPS
+from gtecs.control.hardware.power import FakePDU, FakeUPS, PowerUnitPoller
 
 
 class PowerDaemon(BaseDaemon):
@@ -22,6 +22,7 @@ class PowerDaemon(BaseDaemon):
 
         # hardware
         self.power_units = {unit_name: None for unit_name in params.POWER_UNITS}
+        self.poller = PowerUnitPoller(params.POWER_POLL_TIMEOUT, params.POWER_OUTLET_HOLD_TIME)
 
         # command flags
         self.on_flag = 0
@@ -84,6 +85,7 @@ class PowerDaemon(BaseDaemon):
                         reply = power.on(outlet)
                         if reply:
                             self.log.info(reply)
+                        self.poller.set_outlets(unit, power, outlet, on=True)
                 except Exception:
                     self.log.error('on command failed')
                     self.log.debug('', exc_info=True)
@@ -104,6 +106,7 @@ class PowerDaemon(BaseDaemon):
                         reply = power.off(outlet)
                         if reply:
                             self.log.info(reply)
+                        self.poller.set_outlets(unit, power, outlet, on=False)
                 except Exception:
                     self.log.error('off command failed')
                     self.log.debug('', exc_info=True)
@@ -124,6 +127,7 @@ class PowerDaemon(BaseDaemon):
                         reply = power.reboot(outlet)
                         if reply:
                             self.log.info(reply)
+                        self.poller.set_outlets(unit, power, outlet, on=True)
                 except Exception:
                     self.log.error('reboot command failed')
                     self.log.debug('', exc_info=True)
@@ -210,17 +214,19 @@ class PowerDaemon(BaseDaemon):
         temp_info['timestamp'] = Time(self.loop_time, format='unix', precision=0).iso
         temp_info['uptime'] = self.loop_time - self.start_time
 
+        # Get info from all the units at once
+        snapshots, errors = self.poller.poll(self.power_units)
+
         for unit_name in self.power_units:
             # Get info from each unit
             try:
                 power = self.power_units[unit_name]
                 temp_status = {}
+                if unit_name in errors:
+                    raise errors[unit_name]
+                temp_status.update(snapshots[unit_name])
                 if hasattr(power, 'outlets'):
-                    if power.unit_type == 'PDU':
-                        outlet_statuses = power.status()
-                    elif power.unit_type == 'UPS':
-                        outlet_statuses = power.outlet_status()
-                    temp_status['outlet_statuses'] = outlet_statuses
+                    outlet_statuses = temp_status['outlet_statuses']
                     outlet_names = params.POWER_UNITS[unit_name]['NAMES']
                     for name, status in zip(outlet_names, outlet_statuses):
                         if status == str(power.on_value):
@@ -229,16 +235,6 @@ class PowerDaemon(BaseDaemon):
                             temp_status[name] = 'off'
                         else:
                             temp_status[name] = 'ERROR'
-                if power.unit_type == 'UPS':
-                    temp_status['status'] = power.status()
-                    temp_status['percent'] = power.percent_remaining()
-                    temp_status['time'] = power.time_remaining()
-                    temp_status['load'] = power.load()
-                if power.unit_type == 'ATS':
-                    temp_status['status'] = power.status()
-                    temp_status['status_A'] = power.source_status('A')
-                    temp_status['status_B'] = power.source_status('B')
-                    temp_status['source'] = power.active_source()
                 temp_info['status_' + unit_name] = temp_status
             except Exception:
                 self.log.error('Failed to get {} info'.format(unit_name))
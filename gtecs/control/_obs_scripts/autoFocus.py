@@ -21,7 +21,7 @@ from astropy.time import Time
 from gtecs.control import params
 from gtecs.control.analysis import get_focus_region
 from gtecs.control.catalogs import focus_star
-from gtecs.control.focusing import (RestoreFocusCloser, get_best_focus_position,
+from gtecs.control.focusing import (RestoreFocusCloser, VCurveFocuser, get_best_focus_position,
                                     get_focus_params, get_focuser_positions, get_hfd_position,
                                     measure_focus, set_focuser_positions)
 from gtecs.control.observing import prepare_for_images, slew_to_radec
@@ -31,6 +31,29 @@ import numpy as np
 import pandas as pd
 
 
+def slew_to_focus_star(no_slew=False):
+    """Slew to a focus star, and return the target name."""
+    if no_slew:
+        return 'Autofocus'
+    print('~~~~~~')
+    star = focus_star(Time.now())
+    print('Slewing to target {}...'.format(star))
+    coordinate = star.coord_now()
+    slew_to_radec(coordinate.ra.deg, coordinate.dec.deg, timeout=120)
+    print('Reached target')
+    return star.name
+
+
+def get_region(binning=1, use_annulus_region=True):
+    """Get the region of the images to measure."""
+    if use_annulus_region:
+        # Measure sources in an annulus around the centre
+        return get_focus_region(binning)
+    # Stick to the default central region
+    return (slice(2500 // binning, 6000 // binning),
+            slice(1500 // binning, 4500 // binning))
+
+
 def run(num_exp=3, exptime=5, filt='L', binning=1,
         no_slew=False, no_report=False,
         use_annulus_region=True):
@@ -46,16 +69,7 @@ def run(num_exp=3, exptime=5, filt='L', binning=1,
     print('Starting focus routine')
 
     # Slew to a focus star
-    if not no_slew:
-        print('~~~~~~')
-        star = focus_star(Time.now())
-        print('Slewing to target {}...'.format(star))
-        target_name = star.name
-        coordinate = star.coord_now()
-        slew_to_radec(coordinate.ra.deg, coordinate.dec.deg, timeout=120)
-        print('Reached target')
-    else:
-        target_name = 'Autofocus'
+    target_name = slew_to_focus_star(no_slew)
 
     # Get the focus parameters defined in params
     foc_params = get_focus_params()
@@ -66,14 +80,7 @@ def run(num_exp=3, exptime=5, filt='L', binning=1,
     failed_uts = {}
 
     # Define measurement region
-    if use_annulus_region:
-        # Measure sources in an annulus around the centre
-        region = get_focus_region(binning)
-    else:
-        # Stick to the default central region
-        region = (slice(2500 // binning, 6000 // binning),
-                  slice(1500 // binning, 4500 // binning))
-    regions = [region]  # measure_focus takes a list of regions
+    regions = [get_region(binning, use_annulus_region)]  # measure_focus takes a list of regions
 
     # With the focusers where they are now, take images to get a baseline HFD.
     print('~~~~~~')
@@ -296,6 +303,16 @@ def run(num_exp=3, exptime=5, filt='L', binning=1,
 
     print('Focus data at best focus position:\n', foc_data.round(1))
 
+    finish(foc_data, initial_positions, initial_hfds, active_uts, failed_uts, all_uts,
+           num_exp, exptime, filt, binning, target_name, regions, no_report)
+
+
+def finish(foc_data, initial_positions, initial_hfds, active_uts, failed_uts, all_uts,
+           num_exp, exptime, filt, binning, target_name, regions, no_report):
+    """Check the final focus measurements, reset any failed UTs and report the results."""
+    current_positions = get_focuser_positions(active_uts)
+    final_hfds = foc_data['hfd']
+
     # Compare to initial values
     print('~~~~~~')
     print('Initial positions:', initial_positions)
@@ -366,6 +383,122 @@ def run(num_exp=3, exptime=5, filt='L', binning=1,
     print('Done')
 
 
+def run_adaptive(num_exp=1, exptime=5, filt='L', binning=1,
+                 no_slew=False, no_report=False,
+                 use_annulus_region=True, max_measurements=10):
+    """Run the adaptive autofocus routine.
+
+    Instead of following a fixed sequence of moves, the V-curve for each UT is fitted as the
+    measurements come in, each new position is chosen to best improve the fit, and each UT stops
+    once its best focus position is known well enough (see `focusing.VCurveFocuser`).
+    """
+    # make sure hardware is ready
+    prepare_for_images()
+
+    print('~~~~~~')
+    print('Starting adaptive focus routine')
+
+    # Slew to a focus star
+    target_name = slew_to_focus_star(no_slew)
+
+    # Get the focus parameters defined in params
+    foc_params = get_focus_params()
+
+    # Try to focus all UTs that have focusers, as long as they have params
+    all_uts = sorted(foc_params.index)
+    active_uts = all_uts.copy()
+    failed_uts = {}
+
+    # Define measurement region
+    regions = [get_region(binning, use_annulus_region)]
+
+    print('~~~~~~')
+    initial_positions = get_focuser_positions(active_uts)
+    print('Initial positions:', initial_positions)
+    focusers = {ut: VCurveFocuser(initial_positions[ut],
+                                  foc_params['m_l'][ut],
+                                  foc_params['m_r'][ut],
+                                  foc_params['delta_x'][ut],
+                                  foc_params['nfv'][ut],
+                                  foc_params['big_step'][ut],
+                                  foc_params['max_uncertainty'][ut],
+                                  )
+                for ut in active_uts}
+
+    # Keep taking measurements until every UT has converged
+    current_positions = initial_positions
+    initial_hfds = None
+    for i in range(max_measurements):
+        measuring_uts = [ut for ut in active_uts if not focusers[ut].converged]
+        print('Taking {} focus measurements...'.format(num_exp))
+        foc_data = measure_focus(num_exp, exptime, filt, binning, target_name,
+                                 measuring_uts, regions)
+        if initial_hfds is None:
+            initial_hfds = foc_data['hfd']
+        if num_exp > 1:
+            print('Best HFDs:', foc_data['hfd'].round(1).to_dict())
+
+        new_positions = {}
+        for ut in measuring_uts:
+            focuser = focusers[ut]
+            focuser.add_measurement(current_positions[ut],
+                                    foc_data['hfd'][ut],
+                                    foc_data['hfd_std'][ut])
+            best_position, uncertainty = focuser.get_best_position()
+            if best_position is not None:
+                print('UT{}: best focus estimate {} +/- {:.0f}{}'.format(
+                      ut, best_position, uncertainty, ' (converged)' if focuser.converged else ''))
+            if not focuser.converged:
+                next_position = focuser.get_next_position()
+                if next_position is None:
+                    failed_uts[ut] = 'Unable to measure image HFDs'
+                else:
+                    new_positions[ut] = next_position
+
+        active_uts = sorted(ut for ut in active_uts if ut not in failed_uts)
+        if len(active_uts) == 0:
+            raise ValueError('All UTs have failed')
+        if len(new_positions) == 0 or i == max_measurements - 1:
+            break
+
+        print('~~~~~~')
+        print('Moving focusers...')
+        set_focuser_positions(new_positions, timeout=120)
+        current_positions = get_focuser_positions(active_uts)
+        print('New positions:', current_positions)
+
+    # Move to the best focus positions
+    print('~~~~~~')
+    bf_positions_dict = {}
+    for ut in active_uts:
+        best_position, uncertainty = focusers[ut].get_best_position()
+        if best_position is None:
+            failed_uts[ut] = 'Unable to fit V-curve'
+            continue
+        if not focusers[ut].converged:
+            print('UT{}: Best focus position has not converged, using current estimate'.format(ut))
+        bf_positions_dict[ut] = best_position
+    active_uts = sorted(ut for ut in active_uts if ut not in failed_uts)
+    if len(active_uts) == 0:
+        raise ValueError('All UTs have failed')
+    print('Best focus positions:', bf_positions_dict)
+
+    print('Moving focusers to best focus position...')
+    set_focuser_positions(bf_positions_dict, timeout=60)
+    current_positions = get_focuser_positions(active_uts)
+    print('New positions:', current_positions)
+
+    print('Taking {} focus measurements...'.format(num_exp))
+    foc_data = measure_focus(num_exp, exptime, filt, binning, target_name, active_uts, regions)
+    if num_exp > 1:
+        print('Best HFDs:', foc_data['hfd'].round(1).to_dict())
+
+    print('Focus data at best focus position:\n', foc_data.round(1))
+
+    finish(foc_data, initial_positions, initial_hfds, active_uts, failed_uts, all_uts,
+           num_exp, exptime, filt, binning, target_name, regions, no_report)
+
+
 if __name__ == '__main__':
     parser = ArgumentParser(description='Autofocus the telescopes.')
     # Optional arguments
@@ -396,6 +529,10 @@ if __name__ == '__main__':
     parser.add_argument('--no-report', action='store_true',
                         help=('do not send final focus positions to Slack')
                         )
+    parser.add_argument('--adaptive', action='store_true',
+                        help=('fit the V-curve as measurements are taken, '
+                              'instead of using the fixed sequence of moves')
+                        )
 
     args = parser.parse_args()
     num_exp = args.numexp
@@ -404,12 +541,16 @@ if __name__ == '__main__':
     binning = args.binning
     no_slew = args.no_slew
     no_report = args.no_report
+    adaptive = args.adaptive
 
     # If something goes wrong we need to restore the original focus
     initial_positions = get_focuser_positions()
     try:
         RestoreFocusCloser(initial_positions)
-        run(num_exp, exptime, filt, binning, no_slew, no_report)
+        if adaptive:
+            run_adaptive(num_exp, exptime, filt, binning, no_slew, no_report)
+        else:
+            run(num_exp, exptime, filt, binning, no_slew, no_report)
     except Exception:
         print('Error caught: Restoring original focus positions...')
         set_focuser_positions(initial_positions, timeout=60)
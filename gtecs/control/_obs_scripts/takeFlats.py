@@ -10,7 +10,8 @@ from astropy.time import Time
 
 from gtecs.control import params
 from gtecs.control.astronomy import sunalt_time
-from gtecs.control.catalogs import antisun_flat, exposure_sequence
+from gtecs.control.catalogs import antisun_flat
+from gtecs.control.catalogs.flats import TwilightSkyModel
 from gtecs.control.daemons import daemon_proxy
 from gtecs.control.observing import get_analysis_image, prepare_for_images, slew_to_radec
 
@@ -26,10 +27,18 @@ FILTER_BANDWIDTH = {'L': 2942,
                     }
 # Order filters by twilight sky brightness, dimmest first (remember to reverse in the morning)
 FILTER_ORDER = ['B', 'G', 'R', 'L', 'C']
+# Shortest exposure to use for flats (to avoid shutter effects)
+MIN_EXPTIME = 0.5
 
 
 def take_flat(exptime, filt, offset_step, target_name='Sky flats', glance=False):
-    """Offset the telescope then take an image and return the mean sky brightness."""
+    """Offset the telescope then take an image and return the mean sky brightness.
+
+    Returns the mean of the median counts from each UT, and the exposure start time as a
+    Unix timestamp.
+    """
+    call_time = time.time()
+
     # Make an offset to move the stars
     with daemon_proxy('mnt') as daemon:
         info = daemon.get_info(force_update=True)
@@ -51,7 +60,13 @@ def take_flat(exptime, filt, offset_step, target_name='Sky flats', glance=False)
     print('Median counts:', sky_medians)
     mean_counts = np.mean([sky_medians[ut] for ut in sky_medians])
 
-    return mean_counts
+    # Get the exposure start time
+    try:
+        start_time = np.mean([Time(image_headers[ut]['DATE-OBS']).unix for ut in image_headers])
+    except (KeyError, ValueError):
+        start_time = call_time
+
+    return mean_counts, start_time
 
 
 def run(eve, target_counts, num_exp, filt_list=None, max_exptime=30, offset_step=600,
@@ -106,20 +121,42 @@ def run(eve, target_counts, num_exp, filt_list=None, max_exptime=30, offset_step
     else:
         target_name = 'Sky flats'
 
+    # Model the sky brightness from all the images we take, so we can predict when we'll reach
+    # the target counts and the exposure times needed for each filter
+    model = TwilightSkyModel(eve)
+    start_delay = 0  # time between requesting an image and the exposure starting
+
+    def _take_flat(exptime, filt, glance=False):
+        nonlocal start_delay
+        call_time = time.time()
+        counts, start_time = take_flat(exptime, filt, offset_step, target_name, glance)
+        print('{} image sky mean: {:.1f} counts'.format(filt, counts))
+        start_delay = max(0, start_time - call_time)
+        if not model.add_measurement(filt, start_time, exptime, counts):
+            print('Measurement not used in the sky model (saturated or too faint)')
+        return counts
+
     # Start taking glances and wait for sky to reach target brightness
     print('~~~~~~')
     print('Taking initial exposures')
     filt = filt_list[0]
     while True:
-        counts = take_flat(exptime, filt, offset_step, target_name, glance=True)
-        print('{} image sky mean: {:.1f} counts'.format(filt, counts))
-
-        if eve and counts > target_counts:
-            print('Waiting until below {:.1f} counts'.format(target_counts))
-            time.sleep(1)
-        elif not eve and counts < target_counts:
-            print('Waiting until above {:.1f} counts'.format(target_counts))
-            time.sleep(1)
+        counts = _take_flat(exptime, filt, glance=True)
+
+        if (eve and counts > target_counts) or (not eve and counts < target_counts):
+            # Wait for half of the predicted time until we reach the target (so we can check
+            # the prediction as we get closer), or one second if we can't predict it yet
+            if filt in model.scales:
+                target_time = model.time_for_counts(target_counts, filt, exptime)
+                wait_time = (target_time - start_delay - time.time()) / 2
+                wait_time = float(np.clip(wait_time, 1, 60))
+                print('Target counts predicted at {}'.format(
+                    Time(target_time, format='unix').iso[11:19]))
+            else:
+                wait_time = 1
+            print('Waiting until {} {:.1f} counts, next check in {:.0f}s'.format(
+                'below' if eve else 'above', target_counts, wait_time))
+            time.sleep(wait_time)
         else:
             break
     print('Reached target sky brightness ({:.1f} counts)'.format(target_counts))
@@ -127,44 +164,55 @@ def run(eve, target_counts, num_exp, filt_list=None, max_exptime=30, offset_step
     # Run through the filter list
     for i, filt in enumerate(filt_list):
         print('~~~~~~')
-        filt = filt_list[i]
         print('Using {} filter'.format(filt))
 
-        if i > 0:
-            new_exptime = exptime * (target_counts / counts)
-            # Guess initial exposure time based on the previous filter
-            bandwidth_ratio = FILTER_BANDWIDTH[filt_list[i - 1]] / FILTER_BANDWIDTH[filt]
-            new_exptime = new_exptime * bandwidth_ratio
-            print('Rescaling exposure time from {:.1f} to {:.1f}'.format(exptime, new_exptime))
-            exptime = new_exptime
-            if exptime > max_exptime:
-                print('Limiting exposure time to {:.1f}s'.format(max_exptime))
-                exptime = max_exptime
+        if filt not in model.scales:
+            # Guess initial exposure time based on the last filter we have measurements for
+            # (previous filters might have been skipped)
+            prev_filts = [prev_filt for prev_filt in reversed(filt_list[:i])
+                          if prev_filt in model.scales]
+            if len(prev_filts) > 0:
+                prev_filt = prev_filts[0]
+                new_exptime = model.exptime_for_counts(target_counts, prev_filt,
+                                                       time.time() + start_delay)
+                bandwidth_ratio = FILTER_BANDWIDTH[prev_filt] / FILTER_BANDWIDTH[filt]
+                new_exptime = new_exptime * bandwidth_ratio
+                print('Rescaling exposure time from {:.1f} to {:.1f}'.format(
+                    exptime, new_exptime))
+                exptime = float(np.clip(new_exptime, MIN_EXPTIME, max_exptime))
+            else:
+                print('No previous filter measurements, keeping exposure time of {:.1f}'.format(
+                    exptime))
 
             # Take initial measurement
             print('Taking {} test exposure to find new exposure time'.format(filt))
-            counts = take_flat(new_exptime, filt, offset_step, target_name, glance=True)
-            print('{} image sky mean: {:.1f} counts'.format(filt, counts))
+            counts = _take_flat(exptime, filt, glance=True)
+            if filt not in model.scales:
+                print('Could not measure sky brightness in {} filter, skipping'.format(filt))
+                continue
 
-        # Rescale based on new measurement
-        new_exptime = exptime * (target_counts / counts)
-        print('Rescaling exposure time from {:.1f} to {:.1f}'.format(exptime, new_exptime))
-        exptime = new_exptime
-        if exptime > max_exptime:
-            print('Limiting exposure time to {:.1f}s'.format(max_exptime))
-            exptime = max_exptime
+        ladder = model.exposure_ladder(target_counts, filt, num_exp,
+                                       time.time() + start_delay, overhead=30,
+                                       min_exptime=MIN_EXPTIME, max_exptime=max_exptime)
+        print('Predicted exposure times: {}'.format(
+            ', '.join('{:.1f}s'.format(exptime) for _, exptime in ladder)))
 
         print('~~~~~~')
-        exptime_list = exposure_sequence(exptime, num_exp, eve=eve)
-        print('Taking {} flats in {} filter'.format(len(exptime_list), filt))
-        for i, exptime in enumerate(exptime_list):
-            print('Taking {} filter flat {}/{}'.format(filt, i + 1, len(exptime_list)))
+        print('Taking {} flats in {} filter'.format(num_exp, filt))
+        for j in range(num_exp):
+            # Find the exposure time from the latest model, so each flat corrects the next
+            exptime = model.exptime_for_counts(target_counts, filt, time.time() + start_delay)
             if exptime > max_exptime:
                 print('Limiting exposure time to {:.1f}s'.format(max_exptime))
                 exptime = max_exptime
-
-            counts = take_flat(exptime, filt, offset_step, target_name)
-            print('{} image sky mean: {:.1f} counts'.format(filt, counts))
+            if exptime < MIN_EXPTIME:
+                if not eve:
+                    print('Sky is too bright, stopping flats')
+                    break
+                exptime = MIN_EXPTIME
+
+            print('Taking {} filter flat {}/{} ({:.1f}s)'.format(filt, j + 1, num_exp, exptime))
+            counts = _take_flat(exptime, filt)
 
             # Stop if saturated in the morning
             if not eve and counts > 65000:
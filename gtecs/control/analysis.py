@@ -27,6 +27,75 @@ def get_focus_region(binning=1):
     return region
 
 
+def _region_list(region):
+    """Return the given region as a list of 2-tuples of slices."""
+    if len(region) == 2 and isinstance(region[0], slice) and isinstance(region[1], slice):
+        return [region]
+    return list(region)
+
+
+def get_region_window(region, binning=1):
+    """Find the camera window covering the given image region(s).
+
+    Parameters
+    ----------
+    region : 2-tuple of slice, or list of 2-tuple of slice
+        The image region(s), in BINNED pixels.
+    binning : int, default=1
+        The binning factor of the images.
+
+    Returns
+    -------
+    window : tuple of int
+        The (x, y, dx, dy) window, in unbinned pixels.
+
+    """
+    regions = _region_list(region)
+    x_start = min(r[0].start for r in regions)
+    x_stop = max(r[0].stop for r in regions)
+    y_start = min(r[1].start for r in regions)
+    y_stop = max(r[1].stop for r in regions)
+    return (x_start * binning, y_start * binning,
+            (x_stop - x_start) * binning, (y_stop - y_start) * binning)
+
+
+def window_region(region, window, binning=1):
+    """Convert image region(s) to the coordinates of an image read out from a camera window.
+
+    Parameters
+    ----------
+    region : 2-tuple of slice, or list of 2-tuple of slice
+        The image region(s), in BINNED pixels of the full frame.
+    window : tuple of int
+        The (x, y, dx, dy) window the image was read out from, in unbinned pixels
+        (relative to the start of the full frame).
+    binning : int, default=1
+        The binning factor of the images.
+
+    Returns
+    -------
+    region : 2-tuple of slice, or list of 2-tuple of slice, or None
+        The region(s) within the windowed image, cropped to the window.
+        Any regions entirely outside of the window are removed, and if there are none left
+        then None is returned.
+
+    """
+    single = len(region) == 2 and isinstance(region[0], slice) and isinstance(region[1], slice)
+    x0, y0 = window[0] // binning, window[1] // binning
+    nx, ny = window[2] // binning, window[3] // binning
+    new_regions = []
+    for x_slice, y_slice in _region_list(region):
+        x_start, x_stop = max(x_slice.start - x0, 0), min(x_slice.stop - x0, nx)
+        y_start, y_stop = max(y_slice.start - y0, 0), min(y_slice.stop - y0, ny)
+        if x_start < x_stop and y_start < y_stop:
+            new_regions.append((slice(x_start, x_stop), slice(y_start, y_stop)))
+    if len(new_regions) == 0:
+        return None
+    if single:
+        return new_regions[0]
+    return new_regions
+
+
 def crop_image(data, region):
     """Crop the given image data to the provided region.
 
@@ -277,3 +346,83 @@ def measure_image_hfd(data, region=None, filter_width=15, threshold=5,
     std_hfd = all_hfds[all_hfds - all_hfds.mean() < 2.5 * all_hfds.std()].std()
 
     return median_hfd, std_hfd
+
+
+def measure_image_quality(data, region=None, filter_width=15, threshold=5):
+    """Measure the image quality statistics of sources in an image.
+
+    Unlike running `measure_image_hfd` and `measure_image_fwhm` this only extracts the sources
+    once, so it's cheap enough to run on every image as it is saved.
+
+    Parameters
+    ----------
+    data : `numpy.array`
+        The image data to analyse
+    region : 2-tuple of slice, or list of 2-tuple of slice, or None, default=None
+        If given, crop data to given slices in x/y axes (eg (slice(2500, 6000), slice(1500, 4500))).
+        If a list of regions is given, the sources in each region will be combined.
+        Note the region limits given here must be in BINNED pixels to match the data.
+    filter_width : int, default=15
+        See `gtecs.control.analysis.extract_image_sources()`
+    threshold : int, default=5
+        See `gtecs.control.analysis.extract_image_sources()`
+
+    Returns
+    -------
+    quality : dict
+        The number of sources detected ('num_sources'), and the median HFD ('hfd'),
+        standard deviation of the HFDs ('hfd_std'), median FWHM ('fwhm') and median ellipticity
+        ('ellipticity') of the unsaturated sources.
+        The HFDs and FWHMs are in binned pixels, and are NaN if not enough sources were found.
+
+    """
+    if region is None:
+        regions = [None]
+    elif len(region) == 2 and isinstance(region[0], slice) and isinstance(region[1], slice):
+        regions = [region]
+    else:
+        regions = region
+
+    num_sources = 0
+    all_hfds = []
+    all_fwhms = []
+    all_ellipticities = []
+    for region in regions:
+        # Crop data to the given region (this makes a copy, so we don't change the original)
+        region_data = crop_image(data, region) if region is not None else data.copy()
+
+        # Extract sources
+        objects, region_data = extract_image_sources(region_data, filter_width, threshold)
+        num_sources += len(objects)
+
+        # Measure Half-Flux Radius to find HFDs, as in `extract_hfds`
+        hfrs, flags = sep.flux_radius(region_data, objects['x'], objects['y'],
+                                      rmax=40 * np.ones_like(objects['x']),
+                                      frac=0.5,
+                                      normflux=objects['cflux'],
+                                      )
+        mask = objects['peak'] < 40000
+        all_hfds.append(2 * hfrs[np.logical_and(mask, flags == 0)])
+
+        # Estimate FWHMs and ellipticities, as in `extract_fwhms`
+        a, b = objects['a'][mask], objects['b'][mask]
+        all_fwhms.append(2 * np.sqrt(np.log(2) * (a**2 + b**2)))
+        all_ellipticities.append(1 - b / a)
+
+    all_hfds = np.concatenate(all_hfds)
+    all_fwhms = np.concatenate(all_fwhms)
+    all_ellipticities = np.concatenate(all_ellipticities)
+
+    quality = {'num_sources': num_sources,
+               'hfd': np.nan,
+               'hfd_std': np.nan,
+               'fwhm': np.nan,
+               'ellipticity': np.nan,
+               }
+    if len(all_hfds) > 3:
+        quality['hfd'] = np.median(all_hfds)
+        quality['hfd_std'] = all_hfds[all_hfds - all_hfds.mean() < 2.5 * all_hfds.std()].std()
+    if len(all_fwhms) > 3:
+        quality['fwhm'] = np.median(all_fwhms)
+        quality['ellipticity'] = np.median(all_ellipticities)
+    return quality
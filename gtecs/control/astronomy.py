@@ -1,14 +1,19 @@
 """Astronomy utilities."""
 
+import threading
+
 from astroplan import Observer
 from astroplan.moon import moon_illumination
 
 from astropy import units as u
-from astropy.coordinates import AltAz, CIRS, EarthLocation, FK5, HADec, SkyCoord, get_body, get_sun
+from astropy.coordinates import (AltAz, EarthLocation, FK5, HADec, SkyCoord, get_body,
+                                 get_sun)
 from astropy.coordinates.builtin_frames.utils import get_jd12
 from astropy.time import Time
 
-from erfa import eo06a
+import erfa
+
+import numpy as np
 
 # from . import astropy_speedups  # noqa: F401 to ignore unused module
 from . import params
@@ -16,15 +21,60 @@ from . import params
 
 MAGIC_TIME = Time(-999, format='jd')
 
+# Cached site objects, see `observatory_location()` and `get_observer()`
+_LOCATION = None
+_OBSERVERS = {}
+
+
+def _get_icrs_to_fk5_matrix():
+    """Get the (fixed) rotation matrix from ICRS to FK5 J2000, by transforming the unit vectors."""
+    unit_vectors = SkyCoord(x=[1, 0, 0], y=[0, 1, 0], z=[0, 0, 1],
+                            representation_type='cartesian', frame='icrs')
+    return unit_vectors.transform_to(FK5(equinox='J2000')).cartesian.xyz.value
+
+
+# ICRS to FK5 J2000 rotation, see `j2000_to_apparent()` and `apparent_to_j2000()`
+_ICRS_TO_FK5_J2000_MAT = _get_icrs_to_fk5_matrix()
+
+# Cached night ephemerides, see `get_night_ephemeris()`
+_EPHEMERIS_CACHE = {}
+_EPHEMERIS_CACHE_SIZE = 4
+_EPHEMERIS_LOCK = threading.Lock()
+
+# Cached apparent place context, see `_get_apparent_context()`
+_APPARENT_CONTEXT = None
+APPARENT_CONTEXT_LIFETIME = 60  # seconds
+
+
+def _get_apparent_context(jd=None):
+    """Get the erfa astrometry parameters and equation of the origins for the given time.
+
+    These change very slowly, so they are cached and only recalculated if the given time is more
+    than `APPARENT_CONTEXT_LIFETIME` seconds from the cached one.
+    """
+    global _APPARENT_CONTEXT
+    if jd is None:
+        jd = Time.now().jd
+    context = _APPARENT_CONTEXT
+    if context is None or abs(jd - context[0]) * 86400 > APPARENT_CONTEXT_LIFETIME:
+        # Includes the bias-precession-nutation matrix, aberration and light deflection terms
+        astrom, eo = erfa.apci13(*get_jd12(Time(jd, format='jd'), 'tdb'))
+        context = (jd, astrom, eo)
+        _APPARENT_CONTEXT = context
+    return context[1], context[2]
+
 
 def j2000_to_apparent(ra_deg, dec_deg, jd=None):
     """Find the apparent place for a star at J2000, FK5 coordinates.
 
     This is equivalent to the 'JNow' coordinates used by SiTech.
 
+    The star-independent parts of the transformation are cached (see `_get_apparent_context`),
+    so repeated calls are cheap and arrays of coordinates can be converted at once.
+
     Parameters
     ----------
-    ra_deg : float
+    ra_deg : float or numpy.ndarray
         J2000, FK5 right ascension in degrees
     dec_deg : float or numpy.ndarray
         J2000, FK5 declination in degrees
@@ -35,29 +85,30 @@ def j2000_to_apparent(ra_deg, dec_deg, jd=None):
 
     Returns
     -------
-    ra, dec: float
+    ra, dec: float or numpy.ndarray
          Apparent RA and Dec of star.
 
     """
-    j2000 = SkyCoord(ra_deg, dec_deg, unit=u.deg, frame='fk5')
-    if jd is None:
-        time = Time.now().jd
-    else:
-        time = Time(jd, format='jd')
-    cirs = j2000.transform_to(CIRS(obstime=time))
-    # find the equation of the origins to transform CIRS to apparent place
-    eo = eo06a(*get_jd12(time, 'tt')) * u.rad
-    return (cirs.ra - eo).deg, cirs.dec.deg
+    astrom, eo = _get_apparent_context(jd)
+    # FK5 J2000 to ICRS is a fixed rotation
+    xyz_icrs = erfa.s2c(np.radians(ra_deg), np.radians(dec_deg)) @ _ICRS_TO_FK5_J2000_MAT
+    ra_icrs, dec_icrs = erfa.c2s(xyz_icrs)
+    # ICRS to CIRS, then use the equation of the origins to transform CIRS to apparent place
+    ra_cirs, dec_cirs = erfa.atciqz(ra_icrs, dec_icrs, astrom)
+    return np.degrees(erfa.anp(ra_cirs - eo)), np.degrees(dec_cirs)
 
 
-def apparent_to_j2000(ra_deg, dec_deg, jd):
+def apparent_to_j2000(ra_deg, dec_deg, jd=None):
     """Find the J2000, FK5 coordinates of a star given the apparent place.
 
     Apparent place is the same as the 'JNow' coordinates used by SiTech.
 
+    The star-independent parts of the transformation are cached (see `_get_apparent_context`),
+    so repeated calls are cheap and arrays of coordinates can be converted at once.
+
     Parameters
     ----------
-    ra_deg : float
+    ra_deg : float or numpy.ndarray
         Apparent right ascension in degrees
     dec_deg : float or numpy.ndarray
         Apparent declination in degrees
@@ -68,19 +119,17 @@ def apparent_to_j2000(ra_deg, dec_deg, jd):
 
     Returns
     -------
-    ra, dec: float
+    ra, dec: float or numpy.ndarray
          J2000, FK5 RA and Dec of star.
 
     """
-    if jd is None:
-        time = Time.now().jd
-    else:
-        time = Time(jd, format='jd')
-    # find the equation of the origins to transform apparent place to CIRS
-    eo = eo06a(*get_jd12(time, 'tt')) * u.rad
-    cirs = SkyCoord(ra_deg + eo.to(u.deg).value, dec_deg, unit=u.deg, frame=CIRS(obstime=time))
-    j2000 = cirs.transform_to(FK5())
-    return j2000.ra.deg, j2000.dec.deg
+    astrom, eo = _get_apparent_context(jd)
+    # Use the equation of the origins to transform apparent place to CIRS, then CIRS to ICRS
+    ra_icrs, dec_icrs = erfa.aticq(np.radians(ra_deg) + eo, np.radians(dec_deg), astrom)
+    # ICRS to FK5 J2000 is a fixed rotation
+    xyz_fk5 = erfa.s2c(ra_icrs, dec_icrs) @ _ICRS_TO_FK5_J2000_MAT.T
+    ra_fk5, dec_fk5 = erfa.c2s(xyz_fk5)
+    return np.degrees(erfa.anp(ra_fk5)), np.degrees(dec_fk5)
 
 
 def observatory_location():
@@ -91,9 +140,41 @@ def observatory_location():
     location : `~astropy.coordinates.EarthLocation`
 
     """
-    return EarthLocation(lon=params.SITE_LONGITUDE,
-                         lat=params.SITE_LATITUDE,
-                         height=params.SITE_ALTITUDE)
+    global _LOCATION
+    if _LOCATION is None:
+        _LOCATION = EarthLocation(lon=params.SITE_LONGITUDE,
+                                  lat=params.SITE_LATITUDE,
+                                  height=params.SITE_ALTITUDE)
+    return _LOCATION
+
+
+def _location_key(location):
+    """Get a hashable key for the given location."""
+    return tuple(float(c.to_value(u.m)) for c in location.geocentric)
+
+
+def get_observer(location=None):
+    """Get an astroplan Observer for the given location.
+
+    Observers are cached, so repeated calls for the same location return the same object.
+
+    Parameters
+    ----------
+    location : `~astropy.coordinates.EarthLocation`, optional
+        observatory location
+        default = observatory_location()
+
+    Returns
+    -------
+    observer : `astroplan.Observer`
+
+    """
+    if location is None:
+        location = observatory_location()
+    key = _location_key(location)
+    if key not in _OBSERVERS:
+        _OBSERVERS[key] = Observer(location=location)
+    return _OBSERVERS[key]
 
 
 def altaz_from_radec(ra_deg, dec_deg, time=None, location=None):
@@ -194,6 +275,10 @@ def get_sunalt(time=None, location=None):
     if location is None:
         location = observatory_location()
 
+    ephem = get_night_ephemeris(time, location)
+    if ephem.covers(time):
+        return ephem.sun_alt(time)
+
     sun = get_sun(time)
     altaz_frame = AltAz(obstime=time, location=location)
     altaz_coo = sun.transform_to(altaz_frame)
@@ -228,8 +313,18 @@ def get_night_times(time=None, location=None, horizon=-15):
         time = Time.now()
     if location is None:
         location = observatory_location()
-    observer = Observer(location=location)
 
+    ephem = get_night_ephemeris(time, location)
+    if ephem.sun_rise_time(horizon) is not None and time > ephem.sun_rise_time(horizon):
+        # It's the morning after this night, so we want the next one
+        ephem = get_night_ephemeris(ephem.midnight + 1 * u.day, location)
+    sun_set_time = ephem.sun_set_time(horizon)
+    sun_rise_time = ephem.sun_rise_time(horizon)
+    if sun_set_time is not None and sun_rise_time is not None:
+        return sun_set_time, sun_rise_time
+
+    # The Sun doesn't cross the horizon within the ephemeris, fall back to astroplan
+    observer = get_observer(location)
     if observer.is_night(time, horizon=horizon * u.deg):
         # The time is during the night
         sun_set_time = observer.sun_set_time(time, which='previous', horizon=horizon * u.deg)
@@ -266,7 +361,18 @@ def twilight_length(time=None, location=None, horizon=-15):
         time = Time.now()
     if location is None:
         location = observatory_location()
-    observer = Observer(location=location)
+
+    ephem = get_night_ephemeris(time, location)
+    if ephem.sun_rise_time(0) is not None and time > ephem.sun_rise_time(0):
+        # It's the morning after this night, so we want the next one
+        ephem = get_night_ephemeris(ephem.midnight + 1 * u.day, location)
+    twilight_start = ephem.sun_set_time(0)
+    twilight_end = ephem.sun_set_time(horizon)
+    if twilight_start is not None and twilight_end is not None:
+        return (twilight_end - twilight_start).to(u.min).value
+
+    # The Sun doesn't cross the horizons within the ephemeris, fall back to astroplan
+    observer = get_observer(location)
 
     if observer.is_night(time, horizon=0 * u.deg):
         # The time is after twilight has started
@@ -300,10 +406,8 @@ def local_midnight(time=None, location=None):
         time = Time.now()
     if location is None:
         location = observatory_location()
-    observer = Observer(location=location)
 
-    midnight = observer.midnight(time, which='nearest')
-    return midnight
+    return get_night_ephemeris(time, location).midnight
 
 
 def night_startdate(time=None, location=None):
@@ -342,11 +446,22 @@ def sunalt_time(sunalt, eve=True, time=None, location=None):
         time when sun is at that altitude
 
     """
+    if time is None:
+        time = Time.now()
     if location is None:
         location = observatory_location()
-    observer = Observer(location=location)
 
-    midnight = local_midnight(time, location)
+    ephem = get_night_ephemeris(time, location)
+    if eve:
+        crossing_time = ephem.sun_set_time(sunalt.to_value(u.deg))
+    else:
+        crossing_time = ephem.sun_rise_time(sunalt.to_value(u.deg))
+    if crossing_time is not None:
+        return crossing_time
+
+    # The Sun doesn't reach that altitude within the ephemeris, fall back to astroplan
+    observer = get_observer(location)
+    midnight = ephem.midnight
     if eve:
         return observer.sun_set_time(midnight, which='previous', horizon=sunalt)
     else:
@@ -442,9 +557,15 @@ def get_moon_params(time=None):
     if time is None:
         time = Time.now()
 
-    coords = get_body('moon', time)
-    alt, _ = altaz_from_radec(coords.ra.deg, coords.dec.deg, time)
-    illumination = moon_illumination(time)
+    ephem = get_night_ephemeris(time)
+    if ephem.covers(time):
+        alt = ephem.moon_alt(time)
+        illumination = ephem.moon_illumination(time)
+    else:
+        moon = get_body('moon', time)
+        altaz_frame = AltAz(obstime=time, location=observatory_location())
+        alt = moon.transform_to(altaz_frame).alt.degree
+        illumination = moon_illumination(time)
 
     if 0 <= illumination < 0.25:
         phase = 'D'
@@ -479,6 +600,10 @@ def get_moon_distance(ra_deg, dec_deg, time):
     if time is None:
         time = Time.now()
 
+    ephem = get_night_ephemeris(time)
+    if ephem.covers(time):
+        return ephem.moon_distance(ra_deg, dec_deg, time)
+
     target = SkyCoord(ra_deg, dec_deg, unit=u.deg)
     moon = get_body('moon', time)
 
@@ -489,3 +614,217 @@ def get_moon_distance(ra_deg, dec_deg, time):
     # https://github.com/astropy/astroplan/blob/master/astroplan/constraints.py
 
     return moon.separation(target).degree
+
+
+def _utc_jd(time):
+    """Get the UTC Julian date(s) of the given time, avoiding a copy if possible."""
+    if time.scale == 'utc':
+        return time.jd
+    return time.utc.jd
+
+
+def _mean_midnight_jd(jd, lon_deg):
+    """Find the local mean midnight nearest to the given UTC Julian date."""
+    return np.round(jd + lon_deg / 360 - 0.5) + 0.5 - lon_deg / 360
+
+
+def _radec_to_xyz(ra_deg, dec_deg):
+    """Convert RA and Dec in degrees to unit vectors (along the last axis)."""
+    ra = np.radians(ra_deg)
+    dec = np.radians(dec_deg)
+    cos_dec = np.cos(dec)
+    return np.stack([cos_dec * np.cos(ra), cos_dec * np.sin(ra), np.sin(dec)], axis=-1)
+
+
+class NightEphemeris:
+    """Tabulated Sun and Moon positions for a single night.
+
+    Positions are calculated once on a regular time grid covering the 24 hours around local
+    midnight, and later queries are interpolated from those tables.
+    Times of the Sun crossing given altitudes are cached once they have been found.
+
+    Refraction from atmosphere is ignored, as in `altaz_from_radec`.
+
+    Parameters
+    ----------
+    time : `~astropy.time.Time`
+        any time within the night to tabulate
+        the ephemeris covers the night with the nearest local midnight
+    location : `~astropy.coordinates.EarthLocation`, optional
+        observatory location
+        default = observatory_location()
+    step : float, default=60
+        time between grid points, in seconds
+
+    """
+
+    def __init__(self, time, location=None, step=60):
+        if location is None:
+            location = observatory_location()
+        self.location = location
+        self.step = step
+
+        # Create the time grid around the nearest local mean midnight,
+        # with some padding to allow for the equation of time (up to ~16 minutes)
+        lon = location.lon.deg
+        mean_midnight = _mean_midnight_jd(np.ravel(_utc_jd(time))[0], lon)
+        pad = 30 / 1440
+        num = int(np.ceil((1 + 2 * pad) * 86400 / step)) + 1
+        self.jd = mean_midnight - 0.5 - pad + np.arange(num) * step / 86400
+        times = Time(self.jd, format='jd', scale='utc')
+        self.start_time = times[0]
+        self.end_time = times[-1]
+
+        # Calculate Sun positions
+        altaz_frame = AltAz(obstime=times, location=location)
+        sun = get_sun(times)
+        self._sun_alt = sun.transform_to(altaz_frame).alt.degree
+
+        # Local midnight is the lower transit of the Sun (hour angle of 12h)
+        hadec_frame = HADec(obstime=times, location=location)
+        ha = sun.transform_to(hadec_frame).ha.deg % 360 - 180
+        crossings = np.where((ha[:-1] < 0) & (ha[1:] >= 0))[0]
+        i = crossings[np.argmin(np.abs(crossings - num // 2))]
+        self.midnight_jd = np.interp(0, ha[i:i + 2], self.jd[i:i + 2])
+        self.midnight = Time(self.midnight_jd, format='jd', scale='utc')
+
+        # Calculate Moon positions
+        # Store the (geocentric) coordinates as unit vectors to avoid wrapping when interpolating
+        moon = get_body('moon', times)
+        self._moon_alt = moon.transform_to(altaz_frame).alt.degree
+        self._moon_xyz = _radec_to_xyz(moon.ra.deg, moon.dec.deg)
+        self._moon_illumination = np.asarray(moon_illumination(times))
+
+        # Cache for Sun altitude crossing times
+        self._crossings = {}
+
+    def __repr__(self):
+        return 'NightEphemeris(midnight={}, step={})'.format(self.midnight.iso, self.step)
+
+    def covers(self, time):
+        """Return True if all of the given time(s) are within the ephemeris."""
+        jd = _utc_jd(time)
+        return bool(np.all((jd >= self.jd[0]) & (jd <= self.jd[-1])))
+
+    def sun_alt(self, time):
+        """Return the altitude of the Sun in degrees at the given time(s)."""
+        return np.interp(_utc_jd(time), self.jd, self._sun_alt)
+
+    def moon_alt(self, time):
+        """Return the altitude of the Moon in degrees at the given time(s)."""
+        return np.interp(_utc_jd(time), self.jd, self._moon_alt)
+
+    def moon_illumination(self, time):
+        """Return the fractional illumination of the Moon at the given time(s)."""
+        return np.interp(_utc_jd(time), self.jd, self._moon_illumination)
+
+    def _moon_xyz_at(self, time):
+        """Return the Moon unit vector(s) at the given time(s)."""
+        jd = _utc_jd(time)
+        xyz = np.stack([np.interp(jd, self.jd, self._moon_xyz[:, i]) for i in range(3)], axis=-1)
+        return xyz / np.linalg.norm(xyz, axis=-1, keepdims=True)
+
+    def moon_radec(self, time):
+        """Return the geocentric RA and Dec of the Moon in degrees at the given time(s)."""
+        x, y, z = np.moveaxis(self._moon_xyz_at(time), -1, 0)
+        return np.degrees(np.arctan2(y, x)) % 360, np.degrees(np.arcsin(z))
+
+    def moon_distance(self, ra_deg, dec_deg, time):
+        """Return the angular separation in degrees of the given coordinates from the Moon.
+
+        The difference between the ICRS target and the GCRS Moon frames (<0.01 degrees) is ignored.
+        """
+        moon_xyz = self._moon_xyz_at(time)
+        target_xyz = _radec_to_xyz(ra_deg, dec_deg)
+        cross = np.linalg.norm(np.cross(moon_xyz, target_xyz), axis=-1)
+        dot = np.sum(moon_xyz * target_xyz, axis=-1)
+        return np.degrees(np.arctan2(cross, dot))
+
+    def _sun_crossing(self, horizon, rising):
+        """Find the time the Sun crosses the given altitude before or after local midnight."""
+        key = (float(horizon), rising)
+        if key in self._crossings:
+            return self._crossings[key]
+
+        diff = self._sun_alt - horizon
+        if rising:
+            crossings = np.where((diff[:-1] < 0) & (diff[1:] >= 0) &
+                                 (self.jd[:-1] >= self.midnight_jd))[0]
+        else:
+            crossings = np.where((diff[:-1] >= 0) & (diff[1:] < 0) &
+                                 (self.jd[1:] <= self.midnight_jd))[0]
+        if len(crossings) == 0:
+            crossing_time = None
+        else:
+            # Use the crossings closest to midnight, interpolated between the grid points
+            i = crossings[0] if rising else crossings[-1]
+            frac = diff[i] / (diff[i] - diff[i + 1])
+            crossing_jd = self.jd[i] + frac * (self.jd[i + 1] - self.jd[i])
+            crossing_time = Time(crossing_jd, format='jd', scale='utc')
+
+        self._crossings[key] = crossing_time
+        return crossing_time
+
+    def sun_set_time(self, horizon=0):
+        """Return the time the Sun sets below the given altitude in degrees, or None."""
+        return self._sun_crossing(horizon, rising=False)
+
+    def sun_rise_time(self, horizon=0):
+        """Return the time the Sun rises above the given altitude in degrees, or None."""
+        return self._sun_crossing(horizon, rising=True)
+
+
+def get_night_ephemeris(time=None, location=None):
+    """Get the ephemeris for the night with the nearest local midnight to the given time.
+
+    Ephemerides are cached, so only the first call for each night will need to calculate positions.
+
+    Parameters
+    ----------
+    time : `~astropy.time.Time`, optional
+        time to check
+        if an array of times is given then the first is used to select the night
+        default = Time.now()
+    location : `~astropy.coordinates.EarthLocation`, optional
+        observatory location
+        default = observatory_location()
+
+    Returns
+    -------
+    ephem : `NightEphemeris`
+
+    """
+    if time is None:
+        time = Time.now()
+    if location is None:
+        location = observatory_location()
+
+    if location is _LOCATION:
+        # Avoid the (relatively slow) geodetic conversions for the usual case
+        location_key = 'site'
+        lon = params.SITE_LONGITUDE
+    else:
+        location_key = _location_key(location)
+        lon = location.lon.deg
+
+    jd = np.ravel(_utc_jd(time))[0]
+    with _EPHEMERIS_LOCK:
+        mean_midnight = _mean_midnight_jd(jd, lon)
+        ephem = _get_cached_ephemeris(mean_midnight, location, location_key)
+        if abs(jd - ephem.midnight_jd) > 0.5:
+            # Within a few minutes of local noon the nearest mean midnight might not be the
+            # nearest true midnight, so use the neighbouring night instead
+            mean_midnight += np.sign(jd - ephem.midnight_jd)
+            ephem = _get_cached_ephemeris(mean_midnight, location, location_key)
+    return ephem
+
+
+def _get_cached_ephemeris(mean_midnight, location, location_key):
+    """Get the ephemeris for the given night from the cache, or create it if needed."""
+    key = (location_key, round(mean_midnight, 3))
+    if key not in _EPHEMERIS_CACHE:
+        _EPHEMERIS_CACHE[key] = NightEphemeris(Time(mean_midnight, format='jd', scale='utc'),
+                                               location)
+        while len(_EPHEMERIS_CACHE) > _EPHEMERIS_CACHE_SIZE:
+            del _EPHEMERIS_CACHE[next(iter(_EPHEMERIS_CACHE))]
+    return _EPHEMERIS_CACHE[key]
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Script to build binary catalog files for fast, memory-mapped loading."""
+
+import importlib.resources as pkg_resources
+import os
+from argparse import ArgumentParser
+
+import numpy as np
+
+from gtecs.control.catalogs import flats, gliese, landolt
+from gtecs.control.catalogs.utils import StarCatalog
+
+
+# Package catalogs, and the functions to load them from their original source
+PACKAGE_CATALOGS = {'Gliese91.cat': gliese.load_fits_catalog,
+                    'Landolt09.cat': landolt.load_fits_catalog,
+                    'Flats.cat': flats.load_list_catalog,
+                    }
+
+
+def build_package_catalogs(out_path=None):
+    """Build the binary versions of the catalogs included in the package.
+
+    Parameters
+    ----------
+    out_path : str, optional
+        directory to save the files to
+        default is the package data directory, where the catalog modules will look for them
+
+    """
+    if out_path is None:
+        with pkg_resources.path('gtecs.control.data', '__init__.py') as path:
+            out_path = os.path.dirname(path)
+
+    for filename, load_function in PACKAGE_CATALOGS.items():
+        catalog = load_function()
+        catalog.to_file(os.path.join(out_path, filename))
+        print('Saved {} stars to {}'.format(len(catalog), os.path.join(out_path, filename)))
+
+
+def build_external_catalog(table_path, out_file, name_col, ra_col, dec_col,
+                           pmra_col=None, pmdec_col=None, epoch=2000, extra_cols=None):
+    """Convert an external catalog table into a binary catalog file.
+
+    This can be used for larger catalogs (e.g. a full-sky bright star list for pointing models),
+    which can then be loaded quickly with `StarCatalog.from_file()`.
+
+    Parameters
+    ----------
+    table_path : str
+        table file to read, in any format readable by `astropy.table.Table.read`
+    out_file : str
+        binary catalog file to write
+    name_col : str
+        name of the column containing the star names
+    ra_col : str
+        name of the column containing the right ascensions, in degrees
+    dec_col : str
+        name of the column containing the declinations, in degrees
+    pmra_col : str, optional
+        name of the column containing the RA proper motions in mas/yr, including cos(dec)
+    pmdec_col : str, optional
+        name of the column containing the Dec proper motions in mas/yr
+    epoch : float, default=2000
+        epoch of the catalog positions, as a Julian year
+    extra_cols : list of str, optional
+        any other columns to include (e.g. magnitudes)
+
+    """
+    from astropy.table import Table
+
+    table = Table.read(table_path)
+    columns = {}
+    for col in extra_cols or []:
+        column = table[col]
+        if column.dtype.kind == 'f':
+            column = np.ma.filled(column, np.nan)
+        columns[col] = np.asarray(column)
+    catalog = StarCatalog(names=np.char.strip(np.asarray(table[name_col], dtype=str)),
+                          ra=np.asarray(table[ra_col], dtype=float),
+                          dec=np.asarray(table[dec_col], dtype=float),
+                          pmra=np.asarray(table[pmra_col], dtype=float) if pmra_col else None,
+                          pmdec=np.asarray(table[pmdec_col], dtype=float) if pmdec_col else None,
+                          epoch=epoch,
+                          **columns,
+                          )
+    catalog.to_file(out_file)
+    print('Saved {} stars to {}'.format(len(catalog), out_file))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Build binary catalog files.')
+    parser.add_argument('table', nargs='?', default=None,
+                        help=('external catalog table to convert '
+                              '(if not given then build the package catalogs)')
+                        )
+    parser.add_argument('-o', '--out', default=None,
+                        help=('output file for external tables, '
+                              'or output directory for the package catalogs')
+                        )
+    parser.add_argument('--name-col', default='Name',
+                        help='name column (default="Name")')
+    parser.add_argument('--ra-col', default='RAJ2000',
+                        help='RA column, in degrees (default="RAJ2000")')
+    parser.add_argument('--dec-col', default='DEJ2000',
+                        help='Dec column, in degrees (default="DEJ2000")')
+    parser.add_argument('--pmra-col', default=None,
+                        help='RA proper motion column, in mas/yr (default=None)')
+    parser.add_argument('--pmdec-col', default=None,
+                        help='Dec proper motion column, in mas/yr (default=None)')
+    parser.add_argument('--epoch', type=float, default=2000,
+                        help='epoch of the catalog positions (default=2000)')
+    parser.add_argument('--extra-cols', nargs='+', default=None,
+                        help='any other columns to include')
+
+    args = parser.parse_args()
+    if args.table is None:
+        build_package_catalogs(args.out)
+    else:
+        if args.out is None:
+            args.out = os.path.splitext(args.table)[0] + '.cat'
+        build_external_catalog(args.table, args.out, args.name_col, args.ra_col, args.dec_col,
+                               args.pmra_col, args.pmdec_col, args.epoch, args.extra_cols)
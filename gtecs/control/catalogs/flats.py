@@ -1,15 +1,16 @@
 """Flat field catalog from WHT blank field list."""
 
+import importlib.resources as pkg_resources
 import warnings
 
 from astropy import units as u
 from astropy.coordinates import AltAz, SkyCoord, get_sun
-from astropy.table import Table
 from astropy.time import Time
 
 import numpy as np
 
-from ..astronomy import altaz_from_radec, observatory_location, radec_from_altaz, twilight_length
+from .utils import StarCatalog
+from ..astronomy import observatory_location, radec_from_altaz, twilight_length
 
 data = [
     {'Name': 'MAblank1', 'RA2000': '01 00 00', 'DE2000': '+00 07 00', 'bmag': 11.4, 'rmag': 12.3},
@@ -51,9 +52,8 @@ data = [
     {'Name': 'AAOblank9', 'RA2000': '23 48 20', 'DE2000': '+00 57 21', 'bmag': 9.1, 'rmag': 10.5},
     {'Name': 'BLANK6', 'RA2000': '23 56 40', 'DE2000': '+59 45 00', 'bmag': 7.6, 'rmag': 8.3}
 ]
-ldata = [(datum['Name'], datum['RA2000'], datum['DE2000'], datum['bmag'], datum['rmag'])
-         for datum in data]
-flats_table = Table(rows=ldata, names=('name', 'ra', 'dec', 'bmag', 'rmag'))
+
+_CATALOG = None
 
 
 class FlatField(object):
@@ -73,6 +73,35 @@ class FlatField(object):
         )
 
 
+def get_catalog():
+    """Get the flat field catalog as a `StarCatalog`.
+
+    The catalog is only loaded the first time this is called, from the binary catalog file if
+    it has been built (see `gtecs.control.catalogs.build`) or from the list above if not.
+    """
+    global _CATALOG
+    if _CATALOG is None:
+        try:
+            with pkg_resources.path('gtecs.control.data', 'Flats.cat') as path:
+                _CATALOG = StarCatalog.from_file(path)
+        except FileNotFoundError:
+            _CATALOG = load_list_catalog()
+    return _CATALOG
+
+
+def load_list_catalog():
+    """Load the flat field catalog from the list of fields above."""
+    coords = SkyCoord([datum['RA2000'] for datum in data],
+                      [datum['DE2000'] for datum in data],
+                      unit=(u.hour, u.deg))
+    return StarCatalog(names=[datum['Name'] for datum in data],
+                       ra=coords.ra.deg,
+                       dec=coords.dec.deg,
+                       bmag=np.array([datum['bmag'] for datum in data]),
+                       rmag=np.array([datum['rmag'] for datum in data]),
+                       )
+
+
 def best_flat(time):
     """Find the best flat at a given time.
 
@@ -89,10 +118,11 @@ def best_flat(time):
         the best FlatField
 
     """
-    coords = SkyCoord(flats_table['ra'], flats_table['dec'], unit=(u.hour, u.deg))
-    alt, az = altaz_from_radec(coords.ra.deg, coords.dec.deg, time)
-    row = flats_table[np.argmax(alt)]
-    flat_field = FlatField(row['name'], row['ra'], row['dec'], row['bmag'], row['rmag'])
+    catalog = get_catalog()
+    alt = catalog.altitudes(time)
+    index = np.argmax(alt)
+    flat_field = FlatField(catalog.get_name(index), catalog.ra[index] / 15, catalog.dec[index],
+                           catalog['bmag'][index], catalog['rmag'][index])
     return flat_field
 
 
@@ -184,6 +214,198 @@ def exposure_sequence(start_exptime, num_flats=5, eve=True, time=None):
     return exptime_list
 
 
+class TwilightSkyModel(object):
+    """An online model of the exponential twilight sky brightness change.
+
+    The sky count rate in each filter is modelled as ``A_f * exp(k * t)``, where the decay rate
+    `k` is shared between all filters and the scale `A_f` is fitted for each filter.
+    The model is refitted each time a new measurement is added, using a weighted least-squares
+    fit to the log of the count rates (corrected for the change in brightness during each
+    exposure), so it can be used to predict when target counts will be reached and what
+    exposure times to use.
+
+    Parameters
+    ----------
+    eve : bool
+        True for evening flats (sky getting darker), False for morning (sky getting brighter)
+    bias_level : float, default=0
+        counts to subtract from the median counts before fitting
+    saturation_level : float, default=60000
+        median counts above this level are ignored
+    memory : float, default=900
+        timescale in seconds used to down-weight older measurements, since the decay is only
+        approximately exponential over the whole of twilight
+    time : `astropy.time.Time`, optional
+        night starting date, used to find the initial decay rate from `twilight_length`
+        default = Time.now()
+
+    """
+
+    # Typical scatter in the log of the median counts, and fractional uncertainty on the initial
+    # decay rate, used to weight the measurements against the prior in the fit
+    LOG_COUNTS_UNCERTAINTY = 0.05
+    PRIOR_RATE_UNCERTAINTY = 0.5
+
+    def __init__(self, eve, bias_level=0, saturation_level=60000, memory=900, time=None):
+        self.eve = eve
+        self.bias_level = bias_level
+        self.saturation_level = saturation_level
+        self.memory = memory
+
+        # Initial guess for the decay rate, as used by `exposure_sequence`:
+        # the sky changes by 7.52 magnitudes over the length of twilight.
+        tau = twilight_length(time) * 60
+        self.prior_rate = -7.52 * np.log(10) / tau if eve else 7.52 * np.log(10) / tau
+        self.decay_rate = self.prior_rate
+
+        self.measurements = []
+        self.scales = {}
+        self.ref_time = None
+
+    def __repr__(self):
+        return 'TwilightSkyModel(eve={}, decay_rate={:.3e}/s, filters={})'.format(
+            self.eve, self.decay_rate, sorted(self.scales))
+
+    def _exposure_factor(self, exptime, rate=None):
+        """Get the integral of exp(k * t) over an exposure starting at t=0."""
+        if rate is None:
+            rate = self.decay_rate
+        if abs(rate * exptime) < 1e-9:
+            return exptime
+        return np.expm1(rate * exptime) / rate
+
+    def add_measurement(self, filt, start_time, exptime, counts):
+        """Add a new median counts measurement and refit the model.
+
+        Parameters
+        ----------
+        filt : str
+            filter the image was taken in
+        start_time : float
+            exposure start time, as a Unix timestamp
+        exptime : float
+            exposure time in seconds
+        counts : float
+            median image counts
+
+        Returns
+        -------
+        used : bool
+            False if the measurement was rejected (e.g. saturated or below the bias level)
+
+        """
+        sky_counts = counts - self.bias_level
+        if sky_counts <= 0 or counts >= self.saturation_level or exptime <= 0:
+            return False
+        if self.ref_time is None:
+            self.ref_time = start_time
+        self.measurements.append((filt, start_time - self.ref_time, exptime, sky_counts))
+        self.fit()
+        return True
+
+    def fit(self):
+        """Fit the model to all of the measurements so far."""
+        if len(self.measurements) == 0:
+            return
+        filters = sorted({m[0] for m in self.measurements})
+        filt_t, start_t, exptimes, counts = (np.array(x) for x in zip(*self.measurements))
+        weights = np.exp(-(start_t.max() - start_t) / self.memory)
+
+        # Linear least-squares in log space for the per-filter log-scales and the shared rate,
+        # with the initial rate included as a prior so a single point can still be used.
+        # The exposure factor depends on the rate, so iterate a few times.
+        rate = self.decay_rate
+        for _ in range(3):
+            factors = np.array([self._exposure_factor(e, rate) for e in exptimes])
+            y = np.log(counts / factors)
+            design = np.zeros((len(y) + 1, len(filters) + 1))
+            for i, filt in enumerate(filters):
+                design[:-1, i] = filt_t == filt
+            design[:-1, -1] = start_t
+            design[-1, -1] = 1
+            y = np.append(y, self.prior_rate)
+            w = np.append(np.sqrt(weights) / self.LOG_COUNTS_UNCERTAINTY,
+                          1 / (self.PRIOR_RATE_UNCERTAINTY * abs(self.prior_rate)))
+            solution, _, _, _ = np.linalg.lstsq(design * w[:, np.newaxis], y * w, rcond=None)
+            rate = solution[-1]
+            if self.eve and rate >= 0 or not self.eve and rate <= 0:
+                # Unphysical fit (e.g. from noisy early points), keep the prior rate
+                rate = self.prior_rate
+        self.decay_rate = rate
+        self.scales = {filt: np.exp(solution[i]) for i, filt in enumerate(filters)}
+
+    def count_rate(self, filt, at_time):
+        """Return the predicted sky count rate (counts/s) in the given filter at the given time."""
+        if filt not in self.scales:
+            raise ValueError('No measurements for filter {}'.format(filt))
+        return self.scales[filt] * np.exp(self.decay_rate * (at_time - self.ref_time))
+
+    def expected_counts(self, filt, start_time, exptime):
+        """Return the predicted median counts for an exposure starting at the given time."""
+        return (self.bias_level +
+                self.count_rate(filt, start_time) * self._exposure_factor(exptime))
+
+    def exptime_for_counts(self, target_counts, filt, start_time):
+        """Return the exposure time needed to reach the target counts starting at the given time.
+
+        Returns `numpy.inf` if the target can not be reached (the sky is fading too fast).
+        """
+        sky_counts = target_counts - self.bias_level
+        rate = self.count_rate(filt, start_time)
+        k = self.decay_rate
+        if abs(k) < 1e-12:
+            return sky_counts / rate
+        arg = 1 + sky_counts * k / rate
+        if arg <= 0:
+            return np.inf
+        return np.log(arg) / k
+
+    def time_for_counts(self, target_counts, filt, exptime):
+        """Return the start time for an exposure of the given length to reach the target counts."""
+        if filt not in self.scales:
+            raise ValueError('No measurements for filter {}'.format(filt))
+        sky_counts = target_counts - self.bias_level
+        factor = self._exposure_factor(exptime)
+        return self.ref_time + np.log(sky_counts / (self.scales[filt] * factor)) / self.decay_rate
+
+    def exposure_ladder(self, target_counts, filt, num_exp, start_time, overhead=30,
+                        min_exptime=0.5, max_exptime=60):
+        """Return a sequence of exposure times which should all reach the target counts.
+
+        Parameters
+        ----------
+        target_counts : float
+            target median counts for each exposure
+        filt : str
+            filter to use
+        num_exp : int
+            number of exposures
+        start_time : float
+            start time of the first exposure, as a Unix timestamp
+        overhead : float, default=30
+            time between exposures in seconds (readout, offsets etc)
+        min_exptime : float, default=0.5
+            stop the sequence if the exposure time would be shorter than this
+        max_exptime : float, default=60
+            stop the sequence if the exposure time would be longer than this
+
+        Returns
+        -------
+        ladder : list of (float, float)
+            start times and exposure times
+
+        """
+        ladder = []
+        t = start_time
+        for _ in range(num_exp):
+            exptime = self.exptime_for_counts(target_counts, filt, t)
+            if not min_exptime <= exptime <= max_exptime:
+                break
+            ladder.append((t, exptime))
+            t += exptime + overhead
+        return ladder
+
+
 def sky_brightness(sunalt, filt):
     """Sky brightness as a function of sky altitude.
 
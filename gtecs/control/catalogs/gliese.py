@@ -1,16 +1,17 @@
 """Gliese 1991 catalog of nearby stars."""
 
 import importlib.resources as pkg_resources
-import warnings
 
 from astropy import units as u
 from astropy.coordinates import SkyCoord
-from astropy.table import Table
 from astropy.time import Time
 
 import numpy as np
 
-from ..astronomy import altaz_from_radec, get_moon_distance
+from .utils import StarCatalog, proper_motion_vectors, radec_to_xyz, xyz_to_radec, years_since
+
+
+_CATALOG = None
 
 
 class GlieseStar(object):
@@ -32,12 +33,46 @@ class GlieseStar(object):
             self.Jmag
         )
 
-    def coord_now(self):
-        """Get coordinates at the current time."""
-        dt = Time.now() - Time("J2000")
-        ra = self.coord.ra + self.pmra * dt
-        dec = self.coord.dec + self.pmra * dt
-        return SkyCoord(ra, dec)
+    def coord_now(self, time=None):
+        """Get coordinates at the current time (or the given time)."""
+        ra, dec = self.coord.ra.deg, self.coord.dec.deg
+        pm_xyz = proper_motion_vectors(ra, dec,
+                                       self.pmra.to_value(u.mas / u.yr),
+                                       self.pmdec.to_value(u.mas / u.yr))
+        xyz = radec_to_xyz(ra, dec) + years_since(2000, time) * pm_xyz
+        ra, dec = xyz_to_radec(xyz)
+        return SkyCoord(ra, dec, unit=(u.deg, u.deg))
+
+
+def get_catalog():
+    """Get the Gliese catalog as a `StarCatalog`.
+
+    The catalog is only loaded the first time this is called, from the binary catalog file if
+    it has been built (see `gtecs.control.catalogs.build`) or from the original FITS table if not.
+    """
+    global _CATALOG
+    if _CATALOG is None:
+        try:
+            with pkg_resources.path('gtecs.control.data', 'Gliese91.cat') as path:
+                _CATALOG = StarCatalog.from_file(path)
+        except FileNotFoundError:
+            _CATALOG = load_fits_catalog()
+    return _CATALOG
+
+
+def load_fits_catalog():
+    """Load the Gliese catalog from the original FITS table."""
+    from astropy.table import Table
+
+    with pkg_resources.path('gtecs.control.data', 'Gliese91.fit') as path:
+        gliese_table = Table.read(path)
+    return StarCatalog(names=[str(name).strip() for name in gliese_table['Name']],
+                       ra=gliese_table['RAJ2000'],
+                       dec=gliese_table['DEJ2000'],
+                       pmra=np.asarray(gliese_table['pmRA'], dtype=float) * 1000,
+                       pmdec=np.asarray(gliese_table['pmDE'], dtype=float) * 1000,
+                       Jmag=np.ma.filled(gliese_table['Jmag'].astype(float), np.nan),
+                       )
 
 
 def focus_star(time):
@@ -56,25 +91,24 @@ def focus_star(time):
         the best Gliese Star for focusing
 
     """
-    with pkg_resources.path('gtecs.control.data', 'Gliese91.fit') as path:
-        gliese_table = Table.read(path)
+    if time is None:
+        time = Time.now()
 
-    coords = SkyCoord(gliese_table['RAJ2000'], gliese_table['DEJ2000'], unit=(u.hour, u.deg))
-    alt, _ = altaz_from_radec(coords.ra.deg, coords.dec.deg, time)
-    jmag = gliese_table['Jmag']
+    catalog = get_catalog()
+    alt = catalog.altitudes(time)
 
     # filter on magnitudes
-    with warnings.catch_warnings():
-        warnings.simplefilter('ignore')
-        mag_mask = np.fabs(jmag - 10) < 2
+    with np.errstate(invalid='ignore'):
+        mag_mask = np.fabs(catalog['Jmag'] - 10) < 2
 
     # filter on moon distance
-    moon_dist = get_moon_distance(coords.ra.deg, coords.dec.deg, time)
+    moon_dist = catalog.moon_distances(time)
     moon_mask = moon_dist > 45
 
     mask = mag_mask & moon_mask
 
-    row = gliese_table[mask][np.argmax(alt[mask])]
-    star = GlieseStar(row['Name'], row['RAJ2000'], row['DEJ2000'],
-                      row['pmRA'], row['pmDE'], row['Jmag'])
+    index = np.flatnonzero(mask)[np.argmax(alt[mask])]
+    star = GlieseStar(catalog.get_name(index), catalog.ra[index], catalog.dec[index],
+                      catalog.pmra[index] / 1000, catalog.pmdec[index] / 1000,
+                      catalog['Jmag'][index])
     return star
@@ -3,15 +3,15 @@
 import importlib.resources as pkg_resources
 
 from astropy import units as u
-from astropy.coordinates import AltAz, SkyCoord
-from astropy.table import Table
+from astropy.coordinates import SkyCoord
 from astropy.time import Time
 
 import numpy as np
 
-import scipy.spatial as sp
+from .utils import StarCatalog, proper_motion_vectors, radec_to_xyz, xyz_to_radec, years_since
 
-from ..astronomy import observatory_location
+
+_CATALOG = None
 
 
 class LandoltStar(object):
@@ -34,12 +34,48 @@ class LandoltStar(object):
             self.Vmag, self.BV
         )
 
-    def coord_now(self):
-        """Get coordinates at the current time."""
-        dt = Time.now() - Time("J2000")
-        ra = self.coord.ra + self.pmra * dt
-        dec = self.coord.dec + self.pmra * dt
-        return SkyCoord(ra, dec)
+    def coord_now(self, time=None):
+        """Get coordinates at the current time (or the given time)."""
+        ra, dec = self.coord.ra.deg, self.coord.dec.deg
+        pm_xyz = proper_motion_vectors(ra, dec,
+                                       self.pmra.to_value(u.mas / u.yr),
+                                       self.pmdec.to_value(u.mas / u.yr))
+        xyz = radec_to_xyz(ra, dec) + years_since(2000, time) * pm_xyz
+        ra, dec = xyz_to_radec(xyz)
+        return SkyCoord(ra, dec, unit=(u.deg, u.deg))
+
+
+def get_catalog():
+    """Get the Landolt catalog as a `StarCatalog`.
+
+    The catalog is only loaded the first time this is called, from the binary catalog file if
+    it has been built (see `gtecs.control.catalogs.build`) or from the original FITS table if not.
+    """
+    global _CATALOG
+    if _CATALOG is None:
+        try:
+            with pkg_resources.path('gtecs.control.data', 'Landolt09.cat') as path:
+                _CATALOG = StarCatalog.from_file(path)
+        except FileNotFoundError:
+            _CATALOG = load_fits_catalog()
+    return _CATALOG
+
+
+def load_fits_catalog():
+    """Load the Landolt catalog from the original FITS table."""
+    from astropy.table import Table
+
+    with pkg_resources.path('gtecs.control.data', 'Landolt09.fit') as path:
+        landolt_table = Table.read(path)
+    coords = SkyCoord(landolt_table['RAJ2000'], landolt_table['DEJ2000'], unit=(u.hour, u.deg))
+    return StarCatalog(names=[str(name).strip() for name in landolt_table['Name']],
+                       ra=coords.ra.deg,
+                       dec=coords.dec.deg,
+                       pmra=landolt_table['pmRA'],
+                       pmdec=landolt_table['pmDE'],
+                       Vmag=np.asarray(landolt_table['Vmag'], dtype=float),
+                       BV=np.asarray(landolt_table['B-V'], dtype=float),
+                       )
 
 
 def nearest(x, arr):
@@ -53,6 +89,8 @@ def nearest(x, arr):
         (n,k) array of k-dimensional data
 
     """
+    import scipy.spatial as sp
+
     tree = sp.cKDTree(arr)
     return tree.query(x, 1)
 
@@ -82,22 +120,18 @@ def standard_star(airmass, colour, time=None, location=None):
     """
     if time is None:
         time = Time.now()
-    if location is None:
-        location = observatory_location()
 
-    with pkg_resources.path('gtecs.control.data', 'Landolt09.fit') as path:
-        landolt_table = Table.read(path)
-
-    coords = SkyCoord(landolt_table['RAJ2000'], landolt_table['DEJ2000'], unit=(u.hour, u.deg))
-    altaz_frame = AltAz(location=location, obstime=time)
-    altaz_coords = coords.transform_to(altaz_frame)
-    airmasses = altaz_coords.secz
-    colours = landolt_table['B-V']
+    catalog = get_catalog()
+    alt = catalog.altitudes(time, location)
+    with np.errstate(divide='ignore'):
+        airmasses = np.where(alt > 0, 1 / np.sin(np.radians(alt)), np.inf)
+    colours = catalog['BV']
     mask = np.logical_and(airmasses > 1, airmasses < 4)
     data = np.column_stack((colours[mask], airmasses[mask]))
     goal = [colour, airmass]
     distance, index = nearest(goal, data)
-    row = landolt_table[mask][index]
-    star = LandoltStar(row['Name'], row['RAJ2000'], row['DEJ2000'],
-                       row['pmRA'], row['pmDE'], row['Vmag'], row['B-V'])
+    index = np.flatnonzero(mask)[index]
+    star = LandoltStar(catalog.get_name(index), catalog.ra[index] / 15, catalog.dec[index],
+                       catalog.pmra[index], catalog.pmdec[index],
+                       catalog['Vmag'][index], catalog['BV'][index])
     return star
@@ -0,0 +1,318 @@
+"""Catalog utility functions."""
+
+import json
+import struct
+
+from astropy.time import Time
+
+import numpy as np
+
+from .. import params
+from ..astronomy import get_lst, get_moon_distance, j2000_to_apparent
+
+
+MAS_TO_RAD = np.pi / (180 * 3600 * 1000)
+
+# Binary catalog format, see `write_catalog_file()`
+CATALOG_MAGIC = b'GTECSCAT'
+CATALOG_VERSION = 1
+CATALOG_ALIGNMENT = 64
+_CATALOG_PREFIX = struct.Struct('<8sII')  # magic, version, header length
+
+
+def radec_to_xyz(ra_deg, dec_deg):
+    """Convert RA and Dec in degrees to an (N, 3) array of unit vectors."""
+    ra = np.radians(ra_deg)
+    dec = np.radians(dec_deg)
+    cos_dec = np.cos(dec)
+    return np.ascontiguousarray(np.stack([cos_dec * np.cos(ra),
+                                          cos_dec * np.sin(ra),
+                                          np.sin(dec)], axis=-1))
+
+
+def xyz_to_radec(xyz):
+    """Convert an (N, 3) array of vectors to RA and Dec in degrees."""
+    x, y, z = np.moveaxis(xyz, -1, 0)
+    ra = np.degrees(np.arctan2(y, x)) % 360
+    dec = np.degrees(np.arctan2(z, np.hypot(x, y)))
+    return ra, dec
+
+
+def proper_motion_vectors(ra_deg, dec_deg, pmra, pmdec):
+    """Get the (N, 3) array of tangent-plane velocity vectors for the given proper motions.
+
+    Parameters
+    ----------
+    ra_deg : float or numpy.ndarray
+        right ascension in degrees
+    dec_deg : float or numpy.ndarray
+        declination in degrees
+    pmra : float or numpy.ndarray
+        proper motion in RA in mas/yr, including the cos(dec) factor
+    pmdec : float or numpy.ndarray
+        proper motion in Dec in mas/yr
+
+    Returns
+    -------
+    pm_xyz : numpy.ndarray
+        velocity vectors in radians per year
+
+    """
+    ra = np.radians(ra_deg)
+    dec = np.radians(dec_deg)
+    pmra = np.asarray(pmra, dtype=float) * MAS_TO_RAD
+    pmdec = np.asarray(pmdec, dtype=float) * MAS_TO_RAD
+    # Unit vectors in the direction of increasing RA and Dec
+    e_ra = np.stack([-np.sin(ra), np.cos(ra), np.zeros_like(ra)], axis=-1)
+    e_dec = np.stack([-np.sin(dec) * np.cos(ra), -np.sin(dec) * np.sin(ra), np.cos(dec)], axis=-1)
+    return np.ascontiguousarray(pmra[..., np.newaxis] * e_ra + pmdec[..., np.newaxis] * e_dec)
+
+
+def write_catalog_file(path, columns, meta=None):
+    """Write columns of data to a binary catalog file.
+
+    The file contains a fixed prefix (magic bytes, format version and header length),
+    a JSON header describing each column, and then the raw column data.
+    Each column is stored contiguously (in little-endian byte order) and aligned to
+    `CATALOG_ALIGNMENT` bytes, so it can be memory-mapped directly by `read_catalog_file()`.
+
+    Parameters
+    ----------
+    path : str or `pathlib.Path`
+        file to write to
+    columns : dict of numpy.ndarray
+        data columns, all should have the same length along the first axis
+        string columns are stored as fixed-width UTF-8 bytes
+    meta : dict, optional
+        any other (JSON-serialisable) information to store in the header
+
+    """
+    arrays = {}
+    for name, column in columns.items():
+        column = np.asarray(column)
+        if column.dtype.kind == 'U':
+            column = np.char.encode(column, 'utf-8')
+        if column.dtype.kind == 'O':
+            raise ValueError('Column "{}" has an invalid dtype: {}'.format(name, column.dtype))
+        arrays[name] = np.ascontiguousarray(column, dtype=column.dtype.newbyteorder('<'))
+    lengths = {len(array) for array in arrays.values()}
+    if len(lengths) > 1:
+        raise ValueError('Columns have different lengths: {}'.format(sorted(lengths)))
+    length = lengths.pop() if lengths else 0
+
+    def _align(offset):
+        return -(-offset // CATALOG_ALIGNMENT) * CATALOG_ALIGNMENT
+
+    # The column offsets depend on the header length, which depends on the offsets,
+    # so iterate until the header fits
+    header_size = 0
+    while True:
+        offset = _align(_CATALOG_PREFIX.size + header_size)
+        column_info = []
+        for name, array in arrays.items():
+            column_info.append({'name': name,
+                                'dtype': array.dtype.str,
+                                'shape': list(array.shape),
+                                'offset': offset,
+                                })
+            offset = _align(offset + array.nbytes)
+        header = {'length': length,
+                  'columns': column_info,
+                  'meta': meta if meta is not None else {},
+                  }
+        header_bytes = json.dumps(header).encode('utf-8')
+        if len(header_bytes) <= header_size:
+            break
+        header_size = len(header_bytes)
+
+    header_bytes = header_bytes.ljust(header_size)
+    with open(path, 'wb') as f:
+        f.write(_CATALOG_PREFIX.pack(CATALOG_MAGIC, CATALOG_VERSION, header_size))
+        f.write(header_bytes)
+        for info, array in zip(column_info, arrays.values()):
+            f.write(b'\0' * (info['offset'] - f.tell()))
+            f.write(array.tobytes())
+
+
+def read_catalog_file(path):
+    """Read a binary catalog file written by `write_catalog_file()`.
+
+    The columns are memory-mapped rather than read into memory, so opening even very large
+    catalogs is quick, and the pages are shared between any processes using the same file.
+
+    Parameters
+    ----------
+    path : str or `pathlib.Path`
+        file to read
+
+    Returns
+    -------
+    columns : dict of numpy.ndarray
+        read-only, memory-mapped data columns
+    meta : dict
+        any other information stored in the header
+
+    """
+    with open(path, 'rb') as f:
+        prefix = f.read(_CATALOG_PREFIX.size)
+        if len(prefix) < _CATALOG_PREFIX.size:
+            raise ValueError('File {} is not a valid catalog file'.format(path))
+        magic, version, header_size = _CATALOG_PREFIX.unpack(prefix)
+        if magic != CATALOG_MAGIC:
+            raise ValueError('File {} is not a valid catalog file'.format(path))
+        if version != CATALOG_VERSION:
+            raise ValueError('Catalog file {} has format version {} (expected {})'.format(
+                path, version, CATALOG_VERSION))
+        header = json.loads(f.read(header_size).decode('utf-8'))
+
+    if not header['columns'] or header['length'] == 0:
+        # Can't memory-map empty files
+        columns = {info['name']: np.zeros(info['shape'], dtype=info['dtype'])
+                   for info in header['columns']}
+        return columns, header['meta']
+
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+    columns = {}
+    for info in header['columns']:
+        dtype = np.dtype(info['dtype'])
+        count = int(np.prod(info['shape']))
+        column = np.frombuffer(data, dtype=dtype, count=count, offset=info['offset'])
+        columns[info['name']] = column.reshape(info['shape'])
+    return columns, header['meta']
+
+
+def years_since(epoch, time=None):
+    """Get the number of Julian years between the given epoch and time."""
+    if time is None:
+        time = Time.now()
+    return (time.jd - (2451545.0 + (epoch - 2000) * 365.25)) / 365.25
+
+
+class StarCatalog(object):
+    """A catalog of stars held in contiguous numpy arrays.
+
+    Positions are stored as unit vectors, and proper motions as tangent-plane velocity vectors,
+    so positions at any time can be found with a single vectorised operation.
+
+    Parameters
+    ----------
+    names : list or numpy.ndarray of str
+        star names
+    ra : numpy.ndarray
+        J2000 right ascensions in degrees, at the catalog epoch
+    dec : numpy.ndarray
+        J2000 declinations in degrees, at the catalog epoch
+    pmra : numpy.ndarray, optional
+        proper motions in RA in mas/yr, including the cos(dec) factor
+        default = no proper motion
+    pmdec : numpy.ndarray, optional
+        proper motions in Dec in mas/yr
+        default = no proper motion
+    epoch : float, default=2000
+        epoch of the catalog positions, as a Julian year
+
+    Any other keyword arguments are stored as extra columns (e.g. magnitudes),
+    which can be accessed by name with `catalog[name]`.
+
+    """
+
+    _BASE_COLUMNS = ['names', 'ra', 'dec', 'pmra', 'pmdec', 'xyz', 'pm_xyz']
+
+    def __init__(self, names, ra, dec, pmra=None, pmdec=None, epoch=2000, **columns):
+        self.names = np.asarray(names)
+        self.ra = np.ascontiguousarray(ra, dtype=float)
+        self.dec = np.ascontiguousarray(dec, dtype=float)
+        if pmra is None:
+            pmra = np.zeros_like(self.ra)
+        if pmdec is None:
+            pmdec = np.zeros_like(self.dec)
+        self.pmra = np.ascontiguousarray(pmra, dtype=float)
+        self.pmdec = np.ascontiguousarray(pmdec, dtype=float)
+        self.epoch = epoch
+        self.columns = {name: np.asarray(column) for name, column in columns.items()}
+
+        self.xyz = radec_to_xyz(self.ra, self.dec)
+        self.pm_xyz = proper_motion_vectors(self.ra, self.dec, self.pmra, self.pmdec)
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a catalog from a binary catalog file written with `to_file()`.
+
+        The data are memory-mapped, so nothing needs to be calculated or copied when loading.
+        """
+        columns, meta = read_catalog_file(path)
+        catalog = cls.__new__(cls)
+        for name in cls._BASE_COLUMNS:
+            setattr(catalog, name, columns.pop(name))
+        catalog.epoch = meta['epoch']
+        catalog.columns = columns
+        return catalog
+
+    def to_file(self, path):
+        """Save the catalog to a binary catalog file, which can be loaded with `from_file()`."""
+        columns = {name: getattr(self, name) for name in self._BASE_COLUMNS}
+        columns.update(self.columns)
+        write_catalog_file(path, columns, meta={'epoch': self.epoch})
+
+    def __repr__(self):
+        return 'StarCatalog(length={}, columns={})'.format(len(self), list(self.columns))
+
+    def __len__(self):
+        return len(self.ra)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def get_name(self, index):
+        """Get the name of the star at the given index."""
+        name = self.names[index]
+        if isinstance(name, bytes):
+            name = name.decode('utf-8')
+        return str(name).strip()
+
+    def positions(self, time=None):
+        """Get the unit vectors of all stars at the given time, including proper motion."""
+        xyz = self.xyz + years_since(self.epoch, time) * self.pm_xyz
+        return xyz / np.linalg.norm(xyz, axis=1, keepdims=True)
+
+    def radec(self, time=None):
+        """Get the J2000 RA and Dec in degrees of all stars at the given time."""
+        return xyz_to_radec(self.positions(time))
+
+    def altitudes(self, time=None, location=None):
+        """Get the altitudes in degrees of all stars at the given time.
+
+        Altitudes are found from the hour angles using the local sidereal time and the apparent
+        place of each star. Refraction from atmosphere is ignored.
+
+        Parameters
+        ----------
+        time : `~astropy.time.Time`, optional
+            time to check
+            default = Time.now()
+        location : `~astropy.coordinates.EarthLocation`, optional
+            observatory location
+            default = observatory_location()
+
+        """
+        if time is None:
+            time = Time.now()
+        if location is None:
+            latitude = np.radians(params.SITE_LATITUDE)
+        else:
+            latitude = location.lat.rad
+
+        ra, dec = self.radec(time)
+        ra_app, dec_app = j2000_to_apparent(ra, dec, time.jd)
+        ha = np.radians(get_lst(time, location).deg - ra_app)
+        dec_app = np.radians(dec_app)
+        sin_alt = (np.sin(latitude) * np.sin(dec_app) +
+                   np.cos(latitude) * np.cos(dec_app) * np.cos(ha))
+        return np.degrees(np.arcsin(np.clip(sin_alt, -1, 1)))
+
+    def moon_distances(self, time=None):
+        """Get the angular separation in degrees of all stars from the Moon at the given time."""
+        if time is None:
+            time = Time.now()
+        ra, dec = self.radec(time)
+        return get_moon_distance(ra, dec, time)
@@ -3,6 +3,7 @@
 import importlib.resources as pkg_resources
 import os
 import subprocess
+import threading
 import time
 from abc import ABC, abstractmethod
 
@@ -10,6 +11,8 @@ from gtecs.common import logging
 from gtecs.common.system import get_pid, kill_process
 
 from . import params
+from .metrics import format_prometheus, registry
+from .tracing import Tracer
 
 # Pyro configuration
 if params.PYRO_LOGFILE != 'none':
@@ -98,6 +101,26 @@ class BaseDaemon(ABC):
         self.log = logging.get_logger(self.daemon_id)
         self.log.info('Daemon created')
 
+        # set up timing spans (they do nothing unless tracing is enabled)
+        self.tracer = Tracer(self.daemon_id)
+
+        # set up metrics
+        self.metrics = registry
+        self._rpc_local = threading.local()
+        self._get_info = self.metrics.timed('get_info_duration_seconds', self._get_info)
+
+    @property
+    def loop_time(self):
+        """Time the control loop was last started."""
+        return self._loop_time
+
+    @loop_time.setter
+    def loop_time(self, value):
+        # Each control thread sets this at the start of every loop, so record the loop period
+        if getattr(self, '_loop_time', None) is not None:
+            self.metrics.observe('control_loop_period_seconds', value - self._loop_time)
+        self._loop_time = value
+
     # Primary control thread
     @abstractmethod
     def _control_thread(self):
@@ -120,6 +143,10 @@ class BaseDaemon(ABC):
         """Start the daemon as a Pyro daemon, and run until shutdown."""
         self.pinglife = pinglife
 
+        # Record metrics for every remote method call
+        for method in Pyro4.util.get_exposed_members(self, only_exposed=False)['methods']:
+            setattr(self, method, self._rpc_timed(method, getattr(self, method)))
+
         # Check the Pyro address is available
         try:
             pyro_daemon = Pyro4.Daemon(host, port)
@@ -140,6 +167,32 @@ class BaseDaemon(ABC):
         # Loop has closed
         self.log.info('Daemon successfully shut down')
 
+    def _rpc_timed(self, method, function):
+        """Wrap a method to record metrics when it's called by a Pyro client.
+
+        Calls from within the daemon (including methods called by other methods) aren't counted.
+        """
+        def wrapper(*args, **kwargs):
+            if (getattr(self._rpc_local, 'active', False) or
+                    getattr(Pyro4.current_context, 'client', None) is None):
+                return function(*args, **kwargs)
+
+            self._rpc_local.active = True
+            start_time = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            except Exception:
+                self.metrics.inc('rpc_errors_total', method=method)
+                raise
+            finally:
+                self._rpc_local.active = False
+                self.metrics.inc('rpc_requests_total', method=method)
+                self.metrics.observe('rpc_duration_seconds', time.perf_counter() - start_time,
+                                     method=method)
+        wrapper.__name__ = function.__name__
+        wrapper.__doc__ = function.__doc__
+        return wrapper
+
     def _check_dependencies(self, timeout=5):
         """Check if the daemon's dependencies are alive (if any).
 
@@ -153,6 +206,7 @@ class BaseDaemon(ABC):
                     status, _ = daemon.get_status()
             except Exception:
                 status = 'status_error'
+                self.metrics.inc('dependency_errors_total', dependency=dependency_id)
 
             if status == 'running':
                 # Dependency is fine
@@ -239,6 +293,80 @@ class BaseDaemon(ABC):
             self.wait_for_info()
         return self.info
 
+    def get_health(self, force_update=False):
+        """Return the daemon status and latest info together.
+
+        This lets monitors check a daemon with a single request, rather than separately
+        checking the status and fetching the info.
+
+        Parameters
+        ----------
+        force_update : bool, optional
+            if True wait for the info to be updated (only if the daemon status is 'running')
+            default = False
+
+        Returns
+        -------
+        health : dict
+            'status' and 'status_args' are the daemon status as returned by `get_status()`,
+            'bad_dependencies' and 'bad_hardware' are sorted lists of the failed dependencies
+            and hardware, 'loop_latency' is the time since the control loop last ran in
+            seconds, and 'info' is the info dict (None if the status isn't 'running').
+
+        """
+        status, status_args = self.get_status()
+
+        info = None
+        if status == 'running':
+            try:
+                info = self.get_info(force_update)
+            except Exception:
+                self.log.error('Failed to get info for health check')
+                self.log.debug('', exc_info=True)
+
+        health = {'status': status,
+                  'status_args': status_args,
+                  'bad_dependencies': sorted(self.bad_dependencies),
+                  'bad_hardware': sorted(self.bad_hardware),
+                  'loop_latency': time.time() - self.loop_time,
+                  'info': info,
+                  }
+        return health
+
+    def set_tracing(self, command):
+        """Enable or disable recording timing spans."""
+        if command not in ['on', 'off']:
+            raise ValueError("Command must be 'on' or 'off'")
+
+        if command == 'on' and self.tracer.enabled is False:
+            self.log.info('Enabling tracing')
+            self.tracer.enabled = True
+        elif command == 'off' and self.tracer.enabled is True:
+            self.log.info('Disabling tracing')
+            self.tracer.enabled = False
+
+    def get_trace_spans(self, run_number=None, start_time=None):
+        """Get the timing spans recorded by this daemon (see `gtecs.control.tracing.Tracer`)."""
+        return self.tracer.get_spans(run_number, start_time)
+
+    def get_metrics(self):
+        """Get the daemon metrics.
+
+        Returns
+        -------
+        metrics : dict
+            'counters', 'gauges' and 'histograms', see `gtecs.control.metrics.MetricsRegistry`
+
+        """
+        self.metrics.set_gauge('uptime_seconds', time.time() - self.start_time)
+        if getattr(self, '_loop_time', None) is not None:
+            self.metrics.set_gauge('loop_latency_seconds', time.time() - self.loop_time)
+        return self.metrics.snapshot()
+
+    def get_metrics_text(self):
+        """Get the daemon metrics in the Prometheus text format."""
+        return format_prometheus(self.get_metrics(), labels={'daemon': self.daemon_id})
+
     def shutdown(self):
         """Shutdown the daemon."""
         self.log.info('Daemon shutting down')
@@ -259,15 +387,34 @@ def get_daemon_host(daemon_id):
     return host, port
 
 
+class _TimedProxy(Pyro4.Proxy):
+    """A Pyro proxy which records the latency of each call made through it."""
+
+    def _pyroInvoke(self, methodname, vargs, kwargs, flags=0, objectId=None):
+        start_time = time.perf_counter()
+        try:
+            return super()._pyroInvoke(methodname, vargs, kwargs, flags, objectId)
+        finally:
+            if not methodname.startswith('__'):
+                # Don't count Pyro's internal calls (e.g. getting the metadata)
+                registry.observe('daemon_call_duration_seconds',
+                                 time.perf_counter() - start_time,
+                                 daemon=self._pyroUri.object, method=methodname)
+
+
 def daemon_proxy(daemon_id=None, host=None, port=None, timeout=params.PYRO_TIMEOUT):
-    """Get a proxy connection to the given daemon."""
+    """Get a proxy connection to the given daemon.
+
+    The latency of calls made through the proxy is recorded in the `gtecs.control.metrics`
+    registry of the calling process.
+    """
     try:
         host, port = get_daemon_host(daemon_id)
     except ValueError:
         if host is None or port is None:
             raise ValueError('Daemon "{}" not found, no host/port given'.format(daemon_id))
     address = 'PYRO:{}@{}:{}'.format(daemon_id, host, port)
-    proxy = Pyro4.Proxy(address)
+    proxy = _TimedProxy(address)
     proxy._pyroTimeout = timeout
     return proxy
 
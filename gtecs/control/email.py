@@ -4,11 +4,24 @@ import smtplib
 import time
 
 from . import params
+from .notifications import dispatcher
 
 
-def send_email(recipients=params.EMAIL_LIST, subject='GOTO', message='Test'):
+def send_email(recipients=params.EMAIL_LIST, subject='GOTO', message='Test', blocking=False):
     """Send an email.
 
+    By default the email is queued and sent in the background, see
+    `gtecs.control.notifications.NotificationDispatcher`.
+    If blocking is True then wait until it has been sent.
+    """
+    if blocking:
+        return post_email(message, recipients, subject)
+    dispatcher.send(post_email, message, recipients=tuple(recipients), subject=subject)
+
+
+def post_email(message, recipients=params.EMAIL_LIST, subject='GOTO'):
+    """Send an email, waiting until it has been sent.
+
     TODO: I'm pretty sure this is broken.
     """
     to_address = ', '.join(recipients)
@@ -1,17 +1,60 @@
 """Classes represent individual exposures and the exposure queue."""
 
 import os
+import threading
 import time
+from collections import deque
 try:
     from collections import MutableSequence
 except ImportError:
     # Changed in Python 3.10
     from collections.abc import MutableSequence
 
+import numpy as np
+
 from . import misc
 from . import params
 
 
+def check_window(window):
+    """Check a camera window, and return it as an (x, y, dx, dy) tuple of ints.
+
+    Parameters
+    ----------
+    window : tuple of int, list of tuple of int, array, or None
+        The window as (x, y, dx, dy) in unbinned pixels, or a list of sub-windows
+        (in which case the area covering all of them is returned).
+
+    Returns
+    -------
+    window : tuple of int, or None
+        The (x, y, dx, dy) window, or None if no window was given.
+
+    """
+    if window is None:
+        return None
+    # Convert any arrays (or numpy integers) to plain lists, so they're treated the same
+    try:
+        window = np.asarray(window).tolist()
+    except ValueError:
+        raise ValueError('Invalid window: {}'.format(window))
+    if not isinstance(window, list):
+        raise ValueError('Invalid window: {}'.format(window))
+    if len(window) > 0 and not isinstance(window[0], (int, float)):
+        # Find the area covering all the sub-windows
+        x = min(w[0] for w in window)
+        y = min(w[1] for w in window)
+        dx = max(w[0] + w[2] for w in window) - x
+        dy = max(w[1] + w[3] for w in window) - y
+        window = (x, y, dx, dy)
+    if len(window) != 4:
+        raise ValueError('Invalid window: {}'.format(window))
+    window = tuple(int(i) for i in window)
+    if window[0] < 0 or window[1] < 0 or window[2] < 1 or window[3] < 1:
+        raise ValueError('Invalid window: {}'.format(window))
+    return window
+
+
 class Exposure:
     """A class to represent a single exposure.
 
@@ -38,6 +81,10 @@ class Exposure:
     uts : list of int or None, default=None
         The UTs to take this exposure with.
         If None then default to all UTS with cameras
+    window : tuple of int, list of tuple of int, or None, default=None
+        The window to read out from the cameras, as (x, y, dx, dy) in unbinned pixels.
+        If a list of sub-windows is given then the cameras will read out the area covering them.
+        If None then use the cameras' current window (usually full-frame)
 
     set_num : int or None, default=None
         Set number (assigned by the exq daemon)
@@ -54,7 +101,7 @@ class Exposure:
     """
 
     def __init__(self, exptime, filt=None, binning=1, frametype='normal',
-                 target='NA', imgtype='SCIENCE', glance=False, uts=None,
+                 target='NA', imgtype='SCIENCE', glance=False, uts=None, window=None,
                  set_num=None, set_pos=1, set_tot=1,
                  set_id=None, pointing_id=None):
         # Exposure arguments
@@ -70,6 +117,7 @@ class Exposure:
         self.uts = uts
         self.ut_mask = misc.ut_list_to_mask(uts)
         self.ut_string = misc.ut_mask_to_string(self.ut_mask)
+        self.window = check_window(window)
 
         # Set arguments
         self.set_num = set_num
@@ -92,7 +140,7 @@ class Exposure:
     @classmethod
     def from_line(cls, line):
         """Create an Exposure object from a formatted string."""
-        # eg '20;R;2;normal;NA;SCIENCE;0;1011;1000;1;3;-1;-1'
+        # eg '20;R;2;normal;NA;SCIENCE;0;1011;1000;1;3;-1;-1;X'
         ls = line.split(';')
         exptime = float(ls[0])
         filt = ls[1] if ls[1] != 'X' else None
@@ -107,6 +155,10 @@ class Exposure:
         set_tot = int(ls[10])
         set_id = int(ls[11]) if int(ls[11]) != -1 else None
         pointing_id = int(ls[12]) if int(ls[12]) != -1 else None
+        if len(ls) > 13 and ls[13].strip() != 'X':
+            window = tuple(int(i) for i in ls[13].split(','))
+        else:
+            window = None
 
         exposure = cls(exptime,
                        filt,
@@ -116,6 +168,7 @@ class Exposure:
                        imgtype,
                        glance,
                        uts,
+                       window,
                        set_num,
                        set_pos,
                        set_tot,
@@ -126,8 +179,7 @@ class Exposure:
 
     def as_line(self):
         """Give the line representation of this Exposure."""
-        line = '{};{:.1f};{};{:d};{};{};{};{};{:d};{:d};{:d};{:d};{:d}\n'.format(
-            self.ut_string,
+        line = '{:.1f};{};{:d};{};{};{};{};{};{:d};{:d};{:d};{:d};{:d};{}\n'.format(
             self.exptime,
             self.filt if self.filt is not None else 'X',
             self.binning,
@@ -135,11 +187,13 @@ class Exposure:
             self.target,
             self.imgtype,
             1 if self.glance is True else 0,
+            self.ut_string,
             self.set_num if self.set_num is not None else -1,
             self.set_pos,
             self.set_tot,
             self.set_id if self.set_id is not None else -1,
             self.pointing_id if self.pointing_id is not None else -1,
+            ','.join(str(i) for i in self.window) if self.window is not None else 'X',
         )
         return line
 
@@ -155,6 +209,8 @@ class Exposure:
         msg += '  Image type: {}\n'.format(self.imgtype)
         msg += '  Glance: {}\n'.format(self.glance)
         msg += '  Unit telescope(s): {}\n'.format(self.uts)
+        if self.window is not None:
+            msg += '  Window: ({},{},{},{})\n'.format(*self.window)
         if self.in_set:
             msg += '  Set number: {}\n'.format(self.set_num)
             msg += '  Position in set: {}/{}\n'.format(self.set_pos, self.set_tot)
@@ -193,71 +249,204 @@ class Exposure:
 class ExposureQueue(MutableSequence):
     """A queue sequence to hold Exposures.
 
-    Contains 4 functions:
-    - write_to_file()
-    - insert(index,value)
-    - clear()
-    - get()
+    The queue is saved as a snapshot file listing all the exposures, plus a journal file of the
+    exposures added to the end and taken from the front of the queue since the snapshot was
+    written. Each change is appended to the journal as a single write, so adding or taking an
+    exposure doesn't depend on the length of the queue, and a set of exposures added with
+    `extend()` is saved all at once.
+    Any other changes (e.g. inserting or removing from the middle of the queue) rewrite the
+    snapshot, as does the journal reaching `compact_limit` records or the queue becoming empty.
 
-    """
-
-    def __init__(self):
-        self.data = []
-        self.queue_file = os.path.join(params.FILE_PATH, 'exposure_queue')
+    Parameters
+    ----------
+    queue_file : str, optional
+        path to the queue snapshot file (the journal is saved alongside it)
+        default = 'exposure_queue' in `params.FILE_PATH`
+    compact_limit : int, optional
+        number of journal records after which to rewrite the snapshot
+        default = 1000
 
-        if not os.path.exists(self.queue_file):
-            with open(self.queue_file, 'w') as f:
-                f.write('# Exposure queue file\n')
-                f.close()
+    """
 
-        with open(self.queue_file) as f:
-            lines = f.read().splitlines()
+    def __init__(self, queue_file=None, compact_limit=1000):
+        self.data = deque()
+        if queue_file is None:
+            queue_file = os.path.join(params.FILE_PATH, 'exposure_queue')
+        self.queue_file = queue_file
+        self.journal_file = queue_file + '.journal'
+        self.compact_limit = compact_limit
+
+        self._lock = threading.RLock()
+        self._journal = None
+        self._journal_count = 0
+        self.generation = 0
+
+        # Load the snapshot, then apply any changes since it was written
+        if os.path.exists(self.queue_file):
+            with open(self.queue_file) as f:
+                lines = f.read().splitlines()
             for line in lines:
-                if not line.startswith('#'):
+                if line.startswith('# Generation'):
+                    self.generation = int(line.split()[-1])
+                elif line and not line.startswith('#'):
                     exposure = Exposure.from_line(line)
                     self.data.append(exposure)
+        self._replay_journal()
+
+        # Start from a fresh snapshot and an empty journal
+        self.write_to_file()
+
+    def _replay_journal(self):
+        """Apply the records in the journal file to the queue.
+
+        Records are only applied once their closing '.' line has been read, so any changes
+        which were only partly written (e.g. if the daemon was killed) are ignored.
+        The journal is also ignored if it doesn't match the snapshot generation, which happens
+        if the daemon stopped after writing a new snapshot but before starting the new journal.
+        """
+        if not os.path.exists(self.journal_file):
+            return
+        with open(self.journal_file) as f:
+            lines = f.read().split('\n')
+        if len(lines) < 2 or lines[0] != '# Generation {:d}'.format(self.generation):
+            return
+
+        pending = []
+        # NB the last entry is either empty or an incomplete line
+        for line in lines[1:-1]:
+            if line != '.':
+                pending.append(line)
+                continue
+            for record in pending:
+                if record.startswith('+'):
+                    self.data.append(Exposure.from_line(record[1:]))
+                elif record == '-' and len(self.data) > 0:
+                    self.data.popleft()
+            pending = []
+
+    def _write_journal(self, records):
+        """Append the records to the journal as a single change."""
+        self._journal.write(''.join(records) + '.\n')
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._journal_count += len(records)
+        if self._journal_count >= self.compact_limit or len(self.data) == 0:
+            self.write_to_file()
 
     def write_to_file(self):
-        """Write the current queue to the queue file."""
-        with open(self.queue_file, 'w') as f:
-            f.write('# Exposure queue file\n')
-            for exposure in self.data:
-                f.write(exposure.as_line())
+        """Write the current queue to the queue file, and start a new journal."""
+        with self._lock:
+            self.generation += 1
+
+            # Write the new snapshot alongside the old one, then replace it
+            temp_file = self.queue_file + '.tmp'
+            with open(temp_file, 'w') as f:
+                f.write('# Exposure queue file\n')
+                f.write('# Generation {:d}\n'.format(self.generation))
+                for exposure in self.data:
+                    f.write(exposure.as_line())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.queue_file)
+            dir_fd = os.open(os.path.dirname(os.path.abspath(self.queue_file)), os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+            # Only now can the old journal be discarded
+            if self._journal is not None:
+                self._journal.close()
+            self._journal = open(self.journal_file, 'w')
+            self._journal.write('# Generation {:d}\n'.format(self.generation))
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._journal_count = 0
 
     def __getitem__(self, index):
-        return self.data[index]
+        with self._lock:
+            if isinstance(index, slice):
+                return list(self.data)[index]
+            return self.data[index]
 
     def __setitem__(self, index, value):
-        self.data[index] = value
-        self.write_to_file()
+        with self._lock:
+            self.data[index] = value
+            self.write_to_file()
 
     def __delitem__(self, index):
-        del self.data[index]
-        self.write_to_file()
+        with self._lock:
+            if index == 0 and len(self.data) > 0:
+                self.popleft()
+                return
+            del self.data[index]
+            self.write_to_file()
 
     def __len__(self):
         return len(self.data)
 
+    def __iter__(self):
+        # Iterate over a copy, so changes from other threads don't interrupt
+        with self._lock:
+            return iter(list(self.data))
+
     def insert(self, index, value):
         """Add an item to the queue at a specified position."""
-        self.data.insert(index, value)
-        self.write_to_file()
+        with self._lock:
+            if index >= len(self.data):
+                self.append(value)
+                return
+            self.data.insert(index, value)
+            self.write_to_file()
+
+    def append(self, value):
+        """Add an item to the end of the queue."""
+        self.extend([value])
+
+    def extend(self, values):
+        """Add items to the end of the queue, saving them all in a single journal record."""
+        values = list(values)
+        if len(values) == 0:
+            return
+        with self._lock:
+            self.data.extend(values)
+            self._write_journal(['+' + exposure.as_line() for exposure in values])
+
+    def popleft(self):
+        """Remove and return the item at the front of the queue."""
+        with self._lock:
+            exposure = self.data.popleft()
+            self._write_journal(['-\n'])
+            return exposure
+
+    def pop(self, index=-1):
+        """Remove and return the item at the given position (default last)."""
+        with self._lock:
+            if index == 0 or index == -len(self.data):
+                return self.popleft()
+            exposure = self.data[index]
+            del self.data[index]
+            self.write_to_file()
+            return exposure
 
     def clear(self):
         """Empty the current queue and queue file."""
-        self.data = []
-        self.write_to_file()
+        with self._lock:
+            self.data.clear()
+            self.write_to_file()
 
     def get(self):
         """Return info() for all exposures in the queue."""
-        msg = '{} items in queue:\n'.format(len(self.data))
-        for n, exposure in enumerate(self.data):
+        exposures = list(self)
+        msg = '{} items in queue:\n'.format(len(exposures))
+        for n, exposure in enumerate(exposures):
             msg += '{:0>3.0f}: {}'.format(n + 1, exposure.info())
         return msg.rstrip()
 
     def get_simple(self):
         """Return string for all exposures in the queue."""
-        msg = '{} items in queue:\n'.format(len(self.data))
-        for n, exposure in enumerate(self.data):
+        exposures = list(self)
+        msg = '{} items in queue:\n'.format(len(exposures))
+        for n, exposure in enumerate(exposures):
             msg += '{:0>3.0f}: {}'.format(n + 1, exposure.as_line())
         return msg.rstrip()
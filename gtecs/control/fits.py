@@ -16,11 +16,12 @@ import numpy as np
 
 from . import misc
 from . import params
-from .analysis import get_focus_region, measure_image_hfd
+from .analysis import get_focus_region, measure_image_quality, window_region
 from .astronomy import get_lst, night_startdate
 from .daemons import daemon_proxy
 from .flags import Status
 from .scheduling import get_pointing_info
+from .telemetry import window_stats
 
 
 def fits_filename(tel_number, run_number, ut_number):
@@ -115,32 +116,101 @@ def make_fits(image_data,
                                   'Median image counts')
         hdu.header['STDCNTS '] = (np.std(image_data),
                                   'Std of image counts')
+        hdu.header['SATFRAC '] = (np.count_nonzero(image_data >= params.SATURATION_LEVEL) /
+                                  image_data.size,
+                                  'Fraction of saturated pixels')
 
     # Measure HFDs and add values to the header if requested
     if measure_hfds:
         binning = int(hdu.header['XBINNING'])  # should always be the same as YBINNING
         if hfd_regions is None:
             hfd_regions = [get_focus_region(binning)]
+        window = None
+        if hdu.header.get('WINDOWED'):
+            # The regions are defined on the full frame, so need to be moved into the window
+            window = [int(i) for i in hdu.header['WINDOW'].strip('()').split(',')]
+            full_area = [int(i) for i in hdu.header['FULLAREA'].strip('()').split(',')]
+            window = (window[0] - full_area[0], window[1] - full_area[1], window[2], window[3])
         if len(hfd_regions) > 10:
             log.warning('Too many image regions ({}), restricting to 10.'.format(len(hfd_regions)))
+            hfd_regions = hfd_regions[:10]
         for i, region in enumerate(hfd_regions):
+            if window is not None and region is not None:
+                region = window_region(region, window, binning)
+                if region is None:
+                    log.warning('Image region {} is outside of the window'.format(i))
+                    continue
             try:
-                hfd, hfd_std = measure_image_hfd(image_data.astype('int32'),
-                                                 region=region,
-                                                 filter_width=15 // binning,
-                                                 verbose=False)
-                # NB HFDs are returned in binned pixels
-                hfd *= binning
-                hfd_std *= binning
-                log.debug(f'Measured image HFD: {hfd:.2f} +/- {hfd_std:.2f}')
-                hdu.header['MEDHFD{}'.format(i)] = hfd
-                hdu.header['STDHFD{}'.format(i)] = hfd_std
+                quality = measure_image_quality(image_data.astype('int32'),
+                                                region=region,
+                                                filter_width=15 // binning)
+                hdu.header['NSRCS{}'.format(i)] = quality['num_sources']
+                if np.isfinite(quality['hfd']):
+                    # NB HFDs are returned in binned pixels
+                    hfd = quality['hfd'] * binning
+                    hfd_std = quality['hfd_std'] * binning
+                    log.debug(f'Measured image HFD: {hfd:.2f} +/- {hfd_std:.2f}')
+                    hdu.header['MEDHFD{}'.format(i)] = hfd
+                    hdu.header['STDHFD{}'.format(i)] = hfd_std
+                else:
+                    log.warning('Not enough objects ({}) found for HFD measurement'.format(
+                                quality['num_sources']))
+                if np.isfinite(quality['fwhm']):
+                    hdu.header['MEDFWHM{}'.format(i)] = quality['fwhm'] * binning
+                    hdu.header['MEDELL{}'.format(i)] = quality['ellipticity']
             except Exception:
                 log.exception('Could not measure image HFDs')
 
     return hdu
 
 
+def get_image_quality(header):
+    """Get a compact image quality record from the header of a saved image.
+
+    Parameters
+    ----------
+    header : `astropy.io.fits.Header` or dict
+        the image header, as returned by `make_fits()`
+
+    Returns
+    -------
+    record : dict
+        The image time (Unix timestamp of the exposure midpoint), run number (None for glances),
+        UT, image type, exposure time and filter, and the image quality statistics:
+        the median background counts, the fraction of saturated pixels and, for each region if
+        HFDs were measured, the region index, the number of sources, the median HFD,
+        HFD standard deviation and FWHM (in unbinned pixels) and the median ellipticity.
+        Any values which weren't measured are `None`.
+
+    """
+    def get_float(key):
+        # Make sure we return plain floats, not numpy types, so the records can be serialised
+        return float(header[key]) if key in header else None
+
+    record = {'time': (float(header['JD']) - 2440587.5) * 86400,
+              'run_number': int(header['RUN']) if header['RUN'] != 'NA' else None,
+              'ut': int(header['UT']),
+              'imgtype': header['IMGTYPE'],
+              'exptime': float(header['EXPTIME']),
+              'filter': header.get('FILTER'),
+              'background': get_float('MEDCNTS'),
+              'saturation': get_float('SATFRAC'),
+              'regions': [],
+              }
+    # Regions outside the window (or where the measurement failed) have no cards, so check all 10
+    for i in range(10):
+        if 'NSRCS{}'.format(i) not in header:
+            continue
+        record['regions'].append({'region': i,
+                                  'num_sources': int(header['NSRCS{}'.format(i)]),
+                                  'hfd': get_float('MEDHFD{}'.format(i)),
+                                  'hfd_std': get_float('STDHFD{}'.format(i)),
+                                  'fwhm': get_float('MEDFWHM{}'.format(i)),
+                                  'ellipticity': get_float('MEDELL{}'.format(i)),
+                                  })
+    return record
+
+
 def save_fits(hdu, filename, log=None, log_debug=False, fancy_log=True):
     """Save a FITS HDU to a file."""
     # Remove any existing file
@@ -188,6 +258,19 @@ def save_fits(hdu, filename, log=None, log_debug=False, fancy_log=True):
             print('{}: Saved exposure from camera {}'.format(expstr, hdu.header['UT']))
 
 
+def get_history_info(history, info_time, exptime):
+    """Get statistics of a list of (timestamp, value) history values to add to the header.
+
+    The values used cover the exposure time, or at least `params.MIN_HEADER_HIST_TIME` seconds,
+    before the given time.
+    """
+    hist_time = max(params.MIN_HEADER_HIST_TIME, exptime)
+    if len(history) == 0:
+        return window_stats([], [], info_time.unix, hist_time)
+    times, values = zip(*history)
+    return window_stats(times, values, info_time.unix, hist_time)
+
+
 def get_daemon_info(cam_info=None, timeout=60, log=None, log_debug=False):
     """Get all info dicts from the running daemons, and other common info."""
     info_time = Time.now()
@@ -236,36 +319,15 @@ def get_daemon_info(cam_info=None, timeout=60, log=None, log_debug=False):
     if ('current_exposure' not in daemon_info['cam'] or
             daemon_info['cam']['current_exposure'] is None):
         raise ValueError('No current exposure details in camera info dict')
+    exptime = daemon_info['cam']['current_exposure']['exptime']
 
     # Mount history
     if daemon_info['mnt'] is not None:
         try:
             for key in daemon_info['mnt']['history']:
                 for axis in ['ra', 'dec']:
-                    history_info = {}
-                    history_info['hist_time'] = -999
-                    history_info['min'] = 'NA'
-                    history_info['max'] = 'NA'
-                    history_info['mean'] = 'NA'
-                    history_info['std'] = 'NA'
                     history = daemon_info['mnt']['history'][key][axis]
-                    if len(history) > 0:
-                        # Get history period (based on exposure time)
-                        hist_time = params.MIN_HEADER_HIST_TIME
-                        exp_time = daemon_info['cam']['current_exposure']['exptime']
-                        if exp_time > params.MIN_HEADER_HIST_TIME:
-                            hist_time = exp_time
-                        max_hist_time = info_time.unix - history[0][0]
-                        if hist_time > max_hist_time:
-                            hist_time = max_hist_time
-                        history_info['hist_time'] = hist_time
-                        # Get history values
-                        history = [h[1] for h in history if info_time.unix - h[0] <= hist_time]
-                        if len(history) > 0:
-                            history_info['min'] = np.min(history)
-                            history_info['max'] = np.max(history)
-                            history_info['mean'] = np.mean(history)
-                            history_info['std'] = np.std(history)
+                    history_info = get_history_info(history, info_time, exptime)
                     # Store the history info
                     daemon_info['mnt']['history'][key][axis] = history_info
 
@@ -285,30 +347,8 @@ def get_daemon_info(cam_info=None, timeout=60, log=None, log_debug=False):
         try:
             for key in daemon_info['conditions']['history']:
                 for source in daemon_info['conditions']['history'][key]:
-                    history_info = {}
-                    history_info['hist_time'] = -999
-                    history_info['min'] = 'NA'
-                    history_info['max'] = 'NA'
-                    history_info['mean'] = 'NA'
-                    history_info['std'] = 'NA'
                     history = daemon_info['conditions']['history'][key][source]
-                    if len(history) > 0:
-                        # Get history period (based on exposure time)
-                        hist_time = params.MIN_HEADER_HIST_TIME
-                        exp_time = daemon_info['cam']['current_exposure']['exptime']
-                        if exp_time > params.MIN_HEADER_HIST_TIME:
-                            hist_time = exp_time
-                        max_hist_time = info_time.unix - history[0][0]
-                        if hist_time > max_hist_time:
-                            hist_time = max_hist_time
-                        history_info['hist_time'] = hist_time
-                        # Get history values
-                        history = [h[1] for h in history if info_time.unix - h[0] <= hist_time]
-                        if len(history) > 0:
-                            history_info['min'] = np.min(history)
-                            history_info['max'] = np.max(history)
-                            history_info['mean'] = np.mean(history)
-                            history_info['std'] = np.std(history)
+                    history_info = get_history_info(history, info_time, exptime)
                     # Store the history info
                     if source not in daemon_info['conditions']['weather']:
                         # This shouldn't happen?
@@ -784,6 +824,8 @@ def make_header(ut, daemon_info=None):
     window_area = '({:.0f},{:.0f},{:.0f},{:.0f})'.format(*daemon_info['cam'][ut]['window_area'])
     header.append(('WINDOW  ', window_area,
                    'Windowed region in unbinned pixels (x,y,dx,dy)'))
+    header.append(('WINDOWED', window_area != full_area,
+                   'Was the image read out from a window?'))
     header.append(('CHANNELS', 2,
                    'Number of CCD channels'))  # TODO: this should come from the camera
 
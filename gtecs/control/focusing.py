@@ -1,6 +1,7 @@
 """Focusing utilities."""
 
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 from gtecs.common.system import NeatCloser
 
@@ -9,8 +10,10 @@ import numpy as np
 import pandas as pd
 
 from . import params
-from .analysis import get_focus_region, measure_image_hfd
+from .analysis import (_region_list, crop_image, get_focus_region, get_region_window,
+                       measure_image_hfd, window_region)
 from .daemons import daemon_proxy
+from .fits import get_image_data
 from .observing import get_analysis_image, get_image_headers
 
 
@@ -37,6 +40,8 @@ def get_focus_params():
                   'm_l': {ut: params.AUTOFOCUS_PARAMS[ut]['SLOPE_LEFT'] for ut in all_uts},
                   'm_r': {ut: params.AUTOFOCUS_PARAMS[ut]['SLOPE_RIGHT'] for ut in all_uts},
                   'delta_x': {ut: params.AUTOFOCUS_PARAMS[ut]['DELTA_X'] for ut in all_uts},
+                  'max_uncertainty': {ut: params.AUTOFOCUS_PARAMS[ut]['MAX_UNCERTAINTY']
+                                      for ut in all_uts},
                   }
     foc_params = pd.DataFrame(foc_params)
     return foc_params
@@ -121,6 +126,241 @@ def get_best_focus_position_2(x_l, y_l, x_r, y_r, m_r):
     return x_b
 
 
+class VCurveFocuser(object):
+    """Find the best focus position for a single UT by fitting the V-curve as measurements arrive.
+
+    The V-curve is modelled as two straight lines with the gradients from the focus params,
+    and only measurements on the linear parts of the curve (between the near-focus value and twice
+    that value, as in the takeFocusRun fitting) are used in the fit.
+    With points on both sides of the curve the best focus position is where the lines meet
+    (see `get_best_focus_position_2`), with points only on one side it falls back to using the
+    known offset between the two sides (see `get_best_focus_position`).
+
+    Each new position is chosen on whichever side of the curve adds the most information to the
+    fit (the side with the least total weight), aiming for 1.5x the near-focus value.
+    The position is converged once there are points on both sides and the uncertainty on the
+    best focus position is below `max_uncertainty`.
+
+    Parameters
+    ----------
+    start_position : int
+        The starting focuser position, which is assumed to be reasonably close to best focus.
+    m_l : float
+        Gradient of the left-hand side of the V-curve.
+    m_r : float
+        Gradient of the right-hand side of the V-curve.
+    delta_x : float
+        Difference between the x-intercepts of the two sides.
+    nfv : float
+        The near-focus HFD value, below which the V-curve is no longer linear.
+    big_step : int
+        The furthest to move beyond the positions already measured.
+    max_uncertainty : float, default=100
+        The uncertainty on the best focus position (in steps) needed to be converged.
+    min_points : int, default=3
+        The minimum number of points on the linear parts of the curve needed to be converged.
+    min_separation : int, optional
+        The minimum distance between measurements, new positions won't be chosen any closer to
+        those already measured.
+        Default is a twentieth of `big_step`.
+
+    """
+
+    def __init__(self, start_position, m_l, m_r, delta_x, nfv, big_step,
+                 max_uncertainty=100, min_points=3, min_separation=None):
+        self.start_position = start_position
+        self.m_l = m_l
+        self.m_r = m_r
+        self.delta_x = delta_x
+        self.nfv = nfv
+        self.big_step = big_step
+        self.max_uncertainty = max_uncertainty
+        self.min_points = min_points
+        self.min_separation = min_separation if min_separation is not None else big_step / 20
+
+        self.target_hfd = 1.5 * nfv
+        self.measurements = []
+
+    def __repr__(self):
+        best_position, uncertainty = self.get_best_position()
+        return 'VCurveFocuser(best_position={}, uncertainty={}, measurements={})'.format(
+            best_position, uncertainty, len(self.measurements))
+
+    def add_measurement(self, position, hfd, hfd_std):
+        """Add a HFD measurement taken at the given position (failed measurements are NaNs)."""
+        self.measurements.append((position, hfd, hfd_std))
+
+    @property
+    def valid_measurements(self):
+        """Get the measurements which didn't fail."""
+        return [(x, y, s) for x, y, s in self.measurements if not np.isnan(y)]
+
+    @property
+    def linear_measurements(self):
+        """Get the valid measurements on the linear parts of the V-curve."""
+        return [(x, y, s) for x, y, s in self.valid_measurements
+                if self.nfv < y < 2 * self.nfv]
+
+    def _fit_split(self, left, right):
+        """Fit lines with fixed gradients to the given points on each side of the curve."""
+        # Weighted mean intercepts, with a nominal non-zero sigma
+        fits = {}
+        for side, points, m in [('l', left, self.m_l), ('r', right, self.m_r)]:
+            if len(points) > 0:
+                x, y, s = (np.array(a, dtype=float) for a in zip(*points))
+                w = 1 / np.maximum(s, 0.001) ** 2
+                fits[side] = (np.sum(w * (y - m * x)) / np.sum(w), np.sum(w))
+
+        if 'l' in fits and 'r' in fits:
+            (c_l, w_l), (c_r, w_r) = fits['l'], fits['r']
+            x_b = (c_l - c_r) / (self.m_r - self.m_l)
+            variance = (1 / w_l + 1 / w_r) / (self.m_r - self.m_l) ** 2
+            n_params = 2
+        elif 'r' in fits:
+            (c_r, w_r) = fits['r']
+            c_l = self.m_l * (c_r / self.m_r - self.delta_x)
+            x_b = get_best_focus_position(0, c_r, self.m_l, self.m_r, self.delta_x)
+            variance = 1 / (w_r * self.m_r ** 2)
+            n_params = 1
+        else:
+            (c_l, w_l) = fits['l']
+            c_r = self.m_r * (c_l / self.m_l + self.delta_x)
+            x_b = get_best_focus_position(0, c_r, self.m_l, self.m_r, self.delta_x)
+            variance = 1 / (w_l * self.m_l ** 2)
+            n_params = 1
+
+        # Scale the uncertainty by the scatter about the lines, like `scipy.optimize.curve_fit`
+        chi2 = 0
+        for points, m, c in [(left, self.m_l, c_l), (right, self.m_r, c_r)]:
+            for x, y, s in points:
+                chi2 += (y - (m * x + c)) ** 2 / max(s, 0.001) ** 2
+        dof = len(left) + len(right) - n_params
+        uncertainty = np.sqrt(variance * chi2 / dof) if dof > 0 else np.inf
+
+        return {'x_b': x_b, 'y_b': self.m_r * x_b + c_r, 'c_l': c_l, 'c_r': c_r,
+                'delta_x': (c_r / self.m_r) - (c_l / self.m_l),
+                'uncertainty': uncertainty, 'chi2': chi2, 'two_sided': n_params == 2,
+                'weights': {side: fits[side][1] if side in fits else 0 for side in ['l', 'r']}}
+
+    def _model(self, fit, position):
+        """Get the HFD predicted by the given fit."""
+        if position < fit['x_b']:
+            return self.m_l * position + fit['c_l']
+        return self.m_r * position + fit['c_r']
+
+    def fit(self):
+        """Fit the V-curve to the current measurements.
+
+        Returns
+        -------
+        fit : dict or None
+            The fit parameters, including the best focus position 'x_b' and its 'uncertainty'.
+            None if there are no measurements on the linear parts of the curve.
+
+        """
+        points = sorted(self.linear_measurements)
+        if len(points) == 0:
+            return None
+        start_hfds = [y for x, y, _ in self.valid_measurements if x == self.start_position]
+        start_near_focus = len(start_hfds) > 0 and start_hfds[0] < 2 * self.nfv
+
+        # Try every way of splitting the points between the two sides
+        fits = []
+        for i in range(len(points) + 1):
+            fit = self._fit_split(points[:i], points[i:])
+            # The lines have to meet between the two sets of points
+            # and since the lines are only linear down to the near-focus value they have to meet
+            # below it, and the shape of the curve shouldn't be too different from usual
+            valid = ((i == 0 or points[i - 1][0] <= fit['x_b']) and
+                     (i == len(points) or fit['x_b'] <= points[i][0]) and
+                     fit['y_b'] < self.nfv and
+                     abs(fit['delta_x'] - self.delta_x) <= abs(self.delta_x))
+            # Points away from the linear parts still have to be on the right part of the curve
+            violations = 0
+            for x, y, _ in self.valid_measurements:
+                if y >= 2 * self.nfv and self._model(fit, x) < 2 * self.nfv:
+                    violations += 1
+                elif y <= self.nfv and self._model(fit, x) > self.nfv:
+                    violations += 1
+            # If it's still ambiguous assume we started near focus, but only if we did
+            distance = abs(fit['x_b'] - self.start_position) if start_near_focus else 0
+            fits.append((not valid, violations, round(fit['chi2'], 6), distance, i, fit))
+        return min(fits, key=lambda f: f[:5])[-1]
+
+    def get_best_position(self):
+        """Return the current best focus position estimate and its uncertainty."""
+        fit = self.fit()
+        if fit is None:
+            return None, None
+        return int(fit['x_b']), fit['uncertainty']
+
+    @property
+    def converged(self):
+        """Return True if the best focus position is known well enough."""
+        fit = self.fit()
+        return (fit is not None and fit['two_sided'] and
+                len(self.linear_measurements) >= self.min_points and
+                fit['uncertainty'] <= self.max_uncertainty)
+
+    def get_next_position(self):
+        """Choose the next position to take a measurement at.
+
+        Returns None if there are no valid measurements to go from.
+        """
+        points = self.valid_measurements
+        if len(points) == 0:
+            return None
+        last_position = self.measurements[-1][0]
+
+        fit = self.fit()
+        if fit is not None:
+            # Adding a point to the side with less weight reduces the uncertainty the most
+            if fit['weights']['l'] < fit['weights']['r']:
+                gradient = self.m_l
+            elif fit['weights']['r'] < fit['weights']['l']:
+                gradient = self.m_r
+            else:
+                # Go for whichever is closest
+                left = fit['x_b'] + (self.target_hfd - fit['y_b']) / self.m_l
+                right = fit['x_b'] + (self.target_hfd - fit['y_b']) / self.m_r
+                if abs(left - last_position) < abs(right - last_position):
+                    gradient = self.m_l
+                else:
+                    gradient = self.m_r
+            next_position = fit['x_b'] + max(self.target_hfd - fit['y_b'], 0) / gradient
+        else:
+            # Nothing on the linear parts yet, so move from the best point we have
+            near_points = [p for p in points if p[1] <= self.nfv]
+            points = sorted(points, key=lambda p: p[1])
+            x, y, _ = points[0]
+            if len(near_points) > 0:
+                # We're near focus, so step out onto the right-hand side
+                x, y, _ = max(near_points)
+                next_position = x + (self.target_hfd - y) / self.m_r
+            elif len(points) > 1 and points[1][0] < x:
+                # Moving to the right made it better, so we must be on the left-hand side
+                next_position = x + (self.target_hfd - y) / self.m_l
+            else:
+                # Assume we're on the right-hand side (like the standard autofocus routine)
+                next_position = x + (self.target_hfd - y) / self.m_r
+
+        # Don't go more than a big step beyond anywhere we've measured already
+        positions = [x for x, _, _ in self.measurements]
+        next_position = max(min(positions) - self.big_step,
+                            min(next_position, max(positions) + self.big_step))
+
+        # Never go back to a position we've already measured, as it won't improve the fit
+        # (e.g. if the model doesn't match the measurements), instead step further out from the
+        # current best position, where the curve will be linear
+        if fit is not None:
+            direction = 1 if next_position >= fit['x_b'] else -1
+        else:
+            direction = 1 if next_position >= last_position else -1
+        while any(abs(next_position - x) < self.min_separation for x in positions):
+            next_position += direction * self.min_separation
+        return int(next_position)
+
+
 def get_focuser_positions(uts=None):
     """Find the current focuser positions."""
     with daemon_proxy('foc') as daemon:
@@ -260,10 +500,191 @@ def wait_for_focusers(target_positions, timeout=60):
                 raise TimeoutError('Focuser timed out')
 
 
+def _crop_to_regions(data, region):
+    """Crop image data to the bounding box of the given region(s), and shift the region(s) to match.
+
+    This is used to limit how much data needs to be sent to the analysis processes.
+    """
+    if region is None:
+        return data, None
+    if len(region) == 2 and isinstance(region[0], slice) and isinstance(region[1], slice):
+        regions = [region]
+    else:
+        regions = list(region)
+    if any(s.start is None or s.stop is None or s.step is not None for r in regions for s in r):
+        # Can't easily shift these, so just send the full image
+        return data, region
+
+    x_start = min(r[0].start for r in regions)
+    x_stop = max(r[0].stop for r in regions)
+    y_start = min(r[1].start for r in regions)
+    y_stop = max(r[1].stop for r in regions)
+    data = crop_image(data, (slice(x_start, x_stop), slice(y_start, y_stop)))
+    regions = [(slice(r[0].start - x_start, r[0].stop - x_start),
+                slice(r[1].start - y_start, r[1].stop - y_start))
+               for r in regions]
+    return data, regions
+
+
+def _measure_hfd(data, region, binning):
+    """Measure the HFD in the given image data, returning values in unbinned pixels.
+
+    This is run in a separate process by `iter_focus_data`.
+    """
+    # Extract median HFD and std values from the image data
+    # Note filter_width is 15, this deals much better with out-of-focus images
+    hfd, hfd_std = measure_image_hfd(data, region=region, filter_width=15 // binning,
+                                     verbose=False)
+
+    # HFDs are in binned pixels, convert to unbinned
+    hfd *= binning
+    hfd_std *= binning
+
+    # Check for invalid values
+    if hfd_std <= 0.0:
+        raise ValueError('Invalid HFD std: {}'.format(hfd_std))
+
+    return hfd, hfd_std
+
+
+def _make_focus_dfs(all_data):
+    """Make the per-region dataframes from a list of {ut: data_dict} dicts."""
+    all_dfs = []
+    for region_data in all_data:
+        df = pd.DataFrame([region_data[ut] for ut in sorted(region_data)])
+        df.set_index('UT', inplace=True)
+        all_dfs.append(df)
+    return all_dfs
+
+
+def iter_focus_data(num_exp=1, exptime=5, filt='L', binning=1, target_name='Focus test image',
+                    uts=None, regions=None):
+    """Take a set of images and yield the measured half-flux diameters from each exposure.
+
+    All the exposures are added to the queue at once, and the images are analysed in parallel
+    (over each UT and region) in separate processes while the next exposure is being taken.
+    If regions are given then the cameras only read out the window covering them.
+
+    Parameters are the same as for `measure_focus`.
+
+    Yields
+    ------
+    foc_data : list of `pandas.DataFrame`
+        A list of Pandas dataframes, one for each region, with an index of unit telescope ID.
+        The columns are the same as those returned by `measure_focus`.
+
+    """
+    if uts is None:
+        uts = params.UTS_WITH_FOCUSERS
+    else:
+        uts = [ut for ut in uts if ut in params.UTS_WITH_FOCUSERS]
+    if regions is None:
+        regions = [None]
+    cam_uts = [ut for ut in uts if ut in params.UTS_WITH_CAMERAS]
+    if len(cam_uts) == 0:
+        raise ValueError('Invalid UT values (not in {})'.format(params.UTS_WITH_CAMERAS))
+
+    # Get the current focuser positions and the temperature the last time they moved
+    with daemon_proxy('foc') as daemon:
+        info = daemon.get_info(force_update=True)
+    current_positions = {ut: info[ut]['current_pos'] for ut in info['uts']}
+    last_temps = {ut: info[ut]['last_move_temp'] for ut in info['uts']}
+
+    all_uts = sorted(current_positions.keys())
+
+    def _collect(futures):
+        # Wait for the measurements from one exposure, and add them to the data
+        exp_data = [{} for _ in range(len(regions))]
+        for ut in all_uts:
+            for j in range(len(regions)):
+                if (ut, j) in futures:
+                    try:
+                        hfd, hfd_std = futures[(ut, j)].result()
+                    except Exception as err:
+                        print('HFD measurement for UT{}{} errored: {}'.format(ut,
+                              ' region {}'.format(j) if len(regions) > 1 else '', str(err)))
+                        hfd = np.nan
+                        hfd_std = np.nan
+                else:
+                    # We're ignoring this UT, but still add NaNs
+                    hfd = np.nan
+                    hfd_std = np.nan
+
+                exp_data[j][ut] = {'UT': ut,
+                                   'pos': current_positions[ut],
+                                   'region': j,
+                                   'hfd': hfd,
+                                   'hfd_std': hfd_std,
+                                   'temp': last_temps[ut],
+                                   }
+        return exp_data
+
+    # Only read out the part of the frame we're going to measure,
+    # and move the regions to match the windowed images
+    if all(region is not None for region in regions):
+        window = get_region_window([r for region in regions for r in _region_list(region)],
+                                   binning)
+        regions = [window_region(region, window, binning) for region in regions]
+    else:
+        window = None
+
+    # The run numbers are assigned as each exposure starts, so we know what to look for
+    with daemon_proxy('cam') as daemon:
+        info = daemon.get_info(force_update=True)
+    first_run_number = info['latest_run_number'] + 1
+
+    # Add all the exposures at once, so the cameras don't wait for us between them
+    with daemon_proxy('exq') as daemon:
+        print('Taking {}x {:.0f}s {} exposures'.format(num_exp, exptime, filt))
+        daemon.add(exptime, num_exp, filt, binning,
+                   target=target_name, imgtype='FOCUS', glance=False, uts=cam_uts,
+                   window=window)
+        daemon.resume()
+
+    num_loaded = 0
+    try:
+        with ProcessPoolExecutor() as executor:
+            pending = None
+            for i in range(num_exp):
+                # Wait for the next images, while the previous ones are being analysed
+                print('Taking exposure {}/{}...'.format(i + 1, num_exp))
+                image_data = get_image_data(first_run_number + i, uts=cam_uts,
+                                            timeout=exptime + 150)
+                num_loaded += 1
+
+                # Send the images off to be measured
+                futures = {}
+                for ut in image_data:
+                    for j, region in enumerate(regions):
+                        try:
+                            data, crop_region = _crop_to_regions(image_data[ut], region)
+                            futures[(ut, j)] = executor.submit(_measure_hfd,
+                                                               data, crop_region, binning)
+                        except Exception as err:
+                            print('HFD measurement for UT{}{} errored: {}'.format(ut,
+                                  ' region {}'.format(j) if len(regions) > 1 else '', str(err)))
+
+                # Delete the image data for good measure, to save memory
+                del image_data
+
+                if pending is not None:
+                    yield _make_focus_dfs(_collect(pending))
+                pending = futures
+
+            yield _make_focus_dfs(_collect(pending))
+    finally:
+        if num_loaded < num_exp:
+            # Don't leave the rest of the exposures in the queue
+            with daemon_proxy('exq') as daemon:
+                daemon.clear()
+
+
 def measure_focus(num_exp=1, exptime=5, filt='L', binning=1, target_name='Focus test image',
                   uts=None, regions=None):
     """Take a set of images and measure the median half-flux diameters.
 
+    The images are analysed while the next exposure is being taken, see `iter_focus_data`.
+
     Parameters
     ----------
     num_exp : int, default=1
@@ -294,100 +715,43 @@ def measure_focus(num_exp=1, exptime=5, filt='L', binning=1, target_name='Focus
         uts = params.UTS_WITH_FOCUSERS
     else:
         uts = [ut for ut in uts if ut in params.UTS_WITH_FOCUSERS]
-    if regions is None:
-        regions = [None]
 
-    # Get the current focuser positions and the temperature the last time they moved
-    with daemon_proxy('foc') as daemon:
-        info = daemon.get_info(force_update=True)
-    current_positions = {ut: info[ut]['current_pos'] for ut in info['uts']}
-    last_temps = {ut: info[ut]['last_move_temp'] for ut in info['uts']}
-
-    all_uts = sorted(current_positions.keys())
-
-    all_data = [{ut: [] for ut in all_uts} for _ in range(len(regions))]
-    for i in range(num_exp):
-        print('Taking exposure {}/{}...'.format(i + 1, num_exp))
-        # Take a set of images
-        image_data = get_analysis_image(exptime, filt, binning, target_name, 'FOCUS',
-                                        glance=False, uts=uts)
-
-        # Measure the median HFDs in each image
-        for ut in all_uts:
-            for j, region in enumerate(regions):
-                if ut in image_data:
-                    try:
-                        # Extract median HFD and std values from the image data
-                        # Note filter_width is 15, this deals much better with out-of-focus images
-                        hfd, hfd_std = measure_image_hfd(image_data[ut],
-                                                         region=region,
-                                                         filter_width=15 // binning,
-                                                         verbose=False)
-
-                        # HFDs are in binned pixels, convert to unbinned
-                        hfd *= binning
-                        hfd_std *= binning
-
-                        # Check for invalid values
-                        if hfd_std <= 0.0:
-                            raise ValueError
+    all_exp_dfs = []
+    for exp_dfs in iter_focus_data(num_exp, exptime, filt, binning, target_name, uts, regions):
+        all_exp_dfs.append(exp_dfs)
 
-                    except Exception as err:
-                        print('HFD measurement for UT{}{} errored: {}'.format(ut,
-                              ' region {}'.format(j) if len(regions) > 1 else '', str(err)))
-                        hfd = np.nan
-                        hfd_std = np.nan
-                else:
-                    # We're ignoring this UT, but still add NaNs
-                    hfd = np.nan
-                    hfd_std = np.nan
-
-                # Add to main arrays
-                data_dict = {'UT': ut,
-                             'pos': current_positions[ut],
-                             # 'exposure': i,
-                             'region': j,
-                             'hfd': hfd,
-                             'hfd_std': hfd_std,
-                             'temp': last_temps[ut],
-                             }
-                all_data[j][ut].append(data_dict)
-
-        # Delete the image data for good measure, to save memory
-        del image_data
-
-        if len(regions) == 1:
-            print('HFDs:', {ut: np.round(all_data[0][ut][i]['hfd'], 1) for ut in uts})
+        if len(exp_dfs) == 1:
+            print('HFDs:', {ut: np.round(exp_dfs[0]['hfd'][ut], 1) for ut in uts})
         else:
             msg = 'HFDs:\n'
-            for j, data in enumerate(all_data):
-                msg += 'region {}: {}\n'.format(j, {ut: np.round(data[ut][i]['hfd'], 1)
-                                                    for ut in uts})
+            for j, df in enumerate(exp_dfs):
+                msg += 'region {}: {}\n'.format(j, {ut: np.round(df['hfd'][ut], 1) for ut in uts})
             print(msg[:-1])
 
     all_dfs = []
-    msg = 'Best HFDs:{}'.format('\n' if len(all_data) > 1 else ' ')
-    for j, region_data in enumerate(all_data):
-        # Make into dataframes
-        region_dfs = {ut: pd.DataFrame(region_data[ut]) for ut in region_data}
+    msg = 'Best HFDs:{}'.format('\n' if len(all_exp_dfs[0]) > 1 else ' ')
+    for j in range(len(all_exp_dfs[0])):
+        region_df = pd.concat([exp_dfs[j] for exp_dfs in all_exp_dfs])
 
         # Take the smallest of the HFD values measured as the best estimate for this position.
         # The reasoning is that we already average the HFD over many stars in each frame,
         # so across multiple frames we only sample external fluctuations, usually windshake,
         # which will always make the HFD worse, never better.
         # We also want to make sure we get the std associated with that image.
-        best_dfs = [region_dfs[ut][region_dfs[ut]['hfd'] == region_dfs[ut]['hfd'].min()]
-                    if not np.isnan(region_dfs[ut]['hfd'].min())  # will return NaN if are all NaNs
-                    else region_dfs[ut].iloc[[0]]                 # just take the first row
-                    for ut in region_dfs]
+        best_dfs = []
+        for ut in region_df.index.unique():
+            ut_df = region_df.loc[[ut]]
+            if not np.isnan(ut_df['hfd'].min()):  # will return NaN if are all NaNs
+                best_dfs.append(ut_df[ut_df['hfd'] == ut_df['hfd'].min()])
+            else:
+                best_dfs.append(ut_df.iloc[[0]])  # just take the first row
 
         # Make into a single dataframe
         df = pd.concat(best_dfs)
-        df.set_index('UT', inplace=True)
         all_dfs.append(df)
 
         # Print best HFDs if more than one exp was taken
-        if len(all_data) > 1:
+        if len(all_exp_dfs[0]) > 1:
             msg += 'region {}: '.format(j)
         msg += '{}\n'.format(df['hfd'].round(1).to_dict())
 
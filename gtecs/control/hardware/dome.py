@@ -236,6 +236,11 @@ class AstroHavenDome:
         log debug strings?
         default = False
 
+    The PLC and the switches are each read in their own thread, and the combined status is
+    updated as soon as either reports. The PLC thread blocks waiting for the PLC to send, so
+    limit changes are seen straight away even if the switches are slow to respond.
+    If the switches haven't been read for `switch_max_age` seconds they are ignored.
+
     """
 
     def __init__(self, port, arduino_ip=None, roomalert_ip=None, domealert_uri=None,
@@ -244,6 +249,12 @@ class AstroHavenDome:
         self.serial_baudrate = 9600
         self.serial_timeout = 1
 
+        # Switches are read over the network, so limit how long we wait and how often we ask
+        self.switch_timeout = 5
+        self.switch_period = 2
+        self.switch_period_moving = 0.5
+        self.switch_max_age = 15
+
         if arduino_ip and not arduino_ip.startswith('http'):
             arduino_ip = 'http://' + arduino_ip
         self.arduino_ip = arduino_ip
@@ -295,15 +306,22 @@ class AstroHavenDome:
         self.status_thread_running = False
         self.status_update_time = 0
 
+        # latest readings from each sensor, with the time they were taken
+        self.sensor_status = {'plc': {'update_time': 0}, 'switches': {'update_time': 0}}
+        self._status_lock = threading.Lock()
+        self._switches_stale = False
+
         # serial connection to the dome
         self.dome_serial = serial.Serial(self.serial_port,
                                          baudrate=self.serial_baudrate,
                                          timeout=self.serial_timeout)
 
-        # start status check thread
-        st = threading.Thread(target=self._status_thread)
-        st.daemon = True
-        st.start()
+        # start status threads
+        self.status_thread_running = True
+        for target in [self._plc_thread, self._switch_thread]:
+            st = threading.Thread(target=target)
+            st.daemon = True
+            st.start()
 
     def __del__(self):
         self.disconnect()
@@ -320,31 +338,6 @@ class AstroHavenDome:
         except AttributeError:
             pass
 
-    def _read_plc(self, attempts=3):
-        attempts_remaining = attempts
-        while attempts_remaining:
-            try:
-                if self.dome_serial.in_waiting:
-                    out = self.dome_serial.read(self.dome_serial.in_waiting)
-                    x = out.decode('ascii')[-1]
-                    if self.log_debug:
-                        self.log.debug('plc RECV:"{}"'.format(x))
-                    self._parse_plc_status(x)
-                return
-            except Exception:
-                attempts_remaining -= 1
-                self.log.warning('Error communicating with the PLC')
-                self.log.debug('', exc_info=True)
-                self.log.debug('Previous status: {}'.format(self.old_plc_status))
-                if attempts_remaining > 0:
-                    self.log.warning('Remaining tries: {}'.format(attempts_remaining))
-                    time.sleep(0.5)
-                else:
-                    self.log.error('Could not communicate with the PLC')
-                    self.plc_error = True
-                    self.plc_status['a_side'] = 'ERROR'
-                    self.plc_status['b_side'] = 'ERROR'
-
     def _parse_plc_status(self, status_character):
         # save previous status
         self.old_plc_status = self.plc_status.copy()
@@ -414,7 +407,7 @@ class AstroHavenDome:
             raise ValueError('Unable to parse reply from the PLC: {}'.format(status_character))
 
     def _read_arduino(self):
-        with urllib.request.urlopen(self.arduino_ip) as r:
+        with urllib.request.urlopen(self.arduino_ip, timeout=self.switch_timeout) as r:
             data = json.loads(r.read())
         if self.log_debug:
             self.log.debug('arduino RECV:"{}"'.format(data))
@@ -436,7 +429,8 @@ class AstroHavenDome:
         return switch_dict
 
     def _read_roomalert(self):
-        with urllib.request.urlopen(self.roomalert_ip + '/getData.json') as r:
+        url = self.roomalert_ip + '/getData.json'
+        with urllib.request.urlopen(url, timeout=self.switch_timeout) as r:
             data = json.loads(r.read())
         data = {d['lab']: d['stat'] for d in data['s_sen'] if 'Switch Sen' not in d['lab']}
         if self.log_debug:
@@ -461,6 +455,7 @@ class AstroHavenDome:
     def _read_domealert(self):
         with Pyro4.Proxy(self.domealert_uri) as pyro_daemon:
             pyro_daemon._pyroSerializer = 'serpent'
+            pyro_daemon._pyroTimeout = self.switch_timeout
             data = pyro_daemon.last_measurement()
 
         if self.log_debug:
@@ -490,32 +485,15 @@ class AstroHavenDome:
                        }
         return switch_dict
 
-    def _read_switches(self, attempts=3):
-        attempts_remaining = attempts
-        while attempts_remaining:
-            try:
-                if self.arduino_ip is not None:
-                    switch_dict = self._read_arduino()
-                elif self.roomalert_ip is not None:
-                    switch_dict = self._read_roomalert()
-                elif self.domealert_uri is not None:
-                    switch_dict = self._read_domealert()
-                else:
-                    switch_dict = None
-                self._parse_switch_status(switch_dict)
-                return
-            except Exception:
-                attempts_remaining -= 1
-                self.log.warning('Error communicating with the switches')
-                self.log.debug('', exc_info=True)
-                self.log.debug('Previous status: {}'.format(self.old_switch_status))
-                if attempts_remaining > 0:
-                    self.log.warning('Remaining tries: {}'.format(attempts_remaining))
-                    time.sleep(0.5)
-                else:
-                    self.log.error('Could not communicate with the switches')
-                    self._parse_switch_status(None)
-                    self.switch_error = True
+    def _read_switches(self):
+        if self.arduino_ip is not None:
+            return self._read_arduino()
+        elif self.roomalert_ip is not None:
+            return self._read_roomalert()
+        elif self.domealert_uri is not None:
+            return self._read_domealert()
+        else:
+            return None
 
     def _parse_switch_status(self, switch_dict):
         # save previous status
@@ -589,85 +567,166 @@ class AstroHavenDome:
         except Exception:
             raise ValueError('Unable to parse reply from switches: {}'.format(switch_dict))
 
-    def _read_status(self):
-        """Check the dome status reported by both the dome plc and the extra switches."""
-        # check plc
-        self._read_plc()
+    def _publish(self, sensor, status):
+        """Store the latest status from a sensor, and update the combined status."""
+        self.sensor_status[sensor] = dict(status, update_time=time.time())
+        self._update_status()
+
+    def _update_status(self):
+        """Combine the latest status reported by the dome plc and the extra switches."""
+        with self._status_lock:
+            plc_status = self.plc_status.copy()
+            switch_status = self.switch_status.copy()
+
+            # Ignore the switches if we haven't heard from them recently
+            switch_time = self.sensor_status['switches']['update_time']
+            switch_age = time.time() - switch_time
+            stale = switch_status['hatch'] != 'unknown' and switch_age > self.switch_max_age
+            if stale:
+                switch_status = {'a_side': 'unknown', 'b_side': 'unknown', 'hatch': 'unknown'}
+            if stale != self._switches_stale and switch_time > 0:
+                if stale:
+                    self.log.warning('Switch status is {:.1f}s old, ignoring'.format(switch_age))
+                else:
+                    self.log.info('Switch status updated')
+                self._switches_stale = stale
 
-        # check switches
-        self._read_switches()
+            if self.log_debug:
+                self.log.debug('status: plc:{} switches:{}'.format(plc_status, switch_status))
 
-        if self.log_debug:
-            self.log.debug('status: plc:{} switches:{}'.format(self.plc_status, self.switch_status))
-
-        status = {}
-
-        # dome logic
-        for side in ['a_side', 'b_side']:
-            plc_status = self.plc_status[side]
-            switch_status = self.switch_status[side]
-
-            if switch_status != 'unknown':
-                # Chose which dome status to report
-                if plc_status == switch_status:
-                    # arbitrary
-                    status[side] = plc_status
-                elif plc_status == 'ERROR' and switch_status != 'ERROR':
-                    # go with the one that is still working
-                    status[side] = switch_status
-                elif switch_status == 'ERROR' and plc_status != 'ERROR':
-                    # go with the one that is still working
-                    status[side] = plc_status
-                elif plc_status[-3:] == 'ing':
-                    if switch_status == 'part_open':
-                        # the switches can't tell if it's moving
-                        status[side] = plc_status
-                    else:  # closed or full_open
-                        # switch says it's reached the limit,
-                        # but it hasn't stopped!!
-                        status[side] = switch_status
-                elif plc_status == 'part_open':
-                    # switch says closed or full_open
-                    status[side] = switch_status
-                elif switch_status == 'part_open':
-                    # plc says closed or full_open
-                    status[side] = plc_status
-                else:
-                    # if one says closed and the other says full_open
-                    # or something totally unexpected
-                    status[side] = 'ERROR'
-            else:
-                # we don't have any switches for extra infomation
-                status[side] = plc_status
+            status = {}
 
-        # Get the hatch status from the switch
-        status['hatch'] = self.switch_status['hatch']
+            # dome logic
+            for side in ['a_side', 'b_side']:
+                plc_side = plc_status[side]
+                switch_side = switch_status[side]
+
+                if switch_side != 'unknown':
+                    # Chose which dome status to report
+                    if plc_side == switch_side:
+                        # arbitrary
+                        status[side] = plc_side
+                    elif plc_side == 'ERROR' and switch_side != 'ERROR':
+                        # go with the one that is still working
+                        status[side] = switch_side
+                    elif switch_side == 'ERROR' and plc_side != 'ERROR':
+                        # go with the one that is still working
+                        status[side] = plc_side
+                    elif plc_side[-3:] == 'ing':
+                        if switch_side == 'part_open':
+                            # the switches can't tell if it's moving
+                            status[side] = plc_side
+                        else:  # closed or full_open
+                            # switch says it's reached the limit,
+                            # but it hasn't stopped!!
+                            status[side] = switch_side
+                    elif plc_side == 'part_open':
+                        # switch says closed or full_open
+                        status[side] = switch_side
+                    elif switch_side == 'part_open':
+                        # plc says closed or full_open
+                        status[side] = plc_side
+                    else:
+                        # if one says closed and the other says full_open
+                        # or something totally unexpected
+                        status[side] = 'ERROR'
+                else:
+                    # we don't have any switches for extra infomation
+                    status[side] = plc_side
 
-        return status
+            # Get the hatch status from the switch
+            status['hatch'] = switch_status['hatch']
 
-    def _status_thread(self):
-        if self.status_thread_running:
-            self.log.debug('status thread tried to start when already running')
-            return
+            self.status = status
+            self.status_update_time = time.time()
 
-        self.log.debug('status thread started')
-        self.status_thread_running = True
+    def sensor_ages(self):
+        """Return the time since each sensor last reported, in seconds."""
+        now = time.time()
+        return {sensor: now - status['update_time']
+                for sensor, status in self.sensor_status.items()}
 
+    def _plc_thread(self, attempts=3):
+        """Read the status from the PLC as soon as it is sent."""
+        self.log.debug('plc thread started')
+        attempts_remaining = attempts
         while self.status_thread_running:
             try:
-                self.status = self._read_status()
-                self.status_update_time = time.time()
-                # Check status more often if we are moving
-                if self.output_thread_running:
-                    time.sleep(0.5)
+                # Wait for the PLC to send something (up to the serial timeout),
+                # then read anything else in the buffer and only use the latest
+                out = self.dome_serial.read(1)
+                if out and self.dome_serial.in_waiting:
+                    out += self.dome_serial.read(self.dome_serial.in_waiting)
+                if out:
+                    x = out.decode('ascii')[-1]
+                    if self.log_debug:
+                        self.log.debug('plc RECV:"{}"'.format(x))
+                    with self._status_lock:
+                        self._parse_plc_status(x)
+                    self._publish('plc', self.plc_status)
+                else:
+                    # Nothing new, but still check the switches haven't gone stale
+                    self._update_status()
+                attempts_remaining = attempts
+            except Exception:
+                if not self.status_thread_running:
+                    break
+                attempts_remaining -= 1
+                self.log.warning('Error communicating with the PLC')
+                self.log.debug('', exc_info=True)
+                self.log.debug('Previous status: {}'.format(self.old_plc_status))
+                if attempts_remaining > 0:
+                    self.log.warning('Remaining tries: {}'.format(attempts_remaining))
                 else:
-                    time.sleep(2)
+                    self.log.error('Could not communicate with the PLC')
+                    self.plc_error = True
+                    with self._status_lock:
+                        self.plc_status['a_side'] = 'ERROR'
+                        self.plc_status['b_side'] = 'ERROR'
+                    self._publish('plc', self.plc_status)
+                    attempts_remaining = attempts
+                time.sleep(0.5)
+
+        self.status_thread_running = False
+        self.log.debug('plc thread finished')
+
+    def _switch_thread(self, attempts=3):
+        """Read the status from the extra switches."""
+        self.log.debug('switch thread started')
+        attempts_remaining = attempts
+        while self.status_thread_running:
+            try:
+                switch_dict = self._read_switches()
+                with self._status_lock:
+                    self._parse_switch_status(switch_dict)
+                self._publish('switches', self.switch_status)
+                attempts_remaining = attempts
+                if switch_dict is None:
+                    # No source of switches, so nothing more to do
+                    break
             except Exception:
-                self.log.error('Error in status thread')
+                attempts_remaining -= 1
+                self.log.warning('Error communicating with the switches')
                 self.log.debug('', exc_info=True)
-                self.status_thread_running = False
+                self.log.debug('Previous status: {}'.format(self.old_switch_status))
+                if attempts_remaining > 0:
+                    self.log.warning('Remaining tries: {}'.format(attempts_remaining))
+                    time.sleep(0.5)
+                    continue
+                self.log.error('Could not communicate with the switches')
+                with self._status_lock:
+                    self._parse_switch_status(None)
+                self.switch_error = True
+                self._publish('switches', self.switch_status)
+                attempts_remaining = attempts
+
+            # Check status more often if we are moving
+            if self.output_thread_running:
+                time.sleep(self.switch_period_moving)
+            else:
+                time.sleep(self.switch_period)
 
-        self.log.debug('status thread finished')
+        self.log.debug('switch thread finished')
 
     def _output_thread(self, side, command, frac):
         if self.output_thread_running:
@@ -5,15 +5,18 @@ import logging
 import random
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from astropy import units as u
 from astropy.coordinates import SkyCoord
 from astropy.time import Time
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from ...astronomy import altaz_from_radec, get_lst, radec_from_altaz
 from ...astronomy import apparent_to_j2000, j2000_to_apparent
+from ...telemetry import TelemetryStore, iso_to_unix
 
 
 class DDM500:
@@ -53,6 +56,14 @@ class DDM500:
         self.base_url = f'http://{address}:{port}/api/v{api_version}/telescope/{device_number}/'
         self.client_id = random.randint(0, 2**32)
         self.transaction_count = 0
+        self._transaction_lock = threading.Lock()
+
+        # Use a persistent session, so connections are kept open and reused between commands
+        # (the pool needs to be big enough for the report thread and any concurrent requests)
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        # Used to send the RA and Dec report requests at the same time
+        self._report_executor = ThreadPoolExecutor(max_workers=1)
 
         # These are to account for errors in AutoSlew which mean we can't use the park functions
         self._fake_parking = fake_parking
@@ -74,6 +85,8 @@ class DDM500:
         self.report_history_limit = report_history_limit
         self._report_ra = None
         self._report_dec = None
+        # Store report values (only when they change), allowing for reports up to 20 Hz
+        self.telemetry = TelemetryStore(int(report_history_limit * 20) + 10, skip_repeats=True)
         self._status_update_time = 0
 
         # Create a logger if one isn't given
@@ -103,7 +116,11 @@ class DDM500:
 
     def __del__(self):
         self.report_thread_running = False
-        self.disconnect()
+        try:
+            self.disconnect()
+        finally:
+            self._report_executor.shutdown(wait=False)
+            self.session.close()
 
     def _http_request(self, cmd, command_str, data=None):
         """Send a request to the device, then parse and return the reply."""
@@ -113,9 +130,10 @@ class DDM500:
 
             # Add recommended IDs
             data['ClientID'] = self.client_id
-            count = self.transaction_count + 1
+            with self._transaction_lock:
+                count = self.transaction_count + 1
+                self.transaction_count = count
             data['ClientTransactionID'] = count
-            self.transaction_count = count
 
             url = self.base_url + command_str
             if self.log_debug:
@@ -123,10 +141,10 @@ class DDM500:
 
             if cmd == 'GET':
                 # GET commands require params in the URL (no body)
-                r = requests.get(url, params=data)
+                r = self.session.get(url, params=data)
             elif cmd == 'PUT':
                 # PUT commands require params in the message body
-                r = requests.put(url, data=data)
+                r = self.session.put(url, data=data)
 
             reply_str = r.content.decode(r.encoding)
             if self.log_debug:
@@ -379,9 +397,11 @@ class DDM500:
         # Make sure reporting is on
         self._http_put('action', {'Action': 'reporting', 'Parameters': 'on'})
 
-        # Get report dicts
+        # Get report dicts (fetch both axes at once)
+        future = self._report_executor.submit(self._http_put, 'action',
+                                              {'Action': 'report', 'Parameters': '2'})
         report_ra = self._http_put('action', {'Action': 'report', 'Parameters': '1'})
-        report_dec = self._http_put('action', {'Action': 'report', 'Parameters': '2'})
+        report_dec = future.result()
         if len(report_ra) == 0 or len(report_dec) == 0:
             raise ValueError('Invalid report string')
         self._report_ra = json.loads(report_ra)
@@ -407,81 +427,39 @@ class DDM500:
             'ra': self._report_ra['QCurr'], 'dec': self._report_dec['QCurr']
         }
 
-        # Add to history, and remove old entries
+        # Add to history
         report_time = {
-            'ra': Time(self._report_ra['LastTime'].split('+')[0]).unix,
-            'dec': Time(self._report_dec['LastTime'].split('+')[0]).unix
+            'ra': iso_to_unix(self._report_ra['LastTime']),
+            'dec': iso_to_unix(self._report_dec['LastTime'])
         }
-        if not hasattr(self, '_position_hist'):
-            self._position_hist = {'ra': [], 'dec': []}
-        if not hasattr(self, '_position_error_hist'):
-            self._position_error_hist = {'ra': [], 'dec': []}
-        if not hasattr(self, '_tracking_error_hist'):
-            self._tracking_error_hist = {'ra': [], 'dec': []}
-        if not hasattr(self, '_velocity_hist'):
-            self._velocity_hist = {'ra': [], 'dec': []}
-        if not hasattr(self, '_acceleration_hist'):
-            self._acceleration_hist = {'ra': [], 'dec': []}
-        if not hasattr(self, '_current_hist'):
-            self._current_hist = {'ra': [], 'dec': []}
         for axis in ('ra', 'dec'):
-            # Add new entries, if they have changed
-            if (len(self._position_hist[axis]) == 0 or
-                    self._position_hist[axis][-1][1] != self._position[axis]):
-                self._position_hist[axis].append(
-                    (report_time[axis], self._position[axis]))
-            if (len(self._position_error_hist[axis]) == 0 or
-                    self._position_error_hist[axis][-1][1] != self._position_error[axis]):
-                self._position_error_hist[axis].append(
-                    (report_time[axis], self._position_error[axis]))
-            if (len(self._tracking_error_hist[axis]) == 0 or
-                    self._tracking_error_hist[axis][-1][1] != self._tracking_error[axis]):
-                self._tracking_error_hist[axis].append(
-                    (report_time[axis], self._tracking_error[axis]))
-            if (len(self._velocity_hist[axis]) == 0 or
-                    self._velocity_hist[axis][-1][1] != self._velocity[axis]):
-                self._velocity_hist[axis].append(
-                    (report_time[axis], self._velocity[axis]))
-            if (len(self._acceleration_hist[axis]) == 0 or
-                    self._acceleration_hist[axis][-1][1] != self._acceleration[axis]):
-                self._acceleration_hist[axis].append(
-                    (report_time[axis], self._acceleration[axis]))
-            if (len(self._current_hist[axis]) == 0 or
-                    self._current_hist[axis][-1][1] != self._current[axis]):
-                self._current_hist[axis].append(
-                    (report_time[axis], self._current[axis]))
-
-            # Remove old entries, as long as there's more than one
-            # (we had issues with -999 readings being filtered out)
-            time_limit = time.time() - self.report_history_limit
-            if len(self._position_hist[axis]) > 1:
-                self._position_hist[axis] = [
-                    hist for hist in self._position_hist[axis] if hist[0] > time_limit
-                ]
-            if len(self._position_error_hist[axis]) > 1:
-                self._position_error_hist[axis] = [
-                    hist for hist in self._position_error_hist[axis] if hist[0] > time_limit
-                ]
-            if len(self._tracking_error_hist[axis]) > 1:
-                self._tracking_error_hist[axis] = [
-                    hist for hist in self._tracking_error_hist[axis] if hist[0] > time_limit
-                ]
-            if len(self._velocity_hist[axis]) > 1:
-                self._velocity_hist[axis] = [
-                    hist for hist in self._velocity_hist[axis] if hist[0] > time_limit
-                ]
-            if len(self._acceleration_hist[axis]) > 1:
-                self._acceleration_hist[axis] = [
-                    hist for hist in self._acceleration_hist[axis] if hist[0] > time_limit
-                ]
-            if len(self._current_hist[axis]) > 1:
-                self._current_hist[axis] = [
-                    hist for hist in self._current_hist[axis] if hist[0] > time_limit
-                ]
+            self.telemetry.append(('encoder_position', axis),
+                                  report_time[axis], self._position[axis])
+            self.telemetry.append(('position_error', axis),
+                                  report_time[axis], self._position_error[axis])
+            self.telemetry.append(('tracking_error', axis),
+                                  report_time[axis], self._tracking_error[axis])
+            self.telemetry.append(('velocity', axis),
+                                  report_time[axis], self._velocity[axis])
+            self.telemetry.append(('acceleration', axis),
+                                  report_time[axis], self._acceleration[axis])
+            self.telemetry.append(('motor_current', axis),
+                                  report_time[axis], self._current[axis])
 
         if disable_reporting_after:
             self._http_put('action', {'Action': 'reporting', 'Parameters': 'off'})
 
+    def _get_history(self, key):
+        """Get the recent history of the given report value, within the history limit.
+
+        As before, the last value is always kept even if it is older than the limit.
+        """
+        if not self.report_extra or not self.report_thread_running:
+            raise ValueError('Mount report thread not running')
+        time_limit = time.time() - self.report_history_limit
+        return {axis: self.telemetry.channel((key, axis)).to_list(time_limit)
+                for axis in ('ra', 'dec')}
+
     def _report_thread(self):
         if self.report_thread_running:
             self.log.debug('status thread tried to start when already running')
@@ -513,9 +491,7 @@ class DDM500:
     @property
     def encoder_position_history(self):
         """Return the history of encoder positions in both axes."""
-        if not self.report_extra or not self.report_thread_running:
-            raise ValueError('Mount report thread not running')
-        return self._position_hist
+        return self._get_history('encoder_position')
 
     @property
     def position_error(self):
@@ -527,9 +503,7 @@ class DDM500:
     @property
     def position_error_history(self):
         """Return the history of encoder position errors in both axes."""
-        if not self.report_extra or not self.report_thread_running:
-            raise ValueError('Mount report thread not running')
-        return self._position_error_hist
+        return self._get_history('position_error')
 
     @property
     def tracking_error(self):
@@ -541,9 +515,7 @@ class DDM500:
     @property
     def tracking_error_history(self):
         """Return the history of tracking errors in both axes."""
-        if not self.report_extra or not self.report_thread_running:
-            raise ValueError('Mount report thread not running')
-        return self._tracking_error_hist
+        return self._get_history('tracking_error')
 
     @property
     def velocity(self):
@@ -555,9 +527,7 @@ class DDM500:
     @property
     def velocity_history(self):
         """Return the history of motor velocities in both axes."""
-        if not self.report_extra or not self.report_thread_running:
-            raise ValueError('Mount report thread not running')
-        return self._velocity_hist
+        return self._get_history('velocity')
 
     @property
     def acceleration(self):
@@ -569,9 +539,7 @@ class DDM500:
     @property
     def acceleration_history(self):
         """Return the history of motor accelerations in both axes."""
-        if not self.report_extra or not self.report_thread_running:
-            raise ValueError('Mount report thread not running')
-        return self._acceleration_hist
+        return self._get_history('acceleration')
 
     @property
     def motor_current(self):
@@ -583,9 +551,7 @@ class DDM500:
     @property
     def motor_current_history(self):
         """Return the history of motor currents in both axes."""
-        if not self.report_extra or not self.report_thread_running:
-            raise ValueError('Mount report thread not running')
-        return self._current_hist
+        return self._get_history('motor_current')
 
     def within_ra_limits(self, ra_min=None, ra_max=None):
         """Return true if the mount is within the given RA limits."""
@@ -11,12 +11,37 @@ from ...astronomy import apparent_to_j2000, j2000_to_apparent
 
 
 class SiTech(object):
-    """SiTech servo controller class using TCP/IP commands."""
-
-    def __init__(self, address, port, log=None, log_debug=False):
+    """SiTech servo controller class using TCP/IP commands.
+
+    The mount status is read in a background thread every `status_period` seconds and stored
+    as a single snapshot, which all of the status properties are read from.
+    Commands are sent together with status requests, so the snapshot is updated at the same time.
+
+    Parameters
+    ----------
+    address : str
+        Mount server IP
+    port : int
+        Mount server port
+
+    status_period : float, optional
+        how often to read the mount status, in seconds
+        default = 0.5
+    log : logger, optional
+        logger to log to
+        default = None
+    log_debug : bool, optional
+        log debug strings?
+        default = False
+
+    """
+
+    def __init__(self, address, port, status_period=0.5, log=None, log_debug=False):
         self.address = address
         self.port = port
         self.buffer_size = 1024
+        self._read_buffer = b''
+        self._resync = False
         self.commands = {'GET_STATUS': 'ReadScopeStatus\n',
                          'GET_DESTINATION': 'ReadScopeDestination\n',
                          'SLEW_RADEC': 'GoTo {:.5f} {:.5f}\n',
@@ -37,7 +62,13 @@ class SiTech(object):
                          'JNOW_TO_J2K': 'UnCookCoordinates {:.5f} {:.5f}\n',
                          'CLOSE': 'CloseMe\n',
                          }
+
+        self.status_period = status_period
+        # If the status thread falls behind by this much then read the status directly
+        self.status_max_age = max(2 * status_period, 1)
+        self._status = {}
         self._status_update_time = 0
+        self._status_error = False
 
         self.log = log
         self.log_debug = log_debug
@@ -47,137 +78,214 @@ class SiTech(object):
         self.socket.settimeout(5)
         self.socket.connect((self.address, self.port))
         self.thread_lock = threading.Lock()
+
         # Update status when starting
-        self._update_status()
+        self._fetch_status()
+
+        # Start status thread
+        self.status_thread_running = True
+        t = threading.Thread(target=self._status_thread)
+        t.daemon = True
+        t.start()
 
     def __del__(self):
+        self.disconnect()
+
+    def disconnect(self):
+        """Stop the status thread and close the connection."""
+        self.status_thread_running = False
         try:
-            self.socket.send(self.commands['CLOSE'].encode())  # no reply
+            with self.thread_lock:
+                self.socket.sendall(self.commands['CLOSE'].encode())  # no reply
             self.socket.shutdown(socket.SHUT_RDWR)
             self.socket.close()
-        except OSError:
+        except (AttributeError, OSError):
             pass
 
-    def _tcp_command(self, command_str):
-        """Send a command string to the device, then fetch the reply and return it as a string."""
+    def _read_line(self):
+        """Read from the socket until a complete reply line has been received."""
+        while True:
+            end = self._read_buffer.find(b'\n')
+            if end >= 0:
+                line = self._read_buffer[:end]
+                self._read_buffer = self._read_buffer[end + 1:]
+                return line.decode().rstrip('\r')
+            data = self.socket.recv(self.buffer_size)
+            if not data:
+                raise ConnectionError('Connection closed by SiTech')
+            self._read_buffer += data
+
+    def _flush_socket(self):
+        """Discard any unread data, e.g. late replies to commands that timed out."""
+        self._read_buffer = b''
+        self.socket.settimeout(0)
         try:
-            if self.log and self.log_debug:
+            while self.socket.recv(self.buffer_size):
+                pass
+        except (BlockingIOError, socket.timeout):
+            pass
+        finally:
+            self.socket.settimeout(5)
+        self._resync = False
+
+    def _tcp_commands(self, command_strs):
+        """Send command strings to the device back-to-back, then fetch all the replies."""
+        if self.log and self.log_debug:
+            for command_str in command_strs:
                 self.log.debug('SEND:"{}"'.format(command_str[:-1]))
-            with self.thread_lock:
-                self.socket.send(command_str.encode())
-                reply = self.socket.recv(self.buffer_size)
-            if self.log and self.log_debug:
-                self.log.debug('RECV:"{}"'.format(reply.decode()[:-1]))
-            return reply.decode()
-        except Exception as error:
-            return 'SiTech socket error: {}'.format(error)
+        with self.thread_lock:
+            if self._resync:
+                self._flush_socket()
+            try:
+                self.socket.sendall(''.join(command_strs).encode())
+                replies = [self._read_line() for _ in command_strs]
+            except Exception:
+                # Any replies still to come would be mistaken for later ones
+                self._resync = True
+                raise
+        if self.log and self.log_debug:
+            for reply in replies:
+                self.log.debug('RECV:"{}"'.format(reply))
+        return replies
+
+    def _tcp_command(self, command_str):
+        """Send a command string to the device, then fetch the reply and return it as a string."""
+        return self._tcp_commands([command_str])[0]
 
     def _parse_reply_string(self, reply_string):
         """Parse the return string from a SiTech command.
 
-        The status  values are saved on on the SiTech object, and any attached
-        message is returned.
-
-        Returns None if there is no message,
-        e.g. from just reading the status rather than sending a command.
+        Returns the status flags, the ten numeric values and any attached message
+        (or None if there is no message, e.g. from just reading the status).
         """
-        # store update time
-        self._status_update_time = time.time()
-
-        # save reply string
-        self._reply_string = reply_string
-
-        # split the parameters from the reply string
         reply = reply_string.split(';')
-
-        # a quick check
         if not len(reply) == 12:
-            raise ValueError('Invalid SiTech return string: {}'.format(reply))
+            raise ValueError('Invalid SiTech return string: {}'.format(reply_string))
+
+        flags = int(reply[0])
+        values = [float(value) for value in reply[1:11]]
+        message = reply[11][1:]  # strip leading '_'
+        if len(message) == 0:
+            message = None
+        return flags, values, message
 
-        # the message should be the last entry
-        message = reply[-1][1:-1]  # strip leading '_' and trailing '\n'
+    def _store_status(self, status_string, destination_string):
+        """Parse the replies to the status and destination requests and store the status."""
+        flags, values, _ = self._parse_reply_string(status_string)
+        _, dest_values, _ = self._parse_reply_string(destination_string)
 
+        status = {}
         # parse boolean flags
-        bools = int(reply[0])
-        self._initialized = (bools & 1) > 0
-        self._tracking = (bools & 2) > 0
-        self._slewing = (bools & 4) > 0
-        self._parking = (bools & 8) > 0
-        self._parked = (bools & 16) > 0
-        self._direction = 'east' if (bools & 32) > 0 else 'west'
-        self._blinky = (bools & 64) > 0
-        self._connection_error = (bools & 128) > 0
-        self._limit_switches = {'primary_plus': (bools & 256) > 0,
-                                'primary_minus': (bools & 512) > 0,
-                                'secondary_plus': (bools & 1024) > 0,
-                                'secondary_minus': (bools & 2048) > 0,
-                                }
-        self._homing_switches = {'primary': (bools & 4096) > 0,
-                                 'secondary': (bools & 8192) > 0,
-                                 }
-        self._rotator_pos = (bools & 16384) > 0
-        self._tracking_nonsidereal = (bools & 32768) > 0
-        self._tracking_satellite = (bools & 32768) > 0
+        status['initialized'] = (flags & 1) > 0
+        status['tracking'] = (flags & 2) > 0
+        status['slewing'] = (flags & 4) > 0
+        status['parking'] = (flags & 8) > 0
+        status['parked'] = (flags & 16) > 0
+        status['direction'] = 'east' if (flags & 32) > 0 else 'west'
+        status['blinky'] = (flags & 64) > 0
+        status['connection_error'] = (flags & 128) > 0
+        status['limit_switches'] = {'primary_plus': (flags & 256) > 0,
+                                    'primary_minus': (flags & 512) > 0,
+                                    'secondary_plus': (flags & 1024) > 0,
+                                    'secondary_minus': (flags & 2048) > 0,
+                                    }
+        status['homing_switches'] = {'primary': (flags & 4096) > 0,
+                                     'secondary': (flags & 8192) > 0,
+                                     }
+        status['rotator_pos'] = (flags & 16384) > 0
+        status['tracking_nonsidereal'] = (flags & 32768) > 0
+        status['tracking_satellite'] = (flags & 32768) > 0
 
         # parse values
-        self._ra_jnow = float(reply[1])
-        self._dec_jnow = float(reply[2])
-        self._alt = float(reply[3])
-        self._az = float(reply[4])
-        if message == 'ReadScopeDestination':
-            self._dest_ra_jnow = float(reply[5])
-            self._dest_dec_jnow = float(reply[6])
-            self._dest_alt = float(reply[7])
-            self._dest_az = float(reply[8])
-        else:
-            self._secondary_angle = float(reply[5])
-            self._primary_angle = float(reply[6])
-            self._sidereal_time = float(reply[7])
-            self._jd = float(reply[8])
-        self._hours = float(reply[9])
-        self._airmass = float(reply[10])
+        status['ra_jnow'], status['dec_jnow'], status['alt'], status['az'] = values[:4]
+        status['secondary_angle'] = values[4]
+        status['primary_angle'] = values[5]
+        status['sidereal_time'] = values[6]
+        status['jd'] = values[7]
+        status['hours'] = values[8]
+        status['airmass'] = values[9]
+        status['dest_ra_jnow'] = dest_values[4]
+        status['dest_dec_jnow'] = dest_values[5]
+        status['dest_alt'] = dest_values[6]
+        status['dest_az'] = dest_values[7]
 
         # need to "uncook" the SiTech coordinates into J2000
-        if self._ra_jnow >= 24:  # fix for RA
-            self._ra_jnow -= 24
-        ra_j2000, dec_j2000 = apparent_to_j2000(self._ra_jnow * 360 / 24, self._dec_jnow, self._jd)
-        self._ra = ra_j2000 * 24 / 360
-        if self._ra >= 24:
-            self._ra -= 24
-        self._dec = dec_j2000
+        if status['ra_jnow'] >= 24:  # fix for RA
+            status['ra_jnow'] -= 24
+        ra_j2000, dec_j2000 = apparent_to_j2000(status['ra_jnow'] * 360 / 24,
+                                                status['dec_jnow'],
+                                                status['jd'])
+        status['ra'] = ra_j2000 * 24 / 360
+        if status['ra'] >= 24:
+            status['ra'] -= 24
+        status['dec'] = dec_j2000
         if self.log and self.log_debug:
             self.log.debug('Uncooked {:.6f}/{:.6f} to {:.6f}/{:.6f}'.format(
-                self._ra_jnow, self._dec_jnow, self._ra, self._dec))
+                status['ra_jnow'], status['dec_jnow'], status['ra'], status['dec']))
 
-        if len(message) == 0:
-            return None
-        else:
-            return message
+        # Store the new status all at once, so it's always consistent
+        status['update_time'] = time.time()
+        self._status = status
+        self._status_update_time = status['update_time']
 
-    def _update_status(self):
+    def _fetch_status(self):
         """Read and store status values."""
-        # Only update if we need to, to save sending multiple commands
-        if (time.time() - self._status_update_time) > 0.5:
-            reply_string = self._tcp_command(self.commands['GET_STATUS'])
-            self._parse_reply_string(reply_string)
-            reply_string = self._tcp_command(self.commands['GET_DESTINATION'])
-            self._parse_reply_string(reply_string)
+        replies = self._tcp_commands([self.commands['GET_STATUS'],
+                                      self.commands['GET_DESTINATION']])
+        self._store_status(*replies)
+
+    def _command(self, command_str):
+        """Send a command along with the status requests, and return any message in the reply."""
+        replies = self._tcp_commands([command_str,
+                                      self.commands['GET_STATUS'],
+                                      self.commands['GET_DESTINATION']])
+        _, _, message = self._parse_reply_string(replies[0])
+        self._store_status(*replies[1:])
+        return message
+
+    def _status_thread(self):
+        """Keep the stored status up to date."""
+        while self.status_thread_running:
+            try:
+                self._fetch_status()
+                if self._status_error and self.log:
+                    self.log.info('Reconnected to SiTech')
+                self._status_error = False
+            except Exception:
+                if not self._status_error and self.log:
+                    self.log.error('Failed to read SiTech status')
+                    self.log.debug('', exc_info=True)
+                self._status_error = True
+            time.sleep(self.status_period)
+
+    def _update_status(self):
+        """Make sure the stored status is recent, reading it directly if the thread is behind."""
+        if (time.time() - self._status_update_time) > self.status_max_age:
+            self._fetch_status()
+
+    def get_status_snapshot(self):
+        """Return a dict of all the status values, all from the same update."""
+        self._update_status()
+        status = self._status
+        return {key: dict(value) if isinstance(value, dict) else value
+                for key, value in status.items()}
 
     @property
     def status(self):
         """Return the current mount status."""
         self._update_status()
-        if self._connection_error and not params.FAKE_MOUNT:
+        status = self._status
+        if status['connection_error'] and not params.FAKE_MOUNT:
             status = 'CONNECTION ERROR'
-        elif self._parked:
+        elif status['parked']:
             status = 'Parked'
-        elif self._blinky:
+        elif status['blinky']:
             status = 'IN BLINKY MODE'
-        elif self._slewing:
+        elif status['slewing']:
             status = 'Slewing'
-        elif self._tracking:
+        elif status['tracking']:
             status = 'Tracking'
-        elif self._parking:
+        elif status['parking']:
             status = 'Parking'
         else:
             status = 'Stopped'
@@ -187,115 +295,115 @@ class SiTech(object):
     def tracking(self):
         """Return if the mount is currently tracking."""
         self._update_status()
-        return self._tracking
+        return self._status['tracking']
 
     @property
     def nonsidereal(self):
         """Return if the mount has a non-sidereal tracking rate set."""
         self._update_status()
-        return self._tracking_nonsidereal
+        return self._status['tracking_nonsidereal']
 
     @property
     def slewing(self):
         """Return if the mount is currently slewing."""
         self._update_status()
-        return self._slewing
+        return self._status['slewing']
 
     @property
     def parking(self):
         """Return if the mount is currently parking."""
         self._update_status()
-        return self._parking
+        return self._status['parking']
 
     @property
     def parked(self):
         """Return if the mount is currently parked."""
         self._update_status()
-        return self._parked
+        return self._status['parked']
 
     @property
     def direction(self):
         """Return the direction the mount is pointing."""
         self._update_status()
-        return self._direction
+        return self._status['direction']
 
     @property
     def blinky(self):
         """Return if the mount is currently in blinky mode."""
         self._update_status()
-        return self._blinky
+        return self._status['blinky']
 
     @property
     def connection_error(self):
         """Return if there is an error connecting to the mount."""
         self._update_status()
-        return self._connection_error
+        return self._status['connection_error']
 
     @property
     def limit_switches(self):
         """Return if the mount limit switches have been triggered."""
         self._update_status()
-        return self._limit_switches
+        return self._status['limit_switches']
 
     @property
     def homing_switches(self):
         """Return if the mount homing switches have been triggered."""
         self._update_status()
-        return self._homing_switches
+        return self._status['homing_switches']
 
     @property
     def ra(self):
         """Return the current RA (J2000)."""
         self._update_status()
-        return self._ra
+        return self._status['ra']
 
     @property
     def dec(self):
         """Return the current Dec (J2000)."""
         self._update_status()
-        return self._dec
+        return self._status['dec']
 
     @property
     def alt(self):
         """Return the current altitude."""
         self._update_status()
-        return self._alt
+        return self._status['alt']
 
     @property
     def az(self):
         """Return the current azimuth."""
         self._update_status()
-        return self._az
+        return self._status['az']
 
     @property
     def secondary_angle(self):
         """Return the current secondary axis angle."""
         self._update_status()
-        return self._secondary_angle
+        return self._status['secondary_angle']
 
     @property
     def primary_angle(self):
         """Return the current primary axis angle."""
         self._update_status()
-        return self._primary_angle
+        return self._status['primary_angle']
 
     @property
     def sidereal_time(self):
         """Return the current sidereal time."""
         self._update_status()
-        return self._sidereal_time
+        return self._status['sidereal_time']
 
     @property
     def jd(self):
         """Return the current Julian date."""
         self._update_status()
-        return self._jd
+        return self._status['jd']
 
     @property
     def hours(self):
         """Return the current hours number."""
         self._update_status()
-        return self._hours
+        return self._status['hours']
 
     def slew_to_radec(self, ra, dec):
         """Slew to given RA and Dec coordinates (in J2000)."""
@@ -311,9 +419,7 @@ class SiTech(object):
                 ra, dec, ra_jnow, dec_jnow))
 
         command = self.commands['SLEW_RADEC'].format(float(ra_jnow), float(dec_jnow))
-        reply_string = self._tcp_command(command)
-        message = self._parse_reply_string(reply_string)
-        return message
+        return self._command(command)
 
     def slew_to_altaz(self, alt, az):
         """Slew mount to given Alt/Az."""
@@ -321,9 +427,7 @@ class SiTech(object):
 
         # NB SiTech takes Az first, then Alt
         command = self.commands['SLEW_ALTAZ'].format(float(az), float(alt))
-        reply_string = self._tcp_command(command)
-        message = self._parse_reply_string(reply_string)
-        return message
+        return self._command(command)
 
     def sync_radec(self, ra, dec):
         """Set current pointing to given RA and Dec coordinates (in J2000)."""
@@ -337,45 +441,33 @@ class SiTech(object):
                 ra, dec, ra_jnow, dec_jnow))
 
         command = self.commands['SYNC_RADEC'].format(float(ra_jnow), float(dec_jnow))
-        reply_string = self._tcp_command(command)
-        message = self._parse_reply_string(reply_string)
-        return message
+        return self._command(command)
 
     def sync_altaz(self, alt, az):
         """Set current pointing to given Alt/Az."""
         # NB SiTech takes Az first, then Alt
         command = self.commands['SYNC_ALTAZ'].format(float(az), float(alt))
-        reply_string = self._tcp_command(command)
-        message = self._parse_reply_string(reply_string)
-        return message
+        return self._command(command)
 
     def track(self):
         """Start tracking at the siderial rate."""
         command = self.commands['SET_TRACKMODE'].format(1, 0, 0, 0)
-        reply_string = self._tcp_command(command)
-        message = self._parse_reply_string(reply_string)
-        return message
+        return self._command(command)
 
     def park(self):
         """Move mount to park position."""
         command = self.commands['PARK']
-        reply_string = self._tcp_command(command)
-        message = self._parse_reply_string(reply_string)
-        return message
+        return self._command(command)
 
     def unpark(self):
         """Unpark the mount so it can accept slew commands."""
         command = self.commands['UNPARK']
-        reply_string = self._tcp_command(command)
-        message = self._parse_reply_string(reply_string)
-        return message
+        return self._command(command)
 
     def halt(self):
         """Abort slew (if slewing) and stop tracking (if tracking)."""
         command = self.commands['HALT']
-        reply_string = self._tcp_command(command)
-        message = self._parse_reply_string(reply_string)
-        return message
+        return self._command(command)
 
     def set_trackrate(self, ra_rate, dec_rate):
         """Set tracking rate in RA and Dec in arcseconds per second.
@@ -386,9 +478,7 @@ class SiTech(object):
             command = self.commands['SET_TRACKMODE'].format(1, 0, 0, 0)
         else:
             command = self.commands['SET_TRACKMODE'].format(1, 1, float(ra_rate), float(dec_rate))
-        reply_string = self._tcp_command(command)
-        message = self._parse_reply_string(reply_string)
-        return message
+        return self._command(command)
 
     def set_blinky_mode(self, activate):
         """Activate or deactivate "blinky" (manual) mode,cutting power to the motors."""
@@ -396,15 +486,11 @@ class SiTech(object):
             command = self.commands['BLINKY_ON']
         else:
             command = self.commands['BLINKY_OFF']
-        reply_string = self._tcp_command(command)
-        message = self._parse_reply_string(reply_string)
-        return message
+        return self._command(command)
 
     def offset(self, direction, distance):
         """Set offset in the given direction by the given distance (in arcsec)."""
         if direction.upper() not in ['N', 'E', 'S', 'W']:
             raise ValueError('Invalid direction "{}" (should be [N,E,S,W])'.format(direction))
         command = self.commands['OFFSET'].format(direction.upper(), distance)
-        reply_string = self._tcp_command(command)
-        message = self._parse_reply_string(reply_string)
-        return message
+        return self._command(command)
@@ -5,6 +5,8 @@ import time
 
 import serial  # noqa: I900
 
+from .serialport import SerialBroker
+
 
 class H400:
     """ASA H400 gateway controller class, for focusers and mirror covers.
@@ -75,10 +77,7 @@ class H400:
         self.port = port
         self.serial_baudrate = 38400
         self.serial_timeout = 5
-        self.serial = serial.Serial(self.port,
-                                    baudrate=self.serial_baudrate,
-                                    timeout=self.serial_timeout)
-        self._serial_lock = False
+        self.serial = SerialBroker.get(self.port, self.serial_baudrate, self.serial_timeout)
 
         # Set serial number
         # (ASAs don't actually have a way to get the serial number from the hub,
@@ -103,7 +102,6 @@ class H400:
     def __del__(self):
         try:
             self.debug_thread_running = False
-            self.serial.close()
         except AttributeError:
             pass
 
@@ -115,8 +113,8 @@ class H400:
         except serial.serialutil.SerialException:
             return None
 
-    def _serial_command(self, device, command, value=0):
-        """Send command to the device, then fetch the reply and return it."""
+    def _format_command(self, device, command, value=0):
+        """Get the command string to send to the gateway."""
         if command == 'status':
             device_address = self._ADDRESS_CODE['gateway']
             command_code = self._STATUS_COMMAND_CODE[device]
@@ -128,22 +126,10 @@ class H400:
                 command_code = self._COVER_COMMAND_CODE[command]
             else:
                 raise ValueError('Unknown device: {}'.format(device))
-        command_str = '#{:d} {:d} {:d}$'.format(command_code, device_address, value)
-
-        while self._serial_lock:
-            time.sleep(0.1)
-        self._serial_lock = True
-        try:
-            self.serial.flushInput()
-            self.serial.flushOutput()
-            self.serial.write(command_str.encode('ascii'))
-            time.sleep(0.1)
-            out_bytes = self.serial.read(self.serial.in_waiting)
-        except Exception:
-            raise ConnectionError('No reply from serial connection')
-        finally:
-            self._serial_lock = False
+        return '#{:d} {:d} {:d}$'.format(command_code, device_address, value)
 
+    def _parse_reply(self, out_bytes):
+        """Parse a reply string from the gateway."""
         reply = out_bytes.decode('ascii').strip()
         if not reply.startswith('#') or not reply.endswith('$'):
             raise ValueError('Invalid ASA reply string: "{}"'.format(reply))
@@ -154,15 +140,32 @@ class H400:
         else:
             return reply_list
 
+    def _serial_commands(self, commands):
+        """Send commands to the gateway in a single transaction, and return the replies.
+
+        Commands should be given as a list of (device, command, value).
+        """
+        commands = [(self._format_command(*command).encode('ascii'), b'$', 1)
+                    for command in commands]
+        return [self._parse_reply(out_bytes) for out_bytes in self.serial.commands(commands)]
+
+    def _serial_command(self, device, command, value=0):
+        """Send command to the device, then fetch the reply and return it."""
+        return self._serial_commands([(device, command, value)])[0]
+
     def _get_info(self):
         """Get the focuser status information."""
         # Limit how often we update
         if self._stored_info is None or time.time() - self._stored_info['ts'] > self._info_delay:
             info_dict = {}
 
-            # Get focuser status
+            # Get focuser and cover status together
+            foc_reply, cov_reply = self._serial_commands([('focuser', 'status', 0),
+                                                          ('cover', 'status', 0)])
+
+            # Parse focuser status
             foc_info = {}
-            reply = self._serial_command('focuser', 'status')
+            reply = foc_reply
             # Position is in "LSB" steps (1 LSB=0.156μm), limit is in 0.01mm (10μm) units
             # To be consistent we convert both to μm, and treat them as "steps"
             foc_info['position'] = int(int(reply[1]) * 0.156)
@@ -172,13 +175,13 @@ class H400:
             foc_info['motor_status'] = self._FOCUSER_MOTOR_STATUS_CODE[int(reply[5])]
             info_dict['focuser'] = foc_info
 
-            # Get cover status
+            # Parse cover status
             # NB: The open position is ~2700, the closed position is ~0
             # Unfortunately there's no way to tell if the cover is moving or not
             # The 'part_open' status (0) is true if it's moving or if it's stopped
             # However it shouldn't matter, since new open/close commands can overwrite old ones
             cov_info = {}
-            reply = self._serial_command('cover', 'status')
+            reply = cov_reply
             cov_info['position'] = int(reply[1])  # in 10ths of a degree, I think
             cov_info['status'] = self._COVER_STATUS_CODE[int(reply[4])]
             info_dict['cover'] = cov_info
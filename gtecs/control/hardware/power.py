@@ -1,16 +1,18 @@
 """Classes to control power switches and UPSs."""
 
 import os
-import shutil
 import socket
-import subprocess
+import struct
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait as futures_wait
 
 import Pyro4
 
 from six import byte2int, indexbytes, int2byte
 
+from .snmp import SNMPClient
+
 
 class FakePDU:
     """Fake PDU power class."""
@@ -45,6 +47,10 @@ class FakePDU:
         self._read_temp()
         return ''.join(self._outlet_status)
 
+    def get_info(self):
+        """Return the outlet statuses."""
+        return {'outlet_statuses': self.status()}
+
     def on(self, outlet):
         """Turn on the given outlet."""
         if outlet == 0:  # all
@@ -126,6 +132,15 @@ class FakeUPS:
         self._read_temp()
         return ''.join(self._outlet_status)
 
+    def get_info(self):
+        """Return the UPS status, power remaining, load and outlet statuses."""
+        return {'status': self.status(),
+                'percent': self.percent_remaining(),
+                'time': self.time_remaining(),
+                'load': self.load(),
+                'outlet_statuses': self.outlet_status(),
+                }
+
     def on(self, outlet):
         """Turn on the given outlet."""
         if outlet == 0:  # all
@@ -159,6 +174,7 @@ class APCPDU:
     def __init__(self, address, outlets=8):
         self.unit_type = 'PDU'
         self.address = address
+        self.snmp = SNMPClient(address)
         self.commands = {'ON': '1', 'OFF': '2', 'REBOOT': '3'}
         self.outlets = list(range(1, outlets + 1))
         self.on_value = 1
@@ -176,45 +192,24 @@ class APCPDU:
         return oid_arr
 
     def _snmpget(self, oid_arr):
-        """Get a value using snmpget."""
-        snmpget = shutil.which('snmpget')
-        if snmpget is None:
-            raise OSError('SNMP tools not installed')
-        address = self.address
-        command = [snmpget, '-v', '1', '-c', 'public', address] + oid_arr
-        try:
-            output = subprocess.check_output(command).decode('ascii').split('\n')
-        except subprocess.CalledProcessError:
-            # TODO https://stackoverflow.com/questions/29824461
-            raise
-
-        status = ''
-        for i in range(len(output) - 1):
-            status += output[i][-1]
-        return status
+        """Get the values of the given OIDs, in a single SNMP request."""
+        return self.snmp.get(oid_arr)
 
     def _snmpset(self, oid_arr, value):
-        """Set a value using snmpset."""
-        snmpset = shutil.which('snmpset')
-        if snmpset is None:
-            raise OSError('SNMP tools not installed')
-        address = self.address
-        command_oid_arr = []
-        for oid in oid_arr:
-            command_oid_arr += [oid, 'i', value]
-        command = [snmpset, '-v', '1', '-c', 'private', address] + command_oid_arr
-        output = subprocess.check_output(command).decode('ascii').split('\n')
-        status = ''
-        for i in range(len(output) - 1):
-            status += output[i][-1]
-        return status
+        """Set the given OIDs to an integer value, and return the new values as a string."""
+        values = self.snmp.set([(oid, int(value)) for oid in oid_arr])
+        return ''.join(str(value) for value in values)
 
     def status(self):
         """Return the current status of the outlets."""
         outlet = 0  # all
         oid_arr = self._initialise_oid_array(outlet)
         out = self._snmpget(oid_arr)
-        return out
+        return ''.join(str(value) for value in out)
+
+    def get_info(self):
+        """Return the outlet statuses."""
+        return {'outlet_statuses': self.status()}
 
     def on(self, outlet):
         """Turn on the given outlet."""
@@ -241,6 +236,7 @@ class APCUPS:
     def __init__(self, address, outlets=3):
         self.unit_type = 'UPS'
         self.address = address
+        self.snmp = SNMPClient(address)
         self.command_oids = {'STATUS': '4.1.1.0',
                              'PERCENT': '2.3.1.0',
                              'TIME': '2.2.3.0',
@@ -280,69 +276,71 @@ class APCUPS:
         return oid_arr
 
     def _snmpget(self, oid_arr):
-        """Get a value using snmpget."""
-        snmpget = shutil.which('snmpget')
-        if snmpget is None:
-            raise OSError('SNMP tools not installed')
-        address = self.address
-        command = [snmpget, '-v', '1', '-c', 'public', address] + oid_arr
-        output = subprocess.check_output(command).decode('ascii').split('\n')
-        status = ''
-        for i in range(len(output) - 1):
-            status += output[i].split(' ')[-1]
-        return status
+        """Get the values of the given OIDs, in a single SNMP request."""
+        return self.snmp.get(oid_arr)
 
     def _snmpset(self, oid_arr, value):
-        """Set a value using snmpset."""
-        snmpset = shutil.which('snmpset')
-        if snmpset is None:
-            raise OSError('SNMP tools not installed')
-        address = self.address
-        command_oid_arr = []
-        for oid in oid_arr:
-            command_oid_arr += [oid, 'i', value]
-        command = [snmpset, '-v', '1', '-c', 'private', address] + command_oid_arr
-        output = subprocess.check_output(command).decode('ascii').split('\n')
-        status = ''
-        for i in range(len(output) - 1):
-            status += output[i][-1]
-        return status
+        """Set the given OIDs to an integer value, and return the new values as a string."""
+        values = self.snmp.set([(oid, int(value)) for oid in oid_arr])
+        return ''.join(str(value) for value in values)
+
+    def _parse_values(self, key, value):
+        """Convert a raw SNMP value to the right format."""
+        if key == 'STATUS':
+            return self.statuses[str(value)]
+        elif key in ['PERCENT', 'LOAD']:
+            return float(value) / 10.
+        elif key == 'TIME':
+            return value / 100  # TimeTicks are in hundredths of a second
+        return value
 
     def status(self):
         """Return the current status of the UPS."""
         oid_arr = self._initialise_oid_array(self.command_oids['STATUS'])
-        out = self._snmpget(oid_arr)
-        status = self.statuses[out]
-        return status
+        out = self._snmpget(oid_arr)[0]
+        return self._parse_values('STATUS', out)
 
     def percent_remaining(self):
         """Return the current power percentage remaining in the UPS."""
         oid_arr = self._initialise_oid_array(self.command_oids['PERCENT'])
-        out = self._snmpget(oid_arr)
-        percent = float(out) / 10.
-        return percent
+        out = self._snmpget(oid_arr)[0]
+        return self._parse_values('PERCENT', out)
 
     def time_remaining(self):
         """Return the current power time remaining in the UPS."""
         oid_arr = self._initialise_oid_array(self.command_oids['TIME'])
-        out = self._snmpget(oid_arr)
-        hms = out.split(':')
-        seconds = int(hms[0]) * 3600 + int(hms[1]) * 60 + float(hms[2])
-        return seconds
+        out = self._snmpget(oid_arr)[0]
+        return self._parse_values('TIME', out)
 
     def load(self):
         """Return the current load on the UPS."""
         oid_arr = self._initialise_oid_array(self.command_oids['LOAD'])
-        out = self._snmpget(oid_arr)
-        percent = float(out) / 10.
-        return percent
+        out = self._snmpget(oid_arr)[0]
+        return self._parse_values('LOAD', out)
 
     def outlet_status(self):
         """Return the current status of the outlets."""
         outlet = 0  # all
         oid_arr = self._initialise_oid_array(self.command_oids['OUTLET'], outlet)
         out = self._snmpget(oid_arr)
-        return out
+        return ''.join(str(value) for value in out)
+
+    def get_info(self):
+        """Return the UPS status, power remaining, load and outlet statuses.
+
+        This gets all the values in a single request, rather than calling each function.
+        """
+        keys = ['STATUS', 'PERCENT', 'TIME', 'LOAD']
+        oid_arr = [self._initialise_oid_array(self.command_oids[key])[0] for key in keys]
+        oid_arr += self._initialise_oid_array(self.command_oids['OUTLET'], 0)
+        out = self._snmpget(oid_arr)
+        values = {key: self._parse_values(key, value) for key, value in zip(keys, out)}
+        return {'status': values['STATUS'],
+                'percent': values['PERCENT'],
+                'time': values['TIME'],
+                'load': values['LOAD'],
+                'outlet_statuses': ''.join(str(value) for value in out[len(keys):]),
+                }
 
     def on(self, outlet):
         """Turn on the given outlet."""
@@ -364,68 +362,125 @@ class APCUPS:
 
 
 class APCUPS_USB:
-    """APC Uninterruptible Power Supply class, communicating through USB via `apcupsd`."""
+    """APC Uninterruptible Power Supply class, communicating through USB via `apcupsd`.
 
-    def __init__(self, address='localhost', port=3551):
+    The status is fetched from the apcupsd Network Information Server (NIS) over a persistent
+    TCP connection, and kept for `max_age` seconds so the individual functions (`status()`,
+    `load()` etc) can share a single request.
+    """
+
+    def __init__(self, address='localhost', port=3551, max_age=1):
         self.unit_type = 'UPS'
         self.address = address
         self.port = int(port)
+        self.max_age = max_age
         self.buffer_size = 1024
 
-    def _get_status(self):
-        """Get the UPS status through the apcupsd daemon."""
-        # connect
-        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.socket.settimeout(5)
-        self.socket.connect((self.address, self.port))
-
-        status_command = '\x00\x06status'
-        self.socket.send(status_command.encode())
-        raw_out = ""
-        while not raw_out.endswith('  \n\x00\x00'):
-            out = self.socket.recv(self.buffer_size).decode()
-            raw_out += out
-
-        # close
-        self.socket.shutdown(socket.SHUT_RDWR)
-        self.socket.close()
+        self.socket = None
+        self._lock = threading.Lock()
+        self._status = None
+        self._status_time = 0
 
-        return self._parse_status(raw_out)
+    def __del__(self):
+        self.close()
+
+    def _connect(self):
+        """Open the connection to the NIS, if it isn't already open."""
+        if self.socket is None:
+            self.socket = socket.create_connection((self.address, self.port), timeout=5)
+
+    def close(self):
+        """Close the connection to the NIS."""
+        if getattr(self, 'socket', None) is not None:
+            try:
+                self.socket.shutdown(socket.SHUT_RDWR)
+                self.socket.close()
+            except OSError:
+                pass
+            self.socket = None
+
+    def _recv_exactly(self, length):
+        """Read the given number of bytes from the socket."""
+        data = b''
+        while len(data) < length:
+            out = self.socket.recv(length - len(data))
+            if not out:
+                raise ConnectionError('Connection closed by apcupsd')
+            data += out
+        return data
+
+    def _nis_command(self, command):
+        """Send a command to the NIS and return the reply lines.
+
+        Messages in both directions are prefixed by their length as a 2-byte integer,
+        and the end of the reply is marked by an empty message.
+        """
+        self._connect()
+        self.socket.sendall(struct.pack('>H', len(command)) + command.encode())
+        lines = []
+        while True:
+            length = struct.unpack('>H', self._recv_exactly(2))[0]
+            if length == 0:
+                return lines
+            lines.append(self._recv_exactly(length).decode())
 
-    def _parse_status(self, raw_data):
-        data_list = [x[1:].split(':') for x in raw_data.split('\x00') if len(x) > 2]
+    def _get_status(self):
+        """Get the UPS status through the apcupsd daemon."""
+        with self._lock:
+            if self._status is not None and time.time() - self._status_time < self.max_age:
+                return self._status
+            try:
+                lines = self._nis_command('status')
+            except OSError:
+                # The server might have dropped an idle connection, so try once more
+                self.close()
+                try:
+                    lines = self._nis_command('status')
+                except OSError:
+                    self.close()
+                    raise
+            self._status = self._parse_status(lines)
+            self._status_time = time.time()
+            return self._status
+
+    def _parse_status(self, lines):
+        data_list = [line.split(':', 1) for line in lines if ':' in line]
         data_dict = {x[0].strip().lower(): x[1].strip() for x in data_list}
         return data_dict
 
-    def status(self):
-        """Return the current status of the UPS."""
-        data_dict = self._get_status()
+    def _parse_values(self, data_dict):
+        """Get the status, percent, time and load values from the status dict."""
         status = data_dict['status']
         if status == 'ONLINE':
             status = 'Normal'  # same as SNMP
-        return status
-
-    def percent_remaining(self):
-        """Return the current power percentage remaining in the UPS."""
-        data_dict = self._get_status()
         percent = float(data_dict['bcharge'].split()[0])
-        return percent
-
-    def time_remaining(self):
-        """Return the current power time remaining in the UPS."""
-        data_dict = self._get_status()
         time, unit = data_dict['timeleft'].split()
         if unit == 'Seconds':
             seconds = float(time)
         elif unit == 'Minutes':
             seconds = float(time) * 60
-        return seconds
+        load = float(data_dict['loadpct'].split()[0])
+        return {'status': status, 'percent': percent, 'time': seconds, 'load': load}
+
+    def status(self):
+        """Return the current status of the UPS."""
+        return self._parse_values(self._get_status())['status']
+
+    def percent_remaining(self):
+        """Return the current power percentage remaining in the UPS."""
+        return self._parse_values(self._get_status())['percent']
+
+    def time_remaining(self):
+        """Return the current power time remaining in the UPS."""
+        return self._parse_values(self._get_status())['time']
 
     def load(self):
         """Return the current load on the UPS."""
-        data_dict = self._get_status()
-        percent = float(data_dict['loadpct'].split()[0])
-        return percent
+        return self._parse_values(self._get_status())['load']
+
+    def get_info(self):
+        """Return the UPS status, power remaining and load, from a single status request."""
+        return self._parse_values(self._get_status())
 
     def outlet_status(self):
         """Return the current status of the outlets."""
@@ -450,6 +505,7 @@ class APCATS:
     def __init__(self, address):
         self.unit_type = 'ATS'
         self.address = address
+        self.snmp = SNMPClient(address)
         self.command_oids = {'STATUS': '5.1.3.0',
                              'STATUS_A': '5.1.12.0',
                              'STATUS_B': '5.1.13.0',
@@ -469,23 +525,14 @@ class APCATS:
         return oid_arr
 
     def _snmpget(self, oid_arr):
-        """Get a value using snmpget."""
-        snmpget = shutil.which('snmpget')
-        if snmpget is None:
-            raise OSError('SNMP tools not installed')
-        address = self.address
-        command = [snmpget, '-v', '1', '-c', 'public', address] + oid_arr
-        output = subprocess.check_output(command).decode('ascii').split('\n')
-        status = ''
-        for i in range(len(output) - 1):
-            status += output[i].split(' ')[-1]
-        return status
+        """Get the values of the given OIDs, in a single SNMP request."""
+        return self.snmp.get(oid_arr)
 
     def status(self):
         """Return the current status of the ATS."""
         oid_arr = self._initialise_oid_array(self.command_oids['STATUS'])
-        out = self._snmpget(oid_arr)
-        status = self.statuses[out]
+        out = self._snmpget(oid_arr)[0]
+        status = self.statuses[str(out)]
         return status
 
     def source_status(self, source):
@@ -496,17 +543,31 @@ class APCATS:
             oid_arr = self._initialise_oid_array(self.command_oids['STATUS_B'])
         else:
             raise ValueError('Invalid source')
-        out = self._snmpget(oid_arr)
-        status = self.statuses[out]
+        out = self._snmpget(oid_arr)[0]
+        status = self.statuses[str(out)]
         return status
 
     def active_source(self):
         """Return which source is currently active."""
         oid_arr = self._initialise_oid_array(self.command_oids['SOURCE'])
-        out = self._snmpget(oid_arr)
-        source = self.sources[out]
+        out = self._snmpget(oid_arr)[0]
+        source = self.sources[str(out)]
         return source
 
+    def get_info(self):
+        """Return the ATS status, the status of each source and the active source.
+
+        This gets all the values in a single request, rather than calling each function.
+        """
+        keys = ['STATUS', 'STATUS_A', 'STATUS_B', 'SOURCE']
+        oid_arr = [self._initialise_oid_array(self.command_oids[key])[0] for key in keys]
+        out = dict(zip(keys, self._snmpget(oid_arr)))
+        return {'status': self.statuses[str(out['STATUS'])],
+                'status_A': self.statuses[str(out['STATUS_A'])],
+                'status_B': self.statuses[str(out['STATUS_B'])],
+                'source': self.sources[str(out['SOURCE'])],
+                }
+
 
 class EPCPDU:
     """Expert Power Control Power Distribution Unit class, communicating through SNMP."""
@@ -514,6 +575,7 @@ class EPCPDU:
     def __init__(self, address, outlets=8):
         self.unit_type = 'PDU'
         self.address = address
+        self.snmp = SNMPClient(address)
         self.commands = {'ON': '1', 'OFF': '0'}
         self.outlets = list(range(1, outlets + 1))
         self.on_value = 1
@@ -531,40 +593,24 @@ class EPCPDU:
         return oid_arr
 
     def _snmpget(self, oid_arr):
-        """Get a value using snmpget."""
-        snmpget = shutil.which('snmpget')
-        if snmpget is None:
-            raise OSError('SNMP tools not installed')
-        address = self.address
-        command = [snmpget, '-v', '1', '-c', 'public', address] + oid_arr
-        output = subprocess.check_output(command).decode('ascii').split('\n')
-        status = ''
-        for i in range(len(output) - 1):
-            status += output[i][-1]
-        return status
+        """Get the values of the given OIDs, in a single SNMP request."""
+        return self.snmp.get(oid_arr)
 
     def _snmpset(self, oid_arr, value):
-        """Set a value using snmpset."""
-        snmpset = shutil.which('snmpset')
-        if snmpset is None:
-            raise OSError('SNMP tools not installed')
-        address = self.address
-        command_oid_arr = []
-        for oid in oid_arr:
-            command_oid_arr += [oid, 'i', value]
-        command = [snmpset, '-v', '1', '-c', 'private', address] + command_oid_arr
-        output = subprocess.check_output(command).decode('ascii').split('\n')
-        status = ''
-        for i in range(len(output) - 1):
-            status += output[i][-1]
-        return status
+        """Set the given OIDs to an integer value, and return the new values as a string."""
+        values = self.snmp.set([(oid, int(value)) for oid in oid_arr])
+        return ''.join(str(value) for value in values)
 
     def status(self):
         """Return the current status of the outlets."""
         outlet = 0  # all
         oid_arr = self._initialise_oid_array(outlet)
         out = self._snmpget(oid_arr)
-        return out
+        return ''.join(str(value) for value in out)
+
+    def get_info(self):
+        """Return the outlet statuses."""
+        return {'outlet_statuses': self.status()}
 
     def on(self, outlet):
         """Turn on the given outlet."""
@@ -630,6 +676,10 @@ class ETHPDU:
         status_string = ''.join(status_strings)[:len(self.outlets)]
         return status_string
 
+    def get_info(self):
+        """Return the outlet statuses."""
+        return {'outlet_statuses': self.status()}
+
     def on(self, outlet):
         """Turn on the given outlet."""
         if outlet == 0:
@@ -738,3 +788,125 @@ class DomeAlertRelay:
         with self._proxy() as proxy:
             status = proxy.get_relay()
         return status
+
+
+class PowerUnitPoller(object):
+    """Poll a set of power units concurrently, keeping a snapshot of the status of each unit.
+
+    Each unit is queried with a single `get_info()` call in its own thread, so a poll takes as
+    long as the slowest unit rather than the sum of all of them.
+    After an outlet is switched the expected state is reported straight away (see
+    `set_outlets()`), until either the unit agrees or `hold_time` has passed.
+
+    Parameters
+    ----------
+    timeout : float, optional
+        maximum time to wait for all the units to reply, in seconds
+        default = 10
+    hold_time : float, optional
+        maximum time to report the expected state of switched outlets, in seconds
+        default = 10
+
+    """
+
+    def __init__(self, timeout=10, hold_time=10):
+        self.timeout = timeout
+        self.hold_time = hold_time
+
+        self.snapshots = {}
+        self.snapshot_times = {}
+        self._pending = {}
+        self._futures = {}
+        self._executor = None
+        self._max_workers = 0
+        self._lock = threading.Lock()
+
+    def _apply_pending(self, name, info):
+        """Replace outlet statuses in the info dict with any expected values."""
+        if 'outlet_statuses' not in info or not self._pending.get(name):
+            return info
+        statuses = list(info['outlet_statuses'])
+        for index, (value, expiry_time) in list(self._pending[name].items()):
+            if index >= len(statuses) or statuses[index] == value or time.time() > expiry_time:
+                # The unit has caught up (or we've given up waiting for it)
+                del self._pending[name][index]
+            else:
+                statuses[index] = value
+        return dict(info, outlet_statuses=''.join(statuses))
+
+    def poll(self, units):
+        """Get the latest info from all the given units.
+
+        Parameters
+        ----------
+        units : dict
+            unit names and unit objects (any which are None are skipped)
+
+        Returns
+        -------
+        snapshots : dict
+            info dicts from `get_info()` for each unit that replied in time
+        errors : dict
+            the exception raised for each unit that didn't
+
+        """
+        units = {name: unit for name, unit in units.items() if unit is not None}
+        if self._executor is None or self._max_workers < len(units):
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._max_workers = max(len(units), 1)
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers,
+                                                thread_name_prefix='power_poll')
+
+        for name, unit in units.items():
+            if name in self._futures:
+                old_unit, future = self._futures[name]
+                if old_unit is unit and not future.done():
+                    # Still waiting for the reply from the last poll
+                    continue
+            self._futures[name] = (unit, self._executor.submit(unit.get_info))
+        futures_wait([self._futures[name][1] for name in units], self.timeout)
+
+        snapshots = {}
+        errors = {}
+        with self._lock:
+            for name in units:
+                future = self._futures[name][1]
+                if not future.done():
+                    errors[name] = TimeoutError('No reply after {}s'.format(self.timeout))
+                    continue
+                del self._futures[name]
+                try:
+                    info = future.result()
+                except Exception as err:
+                    errors[name] = err
+                    continue
+                self.snapshots[name] = self._apply_pending(name, info)
+                self.snapshot_times[name] = time.time()
+                snapshots[name] = self.snapshots[name]
+        return snapshots, errors
+
+    def set_outlets(self, name, unit, outlet, on):
+        """Record the expected state of outlets that have just been switched.
+
+        Parameters
+        ----------
+        name : str
+            the unit name
+        unit : object
+            the unit object (used to find its outlets and on/off values)
+        outlet : int
+            the outlet number, or 0 for all outlets
+        on : bool
+            True if the outlet was turned on (or rebooted), False if it was turned off
+
+        """
+        value = str(unit.on_value if on else unit.off_value)
+        outlets = unit.outlets if outlet == 0 else [outlet]
+        expiry_time = time.time() + self.hold_time
+        with self._lock:
+            pending = self._pending.setdefault(name, {})
+            for outlet in outlets:
+                pending[outlet - 1] = (value, expiry_time)
+            if name in self.snapshots:
+                self.snapshots[name] = self._apply_pending(name, self.snapshots[name])
@@ -1,10 +1,37 @@
 """Classes to control RASAs."""
 
-import os
 import time
 
 import serial  # noqa: I900
 
+from .serialport import SerialBroker
+
+
+# Commands with multi-line replies, which end with 'END'
+_INFO_COMMANDS = ['GETSTATUS', 'GETCONFIG', 'GETHUBINFO']
+
+
+def _format_command(dev_number, command_str):
+    """Format a command, and return it with the end marker and count to read the reply."""
+    command = '<F{}{}>'.format(dev_number, command_str).encode('ascii')
+    if command_str in _INFO_COMMANDS:
+        return command, b'END\n', 1
+    else:
+        # A '!' line, then the reply line
+        return command, b'\n', 2
+
+
+def _parse_reply(out_bytes):
+    """Parse a reply, removing the initial '!' line."""
+    if len(out_bytes) == 0:
+        raise ConnectionError('No reply from serial connection')
+    reply = out_bytes.decode('ascii').strip()
+    reply_list = reply.split('\n')[1:]
+    if len(reply_list) == 1:
+        return reply_list[0]
+    else:
+        return reply_list
+
 
 class FocusLynx(object):
     """FocusLynx focuser controller class.
@@ -23,34 +50,12 @@ class FocusLynx(object):
         self.port = port
         self.serial_baudrate = 115200
         self.serial_timeout = 5
-        self.serial = serial.Serial(self.port,
-                                    baudrate=self.serial_baudrate,
-                                    timeout=self.serial_timeout)
-        self.__lockfile = os.path.join('/tmp', os.path.split(self.port)[-1] + '.lock')
-        self._serial_lock = False
+        # Both focusers on a hub share the port, so use the same broker
+        self.serial = SerialBroker.get(self.port, self.serial_baudrate, self.serial_timeout)
 
         # get initial info, fill properties like serial number
         self._get_info()
 
-    def __del__(self):
-        try:
-            self.serial.close()
-        except AttributeError:
-            pass
-
-    @property
-    def _serial_lock(self):
-        return os.path.exists(self.__lockfile)
-
-    @_serial_lock.setter
-    def _serial_lock(self, value):
-        if value:
-            with open(self.__lockfile, 'w') as f:
-                f.write(str(os.getpid()))
-        else:
-            if os.path.exists(self.__lockfile):
-                os.remove(self.__lockfile)
-
     @classmethod
     def locate_device(cls, port, serial_number):
         """Locate the focuser by name."""
@@ -65,33 +70,14 @@ class FocusLynx(object):
             raise ValueError('Serial {} not recognised (not in {})'.format(
                              serial_number, sorted(channel_dict.keys())))
 
+    def _serial_commands(self, command_strs):
+        """Send commands to the device in a single transaction, and return the replies."""
+        commands = [_format_command(self.number, command_str) for command_str in command_strs]
+        return [_parse_reply(out_bytes) for out_bytes in self.serial.commands(commands)]
+
     def _serial_command(self, command_str):
         """Send command to the device, then fetch the reply and return it."""
-        command_str = '<F{}{}>'.format(self.number, command_str)
-
-        while self._serial_lock:
-            time.sleep(0.1)
-        self._serial_lock = True
-        try:
-            self.serial.flushInput()
-            self.serial.flushOutput()
-            self.serial.write(command_str.encode('ascii'))
-            time.sleep(0.1)
-            out_bytes = self.serial.read(self.serial.in_waiting)
-        except Exception:
-            raise ConnectionError('No reply from serial connection')
-        finally:
-            self._serial_lock = False
-
-        if len(out_bytes) == 0:
-            raise ConnectionError('No reply from serial connection')
-
-        reply = out_bytes.decode('ascii').strip()
-        reply_list = reply.split('\n')[1:]
-        if len(reply_list) == 1:
-            return reply_list[0]
-        else:
-            return reply_list
+        return self._serial_commands([command_str])[0]
 
     def _get_info(self):
         """Get the focuser status infomation."""
@@ -99,8 +85,7 @@ class FocusLynx(object):
         if self._stored_info is None or time.time() - self._stored_info['ts'] > self._info_delay:
             info_dict = {}
             # Use both info commands
-            for command in ['GETSTATUS', 'GETCONFIG']:
-                reply = self._serial_command(command)
+            for reply in self._serial_commands(['GETSTATUS', 'GETCONFIG']):
                 for s in reply[1:-1]:
                     key, value = s.split('=')
                     info_dict[key.strip()] = value.strip()
@@ -218,20 +203,11 @@ class FocusLynxHub(object):
         self.port = port
         self.serial_baudrate = 115200
         self.serial_timeout = 5
-        self.serial = serial.Serial(self.port,
-                                    baudrate=self.serial_baudrate,
-                                    timeout=self.serial_timeout)
-        self._serial_lock = False
+        self.serial = SerialBroker.get(self.port, self.serial_baudrate, self.serial_timeout)
 
         # get initial info, fill properties like serial number
         self._get_info()
 
-    def __del__(self):
-        try:
-            self.serial.close()
-        except AttributeError:
-            pass
-
     @classmethod
     def locate_device(cls, port):
         """Locate the focuser hub by port."""
@@ -240,36 +216,21 @@ class FocusLynxHub(object):
         except serial.serialutil.SerialException:
             return None
 
-    def _serial_command(self, dev_number, command_str):
-        """Send command to the device, then fetch the reply and return it."""
-        if dev_number not in self.dev_numbers and dev_number != 'H':
-            raise ValueError('Invalid device number "{}"'.format(dev_number))
+    def _serial_commands(self, commands):
+        """Send commands to the devices in a single transaction, and return the replies.
 
-        command_str = '<F{}{}>'.format(dev_number, command_str)
+        Commands should be given as a list of (dev_number, command_str).
+        """
+        for dev_number, _ in commands:
+            if dev_number not in self.dev_numbers and dev_number != 'H':
+                raise ValueError('Invalid device number "{}"'.format(dev_number))
+        commands = [_format_command(dev_number, command_str)
+                    for dev_number, command_str in commands]
+        return [_parse_reply(out_bytes) for out_bytes in self.serial.commands(commands)]
 
-        while self._serial_lock:
-            time.sleep(0.1)
-        self._serial_lock = True
-        try:
-            self.serial.flushInput()
-            self.serial.flushOutput()
-            self.serial.write(command_str.encode('ascii'))
-            time.sleep(0.1)
-            out_bytes = self.serial.read(self.serial.in_waiting)
-        except Exception:
-            raise ConnectionError('No reply from serial connection')
-        finally:
-            self._serial_lock = False
-
-        if len(out_bytes) == 0:
-            raise ConnectionError('No reply from serial connection')
-
-        reply = out_bytes.decode('ascii').strip()
-        reply_list = reply.split('\n')[1:]
-        if len(reply_list) == 1:
-            return reply_list[0]
-        else:
-            return reply_list
+    def _serial_command(self, dev_number, command_str):
+        """Send command to the device, then fetch the reply and return it."""
+        return self._serial_commands([(dev_number, command_str)])[0]
 
     def _get_info(self):
         """Get the focuser status infomation."""
@@ -278,11 +239,15 @@ class FocusLynxHub(object):
             info_dict = {}
             max_extent_dict = {}
             serial_number_dict = {}
+            # Get both info commands for both focusers in one go
+            commands = [(dev_number, command)
+                        for dev_number in self.dev_numbers
+                        for command in ['GETSTATUS', 'GETCONFIG']]
+            replies = self._serial_commands(commands)
             for dev_number in self.dev_numbers:
                 temp_dict = {}
-                # Use both info commands
                 for command in ['GETSTATUS', 'GETCONFIG']:
-                    reply = self._serial_command(dev_number, command)
+                    reply = replies[commands.index((dev_number, command))]
                     for s in reply[1:-1]:
                         key, value = s.split('=')
                         temp_dict[key.strip()] = value.strip()
@@ -0,0 +1,125 @@
+"""Shared access to serial ports used by more than one device."""
+
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+import serial  # noqa: I900
+
+
+class SerialBroker(object):
+    """A serial port shared between all the device objects using it in this process.
+
+    Commands are sent one transaction at a time under an in-process lock, and replies are read
+    until the protocol's end marker rather than waiting a fixed time.
+    The port is also locked with `flock` for the duration of each transaction, so other
+    processes using a broker for the same port will wait their turn.
+
+    Use `SerialBroker.get()` to get the broker for a port, rather than creating one directly.
+
+    Parameters
+    ----------
+    port : str
+        Device location (e.g. '/dev/ttyUSB0')
+    baudrate : int
+        serial baud rate
+    timeout : float, optional
+        time to wait for a complete reply, in seconds
+        default = 5
+
+    """
+
+    _brokers = {}
+    _brokers_lock = threading.Lock()
+
+    def __init__(self, port, baudrate, timeout=5):
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.serial = serial.Serial(self.port, baudrate=self.baudrate, timeout=self.timeout)
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'SerialBroker(port={}, baudrate={})'.format(self.port, self.baudrate)
+
+    @classmethod
+    def get(cls, port, baudrate, timeout=5):
+        """Get the broker for the given port, opening it if it isn't already open."""
+        with cls._brokers_lock:
+            broker = cls._brokers.get(port)
+            if broker is None or not broker.serial.is_open:
+                broker = cls(port, baudrate, timeout)
+                cls._brokers[port] = broker
+            elif broker.baudrate != baudrate:
+                raise ValueError('Port {} is already open with baudrate {}'.format(
+                                 port, broker.baudrate))
+            return broker
+
+    def _forget(self):
+        """Remove this broker from the cache, so the next `SerialBroker.get()` opens a new one."""
+        with self._brokers_lock:
+            if self._brokers.get(self.port) is self:
+                del self._brokers[self.port]
+
+    def close(self):
+        """Close the port."""
+        self._forget()
+        with self._lock:
+            self.serial.close()
+
+    def _read_reply(self, terminator, count):
+        """Read from the port until the terminator has been received the given number of times."""
+        reply = b''
+        for _ in range(count):
+            out = self.serial.read_until(terminator)
+            reply += out
+            if not out.endswith(terminator):
+                raise ConnectionError('Incomplete reply from serial connection: {!r}'.format(
+                                      reply))
+        return reply
+
+    def commands(self, commands):
+        """Send a series of commands as a single transaction, and return the replies.
+
+        Parameters
+        ----------
+        commands : list of (bytes, bytes, int)
+            the command to send, the end marker of the reply and how many end markers to expect
+            (e.g. the number of lines for a reply terminated by b'\\n')
+
+        Returns
+        -------
+        replies : list of bytes
+            the raw reply to each command, including the end markers
+
+        """
+        replies = []
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self.serial.fileno(), fcntl.LOCK_EX)
+            try:
+                # Clear anything left over from an earlier (failed) transaction
+                self.serial.reset_input_buffer()
+                for command, terminator, count in commands:
+                    self.serial.write(command)
+                    replies.append(self._read_reply(terminator, count))
+            except serial.SerialException as err:
+                # The port is dead (e.g. the device was unplugged), so close it (which also
+                # releases the flock) and forget this broker, so reconnecting opens a new one
+                self._forget()
+                try:
+                    self.serial.close()
+                except (serial.SerialException, OSError):
+                    pass
+                raise ConnectionError('Serial connection error: {}'.format(err)) from err
+            finally:
+                if fcntl is not None and self.serial.is_open:
+                    fcntl.flock(self.serial.fileno(), fcntl.LOCK_UN)
+        return replies
+
+    def command(self, command, terminator, count=1):
+        """Send a single command and return the reply, see `SerialBroker.commands()`."""
+        return self.commands([(command, terminator, count)])[0]
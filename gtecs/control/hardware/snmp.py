@@ -0,0 +1,408 @@
+"""A minimal SNMP v1/v2c client, used to talk to power units without external tools."""
+
+import itertools
+import random
+import socket
+import threading
+
+
+# BER tags
+INTEGER = 0x02
+OCTET_STRING = 0x04
+NULL = 0x05
+OBJECT_IDENTIFIER = 0x06
+SEQUENCE = 0x30
+IP_ADDRESS = 0x40
+COUNTER32 = 0x41
+GAUGE32 = 0x42
+TIMETICKS = 0x43
+OPAQUE = 0x44
+COUNTER64 = 0x46
+NO_SUCH_OBJECT = 0x80
+NO_SUCH_INSTANCE = 0x81
+END_OF_MIB_VIEW = 0x82
+
+# PDU types
+GET_REQUEST = 0xA0
+GET_NEXT_REQUEST = 0xA1
+GET_RESPONSE = 0xA2
+SET_REQUEST = 0xA3
+
+# Error status codes
+ERROR_STATUSES = {0: 'noError',
+                  1: 'tooBig',
+                  2: 'noSuchName',
+                  3: 'badValue',
+                  4: 'readOnly',
+                  5: 'genErr',
+                  6: 'noAccess',
+                  7: 'wrongType',
+                  8: 'wrongLength',
+                  9: 'wrongEncoding',
+                  10: 'wrongValue',
+                  11: 'noCreation',
+                  12: 'inconsistentValue',
+                  13: 'resourceUnavailable',
+                  14: 'commitFailed',
+                  15: 'undoFailed',
+                  16: 'authorizationError',
+                  17: 'notWritable',
+                  18: 'inconsistentName',
+                  }
+
+
+class Counter32(int):
+    """An SNMP Counter32 value."""
+
+    tag = COUNTER32
+
+
+class Gauge32(int):
+    """An SNMP Gauge32 (or Unsigned32) value."""
+
+    tag = GAUGE32
+
+
+class TimeTicks(int):
+    """An SNMP TimeTicks value, in hundredths of a second."""
+
+    tag = TIMETICKS
+
+    @property
+    def seconds(self):
+        """Return the value in seconds."""
+        return self / 100
+
+
+class Counter64(int):
+    """An SNMP Counter64 value."""
+
+    tag = COUNTER64
+
+
+_INT_TYPES = {INTEGER: int,
+              COUNTER32: Counter32,
+              GAUGE32: Gauge32,
+              TIMETICKS: TimeTicks,
+              COUNTER64: Counter64,
+              }
+
+
+def _encode_length(length):
+    if length < 0x80:
+        return bytes([length])
+    length_bytes = length.to_bytes((length.bit_length() + 7) // 8, 'big')
+    return bytes([0x80 | len(length_bytes)]) + length_bytes
+
+
+def encode_tlv(tag, content):
+    """Encode a BER tag-length-value."""
+    return bytes([tag]) + _encode_length(len(content)) + content
+
+
+def encode_int(value, tag=INTEGER):
+    """Encode an integer (signed, in the minimum number of bytes)."""
+    value = int(value)
+    length = ((value if value >= 0 else ~value).bit_length() + 8) // 8
+    return encode_tlv(tag, value.to_bytes(length, 'big', signed=True))
+
+
+def encode_oid(oid):
+    """Encode an object identifier, given as a dotted string (e.g. '.1.3.6.1.2.1.1.1.0')."""
+    arcs = [int(arc) for arc in oid.strip('.').split('.')]
+    if len(arcs) < 2:
+        raise ValueError('Invalid OID: {}'.format(oid))
+    content = bytearray([arcs[0] * 40 + arcs[1]])
+    for arc in arcs[2:]:
+        arc_bytes = [arc & 0x7F]
+        arc >>= 7
+        while arc:
+            arc_bytes.append(0x80 | (arc & 0x7F))
+            arc >>= 7
+        content.extend(reversed(arc_bytes))
+    return encode_tlv(OBJECT_IDENTIFIER, bytes(content))
+
+
+def encode_value(value):
+    """Encode a Python value as the matching SNMP type."""
+    if value is None:
+        return encode_tlv(NULL, b'')
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, int):
+        return encode_int(value, getattr(value, 'tag', INTEGER))
+    if isinstance(value, str):
+        value = value.encode()
+    if isinstance(value, bytes):
+        return encode_tlv(OCTET_STRING, value)
+    raise TypeError('Cannot encode value {!r}'.format(value))
+
+
+def encode_message(pdu_type, request_id, varbinds, community, version=0,
+                   error_status=0, error_index=0):
+    """Encode a full SNMP message.
+
+    Parameters
+    ----------
+    pdu_type : int
+        the PDU tag (e.g. `GET_REQUEST`)
+    request_id : int
+        request ID, which is returned in the response
+    varbinds : list of (str, value)
+        OIDs and values (use None for requests)
+    community : str
+        community string
+    version : int, optional
+        SNMP version code (0 for v1, 1 for v2c)
+        default = 0
+
+    """
+    varbind_list = b''.join(encode_tlv(SEQUENCE, encode_oid(oid) + encode_value(value))
+                            for oid, value in varbinds)
+    pdu = encode_tlv(pdu_type,
+                     encode_int(request_id) + encode_int(error_status) + encode_int(error_index) +
+                     encode_tlv(SEQUENCE, varbind_list))
+    return encode_tlv(SEQUENCE,
+                      encode_int(version) + encode_value(community) + pdu)
+
+
+def decode_tlv(data, offset=0):
+    """Decode a BER tag-length-value.
+
+    Returns the tag, the content bytes and the offset of the next value.
+    """
+    try:
+        tag = data[offset]
+        length = data[offset + 1]
+        offset += 2
+        if length & 0x80:
+            num_bytes = length & 0x7F
+            if num_bytes == 0 or num_bytes > 4:
+                raise ValueError('Invalid BER length')
+            length = int.from_bytes(data[offset:offset + num_bytes], 'big')
+            offset += num_bytes
+    except IndexError:
+        raise ValueError('Truncated SNMP message') from None
+    end = offset + length
+    if end > len(data):
+        raise ValueError('Truncated SNMP message')
+    return tag, data[offset:end], end
+
+
+def decode_oid(content):
+    """Decode object identifier content bytes to a dotted string."""
+    if len(content) == 0:
+        raise ValueError('Empty OID')
+    first = content[0]
+    arcs = [min(first // 40, 2), first - 40 * min(first // 40, 2)]
+    arc = 0
+    for byte in content[1:]:
+        arc = (arc << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            arcs.append(arc)
+            arc = 0
+    return '.' + '.'.join(str(arc) for arc in arcs)
+
+
+def decode_value(tag, content):
+    """Decode value content bytes to a Python value, based on the tag."""
+    if tag in _INT_TYPES:
+        signed = tag == INTEGER
+        return _INT_TYPES[tag](int.from_bytes(content, 'big', signed=signed))
+    if tag in (OCTET_STRING, OPAQUE):
+        return bytes(content)
+    if tag == OBJECT_IDENTIFIER:
+        return decode_oid(content)
+    if tag == IP_ADDRESS:
+        return '.'.join(str(byte) for byte in content)
+    if tag == NULL:
+        return None
+    if tag == NO_SUCH_OBJECT:
+        raise ValueError('No such object')
+    if tag == NO_SUCH_INSTANCE:
+        raise ValueError('No such instance')
+    if tag == END_OF_MIB_VIEW:
+        raise ValueError('End of MIB view')
+    raise ValueError('Unknown SNMP type: 0x{:02x}'.format(tag))
+
+
+def decode_message(data):
+    """Decode a full SNMP message.
+
+    Returns
+    -------
+    version : int
+        SNMP version code
+    community : bytes
+        community string
+    pdu_type : int
+        the PDU tag
+    request_id : int
+        the request ID
+    error_status : int
+        error status code (0 if no error)
+    error_index : int
+        index of the varbind which caused the error (starting from 1)
+    varbinds : list of (str, tag, bytes)
+        the OIDs, value tags and undecoded value content, see `decode_value()`
+
+    """
+    tag, message, _ = decode_tlv(data)
+    if tag != SEQUENCE:
+        raise ValueError('Invalid SNMP message')
+    tag, version, offset = decode_tlv(message)
+    tag, community, offset = decode_tlv(message, offset)
+    pdu_type, pdu, _ = decode_tlv(message, offset)
+
+    tag, request_id, offset = decode_tlv(pdu)
+    tag, error_status, offset = decode_tlv(pdu, offset)
+    tag, error_index, offset = decode_tlv(pdu, offset)
+    tag, varbind_list, _ = decode_tlv(pdu, offset)
+
+    varbinds = []
+    offset = 0
+    while offset < len(varbind_list):
+        _, varbind, offset = decode_tlv(varbind_list, offset)
+        _, oid, value_offset = decode_tlv(varbind)
+        value_tag, value, _ = decode_tlv(varbind, value_offset)
+        varbinds.append((decode_oid(oid), value_tag, value))
+
+    return (int.from_bytes(version, 'big'), bytes(community), pdu_type,
+            int.from_bytes(request_id, 'big', signed=True),
+            int.from_bytes(error_status, 'big'), int.from_bytes(error_index, 'big'),
+            varbinds)
+
+
+class SNMPClient(object):
+    """A simple SNMP client using a persistent UDP socket.
+
+    Parameters
+    ----------
+    address : str
+        device address
+    port : int, optional
+        device SNMP port
+        default = 161
+
+    community : str, optional
+        community string used for GET requests
+        default = 'public'
+    write_community : str, optional
+        community string used for SET requests
+        default = 'private'
+    version : int, optional
+        SNMP version, 1 or 2 (for v2c)
+        default = 1
+    timeout : float, optional
+        time to wait for each response, in seconds
+        default = 1
+    retries : int, optional
+        number of times to resend a request if there's no response
+        default = 3
+
+    """
+
+    def __init__(self, address, port=161, community='public', write_community='private',
+                 version=1, timeout=1, retries=3):
+        if version not in [1, 2]:
+            raise ValueError('Invalid SNMP version: {}'.format(version))
+        self.address = address
+        self.port = port
+        self.community = community
+        self.write_community = write_community
+        self.version = version
+        self.timeout = timeout
+        self.retries = retries
+        self.buffer_size = 65535
+
+        self._request_ids = itertools.count(random.randint(1, 2**30))
+        self._lock = threading.Lock()
+        self.socket = None
+
+    def __del__(self):
+        self.close()
+
+    def _connect(self):
+        if self.socket is None:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.socket.connect((self.address, self.port))
+
+    def close(self):
+        """Close the socket."""
+        if getattr(self, 'socket', None) is not None:
+            self.socket.close()
+            self.socket = None
+
+    def _request(self, pdu_type, varbinds, community):
+        """Send a request and return the decoded varbinds from the response."""
+        with self._lock:
+            self._connect()
+            request_id = next(self._request_ids) % 2**31
+            message = encode_message(pdu_type, request_id, varbinds, community, self.version - 1)
+
+            for _ in range(self.retries + 1):
+                self.socket.send(message)
+                self.socket.settimeout(self.timeout)
+                try:
+                    while True:
+                        data = self.socket.recv(self.buffer_size)
+                        try:
+                            reply = decode_message(data)
+                        except (ValueError, IndexError):
+                            # Ignore corrupt or truncated datagrams, and keep waiting
+                            continue
+                        # Ignore any late replies to earlier requests
+                        if reply[3] == request_id:
+                            break
+                    break
+                except socket.timeout:
+                    continue
+            else:
+                raise TimeoutError('No SNMP response from {}:{}'.format(self.address, self.port))
+
+        error_status, error_index, reply_varbinds = reply[4:]
+        if error_status != 0:
+            oid = varbinds[error_index - 1][0] if 0 < error_index <= len(varbinds) else None
+            raise ValueError('SNMP error: {} ({})'.format(
+                ERROR_STATUSES.get(error_status, error_status), oid))
+        return reply_varbinds
+
+    def get(self, oids):
+        """Get the values of the given OIDs, all in a single request.
+
+        Parameters
+        ----------
+        oids : list of str
+            the OIDs to fetch
+
+        Returns
+        -------
+        values : list
+            the values, in the same order as the OIDs
+            integer types are returned as ints (or subclasses like `TimeTicks`),
+            and strings as bytes
+
+        """
+        reply_varbinds = self._request(GET_REQUEST, [(oid, None) for oid in oids],
+                                       self.community)
+        if len(reply_varbinds) != len(oids):
+            raise ValueError('Expected {} values, got {}'.format(len(oids), len(reply_varbinds)))
+        return [decode_value(tag, value) for _, tag, value in reply_varbinds]
+
+    def set(self, values):
+        """Set the values of the given OIDs, all in a single request.
+
+        Parameters
+        ----------
+        values : list of (str, value)
+            the OIDs and the values to set them to
+            Python ints are sent as INTEGER and str or bytes as OCTET STRING
+
+        Returns
+        -------
+        values : list
+            the new values returned by the device
+
+        """
+        reply_varbinds = self._request(SET_REQUEST, values, self.write_community)
+        return [decode_value(tag, value) for _, tag, value in reply_varbinds]
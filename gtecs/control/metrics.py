@@ -0,0 +1,221 @@
+"""Counters, gauges and latency histograms for monitoring the daemons."""
+
+import functools
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Latency histogram bucket upper limits, in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class Histogram(object):
+    """A histogram of observed values, with fixed buckets.
+
+    Parameters
+    ----------
+    buckets : list of float, optional
+        the upper limits of the buckets (an extra bucket is always added for larger values)
+        default = `DEFAULT_BUCKETS`
+
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0
+        self.max = -math.inf
+
+    def observe(self, value):
+        """Add a value to the histogram."""
+        i = 0
+        while i < len(self.buckets) and value > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Estimate the given quantile (0-1) from the bucket counts.
+
+        Values are interpolated linearly within the bucket, and limited to the maximum value.
+        """
+        if self.count == 0:
+            return math.nan
+        target = q * self.count
+        total = 0
+        for i, count in enumerate(self.counts):
+            if count > 0 and total + count >= target:
+                if i == len(self.buckets):
+                    return self.max
+                lower = self.buckets[i - 1] if i > 0 else 0
+                value = lower + (self.buckets[i] - lower) * (target - total) / count
+                return min(value, self.max)
+            total += count
+        return self.max
+
+    def snapshot(self):
+        """Return a dict of the histogram values."""
+        cumulative = []
+        total = 0
+        for limit, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            cumulative.append((limit, total))
+        return {'count': self.count,
+                'sum': self.sum,
+                'mean': self.sum / self.count if self.count > 0 else math.nan,
+                'max': self.max if self.count > 0 else math.nan,
+                'p50': self.quantile(0.5),
+                'p95': self.quantile(0.95),
+                'buckets': cumulative,
+                }
+
+
+class MetricsRegistry(object):
+    """A thread-safe collection of counters, gauges and histograms.
+
+    Each metric has a name and optional labels (e.g. the method name), given as keyword arguments.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'MetricsRegistry(counters={}, gauges={}, histograms={})'.format(
+            len(self.counters), len(self.gauges), len(self.histograms))
+
+    def inc(self, name, value=1, **labels):
+        """Increase a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, **labels):
+        """Set the current value of a gauge."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.gauges[key] = value
+
+    def observe(self, name, value, **labels):
+        """Add a value to a histogram."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Time the enclosed code, and add the duration in seconds to a histogram."""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start_time, **labels)
+
+    def timed(self, name, function, **labels):
+        """Wrap a function to add its duration in seconds to a histogram each time it's called."""
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.observe(name, time.perf_counter() - start_time, **labels)
+        return wrapper
+
+    def snapshot(self):
+        """Return the current values of all the metrics.
+
+        Returns
+        -------
+        snapshot : dict
+            'counters', 'gauges' and 'histograms' are each lists of dicts containing the metric
+            'name', 'labels' (a dict) and 'value' (for histograms a dict, see `Histogram.snapshot`)
+
+        """
+        with self._lock:
+            counters = [(key, value) for key, value in self.counters.items()]
+            gauges = [(key, value) for key, value in self.gauges.items()]
+            histograms = [(key, hist.snapshot()) for key, hist in self.histograms.items()]
+        return {metric_type: [{'name': name, 'labels': dict(labels), 'value': value}
+                              for (name, labels), value in sorted(metrics)]
+                for metric_type, metrics in [('counters', counters),
+                                             ('gauges', gauges),
+                                             ('histograms', histograms)]}
+
+
+# Each daemon runs in its own process, so they can share a single registry
+# (this also collects the client-side call latencies recorded by `daemons.daemon_proxy`)
+registry = MetricsRegistry()
+
+
+def format_prometheus(snapshot, prefix='gtecs', labels=None):
+    """Format a metrics snapshot in the Prometheus text exposition format.
+
+    Parameters
+    ----------
+    snapshot : dict
+        the metrics, see `MetricsRegistry.snapshot()`
+    prefix : str, default='gtecs'
+        prefix to add to the metric names
+    labels : dict, optional
+        extra labels to add to every metric (e.g. the daemon ID)
+
+    Returns
+    -------
+    text : str
+        the formatted metrics
+
+    """
+    def format_labels(metric_labels, extra=None):
+        all_labels = {**(labels or {}), **metric_labels, **(extra or {})}
+        if len(all_labels) == 0:
+            return ''
+        return '{' + ','.join('{}="{}"'.format(key, str(value).replace('"', '\\"'))
+                              for key, value in all_labels.items()) + '}'
+
+    def format_value(value):
+        if isinstance(value, int):
+            return str(value)
+        value = float(value)
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        if math.isnan(value):
+            return 'NaN'
+        return repr(value)
+
+    lines = []
+    for metric_type, prom_type in [('counters', 'counter'), ('gauges', 'gauge')]:
+        seen = set()
+        for metric in snapshot[metric_type]:
+            name = '{}_{}'.format(prefix, metric['name'])
+            if name not in seen:
+                lines.append('# TYPE {} {}'.format(name, prom_type))
+                seen.add(name)
+            lines.append('{}{} {}'.format(
+                name, format_labels(metric['labels']), format_value(metric['value'])))
+
+    seen = set()
+    for metric in snapshot['histograms']:
+        name = '{}_{}'.format(prefix, metric['name'])
+        if name not in seen:
+            lines.append('# TYPE {} histogram'.format(name))
+            seen.add(name)
+        hist = metric['value']
+        for limit, count in hist['buckets']:
+            lines.append('{}_bucket{} {}'.format(
+                name, format_labels(metric['labels'], {'le': format_value(limit)}), count))
+        lines.append('{}_sum{} {}'.format(
+            name, format_labels(metric['labels']), format_value(hist['sum'])))
+        lines.append('{}_count{} {}'.format(
+            name, format_labels(metric['labels']), hist['count']))
+
+    return '\n'.join(lines) + '\n'
@@ -129,6 +129,8 @@ class BaseMonitor(ABC):
 
         self.info = None
         self.info_timeout = params.PYRO_TIMEOUT
+        self.health = None
+        self._check_info = None
         self.hardware_status = STATUS_UNKNOWN
 
         self.successful_check_time = 0
@@ -161,10 +163,31 @@ class BaseMonitor(ABC):
         except Exception:
             return DAEMON_ERROR_STATUS, None
 
+    def get_health(self):
+        """Get the daemon status and info dict together (see `BaseDaemon.get_health()`).
+
+        Returns None if the daemon didn't reply.
+        """
+        try:
+            with daemon_proxy(self.daemon_id, timeout=self.info_timeout) as daemon:
+                # Force an update if we're currently fixing an error (see get_info())
+                health = daemon.get_health(force_update=len(self.errors) > 0)
+            if not isinstance(health, dict):
+                raise ValueError('Invalid health returned')
+        except Exception:
+            health = None
+        if health is not None and isinstance(health['info'], dict):
+            self.info = health['info']
+        self.health = health
+        return health
+
     def get_info(self):
         """Get the daemon hardware info dict."""
         if self.daemon_id is None:
             return None
+        if self._check_info is not None:
+            # We're within check(), so use the info that came with the health check
+            return self._check_info
         try:
             with daemon_proxy(self.daemon_id, timeout=self.info_timeout) as daemon:
                 # Force an update if we're currently fixing an error,
@@ -255,11 +278,13 @@ class BaseMonitor(ABC):
 
         Note these overwrite self.errors (instead of adding to it) and then return immediately.
         """
-        # Check if the daemon is running
-        is_running = self.is_running()
+        # Get the daemon status and info in one go
+        health = self.get_health()
 
         # ERROR_RUNNING
         # Set the error if the daemon isn't running
+        # We only need to look for the process if the daemon didn't reply
+        is_running = health is not None or self.is_running()
         if not is_running:
             self.add_error(ERROR_RUNNING, critical=True)
             return 1
@@ -268,7 +293,10 @@ class BaseMonitor(ABC):
             self.clear_error(ERROR_RUNNING)
 
         # Get the daemon status
-        daemon_status, args = self.get_daemon_status()
+        if health is not None:
+            daemon_status, args = health['status'], health['status_args']
+        else:
+            daemon_status, args = DAEMON_ERROR_STATUS, None
 
         # ERROR_PING
         # Set the error if the daemon returns a bad status
@@ -315,7 +343,10 @@ class BaseMonitor(ABC):
             self.clear_error(ERROR_PING)
 
         # Get the daemon info
-        info = self.get_info()
+        info = health['info']
+        if isinstance(info, dict):
+            # Use this info for the hardware checks, rather than fetching it again
+            self._check_info = info
 
         # ERROR_INFO
         # Set the error if the daemon doesn't return any info dict
@@ -357,12 +388,15 @@ class BaseMonitor(ABC):
             details of errors found
 
         """
-        # First run common systems checks
-        found_error = self._check_systems()
-
-        # Then run custom hardware checks, unless there's already a systems error
-        if not found_error:
-            self._check_hardware()
+        try:
+            # First run common systems checks
+            found_error = self._check_systems()
+
+            # Then run custom hardware checks, unless there's already a systems error
+            if not found_error:
+                self._check_hardware()
+        finally:
+            self._check_info = None
 
         # The above two will have populated self.errors
         if len(self.errors) > 0:
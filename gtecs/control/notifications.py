@@ -0,0 +1,250 @@
+"""Background dispatcher for outgoing notifications (Slack messages and emails)."""
+
+import asyncio
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+
+from . import params
+from .metrics import registry
+
+
+class NotificationDispatcher(object):
+    """Send notifications from a background thread, so the caller never has to wait.
+
+    Notifications are sent in the order they are added, except for those given a `group`:
+    these are held for `coalesce_time` seconds after the first one arrives, and then sent
+    together as a single message (with repeated lines counted rather than repeated).
+    This stops bursts of messages (e.g. the pilot reporting many new or fixed hardware errors
+    at once) from flooding the channel.
+
+    Sending is limited to `rate_limit` notifications per minute, and failed sends are retried
+    with an increasing delay before being given up on.
+
+    Parameters
+    ----------
+    coalesce_time : float, optional
+        time to wait for more notifications in the same group, in seconds
+        default = `params.NOTIFY_COALESCE_TIME`
+    rate_limit : int, optional
+        maximum number of notifications to send per minute (0 for no limit)
+        default = `params.NOTIFY_RATE_LIMIT`
+    max_retries : int, optional
+        number of times to retry a failed send
+        default = `params.NOTIFY_RETRIES`
+    retry_delay : float, default=2
+        delay before the first retry, in seconds (doubled for each following retry)
+    queue_size : int, optional
+        maximum number of notifications waiting to be sent, more will be dropped
+        default = `params.NOTIFY_QUEUE_SIZE`
+
+    """
+
+    def __init__(self, coalesce_time=None, rate_limit=None, max_retries=None, retry_delay=2,
+                 queue_size=None):
+        self.coalesce_time = (coalesce_time if coalesce_time is not None
+                              else params.NOTIFY_COALESCE_TIME)
+        self.rate_limit = rate_limit if rate_limit is not None else params.NOTIFY_RATE_LIMIT
+        self.max_retries = max_retries if max_retries is not None else params.NOTIFY_RETRIES
+        self.retry_delay = retry_delay
+        if queue_size is None:
+            queue_size = params.NOTIFY_QUEUE_SIZE
+
+        self.log = logging.getLogger('notifications')
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.groups = OrderedDict()
+        self.send_times = deque()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'NotificationDispatcher(queued={}, groups={})'.format(
+            self.queue.qsize(), len(self.groups))
+
+    def _start(self):
+        """Start the sending thread, if it isn't already running."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._sending_thread, daemon=True)
+                self._thread.start()
+
+    def _put(self, item):
+        """Add an item to the queue without blocking."""
+        self._start()
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            if item[0] == 'message':
+                description = 'message "{}"'.format(item[2])
+            else:
+                description = 'call to {}'.format(item[1].__name__)
+            self.log.error('Notification queue is full, dropping {}'.format(description))
+            registry.inc('notifications_total', status='dropped')
+
+    def send(self, function, text, group=None, **kwargs):
+        """Queue a message to be sent.
+
+        Parameters
+        ----------
+        function : callable
+            the function which sends the message, called as `function(text, **kwargs)`
+            (e.g. `gtecs.control.slack.post_slack_msg`)
+        text : str
+            the message text
+        group : str, optional
+            if given, coalesce this message with any others in the same group
+            (messages are only coalesced if they are sent with the same function and kwargs)
+
+        """
+        self._put(('message', function, text, group, kwargs))
+
+    def submit(self, function, *args, **kwargs):
+        """Queue a function to be run by the sending thread.
+
+        This is used for reports which need to gather information before sending a message,
+        the function isn't retried if it fails.
+        """
+        self._put(('call', function, args, kwargs))
+
+    def flush(self, timeout=None):
+        """Send any queued or coalescing notifications, and wait until they have been sent.
+
+        Returns
+        -------
+        finished : bool
+            True if everything was sent before the timeout
+
+        """
+        if self._thread is None:
+            return True
+        self._start()
+        start_time = time.time()
+        # Wait for space in the queue rather than dropping the flush, so the coalescing groups
+        # are always sent (if the sending thread gets to it before the timeout)
+        try:
+            self.queue.put(('flush', None), timeout=timeout)
+        except queue.Full:
+            return False
+        while self.queue.unfinished_tasks > 0 or len(self.groups) > 0:
+            if timeout is not None and time.time() - start_time > timeout:
+                return False
+            time.sleep(0.05)
+        return True
+
+    async def flush_async(self, timeout=None):
+        """Wait for the queued notifications to be sent without blocking the event loop."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.flush, timeout)
+
+    def _sending_thread(self):
+        """Take items from the queue and send them."""
+        while True:
+            # Wait for the next item, or until the oldest coalescing group is due
+            timeout = None
+            if len(self.groups) > 0:
+                next_group = next(iter(self.groups.values()))
+                timeout = max(0, next_group['time'] + self.coalesce_time - time.time())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            try:
+                if item is None:
+                    pass
+                elif item[0] == 'message':
+                    _, function, text, group, kwargs = item
+                    if group is not None and self.coalesce_time > 0:
+                        self._add_to_group(function, text, group, kwargs)
+                    else:
+                        self._send(function, text, kwargs)
+                elif item[0] == 'call':
+                    _, function, args, kwargs = item
+                    try:
+                        function(*args, **kwargs)
+                    except Exception:
+                        self.log.error('Error running {}'.format(function.__name__))
+                        self.log.debug('', exc_info=True)
+
+                # Send any groups which are due (or all of them if flushing)
+                flush = item is not None and item[0] == 'flush'
+                while len(self.groups) > 0:
+                    key, next_group = next(iter(self.groups.items()))
+                    if not flush and time.time() - next_group['time'] < self.coalesce_time:
+                        break
+                    del self.groups[key]
+                    self._send_group(next_group)
+            finally:
+                if item is not None:
+                    self.queue.task_done()
+
+    def _add_to_group(self, function, text, group, kwargs):
+        """Add a message to a coalescing group."""
+        key = (function, group, tuple(sorted(kwargs.items(), key=lambda kv: kv[0])))
+        try:
+            hash(key)
+        except TypeError:
+            # Unhashable arguments (e.g. attachments), can't be coalesced
+            self._send(function, text, kwargs)
+            return
+        if key not in self.groups:
+            self.groups[key] = {'function': function, 'kwargs': kwargs, 'time': time.time(),
+                                'lines': OrderedDict()}
+        lines = self.groups[key]['lines']
+        lines[text] = lines.get(text, 0) + 1
+
+    def _send_group(self, group):
+        """Send the coalesced messages in a group as a single message."""
+        lines = ['{} (x{:d})'.format(text, count) if count > 1 else text
+                 for text, count in group['lines'].items()]
+        num_messages = sum(group['lines'].values())
+        if num_messages > 1:
+            registry.inc('notifications_total', num_messages - 1, status='coalesced')
+        self._send(group['function'], '\n'.join(lines), group['kwargs'])
+
+    def _wait_for_rate_limit(self):
+        """Wait until another notification is allowed to be sent."""
+        if self.rate_limit <= 0:
+            return
+        while len(self.send_times) > 0 and time.time() - self.send_times[0] > 60:
+            self.send_times.popleft()
+        if len(self.send_times) >= self.rate_limit:
+            time.sleep(max(0, self.send_times[0] + 60 - time.time()))
+            self.send_times.popleft()
+        self.send_times.append(time.time())
+
+    def _send(self, function, text, kwargs):
+        """Send a message, retrying if it fails."""
+        self._wait_for_rate_limit()
+        for attempt in range(self.max_retries + 1):
+            start_time = time.perf_counter()
+            try:
+                function(text, **kwargs)
+                registry.inc('notifications_total', status='sent')
+                registry.observe('notification_duration_seconds',
+                                 time.perf_counter() - start_time)
+                return
+            except Exception:
+                if attempt < self.max_retries:
+                    delay = self.retry_delay * 2 ** attempt
+                    self.log.warning('Failed to send notification, retrying in {:.0f}s'.format(
+                                     delay))
+                    self.log.debug('', exc_info=True)
+                    registry.inc('notifications_total', status='retried')
+                    time.sleep(delay)
+        self.log.error('Failed to send notification after {} attempts: "{}"'.format(
+                       self.max_retries + 1, text))
+        registry.inc('notifications_total', status='failed')
+
+
+# Each process has a single dispatcher, the thread is only started once something is sent
+dispatcher = NotificationDispatcher()
+
+
+@atexit.register
+def _flush_at_exit():
+    """Try to send anything still queued before the process exits (e.g. at the end of scripts)."""
+    dispatcher.flush(timeout=params.NOTIFY_EXIT_TIMEOUT)
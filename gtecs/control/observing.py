@@ -227,7 +227,7 @@ def slew_to_altaz(alt, az, timeout=120):
 
 
 def get_analysis_image(exptime, filt, binning, name, imgtype='SCIENCE', glance=False, uts=None,
-                       get_data=True, get_headers=False):
+                       get_data=True, get_headers=False, window=None):
     """Take a single exposure set, then open the images and return the image data.
 
     Parameters
@@ -251,6 +251,10 @@ def get_analysis_image(exptime, filt, binning, name, imgtype='SCIENCE', glance=F
         return the image data arrays (takes time)
     get_headers : bool, default=False
         return the image headers instead of the full data arrays (much faster)
+    window : tuple of int, list of tuple of int, or None, default=`None`
+        if given, the window to read out from the cameras (see `gtecs.control.exposures.Exposure`)
+        window=`None` (the default) will use the default window for focus and glance frames,
+        or the full frame otherwise
 
     Returns
     -------
@@ -280,7 +284,7 @@ def get_analysis_image(exptime, filt, binning, name, imgtype='SCIENCE', glance=F
     with daemon_proxy('exq') as daemon:
         print(f'Taking {exptime:.0f}s {filt} {"exposure" if not glance else "glance"}')
         daemon.add(exptime, 1, filt, binning,
-                   target=name, imgtype=imgtype, glance=glance, uts=uts)
+                   target=name, imgtype=imgtype, glance=glance, uts=uts, window=window)
         daemon.resume()
         image_start_time = time.time()
 
@@ -72,6 +72,10 @@ PYRO_TIMEOUT = config['PYRO_TIMEOUT']
 PYRO_LOGFILE = config['PYRO_LOGFILE']
 DAEMON_CHECK_PERIOD = config['DAEMON_CHECK_PERIOD']
 DAEMON_SLEEP_TIME = config['DAEMON_SLEEP_TIME']
+# Record timing spans in the daemons (see `gtecs.control.tracing`)
+TRACING = config['TRACING']
+TRACE_HISTORY = config['TRACE_HISTORY']
+TRACE_PATH = os.path.join(FILE_PATH, 'traces')
 
 DAEMONS = config['DAEMONS']
 for daemon_id in DAEMONS:
@@ -258,6 +262,7 @@ FAKE_MOUNT = config['FAKE_MOUNT']
 FAKE_MOUNT_PARKING = config['FAKE_MOUNT_PARKING']
 FORCE_MOUNT_PIER_SIDE = config['FORCE_MOUNT_PIER_SIDE']
 MOUNT_HISTORY_PERIOD = config['MOUNT_HISTORY_PERIOD']
+MOUNT_STATUS_PERIOD = config['MOUNT_STATUS_PERIOD']
 
 MIN_ELEVATION = config['MIN_ELEVATION']
 MAX_HOURANGLE = config['MAX_HOURANGLE']
@@ -275,11 +280,19 @@ CAM_IMAGING_TEMPERATURE = config['CAM_IMAGING_TEMPERATURE']
 CAM_STANDBY_TEMPERATURE = config['CAM_STANDBY_TEMPERATURE']
 COMPRESS_IMAGES = config['COMPRESS_IMAGES']
 MIN_HEADER_HIST_TIME = config['MIN_HEADER_HIST_TIME']
+SATURATION_LEVEL = config['SATURATION_LEVEL']
+# Image quality records to keep in the camera daemon, and if they should also be saved to files
+IMAGE_QUALITY_HISTORY = config['IMAGE_QUALITY_HISTORY']
+IMAGE_QUALITY_LOG = config['IMAGE_QUALITY_LOG']
+IMAGE_QUALITY_PATH = os.path.join(FILE_PATH, 'image_quality')
 
 ############################################################
 # Exposure Queue parameters
 EXQ_DITHERING = config['EXQ_DITHERING']
 EXQ_DITHER_DELAY = config['EXQ_DITHER_DELAY']
+# Default windows for focus and glance frames (x, y, dx, dy in unbinned pixels, empty for full)
+EXQ_FOCUS_WINDOW = tuple(config['EXQ_FOCUS_WINDOW']) if config['EXQ_FOCUS_WINDOW'] else None
+EXQ_GLANCE_WINDOW = tuple(config['EXQ_GLANCE_WINDOW']) if config['EXQ_GLANCE_WINDOW'] else None
 
 ############################################################
 # Power parameters
@@ -287,6 +300,8 @@ POWER_CHECK_PERIOD = config['POWER_CHECK_PERIOD']
 POWER_CHECK_SCRIPT = '_power_status'
 POWER_UNITS = config['POWER_UNITS']
 POWER_GROUPS = config['POWER_GROUPS']
+POWER_POLL_TIMEOUT = config['POWER_POLL_TIMEOUT']
+POWER_OUTLET_HOLD_TIME = config['POWER_OUTLET_HOLD_TIME']
 DASHBOARD_ALLOWED_OUTLETS = config['DASHBOARD_ALLOWED_OUTLETS']
 OBSERVING_OFF_OUTLETS = config['OBSERVING_OFF_OUTLETS']
 
@@ -355,6 +370,7 @@ OBS_FOCUS_TEMP_COMPENSATION = config['OBS_FOCUS_TEMP_COMPENSATION']
 OBS_FOCUS_IMAGES = config['OBS_FOCUS_IMAGES']
 
 AUTOFOCUS_SLACK_REPORTS = config['AUTOFOCUS_SLACK_REPORTS']
+AUTOFOCUS_ADAPTIVE = config['AUTOFOCUS_ADAPTIVE']
 
 PILOT_TAKE_FOCRUNS = config['PILOT_TAKE_FOCRUNS']
 FOCRUN_PERIOD = config['FOCRUN_PERIOD']
@@ -392,6 +408,8 @@ for ut in AUTOFOCUS_PARAMS:
         AUTOFOCUS_PARAMS[ut]['TEMP_MINCHANGE'] = 0.5
     if 'FOCRUN_SCALE' not in AUTOFOCUS_PARAMS[ut]:
         AUTOFOCUS_PARAMS[ut]['FOCRUN_SCALE'] = 1
+    if 'MAX_UNCERTAINTY' not in AUTOFOCUS_PARAMS[ut]:
+        AUTOFOCUS_PARAMS[ut]['MAX_UNCERTAINTY'] = 200
     # Enforce type
     AUTOFOCUS_PARAMS[ut]['NEAR_FOCUS_VALUE'] = int(AUTOFOCUS_PARAMS[ut]['NEAR_FOCUS_VALUE'])
     AUTOFOCUS_PARAMS[ut]['BIG_STEP'] = int(AUTOFOCUS_PARAMS[ut]['BIG_STEP'])
@@ -402,12 +420,18 @@ for ut in AUTOFOCUS_PARAMS:
     AUTOFOCUS_PARAMS[ut]['TEMP_GRADIENT'] = float(AUTOFOCUS_PARAMS[ut]['TEMP_GRADIENT'])
     AUTOFOCUS_PARAMS[ut]['TEMP_MINCHANGE'] = float(AUTOFOCUS_PARAMS[ut]['TEMP_MINCHANGE'])
     AUTOFOCUS_PARAMS[ut]['FOCRUN_SCALE'] = float(AUTOFOCUS_PARAMS[ut]['FOCRUN_SCALE'])
+    AUTOFOCUS_PARAMS[ut]['MAX_UNCERTAINTY'] = float(AUTOFOCUS_PARAMS[ut]['MAX_UNCERTAINTY'])
 
 ############################################################
 # Slack bot parameters
 ENABLE_SLACK = config['ENABLE_SLACK']
 SLACK_BOT_TOKEN = config['SLACK_BOT_TOKEN']
 SLACK_DEFAULT_CHANNEL = config['SLACK_DEFAULT_CHANNEL']
+NOTIFY_COALESCE_TIME = config['NOTIFY_COALESCE_TIME']
+NOTIFY_RATE_LIMIT = config['NOTIFY_RATE_LIMIT']
+NOTIFY_RETRIES = config['NOTIFY_RETRIES']
+NOTIFY_QUEUE_SIZE = config['NOTIFY_QUEUE_SIZE']
+NOTIFY_EXIT_TIMEOUT = config['NOTIFY_EXIT_TIMEOUT']
 
 ############################################################
 # Check for any parameters in the config spec that have not been defined in this module
@@ -17,6 +17,7 @@ from . import monitors
 from . import params
 from .astronomy import get_sunalt, local_midnight, sunalt_time
 from .flags import Conditions, Status
+from .notifications import dispatcher
 from .scheduling import update_schedule_pyro, update_schedule_server_async
 from .slack import send_slack_msg, send_startup_report, send_timing_report
 
@@ -285,12 +286,12 @@ class Pilot:
                     self.current_errors[monitor.daemon_id].add(error)
                     msg = 'New error from {}: {}'.format(monitor.monitor_id, error)
                     self.log.warning(msg)
-                    send_slack_msg(msg)
+                    send_slack_msg(msg, group='hardware_errors')
                 for error in [e for e in self.current_errors[monitor.daemon_id] if e not in errors]:
                     self.current_errors[monitor.daemon_id].remove(error)
                     msg = 'Fixed error from {}: {}'.format(monitor.monitor_id, error)
                     self.log.info(msg)
-                    send_slack_msg(msg)
+                    send_slack_msg(msg, group='hardware_errors')
                 error_count += num_errs
                 if num_errs > 0:
                     self.log.debug('{} info: {}'.format(monitor.monitor_id, monitor.info))
@@ -478,12 +479,14 @@ class Pilot:
 
         # Send night start reports
         if not restart:
-            send_timing_report(startup_sunalt=self.startup_sunalt,
-                               open_sunalt=self.open_sunalt,
-                               obs_start_sunalt=self.obs_start_sunalt,
-                               obs_stop_sunalt=self.obs_stop_sunalt,
-                               close_sunalt=self.close_sunalt,
-                               )
+            # (sent in the background, as the times take a while to calculate)
+            dispatcher.submit(send_timing_report,
+                              startup_sunalt=self.startup_sunalt,
+                              open_sunalt=self.open_sunalt,
+                              obs_start_sunalt=self.obs_start_sunalt,
+                              obs_stop_sunalt=self.obs_stop_sunalt,
+                              close_sunalt=self.close_sunalt,
+                              )
 
         # Wait for first flag check
         while not self.initial_flags_check_complete:
@@ -740,6 +743,8 @@ class Pilot:
                    }
         if not params.AUTOFOCUS_SLACK_REPORTS:  # This is ugly, these should all be in a config file
             autofoc['args'].append('--no-report')
+        if params.AUTOFOCUS_ADAPTIVE:
+            autofoc['args'].append('--adaptive')
         focrun_e = {'name': 'FOCRUN',
                     'sunalt': -13,
                     'late_sunalt': -14,
@@ -1356,7 +1361,7 @@ class Pilot:
 
         # send the startup report
         if send_report:
-            send_startup_report(msg='*Pilot reports startup complete*')
+            dispatcher.submit(send_startup_report, msg='*Pilot reports startup complete*')
 
         self.log.debug('startup process complete')
 
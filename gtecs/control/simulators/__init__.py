@@ -0,0 +1 @@
+"""Local stand-ins for hardware interfaces, for testing and benchmarking."""
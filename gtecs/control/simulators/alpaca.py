@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""A local stand-in for the ASCOM Alpaca telescope server used by ASA mounts (AutoSlew)."""
+
+import json
+import random
+import threading
+import time
+from argparse import ArgumentParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+
+class AlpacaMountServer(object):
+    """A simulated Alpaca telescope server.
+
+    It implements the commands used by `gtecs.control.hardware.mount.asa_alpaca.DDM500`,
+    with a simple model of the mount (slews take a fixed time and always succeed).
+    Every request can be delayed to simulate the network and mount latency.
+
+    Parameters
+    ----------
+    host : str, optional
+        host address to serve on
+        default = 'localhost'
+    port : int, optional
+        port to serve on
+        default = 0 (pick a free port, see `AlpacaMountServer.port`)
+
+    latency : float, optional
+        time to wait before replying to each request, in seconds
+        default = 0
+    jitter : float, optional
+        maximum random extra time to add to the latency, in seconds
+        default = 0
+    slew_time : float, optional
+        time slews take to complete, in seconds
+        default = 5
+
+    """
+
+    def __init__(self, host='localhost', port=0, latency=0, jitter=0, slew_time=5):
+        self.latency = latency
+        self.jitter = jitter
+        self.slew_time = slew_time
+
+        self.request_count = 0
+        self.connection_count = 0
+        self._lock = threading.Lock()
+        self._transaction_count = 0
+
+        # Mount state
+        self.connected = False
+        self.ra = 0
+        self.dec = 0
+        self.alt = 40
+        self.az = 0
+        self.tracking = False
+        self.parked = True
+        self.motors_on = True
+        self.pier_side = 0
+        self.reporting = False
+        self._slew_end_time = 0
+
+        handler = type('AlpacaHandler', (_AlpacaHandler,), {'server_object': self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.host, self.port = self.httpd.server_address[:2]
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        """Start the server in a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Shut down the server."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    @property
+    def slewing(self):
+        """Return if the simulated mount is currently slewing."""
+        return time.time() < self._slew_end_time
+
+    def _slew(self, ra=None, dec=None, alt=None, az=None):
+        if self.parked:
+            raise ValueError('Mount is parked')
+        if ra is not None:
+            self.ra, self.dec = ra, dec
+            self.tracking = True
+        else:
+            self.alt, self.az = alt, az
+            self.tracking = False
+        self._slew_end_time = time.time() + self.slew_time
+
+    def _report(self, axis):
+        position = self.ra * 15 if axis == '1' else self.dec
+        report = {'EncPos': position,
+                  'PosErr': random.gauss(0, 0.1),
+                  'Velocity': random.gauss(0.004 if self.tracking else 0, 1e-5),
+                  'QCurr': random.gauss(0.5, 0.05),
+                  'LastTime': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime()) + '+00:00',
+                  }
+        return json.dumps(report)
+
+    def _get(self, command, data):
+        """Return the value for a GET command."""
+        values = {'connected': self.connected,
+                  'utcdate': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime()),
+                  'siderealtime': (time.time() / 3600 * 1.00273790935 + 6.6) % 24,
+                  'rightascension': self.ra,
+                  'declination': self.dec,
+                  'azimuth': self.az,
+                  'altitude': self.alt,
+                  'slewing': self.slewing,
+                  'tracking': self.tracking,
+                  'ispulseguiding': False,
+                  'atpark': self.parked,
+                  'rightascensionrate': 0,
+                  'declinationrate': 0,
+                  'guideraterightascension': 0.004,
+                  'guideratedeclination': 0.004,
+                  'sideofpier': self.pier_side,
+                  'destinationsideofpier': self.pier_side,
+                  'equatorialsystem': 1,
+                  'doesrefraction': False,
+                  'trackingrates': [0],
+                  'name': 'Simulated mount',
+                  'description': 'Alpaca mount simulator',
+                  'driverinfo': 'gtecs.control.simulators.alpaca',
+                  'driverversion': '1.0',
+                  'interfaceversion': 3,
+                  }
+        if command not in values:
+            raise ValueError('Unknown command: {}'.format(command))
+        return values[command]
+
+    def _put(self, command, data):
+        """Carry out a PUT command, and return the value (if any)."""
+        if command == 'connected':
+            self.connected = data.get('connected', 'False').lower() == 'true'
+        elif command == 'action':
+            action = data.get('action', '')
+            parameters = data.get('parameters', '')
+            if action == 'reporting':
+                self.reporting = parameters == 'on'
+            elif action == 'report':
+                if not self.reporting:
+                    return ''
+                return self._report(parameters)
+            elif action == 'MotStat':
+                self.motors_on = parameters == 'on'
+            elif action.startswith('telescope:report'):
+                return 'DDM500'
+            elif action.startswith('telescope:'):
+                return ''
+        elif command == 'commandstring':
+            replies = {'MotStat': 'true' if self.motors_on else 'false',
+                       'MaxSpeed': '10',
+                       'GetCorrections': '',
+                       'GetMountName': 'Simulated mount',
+                       'GetVersion': '1.0',
+                       }
+            return replies.get(data.get('command'), '')
+        elif command == 'slewtocoordinatesasync':
+            self._slew(ra=float(data['rightascension']), dec=float(data['declination']))
+        elif command == 'slewtoaltazasync':
+            self._slew(alt=float(data['altitude']), az=float(data['azimuth']))
+        elif command == 'synctocoordinates':
+            self.ra, self.dec = float(data['rightascension']), float(data['declination'])
+        elif command == 'tracking':
+            self.tracking = data.get('tracking', 'False').lower() == 'true'
+        elif command == 'park':
+            self.parked = True
+            self.tracking = False
+        elif command == 'unpark':
+            self.parked = False
+        elif command == 'abortslew':
+            self._slew_end_time = 0
+        elif command != 'pulseguide':
+            raise ValueError('Unknown command: {}'.format(command))
+        return None
+
+    def handle(self, method, command, data):
+        """Handle a request and return the reply dict."""
+        time.sleep(self.latency + random.uniform(0, self.jitter))
+        with self._lock:
+            self.request_count += 1
+            self._transaction_count += 1
+            reply = {'ClientTransactionID': int(data.get('clienttransactionid', 0)),
+                     'ServerTransactionID': self._transaction_count,
+                     'ErrorNumber': 0,
+                     'ErrorMessage': '',
+                     }
+            try:
+                if method == 'GET':
+                    reply['Value'] = self._get(command, data)
+                else:
+                    value = self._put(command, data)
+                    if value is not None:
+                        reply['Value'] = value
+            except (KeyError, ValueError) as err:
+                reply['ErrorNumber'] = 1024
+                reply['ErrorMessage'] = str(err)
+        return reply
+
+
+class _AlpacaHandler(BaseHTTPRequestHandler):
+    """Request handler for `AlpacaMountServer`."""
+
+    # Use HTTP/1.1 so connections can be kept alive
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server_object = None
+
+    def setup(self):
+        super().setup()
+        with self.server_object._lock:
+            self.server_object.connection_count += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, method, data):
+        path = urlparse(self.path).path.rstrip('/')
+        command = path.split('/')[-1].lower()
+        # Alpaca parameter names are case-insensitive
+        data = {key.lower(): value for key, value in data}
+        body = json.dumps(self.server_object.handle(method, command, data)).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # noqa: N802
+        self._reply('GET', parse_qsl(urlparse(self.path).query))
+
+    def do_PUT(self):  # noqa: N802
+        length = int(self.headers.get('Content-Length', 0))
+        self._reply('PUT', parse_qsl(self.rfile.read(length).decode()))
+
+
+def benchmark(latency=0.005, jitter=0, number=100):
+    """Time fetching mount reports from a simulated server with the given latency."""
+    import logging
+    from ..hardware.mount.asa_alpaca import DDM500
+
+    with AlpacaMountServer(latency=latency, jitter=jitter) as server:
+        mount = DDM500(server.host, server.port, report_extra=False,
+                       log=logging.getLogger('benchmark'))
+        start_time = time.time()
+        for _ in range(number):
+            mount._get_report(disable_reporting_after=False)
+        report_time = (time.time() - start_time) / number
+        print('Latency {:.1f} ms: report took {:.1f} ms ({} connections for {} requests)'.format(
+            latency * 1000, report_time * 1000, server.connection_count, server.request_count))
+        mount.report_thread_running = False
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Run a simulated Alpaca mount server.')
+    parser.add_argument('--host', default='localhost',
+                        help='host address to serve on (default="localhost")')
+    parser.add_argument('--port', type=int, default=11111,
+                        help='port to serve on (default=11111)')
+    parser.add_argument('--latency', type=float, default=0,
+                        help='delay before each reply in seconds (default=0)')
+    parser.add_argument('--jitter', type=float, default=0,
+                        help='maximum random extra delay in seconds (default=0)')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='time fetching reports from the simulator, then exit')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.latency, args.jitter)
+    else:
+        server = AlpacaMountServer(args.host, args.port, args.latency, args.jitter)
+        print('Serving simulated Alpaca mount on {}:{}'.format(server.host, server.port))
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            server.stop()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""A local stand-in for the ASA mount TCP server (used by `hardware.mount.asa_tcp`)."""
+
+import random
+import time
+from argparse import ArgumentParser
+
+from .base import FaultInjector, TCPSimulator
+from ..hardware.mount.asa_codec import CommandStatus, KEYWORD_NAMES, decode_reply, encode_command
+
+
+class ASAMountServer(TCPSimulator):
+    """A simulated ASA mount TCP server.
+
+    It implements the commands used by `gtecs.control.hardware.mount.asa_tcp.DDM500`,
+    with a simple model of the mount (slews take a fixed time and always succeed).
+
+    Parameters
+    ----------
+    host : str, optional
+        host address to serve on
+        default = 'localhost'
+    port : int, optional
+        port to serve on
+        default = 0 (pick a free port, see `ASAMountServer.port`)
+    faults : `FaultInjector`, optional
+        latency and faults to apply to replies
+        default = no latency or faults
+
+    slew_time : float, optional
+        time slews take to complete, in seconds
+        default = 5
+
+    """
+
+    def __init__(self, host='localhost', port=0, faults=None, slew_time=5):
+        super().__init__(host, port, faults)
+        self.slew_time = slew_time
+
+        # Mount state
+        self.connected = False
+        self.ra = 0  # hours (apparent)
+        self.dec = 0
+        self.alt = 40
+        self.az = 0
+        self.ra_rate = 0
+        self.dec_rate = 0
+        self.tracking = False
+        self.parked = True
+        self.error_message = ''
+        self._slew_end_time = 0
+        self._rng = random.Random(0)
+
+    @property
+    def slewing(self):
+        """Return if the simulated mount is currently slewing."""
+        return time.time() < self._slew_end_time
+
+    def split_requests(self, buffer):
+        """Split complete records from the buffer."""
+        requests = []
+        while True:
+            end = buffer.find(b'$EOR')
+            if end < 0:
+                return requests, buffer
+            record = buffer[:end + 4]
+            buffer = buffer[end + 4:]
+            start = record.find(b'$SOR,')
+            if start >= 0:
+                requests.append(record[start:])
+
+    def _slew(self, ra=None, dec=None, alt=None, az=None):
+        if self.parked:
+            raise ValueError('Mount is parked')
+        if ra is not None:
+            self.ra, self.dec = ra, dec
+            self.tracking = True
+        else:
+            self.alt, self.az = alt, az
+            self.tracking = False
+        self._slew_end_time = time.time() + self.slew_time
+
+    def _status_params(self):
+        """Get the parameters for a MOUNTSTATUS reply."""
+        moving = self.slewing or self.tracking
+        params = [('UTC', 'DOUBLE', time.time() / 86400 + 2440587.5),
+                  ('RIGHTASCENSION', 'DOUBLE', self.ra),
+                  ('DECLINATION', 'DOUBLE', self.dec),
+                  ('AZIMUTH', 'DOUBLE', self.az),
+                  ('ELEVATION', 'DOUBLE', self.alt),
+                  ('TELSLEWING', 'INT16', int(self.slewing)),
+                  ('TELTRACKING', 'INT16', int(self.tracking)),
+                  ('INITIALIZING', 'INT16', 0),
+                  ]
+        for axis in ['1', '2']:
+            params += [('POSITIONERROR' + axis, 'DOUBLE', self._rng.gauss(0, 0.1)),
+                       ('TRACKINGERROR' + axis, 'DOUBLE', self._rng.gauss(0, 0.05)),
+                       ('VELOCITY' + axis, 'DOUBLE', 0.004 if moving else 0),
+                       ('ACCELERATION' + axis, 'DOUBLE', 0),
+                       ('CURRENTQ' + axis, 'DOUBLE', self._rng.gauss(0.5, 0.05)),
+                       ]
+        return params
+
+    def _properties(self):
+        return {'ATPARK': ('INT16', int(self.parked)),
+                'TELTRACKING': ('INT16', int(self.tracking)),
+                'TELSLEWING': ('INT16', int(self.slewing)),
+                }
+
+    def _reply_params(self, command, params):
+        """Carry out a command, and return the reply parameters (other than CMDSTATUS)."""
+        if command in ['TELCONNECT', 'TELDISCONNECT']:
+            self.connected = command == 'TELCONNECT'
+        elif command == 'TELCONNECTED':
+            return [('CONNECTED', 'INT16', int(self.connected))]
+        elif command == 'MOUNTSTATUS':
+            return self._status_params()
+        elif command == 'RIGHTASCENSIONRATE':
+            return [('RA_RATE', 'DOUBLE', self.ra_rate), ('TELTIME', 'DOUBLE', time.time())]
+        elif command == 'DECLINATIONRATE':
+            return [('DEC_RATE', 'DOUBLE', self.dec_rate), ('TELTIME', 'DOUBLE', time.time())]
+        elif command == 'GETPROPERTY':
+            name = KEYWORD_NAMES[int(params['PROPERTY'])]
+            properties = self._properties()
+            if name not in properties:
+                raise ValueError('Unknown property {}'.format(name))
+            return [(name,) + properties[name]]
+        elif command == 'SETPROPERTY':
+            name = KEYWORD_NAMES[int(params['PROPERTY'])]
+            if name == 'TELTRACKING':
+                self.tracking = bool(int(params[name]))
+            else:
+                raise ValueError('Cannot set property {}'.format(name))
+        elif command == 'MOUNTSLEWTOSTARASYNC':
+            self._slew(ra=float(params['RIGHTASCENSION']), dec=float(params['DECLINATION']))
+            self.ra_rate = float(params.get('RA_RATE', 0))
+            self.dec_rate = float(params.get('DEC_RATE', 0))
+        elif command == 'MOUNTSLEWTOAZELEASYNC':
+            self._slew(alt=float(params['ELEVATION']), az=float(params['AZIMUTH']))
+        elif command == 'SYNCTOCOORDINATES':
+            self.ra, self.dec = float(params['RIGHTASCENSION']), float(params['DECLINATION'])
+        elif command == 'SYNCTOALTAZ':
+            self.alt, self.az = float(params['ELEVATION']), float(params['AZIMUTH'])
+        elif command == 'PARK':
+            self.parked = True
+            self.tracking = False
+        elif command == 'UNPARK':
+            self.parked = False
+        elif command == 'ABORTSLEW':
+            self._slew_end_time = 0
+            self.tracking = False
+        elif command == 'ERRORRAISED':
+            return [('ERRORRAISED', 'INT16', int(bool(self.error_message))),
+                    ('ERRORMSG', 'CHAR', self.error_message)]
+        else:
+            raise ValueError('Unknown command {}'.format(command))
+        return []
+
+    def handle(self, request):
+        """Reply to a request record."""
+        try:
+            command, params = decode_reply(request.decode())
+        except (UnicodeDecodeError, ValueError):
+            # The real server ignores anything it can't parse
+            return None
+        try:
+            reply_params = [('CMDSTATUS', 'CHAR', CommandStatus['DONE'].value)]
+            reply_params += self._reply_params(command, params)
+        except (KeyError, ValueError) as err:
+            # NB: commas would break the record format
+            message = str(err).replace(',', ';')
+            reply_params = [('CMDSTATUS', 'CHAR', CommandStatus['CMDERROR'].value),
+                            ('ERRORMSG', 'CHAR', message)]
+        return encode_command(command, reply_params).encode()
+
+
+def benchmark(latency=0.005, jitter=0, number=100):
+    """Time fetching the mount status from a simulated server with the given latency."""
+    import logging
+    from ..hardware.mount.asa_tcp import DDM500
+
+    faults = FaultInjector(latency, jitter)
+    with ASAMountServer(faults=faults) as server:
+        mount = DDM500(server.host, server.port, log=logging.getLogger('benchmark'))
+        start_time = time.time()
+        for _ in range(number):
+            mount._status_update_time = 0
+            mount._update_status()
+        status_time = (time.time() - start_time) / number
+        print('Latency {:.1f} ms: status update took {:.1f} ms ({} requests)'.format(
+            latency * 1000, status_time * 1000, server.request_count))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Run a simulated ASA mount TCP server.')
+    parser.add_argument('--host', default='localhost',
+                        help='host address to serve on (default="localhost")')
+    parser.add_argument('--port', type=int, default=8000,
+                        help='port to serve on (default=8000)')
+    parser.add_argument('--latency', type=float, default=0,
+                        help='delay before each reply in seconds (default=0)')
+    parser.add_argument('--jitter', type=float, default=0,
+                        help='maximum random extra delay in seconds (default=0)')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='time fetching the status from the simulator, then exit')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.latency, args.jitter)
+    else:
+        server = ASAMountServer(args.host, args.port, FaultInjector(args.latency, args.jitter))
+        print('Serving simulated ASA mount on {}:{}'.format(server.host, server.port))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.socket.close()
@@ -0,0 +1,299 @@
+"""Common transports and fault injection for the protocol simulators."""
+
+import os
+import pty
+import random
+import select
+import socket
+import threading
+import time
+import tty
+
+
+class FaultInjector(object):
+    """Add latency, jitter and faults to simulated replies.
+
+    All the random choices come from a single seeded generator, so a given sequence of requests
+    will always see the same sequence of delays and faults.
+
+    Parameters
+    ----------
+    latency : float, optional
+        time to wait before each reply, in seconds
+        default = 0
+    jitter : float, optional
+        maximum random extra time to add to the latency, in seconds
+        default = 0
+    drop_rate : float, optional
+        fraction of replies to not send
+        default = 0
+    corrupt_rate : float, optional
+        fraction of replies to send with one byte changed
+        default = 0
+    split_rate : float, optional
+        fraction of replies to send in two parts, with a short delay between them
+        default = 0
+    disconnect_rate : float, optional
+        fraction of replies after which to close the connection (TCP simulators only)
+        default = 0
+    seed : int, optional
+        seed for the random generator
+        default = 0
+
+    """
+
+    def __init__(self, latency=0, jitter=0, drop_rate=0, corrupt_rate=0, split_rate=0,
+                 disconnect_rate=0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.corrupt_rate = corrupt_rate
+        self.split_rate = split_rate
+        self.disconnect_rate = disconnect_rate
+        self.split_delay = 0.005
+
+        self.rng = random.Random(seed)
+        self.counts = {'replies': 0, 'dropped': 0, 'corrupted': 0, 'split': 0,
+                       'disconnected': 0}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'FaultInjector(latency={}, jitter={}, counts={})'.format(
+            self.latency, self.jitter, self.counts)
+
+    def plan(self, reply):
+        """Decide how to send a reply.
+
+        Returns
+        -------
+        chunks : list of (float, bytes)
+            the time to wait and the data to send for each part of the reply
+            (empty if the reply should be dropped)
+        disconnect : bool
+            if True the connection should be closed after sending
+
+        """
+        with self._lock:
+            self.counts['replies'] += 1
+            delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0)
+            disconnect = self.rng.random() < self.disconnect_rate
+            if disconnect:
+                self.counts['disconnected'] += 1
+            if self.rng.random() < self.drop_rate:
+                self.counts['dropped'] += 1
+                return [], disconnect
+            if len(reply) > 0 and self.rng.random() < self.corrupt_rate:
+                self.counts['corrupted'] += 1
+                index = self.rng.randrange(len(reply))
+                reply = reply[:index] + bytes([reply[index] ^ 0x5A]) + reply[index + 1:]
+            if len(reply) > 1 and self.rng.random() < self.split_rate:
+                self.counts['split'] += 1
+                index = self.rng.randrange(1, len(reply))
+                return [(delay, reply[:index]), (self.split_delay, reply[index:])], disconnect
+            return [(delay, reply)], disconnect
+
+
+class ProtocolSimulator(object):
+    """Base class for simulators of line- or record-based device protocols.
+
+    Subclasses define how to split the incoming byte stream into requests
+    (`split_requests()`) and how to reply to each one (`handle()`), and the transport classes
+    below deal with the connections.
+    Requests are handled one at a time while holding `self.lock`, so subclasses don't need to
+    worry about threads when changing their simulated state.
+
+    Parameters
+    ----------
+    faults : `FaultInjector`, optional
+        latency and faults to apply to replies
+        default = no latency or faults
+
+    """
+
+    def __init__(self, faults=None):
+        self.faults = faults if faults is not None else FaultInjector()
+        self.request_count = 0
+        self.lock = threading.Lock()
+        self.running = False
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def split_requests(self, buffer):
+        """Split complete requests from the start of the buffer.
+
+        Returns the list of requests and the remaining (incomplete) data.
+        """
+        raise NotImplementedError
+
+    def handle(self, request):
+        """Return the reply bytes for a request (or None to not reply)."""
+        raise NotImplementedError
+
+    def _process(self, buffer, send):
+        """Handle all the complete requests in the buffer, and return the remaining data.
+
+        Returns None if the connection should be closed.
+        """
+        requests, buffer = self.split_requests(buffer)
+        for request in requests:
+            with self.lock:
+                self.request_count += 1
+                reply = self.handle(request)
+            if reply is None:
+                continue
+            chunks, disconnect = self.faults.plan(reply)
+            for delay, chunk in chunks:
+                if delay > 0:
+                    time.sleep(delay)
+                send(chunk)
+            if disconnect:
+                return None
+        return buffer
+
+    def start(self):
+        """Start the simulator in a background thread."""
+        self.running = True
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the simulator."""
+        self.running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def serve_forever(self):
+        """Handle requests until stopped."""
+        raise NotImplementedError
+
+
+class TCPSimulator(ProtocolSimulator):
+    """A protocol simulator served over TCP.
+
+    Parameters
+    ----------
+    host : str, optional
+        host address to serve on
+        default = 'localhost'
+    port : int, optional
+        port to serve on
+        default = 0 (pick a free port, see `port`)
+    faults : `FaultInjector`, optional
+        latency and faults to apply to replies
+        default = no latency or faults
+
+    """
+
+    def __init__(self, host='localhost', port=0, faults=None):
+        super().__init__(faults)
+        self.connection_count = 0
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind((host, port))
+        self.socket.listen()
+        self.host, self.port = self.socket.getsockname()[:2]
+
+    def stop(self):
+        """Stop the simulator and close the listening socket."""
+        super().stop()
+        self.socket.close()
+
+    def serve_forever(self):
+        """Accept connections until stopped."""
+        self.running = True
+        self.socket.settimeout(0.1)
+        while self.running:
+            try:
+                connection, _ = self.socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self.connection_count += 1
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            t = threading.Thread(target=self._serve_connection, args=[connection], daemon=True)
+            t.start()
+
+    def _serve_connection(self, connection):
+        connection.settimeout(0.1)
+        buffer = b''
+        try:
+            while self.running and buffer is not None:
+                try:
+                    data = connection.recv(4096)
+                except socket.timeout:
+                    continue
+                if not data:
+                    break
+                buffer = self._process(buffer + data, connection.sendall)
+        except OSError:
+            pass
+        finally:
+            connection.close()
+
+
+class SerialSimulator(ProtocolSimulator):
+    """A protocol simulator served on a pseudo-terminal, to stand in for a serial device.
+
+    The device path to open is given by `port` (e.g. '/dev/pts/3').
+
+    Parameters
+    ----------
+    faults : `FaultInjector`, optional
+        latency and faults to apply to replies (disconnects are ignored)
+        default = no latency or faults
+    tick_period : float, optional
+        how often to call `tick()`, for devices which send data without being asked
+        default = None (never)
+
+    """
+
+    def __init__(self, faults=None, tick_period=None):
+        super().__init__(faults)
+        self.tick_period = tick_period
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+
+    def stop(self):
+        """Stop the simulator and close the terminal."""
+        super().stop()
+        for fd in [self._master, self._slave]:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _send(self, data):
+        os.write(self._master, data)
+
+    def tick(self):
+        """Return any data to send without a request (or None)."""
+        return None
+
+    def serve_forever(self):
+        """Handle requests until stopped."""
+        self.running = True
+        buffer = b''
+        next_tick = time.time() + (self.tick_period or 0)
+        while self.running:
+            readable, _, _ = select.select([self._master], [], [], 0.05)
+            if readable:
+                try:
+                    buffer += os.read(self._master, 4096)
+                except OSError:
+                    break
+                buffer = self._process(buffer, self._send) or b''
+            if self.tick_period and time.time() > next_tick:
+                next_tick = time.time() + self.tick_period
+                with self.lock:
+                    data = self.tick()
+                if data:
+                    self._send(data)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""A local stand-in for the AstroHaven dome PLC serial interface (used by `hardware.dome`)."""
+
+import time
+from argparse import ArgumentParser
+
+from .base import FaultInjector, SerialSimulator
+
+
+class AstroHavenPLC(SerialSimulator):
+    """A simulated AstroHaven dome PLC, on a pseudo-terminal.
+
+    The shutters only move while the PLC keeps receiving move bytes ('a'/'A' to open/close the
+    A side, 'b'/'B' for the B side), and each byte is echoed back until the shutter reaches its
+    limit, when 'x'/'X' or 'y'/'Y' is sent instead.
+    When not moving the PLC sends a status digit ('0'-'3') every `idle_period` seconds.
+
+    Parameters
+    ----------
+    faults : `FaultInjector`, optional
+        latency and faults to apply to replies
+        default = no latency or faults
+    move_time : float, optional
+        time for a shutter to move fully open or closed, in seconds
+        default = 10
+    idle_period : float, optional
+        how often to send the status when not moving, in seconds
+        default = 1
+
+    """
+
+    def __init__(self, faults=None, move_time=10, idle_period=1):
+        super().__init__(faults, tick_period=idle_period)
+        self.move_time = move_time
+        # Shutter positions, from 0 (closed) to 1 (full open)
+        self.position = {'a': 0., 'b': 0.}
+        self._last_move_time = {'a': 0, 'b': 0}
+        self.reset_count = 0
+
+    @property
+    def port_status(self):
+        """Return the status digit for the current shutter positions."""
+        return str((1 if self.position['b'] > 0 else 0) + (2 if self.position['a'] > 0 else 0))
+
+    def split_requests(self, buffer):
+        """Each byte is a separate command."""
+        return [buffer[i:i + 1] for i in range(len(buffer))], b''
+
+    def handle(self, request):
+        """Move the shutters and reply to a command byte."""
+        char = request.decode('ascii', 'replace')
+        if char == 'R':
+            self.reset_count += 1
+            return b'R'
+        side = char.lower()
+        if side not in self.position:
+            return None
+        opening = char.islower()
+
+        # Move by the time since the last byte, or a nominal amount if this starts a new move
+        now = time.time()
+        elapsed = now - self._last_move_time[side]
+        step = (elapsed if elapsed < 0.5 else 0.05) / self.move_time
+        self._last_move_time[side] = now
+        if opening:
+            self.position[side] = min(self.position[side] + step, 1)
+            if self.position[side] == 1:
+                return b'x' if side == 'a' else b'y'
+        else:
+            self.position[side] = max(self.position[side] - step, 0)
+            if self.position[side] == 0:
+                return b'X' if side == 'a' else b'Y'
+        return request
+
+    def tick(self):
+        """Send the status if we're not moving."""
+        if time.time() - max(self._last_move_time.values()) > self.tick_period:
+            return self.port_status.encode()
+        return None
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Run a simulated AstroHaven dome PLC.')
+    parser.add_argument('--move-time', type=float, default=10,
+                        help='time to fully open or close a shutter in seconds (default=10)')
+    parser.add_argument('--latency', type=float, default=0,
+                        help='delay before each reply in seconds (default=0)')
+    args = parser.parse_args()
+
+    plc = AstroHavenPLC(FaultInjector(args.latency), args.move_time)
+    print('Serving simulated dome PLC on {}'.format(plc.port))
+    try:
+        plc.serve_forever()
+    except KeyboardInterrupt:
+        plc.stop()
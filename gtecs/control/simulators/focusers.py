@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Local stand-ins for the serial focuser controllers (used by `hardware.rasa` and `.ota`)."""
+
+import time
+from argparse import ArgumentParser
+
+from .base import FaultInjector, SerialSimulator
+
+
+class _SimulatedMotor(object):
+    """A motor moving at a fixed speed towards its target."""
+
+    def __init__(self, position, speed):
+        self.speed = speed
+        self._start_position = position
+        self._target = position
+        self._start_time = time.time()
+
+    @property
+    def position(self):
+        """Get the current position."""
+        distance = self._target - self._start_position
+        moved = min(abs(distance), (time.time() - self._start_time) * self.speed)
+        return int(self._start_position + (moved if distance >= 0 else -moved))
+
+    @property
+    def target(self):
+        """Get the target position."""
+        return self._target
+
+    @property
+    def moving(self):
+        """Return if the motor is still moving."""
+        return self.position != self._target
+
+    def move_to(self, target):
+        """Start moving to the given position."""
+        self._start_position = self.position
+        self._start_time = time.time()
+        self._target = int(target)
+
+    def set(self, position):
+        """Set the current position, and stop."""
+        self._start_position = self._target = int(position)
+
+
+class FocusLynxHub(SerialSimulator):
+    """A simulated Optec FocusLynx hub, on a pseudo-terminal.
+
+    It implements the commands used by `gtecs.control.hardware.rasa.FocusLynx` and
+    `FocusLynxHub`, with the given number of focusers attached which all move at a fixed speed.
+
+    Parameters
+    ----------
+    faults : `FaultInjector`, optional
+        latency and faults to apply to replies
+        default = no latency or faults
+    nicknames : list of str, optional
+        the nickname of each attached focuser (devices 1, 2, ...)
+        default = ['foc1', 'foc2']
+    max_position : int, optional
+        the maximum position of the focusers, in steps
+        default = 125440
+    speed : float, optional
+        how fast the focusers move, in steps per second
+        default = 10000
+
+    """
+
+    def __init__(self, faults=None, nicknames=None, max_position=125440, speed=10000):
+        super().__init__(faults)
+        if nicknames is None:
+            nicknames = ['foc1', 'foc2']
+        self.nicknames = {str(i + 1): nickname for i, nickname in enumerate(nicknames)}
+        self.max_position = max_position
+        self.motors = {dev: _SimulatedMotor(max_position // 2, speed) for dev in self.nicknames}
+        self.temperature = 21.7
+
+    def split_requests(self, buffer):
+        """Split complete '<...>' commands from the buffer."""
+        *requests, buffer = buffer.split(b'>')
+        requests = [request[request.find(b'<') + 1:].decode('ascii', 'replace')
+                    for request in requests if b'<' in request]
+        return requests, buffer
+
+    def _reply_lines(self, dev, command):
+        if dev == 'H' and command == 'GETHUBINFO':
+            return ['HUB INFO', 'Hub FVer = 2.0.4', 'Sleeping = 0', 'Wired IP = 0.0.0.0', 'END']
+        if dev not in self.motors:
+            return ['ER=Invalid device number']
+        motor = self.motors[dev]
+        if command == 'GETSTATUS':
+            return ['STATUS{}'.format(dev),
+                    'Temp(C) = {:+.1f}'.format(self.temperature),
+                    'Curr Pos = {:06d}'.format(motor.position),
+                    'Targ Pos = {:06d}'.format(motor.target),
+                    'IsMoving = {:d}'.format(motor.moving),
+                    'IsHoming = 0',
+                    'IsHomed = 1',
+                    'END']
+        elif command == 'GETCONFIG':
+            return ['CONFIG{}'.format(dev),
+                    'Nickname = {}'.format(self.nicknames[dev]),
+                    'Max Pos = {:06d}'.format(self.max_position),
+                    'END']
+        elif command == 'HELLO':
+            return [self.nicknames[dev]]
+        elif command.startswith('MA') and command[2:].isdigit():
+            motor.move_to(min(int(command[2:]), self.max_position))
+            return ['M']
+        elif command == 'CENTER':
+            motor.move_to(self.max_position // 2)
+            return ['H']
+        elif command == 'HALT':
+            motor.set(motor.position)
+            return ['HALTED']
+        elif command.startswith('SCCP') and command[4:].isdigit():
+            motor.set(int(command[4:]))
+            return ['SET']
+        else:
+            return ['ER=Unknown command']
+
+    def handle(self, request):
+        """Reply to a '<F{dev}{command}' request."""
+        if not request.startswith('F') or len(request) < 2:
+            return None
+        lines = ['!'] + self._reply_lines(request[1], request[2:])
+        return ('\n'.join(lines) + '\n').encode('ascii')
+
+
+class H400Gateway(SerialSimulator):
+    """A simulated ASA H400 gateway, with a focuser and mirror cover, on a pseudo-terminal.
+
+    It implements the commands used by `gtecs.control.hardware.ota.H400`.
+
+    Parameters
+    ----------
+    faults : `FaultInjector`, optional
+        latency and faults to apply to replies
+        default = no latency or faults
+    limit : int, optional
+        the focuser limit, in 0.01mm units
+        default = 3000
+    speed : float, optional
+        how fast the focuser moves, in LSB steps (0.156μm) per second
+        default = 50000
+    cover_time : float, optional
+        how long the mirror cover takes to open or close, in seconds
+        default = 5
+
+    """
+
+    def __init__(self, faults=None, limit=3000, speed=50000, cover_time=5):
+        super().__init__(faults)
+        self.limit = limit
+        self.max_position = int(limit * 10 / 0.156)
+        self.focuser = _SimulatedMotor(self.max_position // 2, speed)
+        # NB: the cover position is in 10ths of a degree, fully open is ~2700
+        self.cover = _SimulatedMotor(0, 2700 / cover_time)
+
+    def split_requests(self, buffer):
+        """Split complete '#...$' commands from the buffer."""
+        *requests, buffer = buffer.split(b'$')
+        requests = [request[request.find(b'#') + 1:].decode('ascii', 'replace')
+                    for request in requests if b'#' in request]
+        return requests, buffer
+
+    def _reply_values(self, code, address, value):
+        if code == 1001:
+            moving = self.focuser.moving
+            return [1001, self.focuser.position, 1, self.limit, 1 if moving else 3, 5]
+        elif code == 1002:
+            position = self.cover.position
+            status = 2 if position == 0 else 1 if position == 2700 else 0
+            return [1002, position, 0, 0, status]
+        elif code == 205 and address == 107:
+            self.focuser.move_to(max(0, min(value, self.max_position)))
+        elif code == 206 and address == 107:
+            self.focuser.move_to(max(0, min(self.focuser.position + value, self.max_position)))
+        elif code == 204 and address == 107:
+            self.focuser.set(self.focuser.position)
+        elif code == 204 and address == 1:
+            self.cover.set(self.cover.position)
+        elif code == 304 and address == 1:
+            self.cover.move_to(2700)
+        elif code == 305 and address == 1:
+            self.cover.move_to(0)
+        else:
+            return [5001, address, value]
+        return [5000, address, value]
+
+    def handle(self, request):
+        """Reply to a '#code address value' request."""
+        try:
+            code, address, value = (int(word) for word in request.split())
+        except ValueError:
+            return None
+        values = self._reply_values(code, address, value)
+        return '#{}$'.format(' '.join(str(value) for value in values)).encode('ascii')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Run a simulated focuser controller.')
+    parser.add_argument('device', choices=['focuslynx', 'h400'],
+                        help='which controller to simulate')
+    parser.add_argument('--latency', type=float, default=0,
+                        help='delay before each reply in seconds (default=0)')
+    args = parser.parse_args()
+
+    if args.device == 'focuslynx':
+        simulator = FocusLynxHub(FaultInjector(args.latency))
+    else:
+        simulator = H400Gateway(FaultInjector(args.latency))
+    print('Serving simulated {} on {}'.format(args.device, simulator.port))
+    try:
+        simulator.serve_forever()
+    except KeyboardInterrupt:
+        simulator.stop()
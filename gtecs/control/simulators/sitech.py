@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""A local stand-in for the SiTechExe TCP server (used by `hardware.mount.sitech`)."""
+
+import time
+from argparse import ArgumentParser
+
+from .base import FaultInjector, TCPSimulator
+
+
+class SiTechServer(TCPSimulator):
+    """A simulated SiTechExe TCP server.
+
+    It implements the commands used by `gtecs.control.hardware.mount.sitech.SiTech`,
+    with a simple model of the mount (slews take a fixed time and always succeed).
+
+    Parameters
+    ----------
+    host : str, optional
+        host address to serve on
+        default = 'localhost'
+    port : int, optional
+        port to serve on
+        default = 0 (pick a free port, see `SiTechServer.port`)
+    faults : `FaultInjector`, optional
+        latency and faults to apply to replies
+        default = no latency or faults
+
+    slew_time : float, optional
+        time slews take to complete, in seconds
+        default = 5
+
+    """
+
+    def __init__(self, host='localhost', port=0, faults=None, slew_time=5):
+        super().__init__(host, port, faults)
+        self.slew_time = slew_time
+
+        # Mount state
+        self.ra = 0  # hours (JNow)
+        self.dec = 0
+        self.alt = 40
+        self.az = 0
+        self.dest = (0, 0, 40, 0)
+        self.tracking = False
+        self.nonsidereal = False
+        self.parked = True
+        self.blinky = False
+        self._slew_end_time = 0
+
+    @property
+    def slewing(self):
+        """Return if the simulated mount is currently slewing."""
+        return time.time() < self._slew_end_time
+
+    def split_requests(self, buffer):
+        """Split complete lines from the buffer."""
+        *lines, buffer = buffer.split(b'\n')
+        return [line.decode('ascii', 'replace').strip() for line in lines], buffer
+
+    def _slew(self, ra=None, dec=None, alt=None, az=None):
+        if self.parked:
+            return 'Mount is parked'
+        if ra is not None:
+            self.ra, self.dec = ra, dec
+            self.tracking = True
+        else:
+            self.alt, self.az = alt, az
+            self.tracking = False
+        self.dest = (self.ra, self.dec, self.alt, self.az)
+        self._slew_end_time = time.time() + self.slew_time
+        return 'GoTo accepted'
+
+    def _status_string(self, message, destination=False):
+        """Format the status reply string."""
+        flags = (1 | (2 if self.tracking else 0) | (4 if self.slewing else 0) |
+                 (16 if self.parked else 0) | (64 if self.blinky else 0) |
+                 (32768 if self.nonsidereal else 0))
+        jd = time.time() / 86400 + 2440587.5
+        if destination:
+            values = self.dest
+        else:
+            lst = (time.time() / 3600 * 1.00273790935 + 6.6) % 24
+            values = (self.dec, (lst - self.ra) * 15, lst, jd)
+        fields = [str(flags)]
+        fields += ['{:.5f}'.format(value) for value in (self.ra, self.dec, self.alt, self.az)]
+        fields += ['{:.5f}'.format(value) for value in values]
+        fields += ['0.00000', '1.000', '_' + message]  # hours, airmass
+        return ';'.join(fields) + '\n'
+
+    def handle(self, request):
+        """Reply to a request line."""
+        words = request.split()
+        if not words:
+            return None
+        command, args = words[0], words[1:]
+        message = ''
+        destination = False
+        try:
+            if command == 'ReadScopeStatus':
+                pass
+            elif command == 'ReadScopeDestination':
+                message = 'ReadScopeDestination'
+                destination = True
+            elif command == 'GoTo':
+                message = self._slew(ra=float(args[0]), dec=float(args[1]))
+            elif command == 'GoToAltAz':
+                message = self._slew(az=float(args[0]), alt=float(args[1]))
+            elif command == 'Sync':
+                self.ra, self.dec = float(args[0]), float(args[1])
+                message = 'Sync accepted'
+            elif command == 'SyncToAltAz':
+                self.az, self.alt = float(args[0]), float(args[1])
+                message = 'Sync accepted'
+            elif command == 'Park':
+                self.parked = True
+                self.tracking = False
+                message = 'Park accepted'
+            elif command == 'UnPark':
+                self.parked = False
+                message = 'UnPark accepted'
+            elif command == 'Abort':
+                self._slew_end_time = 0
+                self.tracking = False
+                message = 'Abort accepted'
+            elif command == 'SetTrackMode':
+                self.tracking = bool(int(args[0]))
+                self.nonsidereal = bool(int(args[1]))
+                message = 'SetTrackMode accepted'
+            elif command == 'MotorsToBlinky':
+                self.blinky = True
+            elif command == 'MotorsToAuto':
+                self.blinky = False
+            elif command in ['JogArcSeconds', 'PulseGuide']:
+                message = '{} accepted'.format(command)
+            elif command == 'CloseMe':
+                return None
+            else:
+                message = 'Unknown command {}'.format(command)
+        except (IndexError, ValueError):
+            message = 'Invalid arguments for {}'.format(command)
+        return self._status_string(message, destination).encode()
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Run a simulated SiTechExe server.')
+    parser.add_argument('--host', default='localhost',
+                        help='host address to serve on (default="localhost")')
+    parser.add_argument('--port', type=int, default=8079,
+                        help='port to serve on (default=8079)')
+    parser.add_argument('--latency', type=float, default=0,
+                        help='delay before each reply in seconds (default=0)')
+    parser.add_argument('--jitter', type=float, default=0,
+                        help='maximum random extra delay in seconds (default=0)')
+    parser.add_argument('--split-rate', type=float, default=0,
+                        help='fraction of replies to send in two parts (default=0)')
+    args = parser.parse_args()
+
+    faults = FaultInjector(args.latency, args.jitter, split_rate=args.split_rate)
+    server = SiTechServer(args.host, args.port, faults)
+    print('Serving simulated SiTechExe on {}:{}'.format(server.host, server.port))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.socket.close()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""A local stand-in for the SNMP agents in the power units."""
+
+import random
+import socket
+import threading
+import time
+from argparse import ArgumentParser
+
+from ..hardware.snmp import (GET_NEXT_REQUEST, GET_REQUEST, GET_RESPONSE, INTEGER,
+                             SET_REQUEST, Gauge32, TimeTicks,
+                             decode_message, decode_value, encode_message)
+
+
+def apc_pdu_values(outlets=8):
+    """Get the OID values for a simulated APC PDU."""
+    base = '.1.3.6.1.4.1.318.1.1.12.3.3.1.1.4'
+    return {'{}.{}'.format(base, outlet): 1 for outlet in range(1, outlets + 1)}
+
+
+def apc_ups_values(outlets=3):
+    """Get the OID values for a simulated APC UPS."""
+    base = '.1.3.6.1.4.1.318.1.1.1'
+    values = {base + '.4.1.1.0': 2,  # Normal
+              base + '.2.3.1.0': Gauge32(1000),  # 100.0%
+              base + '.2.2.3.0': TimeTicks(360000),  # 1 hour
+              base + '.4.3.3.0': Gauge32(250),  # 25.0%
+              }
+    for outlet in range(1, outlets + 1):
+        values['{}.12.3.2.1.3.{}'.format(base, outlet)] = 1
+    return values
+
+
+def apc_ats_values():
+    """Get the OID values for a simulated APC ATS."""
+    base = '.1.3.6.1.4.1.318.1.1.8'
+    return {base + '.5.1.3.0': 2,  # Normal
+            base + '.5.1.12.0': 2,
+            base + '.5.1.13.0': 2,
+            base + '.5.1.2.0': 1,  # source A
+            }
+
+
+def epc_pdu_values(outlets=8):
+    """Get the OID values for a simulated EPC PDU."""
+    base = '.1.3.6.1.4.1.28507.29.1.3.1.2.1.3'
+    return {'{}.{}'.format(base, outlet): 1 for outlet in range(1, outlets + 1)}
+
+
+class SNMPAgent(object):
+    """A simulated SNMP v1/v2c agent, serving a fixed set of OID values over UDP.
+
+    Parameters
+    ----------
+    values : dict
+        OID strings and their values (use the types in `gtecs.control.hardware.snmp`,
+        e.g. `Gauge32`, for anything other than INTEGER or OCTET STRING)
+    host : str, optional
+        host address to serve on
+        default = 'localhost'
+    port : int, optional
+        port to serve on
+        default = 0 (pick a free port, see `SNMPAgent.port`)
+
+    community : str, optional
+        community string to accept for GET requests
+        default = 'public'
+    write_community : str, optional
+        community string to accept for SET requests
+        default = 'private'
+    latency : float, optional
+        time to wait before replying to each request, in seconds
+        default = 0
+    drop_rate : float, optional
+        fraction of requests to ignore, to test timeouts and retries
+        default = 0
+
+    SET requests are only accepted for OIDs which already exist, and for APC-style outlet
+    commands a value of 3 (reboot) is stored as 1 (on).
+
+    """
+
+    def __init__(self, values, host='localhost', port=0, community='public',
+                 write_community='private', latency=0, drop_rate=0):
+        self.values = dict(values)
+        self.community = community.encode()
+        self.write_community = write_community.encode()
+        self.latency = latency
+        self.drop_rate = drop_rate
+        self.request_count = 0
+
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((host, port))
+        self.host, self.port = self.socket.getsockname()[:2]
+        self.running = False
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        """Start the agent in a background thread."""
+        self.running = True
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the agent."""
+        self.running = False
+        if self._thread is not None:
+            self._thread.join()
+        self.socket.close()
+
+    def serve_forever(self):
+        """Handle requests until stopped."""
+        self.socket.settimeout(0.1)
+        while self.running:
+            try:
+                data, address = self.socket.recvfrom(65535)
+            except socket.timeout:
+                continue
+            self.request_count += 1
+            if random.random() < self.drop_rate:
+                continue
+            reply = self.handle(data)
+            if reply is not None:
+                time.sleep(self.latency)
+                self.socket.sendto(reply, address)
+
+    def handle(self, data):
+        """Handle a request, and return the encoded response (or None to ignore it)."""
+        try:
+            version, community, pdu_type, request_id, _, _, varbinds = decode_message(data)
+        except ValueError:
+            return None
+        if pdu_type == SET_REQUEST:
+            if community != self.write_community:
+                return None
+        elif community != self.community:
+            return None
+
+        reply_varbinds = []
+        error_status = error_index = 0
+        for i, (oid, tag, value) in enumerate(varbinds):
+            if pdu_type == GET_NEXT_REQUEST:
+                next_oids = sorted((key for key in self.values if _oid_key(key) > _oid_key(oid)),
+                                   key=_oid_key)
+                oid = next_oids[0] if next_oids else None
+            if oid not in self.values:
+                error_status, error_index = 2, i + 1  # noSuchName
+                reply_varbinds = [(oid, None) for oid, _, _ in varbinds]
+                break
+            if pdu_type == SET_REQUEST:
+                value = decode_value(tag, value)
+                if tag == INTEGER and self.values[oid] in [1, 2] and value == 3:
+                    value = 1  # reboot outlet
+                self.values[oid] = value
+            reply_varbinds.append((oid, self.values[oid]))
+
+        if pdu_type not in [GET_REQUEST, GET_NEXT_REQUEST, SET_REQUEST]:
+            return None
+        return encode_message(GET_RESPONSE, request_id, reply_varbinds, community.decode(),
+                              version, error_status, error_index)
+
+
+def _oid_key(oid):
+    return tuple(int(arc) for arc in oid.strip('.').split('.'))
+
+
+def benchmark(number=200):
+    """Time reading a simulated UPS with individual and bulk requests."""
+    from ..hardware.power import APCUPS
+
+    with SNMPAgent(apc_ups_values()) as agent:
+        ups = APCUPS(agent.host)
+        ups.snmp.port = agent.port
+        start_time = time.time()
+        for _ in range(number):
+            ups.status()
+            ups.percent_remaining()
+            ups.time_remaining()
+            ups.load()
+            ups.outlet_status()
+        single_time = (time.time() - start_time) / number
+        start_time = time.time()
+        for _ in range(number):
+            ups.get_info()
+        bulk_time = (time.time() - start_time) / number
+        print('UPS info: {:.2f} ms with separate requests, {:.2f} ms with one request'.format(
+            single_time * 1000, bulk_time * 1000))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Run a simulated SNMP power unit agent.')
+    parser.add_argument('unit', choices=['APCPDU', 'APCUPS', 'APCATS', 'EPCPDU'],
+                        help='type of unit to simulate')
+    parser.add_argument('--host', default='localhost',
+                        help='host address to serve on (default="localhost")')
+    parser.add_argument('--port', type=int, default=1161,
+                        help='port to serve on (default=1161)')
+    parser.add_argument('--latency', type=float, default=0,
+                        help='delay before each reply in seconds (default=0)')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='time reading a simulated UPS, then exit')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark()
+    else:
+        unit_values = {'APCPDU': apc_pdu_values,
+                       'APCUPS': apc_ups_values,
+                       'APCATS': apc_ats_values,
+                       'EPCPDU': epc_pdu_values,
+                       }
+        agent = SNMPAgent(unit_values[args.unit](), args.host, args.port, latency=args.latency)
+        print('Serving simulated {} on {}:{}'.format(args.unit, agent.host, agent.port))
+        try:
+            agent.serve_forever()
+        except KeyboardInterrupt:
+            agent.socket.close()
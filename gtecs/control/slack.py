@@ -8,10 +8,11 @@ from gtecs.common.slack import send_message
 from . import params
 from .astronomy import night_startdate, sunalt_time
 from .flags import Conditions, Status
+from .notifications import dispatcher
 
 
-def send_slack_msg(text, channel=None, username=None, *args, **kwargs):
-    """Send a message to Slack.
+def post_slack_msg(text, channel=None, username=None, *args, **kwargs):
+    """Send a message to Slack, waiting until it has been sent.
 
     Parameters
     ----------
@@ -45,6 +46,35 @@ def send_slack_msg(text, channel=None, username=None, *args, **kwargs):
         print('Slack Message:', text)
 
 
+def send_slack_msg(text, channel=None, username=None, group=None, blocking=False, **kwargs):
+    """Send a message to Slack.
+
+    By default the message is queued and sent in the background, see
+    `gtecs.control.notifications.NotificationDispatcher`.
+
+    Parameters
+    ----------
+    text : string
+        The message text.
+    channel : string, optional
+        The channel to post the message to.
+        If None, defaults to `params.SLACK_DEFAULT_CHANNEL`.
+    username : string, optional
+        The Slack bot username to post the message as.
+        If None, defaults to 'params.TELESCOPE_NAME'.
+    group : string, optional
+        If given, messages in the same group sent close together are combined into one message.
+    blocking : bool, default=False
+        If True, send the message immediately and wait until it has been sent.
+
+    Other parameters are passed to `gtecs.common.slack.send_message`.
+
+    """
+    if blocking:
+        return post_slack_msg(text, channel, username, **kwargs)
+    dispatcher.send(post_slack_msg, text, group, channel=channel, username=username, **kwargs)
+
+
 def send_status_report(msg, colour=None, startup=True, slack_channel=None, site=params.SITE_NAME):
     """Send a Slack message with the current conditions, status and webcams."""
     attachments = []
@@ -0,0 +1,205 @@
+"""Fixed-size time series storage for hardware telemetry."""
+
+import calendar
+import threading
+
+import numpy as np
+
+
+def iso_to_unix(timestamp):
+    """Convert an ISO format UTC timestamp string to a Unix timestamp.
+
+    This is much faster than going through `astropy.time.Time`, which matters when parsing
+    reports several times a second. Any timezone suffix is ignored.
+    """
+    date, _, clock = timestamp.replace(' ', 'T').partition('T')
+    clock = clock.split('+')[0].rstrip('Z')
+    year, month, day = date.split('-')
+    hour, minute, second = clock.split(':')
+    return (calendar.timegm((int(year), int(month), int(day), int(hour), int(minute), 0)) +
+            float(second))
+
+
+def window_stats(times, values, end_time, hist_time):
+    """Get statistics of the values within a time window.
+
+    Parameters
+    ----------
+    times : numpy.ndarray
+        Unix timestamps of the values (in order)
+    values : numpy.ndarray
+        values to use
+    end_time : float
+        Unix timestamp of the end of the window
+    hist_time : float
+        length of the window in seconds
+        this will be reduced if there aren't values going back this far
+
+    Returns
+    -------
+    info : dict
+        the window length used (`hist_time`) and the min, max, mean and std of the values
+        (set to 'NA' if there were no values in the window)
+
+    """
+    info = {'hist_time': -999, 'min': 'NA', 'max': 'NA', 'mean': 'NA', 'std': 'NA'}
+    if len(times) == 0:
+        return info
+
+    times = np.asarray(times, dtype=float)
+    values = np.asarray(values, dtype=float)
+    hist_time = min(hist_time, end_time - times[0])
+    info['hist_time'] = hist_time
+    mask = end_time - times <= hist_time
+    if np.any(mask):
+        values = values[mask]
+        info['min'] = np.min(values)
+        info['max'] = np.max(values)
+        info['mean'] = np.mean(values)
+        info['std'] = np.std(values)
+    return info
+
+
+class TimeSeriesBuffer(object):
+    """A fixed-capacity ring buffer of timestamped values.
+
+    Values are stored in preallocated numpy arrays, so appending is O(1) with no allocation,
+    and once the buffer is full the oldest values are overwritten.
+
+    Parameters
+    ----------
+    capacity : int
+        maximum number of values to store
+    skip_repeats : bool, default=False
+        if True, don't store a value if it is the same as the previous one
+
+    """
+
+    def __init__(self, capacity, skip_repeats=False):
+        if capacity < 1:
+            raise ValueError('Capacity must be at least 1')
+        self.capacity = int(capacity)
+        self.skip_repeats = skip_repeats
+        self._times = np.zeros(self.capacity, dtype=float)
+        self._values = np.zeros(self.capacity, dtype=float)
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'TimeSeriesBuffer(capacity={}, length={})'.format(self.capacity, len(self))
+
+    def __len__(self):
+        return self._count
+
+    def append(self, timestamp, value):
+        """Add a value to the buffer.
+
+        Returns False if the value wasn't added because it was a repeat, otherwise True.
+        """
+        with self._lock:
+            if self.skip_repeats and self._count > 0 and self._values[self._next - 1] == value:
+                return False
+            self._times[self._next] = timestamp
+            self._values[self._next] = value
+            self._next = (self._next + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+            return True
+
+    def latest(self):
+        """Return the most recent (timestamp, value), or None if the buffer is empty."""
+        with self._lock:
+            if self._count == 0:
+                return None
+            return float(self._times[self._next - 1]), float(self._values[self._next - 1])
+
+    def get(self, start_time=None, end_time=None, keep_last=False):
+        """Get copies of the timestamps and values within the given time range, oldest first.
+
+        Parameters
+        ----------
+        start_time : float, optional
+            Unix timestamp of the start of the range
+            default = no limit
+        end_time : float, optional
+            Unix timestamp of the end of the range
+            default = no limit
+        keep_last : bool, default=False
+            if True, always include the most recent value before `end_time`,
+            even if it is older than `start_time`
+
+        Returns
+        -------
+        times : numpy.ndarray
+            Unix timestamps
+        values : numpy.ndarray
+            values
+
+        """
+        with self._lock:
+            start = (self._next - self._count) % self.capacity
+            order = (np.arange(self._count) + start) % self.capacity
+            times = self._times[order]
+            values = self._values[order]
+
+        # Timestamps are in order, so we can find the range with a binary search
+        first, last = 0, len(times)
+        if end_time is not None:
+            last = np.searchsorted(times, end_time, side='right')
+        if start_time is not None:
+            first = np.searchsorted(times, start_time, side='left')
+            if keep_last and first >= last:
+                first = max(last - 1, 0)
+        return times[first:last], values[first:last]
+
+    def stats(self, end_time, hist_time):
+        """Get statistics of the values in a time window, see `window_stats()`."""
+        times, values = self.get(end_time=end_time)
+        return window_stats(times, values, end_time, hist_time)
+
+    def to_list(self, start_time=None, keep_last=True):
+        """Get a list of (timestamp, value) tuples since the given time."""
+        times, values = self.get(start_time, keep_last=keep_last)
+        return list(zip(times.tolist(), values.tolist()))
+
+
+class TelemetryStore(object):
+    """A collection of `TimeSeriesBuffer` channels, created as they are needed.
+
+    Parameters
+    ----------
+    capacity : int
+        maximum number of values to store in each channel
+    skip_repeats : bool, default=False
+        if True, don't store values which are the same as the previous one in that channel
+
+    """
+
+    def __init__(self, capacity, skip_repeats=False):
+        self.capacity = capacity
+        self.skip_repeats = skip_repeats
+        self.channels = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'TelemetryStore(channels={})'.format(sorted(self.channels))
+
+    def __contains__(self, name):
+        return name in self.channels
+
+    def __getitem__(self, name):
+        return self.channels[name]
+
+    def channel(self, name):
+        """Get the buffer for the given channel, creating it if needed."""
+        try:
+            return self.channels[name]
+        except KeyError:
+            with self._lock:
+                if name not in self.channels:
+                    self.channels[name] = TimeSeriesBuffer(self.capacity, self.skip_repeats)
+                return self.channels[name]
+
+    def append(self, name, timestamp, value):
+        """Add a value to the given channel."""
+        return self.channel(name).append(timestamp, value)
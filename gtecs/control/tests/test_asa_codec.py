@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Tests for the ASA mount TCP protocol codec.
+
+Run with pytest, or run directly to compare the speed of the codec to the original Enum-based
+implementation.
+"""
+
+import random
+import string
+import timeit
+
+from gtecs.control.hardware.mount.asa_codec import (CommandStatus, Commands, Keywords,
+                                                    ParameterType, decode_reply, encode_command)
+
+import pytest
+
+
+def enum_encode_command(command, params):
+    """Format a command using Enum lookups (the original implementation)."""
+    msg = '$SOR,'
+    msg += '{:0>10.0f},'
+    msg += str(Commands[command].value) + ','
+    msg += str(len(params)) + ','
+    for param in params:
+        keyword_num = Keywords[param[0]].value
+        value_type_num = ParameterType[param[1]].value
+        msg += '{}={}:{},'.format(keyword_num, value_type_num, param[2])
+    msg += '$EOM,'
+    msg += '$EOR'
+    msg = msg.format(len(msg))
+    return msg
+
+
+def enum_decode_reply(reply_str):
+    """Parse a reply using Enum lookups (the original implementation)."""
+    reply = reply_str.split(',')
+    if reply[0] != '$SOR' or reply[-1] != '$EOR':
+        raise ValueError('Invalid return string: {}'.format(reply_str))
+    command = Commands(int(reply[2])).name
+    nparams = int(reply[3])
+    param_dict = {}
+    for i in range(nparams):
+        param = reply[4 + i].replace('=', ':').split(':')
+        keyword = Keywords(int(param[0])).name
+        value_type = ParameterType(int(param[1])).name
+        value = param[2]
+        try:
+            if value_type == 'DOUBLE':
+                value = float(value)
+            else:
+                value = int(value)
+        except ValueError:
+            value = str(value)
+        if keyword == 'CMDSTATUS':
+            value = CommandStatus(value).name
+        param_dict[keyword] = value
+    return command, param_dict
+
+
+def random_params(rng, nparams):
+    """Generate a list of random, valid parameters."""
+    params = [('CMDSTATUS', 'INT16', rng.choice(list(CommandStatus)).value)]
+    for keyword in rng.sample([k.name for k in Keywords if k.name != 'CMDSTATUS'], nparams):
+        value_type = rng.choice(['DOUBLE', 'INT16', 'INT32', 'CHAR'])
+        if value_type == 'DOUBLE':
+            value = rng.uniform(-1e6, 1e6)
+        elif value_type == 'CHAR':
+            value = ''.join(rng.choice(string.ascii_letters + ' ') for _ in range(8))
+        else:
+            value = rng.randint(-32768, 32767)
+        params.append((keyword, value_type, value))
+    return params
+
+
+def random_message(rng):
+    """Generate a random, valid message."""
+    command = rng.choice(list(Commands)).name
+    return command, random_params(rng, rng.randint(0, 20))
+
+
+STATUS_REPLY = encode_command('MOUNTSTATUS', random_params(random.Random(0), 30))
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_encode_matches_enum(seed):
+    """Check the encoded messages match the original implementation."""
+    command, params = random_message(random.Random(seed))
+    assert encode_command(command, params) == enum_encode_command(command, params)
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_round_trip(seed):
+    """Check messages are decoded to the same command and values they were encoded from."""
+    command, params = random_message(random.Random(seed))
+    reply_str = encode_command(command, params)
+    assert int(reply_str[5:15]) == len(reply_str)
+
+    reply_command, reply_params = decode_reply(reply_str)
+    assert reply_command == command
+    assert reply_params == enum_decode_reply(reply_str)[1]
+    for keyword, value_type, value in params:
+        if keyword == 'CMDSTATUS':
+            assert reply_params[keyword] == CommandStatus(value).name
+        elif value_type == 'DOUBLE':
+            assert reply_params[keyword] == float(str(value))
+        else:
+            assert reply_params[keyword] == value
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_fuzz(seed):
+    """Check corrupted replies either decode the same as the original or raise ValueError."""
+    rng = random.Random(seed)
+    reply_str = encode_command(*random_message(rng))
+    chars = list(reply_str)
+    for _ in range(rng.randint(1, 5)):
+        position = rng.randrange(len(chars))
+        mutation = rng.choice(['delete', 'replace', 'insert'])
+        if mutation == 'delete':
+            del chars[position]
+        elif mutation == 'replace':
+            chars[position] = rng.choice(string.printable)
+        else:
+            chars.insert(position, rng.choice(',=:$0123456789'))
+    reply_str = ''.join(chars)
+
+    try:
+        expected = enum_decode_reply(reply_str)
+    except Exception:
+        expected = None
+
+    if expected is None:
+        with pytest.raises(ValueError):
+            decode_reply(reply_str)
+    else:
+        try:
+            command, param_dict = decode_reply(reply_str)
+        except ValueError:
+            # The codec can be stricter (e.g. when there are fewer parameters than stated)
+            return
+        assert command == expected[0]
+        assert param_dict.keys() == expected[1].keys()
+        for keyword, value in param_dict.items():
+            # The original implementation cut values off at any "=" or ":" characters
+            if not isinstance(value, str) or not any(char in value for char in '=:'):
+                assert value == expected[1][keyword]
+
+
+def test_invalid_codes():
+    """Check unknown codes raise ValueError."""
+    with pytest.raises(ValueError):
+        decode_reply('$SOR,0000000029,9999,0,$EOM,$EOR')
+    with pytest.raises(ValueError):
+        decode_reply('$SOR,0000000038,59,1,9999=50:1,$EOM,$EOR')
+    with pytest.raises(ValueError):
+        decode_reply('$SOR,0000000038,59,2,9999=50:1,$EOM,$EOR')
+    with pytest.raises(ValueError):
+        decode_reply('not a reply')
+
+
+def benchmark(number=10000):
+    """Compare the speed of the codec with the original implementation."""
+    command, params = 'MOUNTSLEWTOSTARASYNC', random_params(random.Random(1), 6)
+    for name, encode, decode in [('enum', enum_encode_command, enum_decode_reply),
+                                 ('codec', encode_command, decode_reply)]:
+        encode_time = timeit.timeit(lambda: encode(command, params), number=number)
+        decode_time = timeit.timeit(lambda: decode(STATUS_REPLY), number=number)
+        print('{: >6}: encode {:.1f} us, decode status {:.1f} us'.format(
+            name, encode_time / number * 1e6, decode_time / number * 1e6))
+
+
+if __name__ == '__main__':
+    benchmark()
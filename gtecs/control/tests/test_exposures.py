@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Tests for saving and reloading the exposure queue from its snapshot and journal files."""
+
+import os
+import shutil
+
+from gtecs.control.exposures import Exposure, ExposureQueue
+
+import pytest
+
+
+def make_exposures(num, start=1):
+    """Create a set of exposures, with a different target name for each."""
+    return [Exposure(10, 'L', target='T{:d}'.format(i), set_num=1, set_pos=i, set_tot=num)
+            for i in range(start, start + num)]
+
+
+def get_targets(exposure_queue):
+    """Get the target names of the exposures in the queue, in order."""
+    return [exposure.target for exposure in exposure_queue]
+
+
+@pytest.fixture
+def queue_file(tmp_path):
+    """Get the path to a new queue file."""
+    return str(tmp_path / 'exposure_queue')
+
+
+def test_reload(queue_file):
+    """Test the queue is restored from the snapshot and journal, and then compacted."""
+    exposure_queue = ExposureQueue(queue_file)
+    generation = exposure_queue.generation
+    exposure_queue.extend(make_exposures(3))
+    exposure_queue.append(make_exposures(1, start=4)[0])
+    exposure_queue.popleft()
+    assert get_targets(exposure_queue) == ['T2', 'T3', 'T4']
+
+    # Changes to the ends of the queue only go in the journal
+    assert exposure_queue.generation == generation
+    with open(queue_file) as f:
+        assert 'T2' not in f.read()
+
+    # Reloading replays the journal, then writes a new snapshot and an empty journal
+    new_queue = ExposureQueue(queue_file)
+    assert get_targets(new_queue) == ['T2', 'T3', 'T4']
+    assert [e.as_line() for e in new_queue] == [e.as_line() for e in exposure_queue]
+    assert new_queue.generation == generation + 1
+    with open(queue_file + '.journal') as f:
+        assert f.read() == '# Generation {:d}\n'.format(new_queue.generation)
+
+    # Changes in the middle of the queue rewrite the snapshot
+    new_queue.insert(1, make_exposures(1, start=5)[0])
+    assert new_queue.generation == generation + 2
+    assert get_targets(ExposureQueue(queue_file)) == ['T2', 'T5', 'T3', 'T4']
+
+
+@pytest.mark.parametrize('cut', [1, 10, -2])
+def test_partial_record(queue_file, cut):
+    """Test a record which was only partly written to the journal is ignored."""
+    exposure_queue = ExposureQueue(queue_file)
+    exposure_queue.extend(make_exposures(2))
+    with open(queue_file + '.journal') as f:
+        complete_length = len(f.read())
+    exposure_queue.extend(make_exposures(3, start=3))
+
+    # Cut the journal part way through the second record
+    # (the whole record is missing its closing '.' even if only the last byte is lost)
+    with open(queue_file + '.journal', 'r+') as f:
+        f.truncate(complete_length + cut if cut > 0 else len(f.read()) + cut)
+
+    new_queue = ExposureQueue(queue_file)
+    assert get_targets(new_queue) == ['T1', 'T2']
+
+
+def test_old_generation(queue_file):
+    """Test a journal left from before the latest snapshot is ignored."""
+    exposure_queue = ExposureQueue(queue_file)
+    exposure_queue.extend(make_exposures(3))
+    exposure_queue.popleft()
+    old_journal = queue_file + '.old'
+    shutil.copy(queue_file + '.journal', old_journal)
+
+    # Write a new snapshot, then put the old journal back
+    # (as if the daemon stopped before starting the new journal)
+    del exposure_queue[1]
+    assert get_targets(exposure_queue) == ['T2']
+    os.replace(old_journal, queue_file + '.journal')
+
+    # Replaying the old records would remove 'T2' and add the first set again
+    new_queue = ExposureQueue(queue_file)
+    assert get_targets(new_queue) == ['T2']
+
+
+def test_compaction(queue_file):
+    """Test the snapshot is rewritten once the journal is long enough, or the queue is empty."""
+    exposure_queue = ExposureQueue(queue_file, compact_limit=4)
+    generation = exposure_queue.generation
+    exposure_queue.extend(make_exposures(3))
+    assert exposure_queue.generation == generation
+    exposure_queue.popleft()
+    assert exposure_queue.generation == generation + 1
+    with open(queue_file + '.journal') as f:
+        assert f.read() == '# Generation {:d}\n'.format(exposure_queue.generation)
+    assert get_targets(ExposureQueue(queue_file)) == ['T2', 'T3']
+
+    exposure_queue = ExposureQueue(queue_file)
+    generation = exposure_queue.generation
+    exposure_queue.popleft()
+    exposure_queue.popleft()
+    assert len(exposure_queue) == 0
+    assert exposure_queue.generation == generation + 1
+    assert len(ExposureQueue(queue_file)) == 0
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Tests for the twilight sky brightness model used to choose flat field exposure times."""
+
+from gtecs.control.catalogs import flats
+
+import numpy as np
+
+import pytest
+
+
+# Simulated sky parameters (evening, so the sky is getting darker)
+START_TIME = 1700000000
+DECAY_RATE = -0.004  # per second
+COUNT_RATE = {'L': 2000, 'R': 800}  # counts per second at START_TIME
+
+
+def sky_counts(filt, start_time, exptime):
+    """Get the counts integrated over an exposure of the simulated sky."""
+    rate = COUNT_RATE[filt] * np.exp(DECAY_RATE * (start_time - START_TIME))
+    return rate * np.expm1(DECAY_RATE * exptime) / DECAY_RATE
+
+
+@pytest.fixture
+def model(monkeypatch):
+    """Create a model with a fixed 60 minute twilight, giving a prior rate of -0.0048/s."""
+    monkeypatch.setattr(flats, 'twilight_length', lambda time=None: 60)
+    return flats.TwilightSkyModel(eve=True)
+
+
+def test_no_measurements(model):
+    """Check predictions can't be made without measurements in that filter."""
+    assert model.scales == {}
+    with pytest.raises(ValueError):
+        model.exptime_for_counts(30000, 'L', START_TIME)
+    with pytest.raises(ValueError):
+        model.time_for_counts(30000, 'L', 10)
+
+    # Saturated and empty images should be rejected
+    assert not model.add_measurement('L', START_TIME, 10, 65000)
+    assert not model.add_measurement('L', START_TIME, 10, -5)
+    assert model.measurements == []
+
+
+def test_single_measurement(model):
+    """Check a single point uses the prior rate, and still predicts counts through that point."""
+    counts = sky_counts('L', START_TIME, 5)
+    assert model.add_measurement('L', START_TIME, 5, counts)
+    assert model.decay_rate == pytest.approx(model.prior_rate, rel=1e-6)
+    assert model.expected_counts('L', START_TIME, 5) == pytest.approx(counts, rel=1e-6)
+    assert model.exptime_for_counts(counts, 'L', START_TIME) == pytest.approx(5, rel=1e-6)
+
+    # No prediction for another filter yet
+    with pytest.raises(ValueError):
+        model.exptime_for_counts(30000, 'R', START_TIME)
+
+
+def test_fit_decay(model):
+    """Check the fitted rate and predicted exposure times from noisy decaying counts."""
+    rng = np.random.default_rng(42)
+    start_time = START_TIME
+    for i in range(12):
+        filt = 'L' if i < 8 else 'R'
+        exptime = 3 + i
+        counts = sky_counts(filt, start_time, exptime) * np.exp(rng.normal(0, 0.02))
+        assert model.add_measurement(filt, start_time, exptime, counts)
+        start_time += exptime + 30
+
+    # The rate is shared between filters, the prior should only have a small effect
+    assert model.decay_rate == pytest.approx(DECAY_RATE, rel=0.05)
+    assert model.scales['R'] / model.scales['L'] == pytest.approx(0.4, rel=0.05)
+
+    # Find the exposure time which gives 30000 counts on the simulated sky
+    target_time = start_time + 60
+    true_rate = COUNT_RATE['L'] * np.exp(DECAY_RATE * (target_time - START_TIME))
+    true_exptime = np.log(1 + 30000 * DECAY_RATE / true_rate) / DECAY_RATE
+    exptime = model.exptime_for_counts(30000, 'L', target_time)
+    assert exptime == pytest.approx(true_exptime, rel=0.05)
+    assert sky_counts('L', target_time, exptime) == pytest.approx(30000, rel=0.05)
+
+    # Far enough into twilight the target can't be reached at all
+    assert model.exptime_for_counts(30000, 'L', START_TIME + 3600) == np.inf
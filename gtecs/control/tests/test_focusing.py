@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Tests for the adaptive autofocus V-curve fitting, using a simulated V-curve."""
+
+from gtecs.control.focusing import VCurveFocuser
+
+import numpy as np
+
+import pytest
+
+
+# Simulated V-curve parameters
+BEST_POSITION = 20000
+GRADIENT = 0.004
+MIN_HFD = 1
+NFV = 4
+# Difference between the x-intercepts, as defined in `focusing.get_best_focus_position()`
+DELTA_X = 2 * MIN_HFD / GRADIENT
+
+
+def vcurve_hfd(position):
+    """Get the HFD at the given position, flattening out below the near-focus value."""
+    hfd = MIN_HFD + GRADIENT * abs(position - BEST_POSITION)
+    if hfd < NFV:
+        hfd = 0.6 * NFV + 0.4 * hfd
+    return hfd
+
+
+def run_focuser(start_position, big_step, seed, noise=0.05, max_measurements=10):
+    """Run the focuser against the simulated V-curve, like `autoFocus.run_adaptive()`."""
+    rng = np.random.default_rng(seed)
+    focuser = VCurveFocuser(start_position, -GRADIENT, GRADIENT, DELTA_X, NFV, big_step,
+                            max_uncertainty=100)
+    position = start_position
+    for _ in range(max_measurements):
+        hfd = vcurve_hfd(position)
+        focuser.add_measurement(position, hfd + rng.normal(0, noise * hfd), noise * hfd)
+        if focuser.converged:
+            break
+        position = focuser.get_next_position()
+    return focuser
+
+
+@pytest.mark.parametrize('offset', [-3000, -1500, 1500, 3000])
+@pytest.mark.parametrize('big_step', [1000, 2000])
+@pytest.mark.parametrize('seed', range(20))
+def test_converges(offset, big_step, seed):
+    """Check the focuser converges near best focus starting from either side of the curve."""
+    focuser = run_focuser(BEST_POSITION + offset, big_step, seed)
+    assert focuser.converged
+    best_position, _ = focuser.get_best_position()
+    assert abs(best_position - BEST_POSITION) < 250
+
+    # It should never measure the same position twice
+    positions = [x for x, _, _ in focuser.measurements]
+    assert len(set(positions)) == len(positions)
+
+
+def test_far_start_on_right():
+    """Check a single linear point is put on the correct side when starting far from focus."""
+    focuser = VCurveFocuser(23000, -GRADIENT, GRADIENT, DELTA_X, NFV, 2000)
+    focuser.add_measurement(23000, vcurve_hfd(23000), 0.1)
+    focuser.add_measurement(21000, vcurve_hfd(21000), 0.1)
+    best_position, _ = focuser.get_best_position()
+    assert abs(best_position - BEST_POSITION) < 100
+
+    # The next point should be on the other side, not back where we started
+    next_position = focuser.get_next_position()
+    assert next_position < BEST_POSITION
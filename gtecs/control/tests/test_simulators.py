@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Tests for the protocol simulators, and the device drivers run against them."""
+
+import logging
+import time
+
+from gtecs.control.hardware.dome import AstroHavenDome
+from gtecs.control.hardware.mount.asa_tcp import DDM500
+from gtecs.control.hardware.mount.sitech import SiTech
+from gtecs.control.hardware.ota import H400
+from gtecs.control.hardware.rasa import FocusLynx, FocusLynxHub
+from gtecs.control.simulators.asa_tcp import ASAMountServer
+from gtecs.control.simulators.base import FaultInjector
+from gtecs.control.simulators.dome import AstroHavenPLC
+from gtecs.control.simulators.focusers import FocusLynxHub as FocusLynxHubSimulator
+from gtecs.control.simulators.focusers import H400Gateway
+from gtecs.control.simulators.sitech import SiTechServer
+
+import pytest
+
+import serial  # noqa: I900
+
+
+def wait_for(condition, timeout=10):
+    """Wait until the condition function returns True, or fail after the timeout."""
+    start_time = time.time()
+    while not condition():
+        assert time.time() - start_time < timeout
+        time.sleep(0.05)
+
+
+def test_fault_injector_deterministic():
+    """Test the same seed gives the same faults."""
+    plans = []
+    for _ in range(2):
+        faults = FaultInjector(0.01, 0.01, drop_rate=0.1, corrupt_rate=0.1, split_rate=0.2,
+                               disconnect_rate=0.05, seed=42)
+        plans.append([faults.plan(b'reply\n') for _ in range(200)])
+    assert plans[0] == plans[1]
+    assert faults.counts['replies'] == 200
+    assert faults.counts['split'] > 0
+    assert faults.counts['dropped'] > 0
+
+
+def test_focuslynx():
+    """Test the FocusLynx drivers against the simulated hub."""
+    with FocusLynxHubSimulator(nicknames=['foc1', 'foc2'], speed=1e6) as simulator:
+        hub = FocusLynxHub(simulator.port)
+        assert hub.connected
+        assert hub.get_serial_number(2) == 'foc2'
+
+        focuser = FocusLynx(simulator.port, 1)
+        assert focuser.serial_number == 'foc1'
+        start_position = focuser.stepper_position
+        focuser.move_focuser(100)
+        time.sleep(0.1)
+        focuser._stored_info = None
+        assert focuser.stepper_position == start_position + 100
+        assert focuser.get_status() == 'Ready'
+
+
+def test_h400():
+    """Test the H400 driver against the simulated gateway."""
+    with H400Gateway(speed=1e6, cover_time=0.1) as simulator:
+        h400 = H400(simulator.port)
+        assert h400.max_extent == simulator.limit * 10
+        h400.set_focuser(1000)
+        h400.open_cover()
+        time.sleep(0.2)
+        h400._stored_info = None
+        assert abs(h400.stepper_position - 1000) <= 1
+        assert h400.get_status() == 'Ready'
+        assert h400.get_cover_position() == 'full_open'
+
+
+def test_dome_plc():
+    """Test the simulated dome PLC moves and reports its status."""
+    with AstroHavenPLC(move_time=0.5, idle_period=0.1) as simulator:
+        port = serial.Serial(simulator.port, 9600, timeout=1)
+        assert port.read(1) == b'0'
+        replies = b''
+        for _ in range(20):
+            port.write(b'a')
+            replies += port.read(1)
+            time.sleep(0.05)
+        assert replies.endswith(b'x')
+        assert simulator.port_status == '2'
+        port.close()
+
+
+def test_asa_mount():
+    """Test the ASA mount driver against the simulated server, including losing the connection."""
+    log = logging.getLogger('test_asa_mount')
+    with ASAMountServer(slew_time=0.5) as server:
+        mount = DDM500(server.host, server.port, log=log)
+        assert server.connected
+        assert mount.connected
+        assert mount.status == 'Parked'
+
+        # The mount has to be unparked before it can slew
+        with pytest.raises(ValueError, match='parked'):
+            mount.slew_to_radec(6, 30)
+        mount.unpark()
+        mount.slew_to_radec(6, 30)
+        mount._status_update_time = 0
+        assert mount.status == 'Slewing'
+        time.sleep(0.6)
+        mount._status_update_time = 0
+        assert mount.status == 'Tracking'
+        assert mount.ra == pytest.approx(6, abs=1e-4)
+        assert mount.dec == pytest.approx(30, abs=1e-3)
+
+        # The server closes the connection after the next reply
+        server.faults = FaultInjector(disconnect_rate=1)
+        mount.halt()
+        server.faults = FaultInjector()
+        mount._status_update_time = 0
+        with pytest.raises(OSError):
+            mount.get_status_snapshot()
+
+        # The daemon reconnects by creating a new driver, the mount state should be unchanged
+        mount = DDM500(server.host, server.port, log=log)
+        assert server.connection_count == 2
+        assert mount.status == 'Stopped'
+        assert not mount.parked
+
+
+def test_sitech_mount():
+    """Test the SiTech driver against the simulated server, including losing the connection."""
+    with SiTechServer(slew_time=0.5) as server:
+        mount = SiTech(server.host, server.port, status_period=0.05)
+        assert mount.status == 'Parked'
+
+        # The mount has to be unparked before it can slew
+        assert mount.slew_to_radec(6, 30) == 'Mount is parked'
+        assert mount.unpark() == 'UnPark accepted'
+        assert mount.slew_to_radec(6, 30) == 'GoTo accepted'
+        assert mount.status == 'Slewing'
+        wait_for(lambda: mount.status == 'Tracking')
+        assert mount.ra == pytest.approx(6, abs=1e-4)
+        assert mount.dec == pytest.approx(30, abs=1e-3)
+
+        # The server closes the connection, the status thread should notice
+        server.faults = FaultInjector(disconnect_rate=1)
+        wait_for(lambda: mount._status_error)
+        server.faults = FaultInjector()
+        mount._status_update_time = 0
+        with pytest.raises(OSError):
+            mount.get_status_snapshot()
+        mount.disconnect()
+
+        # The daemon reconnects by creating a new driver, the mount state should be unchanged
+        mount = SiTech(server.host, server.port, status_period=0.05)
+        assert server.connection_count == 2
+        assert mount.status == 'Tracking'
+        mount.disconnect()
+
+
+def test_astrohaven_dome():
+    """Test the dome driver against the simulated PLC, including corrupted replies."""
+    with AstroHavenPLC(move_time=5, idle_period=0.3) as simulator:
+        dome = AstroHavenDome(simulator.port)
+        wait_for(lambda: dome.status is not None and dome.status['b_side'] == 'closed')
+
+        # If every reply is corrupted the driver should give up and stop moving
+        simulator.faults = FaultInjector(corrupt_rate=1)
+        dome.open_side('b_side')
+        wait_for(lambda: dome.status['b_side'] == 'ERROR')
+        assert dome.plc_error
+        wait_for(lambda: not dome.output_thread_running)
+        assert 0 < simulator.position['b'] < 1
+
+        # Once the replies are fixed the status should recover from the idle status
+        simulator.faults = FaultInjector()
+        wait_for(lambda: dome.status['b_side'] == 'part_open')
+
+        # Now it can finish opening, and close again
+        simulator.move_time = 0.5
+        dome.open_side('b_side')
+        wait_for(lambda: dome.status['b_side'] == 'full_open')
+        wait_for(lambda: not dome.output_thread_running)
+        assert simulator.position['b'] == 1
+        dome.close_side('b_side')
+        wait_for(lambda: dome.status['b_side'] == 'closed')
+        assert simulator.position['b'] == 0
+        dome.disconnect()
@@ -0,0 +1,284 @@
+"""Timing spans, for following exposures through the daemons."""
+
+import glob
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from . import params
+from .astronomy import night_startdate
+
+
+class Span(object):
+    """A timed section of code, recorded by a `Tracer` when it ends.
+
+    Spans can either be used as context managers, or ended explicitly with `Span.end()`
+    (e.g. for states which last over multiple loops of a daemon control thread).
+    """
+
+    __slots__ = ['tracer', 'name', 'run_number', 'attrs', 'start_time']
+
+    def __init__(self, tracer, name, run_number=None, attrs=None, start_time=None):
+        self.tracer = tracer
+        self.name = name
+        self.run_number = run_number
+        self.attrs = attrs
+        self.start_time = start_time if start_time is not None else time.time()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.end(error=exc_type.__name__)
+        else:
+            self.end()
+
+    def end(self, **attrs):
+        """End the span and record it."""
+        if self.attrs:
+            attrs = {**self.attrs, **attrs}
+        self.tracer.record(self.name, self.start_time, time.time(), self.run_number, **attrs)
+
+
+class _NullSpan(object):
+    """A span that does nothing, returned when tracing is disabled."""
+
+    __slots__ = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return
+
+    def end(self, **attrs):
+        """Do nothing."""
+        return
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer(object):
+    """Record timing spans to a ring buffer and a JSON-lines file.
+
+    When disabled `Tracer.span()` returns a shared no-op span, so the cost of leaving the calls
+    in the daemons is just the method call.
+
+    Parameters
+    ----------
+    source : str
+        the name of the process recording the spans (usually the daemon ID)
+    enabled : bool, optional
+        if True record spans
+        default = `params.TRACING`
+    capacity : int, optional
+        number of spans to keep in memory
+        default = `params.TRACE_HISTORY`
+    path : str, optional
+        directory to write span files to, a subdirectory is created for each night
+        default = `params.TRACE_PATH`
+
+    """
+
+    def __init__(self, source, enabled=None, capacity=None, path=None):
+        self.source = source
+        self.enabled = enabled if enabled is not None else bool(params.TRACING)
+        self.path = path if path is not None else params.TRACE_PATH
+        if capacity is None:
+            capacity = params.TRACE_HISTORY
+        self.spans = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._filename = None
+        self._filename_time = 0
+
+    def __repr__(self):
+        return 'Tracer(source={}, enabled={}, spans={})'.format(
+            self.source, self.enabled, len(self.spans))
+
+    def span(self, name, run_number=None, **attrs):
+        """Start a new span.
+
+        Parameters
+        ----------
+        name : str
+            the name of the span (e.g. 'exposing')
+        run_number : int, optional
+            the run number of the exposure this span is part of
+        attrs
+            any other values to record with the span
+
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, run_number, attrs)
+
+    def record(self, name, start_time, end_time, run_number=None, **attrs):
+        """Record a span which has already finished."""
+        if not self.enabled:
+            return
+        span = {'source': self.source,
+                'name': name,
+                'run': run_number,
+                'start': start_time,
+                'end': end_time,
+                **attrs,
+                }
+        line = json.dumps(span, default=str) + '\n'
+        with self._lock:
+            self.spans.append(span)
+            try:
+                with open(self._get_filename(end_time), 'a') as f:
+                    f.write(line)
+            except Exception:
+                # Tracing should never interrupt the daemon, the span is still in memory
+                pass
+
+    def _get_filename(self, now):
+        """Get the file for tonight's spans (only checking the date every few minutes)."""
+        if self._filename is None or now - self._filename_time > 600:
+            direc = os.path.join(self.path, night_startdate())
+            os.makedirs(direc, exist_ok=True)
+            self._filename = os.path.join(direc, '{}.jsonl'.format(self.source))
+            self._filename_time = now
+        return self._filename
+
+    def get_spans(self, run_number=None, start_time=None):
+        """Get the recorded spans in memory, optionally filtered by run number or start time."""
+        with self._lock:
+            spans = list(self.spans)
+        if run_number is not None:
+            spans = [span for span in spans if span['run'] == run_number]
+        if start_time is not None:
+            spans = [span for span in spans if span['end'] > start_time]
+        return spans
+
+
+def load_spans(night=None, path=None):
+    """Load all the spans recorded by every daemon on the given night.
+
+    Parameters
+    ----------
+    night : str, optional
+        the date at the start of the night, in format Y-M-D
+        default = the current night
+    path : str, optional
+        directory the span files are saved in
+        default = `params.TRACE_PATH`
+
+    Returns
+    -------
+    spans : list of dict
+        all the spans, sorted by start time
+
+    """
+    if night is None:
+        night = night_startdate()
+    if path is None:
+        path = params.TRACE_PATH
+
+    spans = []
+    for filename in glob.glob(os.path.join(path, night, '*.jsonl')):
+        with open(filename) as f:
+            for line in f:
+                try:
+                    spans.append(json.loads(line))
+                except ValueError:
+                    # A partly-written line, if the daemon was killed
+                    continue
+    return sorted(spans, key=lambda span: span['start'])
+
+
+def get_exposure_timeline(spans, run_number):
+    """Get all the spans involved in taking the given exposure.
+
+    This includes the spans recorded with the run number, the exposure queue spans for the same
+    set position (the run number isn't assigned until the cameras start), and any other spans
+    without run numbers (e.g. mount and filter wheel moves) which overlap with those.
+
+    Returns
+    -------
+    timeline : list of dict
+        the spans, sorted by start time
+
+    """
+    run_spans = [span for span in spans if span['run'] == run_number]
+    if len(run_spans) == 0:
+        return []
+
+    # Find the exposure queue spans from the set info the camera daemon recorded
+    set_info = {(span['set_num'], span['set_pos']) for span in run_spans
+                if span.get('set_num') is not None}
+    exq_spans = [span for span in spans
+                 if span['run'] is None and (span.get('set_num'), span.get('set_pos')) in set_info]
+    run_spans += exq_spans
+
+    # Add any other spans that overlap the exposure
+    start = min(span['start'] for span in run_spans)
+    end = max(span['end'] for span in run_spans)
+    other_spans = [span for span in spans
+                   if span['run'] is None and span not in exq_spans and
+                   span['end'] > start and span['start'] < end]
+
+    return sorted(run_spans + other_spans, key=lambda span: span['start'])
+
+
+def get_dead_time_stats(spans, max_gap=300):
+    """Get statistics of the time between exposures, and of each type of span.
+
+    Parameters
+    ----------
+    spans : list of dict
+        the spans to analyse, see `load_spans()`
+    max_gap : float, default=300
+        gaps between exposures longer than this (in seconds) are assumed to be when the
+        telescope was idle, and are not counted as dead time
+
+    Returns
+    -------
+    stats : dict
+        'num_exposures' is the number of exposures, 'exposing_time' is the total time spent
+        exposing, 'dead_time' is the total time between exposures (excluding idle gaps),
+        'efficiency' is the fraction of the time spent exposing,
+        'dead_times' are statistics of the gaps between exposures and 'spans' are statistics
+        of the durations of each type of span (keyed by (source, name)), each as a dict of
+        'count', 'total', 'mean', 'median' and 'max'.
+
+    """
+    def summary(values):
+        values = np.asarray(values, dtype=float)
+        if len(values) == 0:
+            return {'count': 0, 'total': 0, 'mean': np.nan, 'median': np.nan, 'max': np.nan}
+        return {'count': len(values),
+                'total': float(np.sum(values)),
+                'mean': float(np.mean(values)),
+                'median': float(np.median(values)),
+                'max': float(np.max(values)),
+                }
+
+    exposures = sorted((span for span in spans
+                        if span['source'] == 'cam' and span['name'] == 'exposing'),
+                       key=lambda span: span['start'])
+    gaps = [exposures[i + 1]['start'] - exposures[i]['end'] for i in range(len(exposures) - 1)]
+    dead_times = [gap for gap in gaps if 0 <= gap < max_gap]
+    exposing_time = sum(span['end'] - span['start'] for span in exposures)
+
+    durations = {}
+    for span in spans:
+        key = (span['source'], span['name'])
+        durations.setdefault(key, []).append(span['end'] - span['start'])
+
+    stats = {'num_exposures': len(exposures),
+             'exposing_time': exposing_time,
+             'dead_time': sum(dead_times),
+             'efficiency': (exposing_time / (exposing_time + sum(dead_times))
+                            if exposing_time > 0 else np.nan),
+             'dead_times': summary(dead_times),
+             'spans': {key: summary(durations[key]) for key in sorted(durations)},
+             }
+    return stats